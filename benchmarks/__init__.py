@@ -0,0 +1,11 @@
+"""
+Benchmarks - Dispatcher Throughput Suite
+
+Bu paket bot update'larni qanchalik tez marshrutlashini o'lchaydi. Haqiqiy
+Dispatcher setup_handlers orqali quriladi, Telegram'ga chiqadigan so'rovlar
+esa FakeSession tomonidan yozib olinadi (tarmoq ishlatilmaydi).
+
+Ishga tushirish:
+    python -m benchmarks.dispatcher_bench --updates 5000
+    python -m benchmarks.dispatcher_bench --baseline bench.json --max-regression 0.2
+"""
@@ -0,0 +1,231 @@
+"""
+Dispatcher Benchmark - Updates/sec and Latency per Router
+
+Haqiqiy Dispatcher'ni (loader.dp + setup_handlers) soxta update'lar bilan
+yuklaydi va natijani chiqaradi:
+
+- umumiy o'tkazuvchanlik (updates/sec)
+- har bir rol router'i (RoleGateRouter) bo'yicha p50/p95/p99 - update boshidan oxirigacha
+- har bir handler moduli bo'yicha p50/p95/p99 - MetricsMiddleware ma'lumotlari
+- Telegram API chaqiruvlari soni (FakeSession)
+
+--baseline fayli berilsa, natija u bilan solishtiriladi va regressiya
+--max-regression chegarasidan oshsa jarayon 1 kodi bilan tugaydi.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import sys
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+# Har bir update uchun INFO loglari o'lchovni buzmasligi uchun
+os.environ.setdefault('LOG_LEVEL', 'WARNING')
+
+from aiogram.dispatcher.event.bases import UNHANDLED
+from aiogram.types import Update
+
+from benchmarks.fake_session import FakeSession
+from benchmarks.updates import ROLE_KEYBOARD_MODULES, UpdateFactory, bench_user_ids, build_workload
+from utils.metrics import QUANTILES, _quantile, metrics
+
+
+def _latency_summary(values: List[float]) -> Dict[str, Any]:
+    values = sorted(values)
+    summary = {'count': len(values)}
+    for q in QUANTILES:
+        summary[f'p{int(q * 100)}'] = _quantile(values, q)
+    return summary
+
+
+async def _setup(session_latency: float) -> Tuple[Any, Any, FakeSession]:
+    """loader.dp ni haqiqiy handler'lar bilan tayyorlash va bot session'ini almashtirish"""
+    import loader
+    from middlewares.metrics_middleware import ApiMetricsMiddleware
+
+    session = FakeSession(latency=session_latency)
+    session.middleware(ApiMetricsMiddleware())
+    loader.bot.session = session
+
+    await loader.setup_bot()
+    return loader, loader.dp, session
+
+
+async def run_benchmark(
+    updates: int = 5000,
+    concurrency: int = 1,
+    warmup: int = 500,
+    roles: Optional[List[str]] = None,
+    seed: int = 0,
+    session_latency: float = 0.0,
+) -> Dict[str, Any]:
+    """Benchmark'ni bajarish va natijalarni lug'at ko'rinishida qaytarish"""
+    loader, dp, session = await _setup(session_latency)
+    bot = loader.bot
+
+    user_ids = bench_user_ids(roles or list(ROLE_KEYBOARD_MODULES))
+    for role, user_id in user_ids.items():
+        loader.ROLE_MAPPING[user_id] = role
+
+    factory = UpdateFactory(bot)
+    warmup_load = build_workload(factory, user_ids, warmup, seed=seed + 1)
+    workload = build_workload(factory, user_ids, updates, seed=seed)
+
+    latencies: Dict[str, List[float]] = {role: [] for role in user_ids}
+    counters = {'handled': 0, 'unhandled': 0, 'errors': 0}
+
+    async def feed(role: str, update: Update, record: bool) -> None:
+        started = time.perf_counter()
+        try:
+            result = await dp.feed_update(bot, update)
+            outcome = 'unhandled' if result is UNHANDLED else 'handled'
+        except Exception:
+            outcome = 'errors'
+        elapsed = time.perf_counter() - started
+        if record:
+            latencies[role].append(elapsed)
+            counters[outcome] += 1
+
+    async def drive(items: List[Tuple[str, Update]], record: bool) -> None:
+        queue: asyncio.Queue = asyncio.Queue()
+        for item in items:
+            queue.put_nowait(item)
+
+        async def worker() -> None:
+            while not queue.empty():
+                role, update = queue.get_nowait()
+                await feed(role, update, record)
+
+        await asyncio.gather(*(worker() for _ in range(max(1, concurrency))))
+
+    await drive(warmup_load, record=False)
+
+    metrics.window_samples = max(updates, metrics.window_samples)
+    metrics.reset()
+    session.reset()
+
+    started = time.perf_counter()
+    await drive(workload, record=True)
+    elapsed = time.perf_counter() - started
+
+    # Pool'lar, FSM storage va boshqa resurslarni bot to'xtagandagidek yopish
+    await dp.emit_shutdown(dispatcher=dp, bots=[bot], bot=bot, **dp.workflow_data)
+
+    all_latencies = [value for values in latencies.values() for value in values]
+    return {
+        'updates': updates,
+        'concurrency': concurrency,
+        'seconds': round(elapsed, 4),
+        'updates_per_sec': round(updates / elapsed, 2) if elapsed else 0.0,
+        **counters,
+        'latency': _latency_summary(all_latencies),
+        'roles': {role: _latency_summary(values) for role, values in latencies.items()},
+        'routers': {
+            key: {name: window.summary()[name] for name in ('count', 'errors', 'p50', 'p95', 'p99')}
+            for key, window in sorted(metrics.routers.items())
+        },
+        'api_calls': dict(session.counts.most_common()),
+    }
+
+
+def check_regression(result: Dict[str, Any], baseline: Dict[str, Any], max_regression: float) -> List[str]:
+    """Baseline bilan solishtirish; chegaradan oshgan ko'rsatkichlar ro'yxati"""
+    failures = []
+    min_ups = baseline['updates_per_sec'] * (1 - max_regression)
+    if result['updates_per_sec'] < min_ups:
+        failures.append(
+            f"updates/sec {result['updates_per_sec']:.1f} < {min_ups:.1f} "
+            f"(baseline {baseline['updates_per_sec']:.1f})"
+        )
+    for q in ('p95', 'p99'):
+        limit = baseline['latency'][q] * (1 + max_regression)
+        if limit and result['latency'][q] > limit:
+            failures.append(
+                f"{q} {result['latency'][q] * 1000:.2f} ms > {limit * 1000:.2f} ms "
+                f"(baseline {baseline['latency'][q] * 1000:.2f} ms)"
+            )
+    return failures
+
+
+def _ms(seconds: float) -> str:
+    return f"{seconds * 1000:8.3f}"
+
+
+def print_report(result: Dict[str, Any]) -> None:
+    print(f"\n📊 Dispatcher benchmark: {result['updates']} updates, concurrency={result['concurrency']}")
+    print(f"⏱  {result['seconds']:.3f}s → {result['updates_per_sec']:.1f} updates/sec")
+    print(f"✅ handled={result['handled']}  ➖ unhandled={result['unhandled']}  ❌ errors={result['errors']}")
+    latency = result['latency']
+    print(f"📈 latency ms: p50 {_ms(latency['p50'])}  p95 {_ms(latency['p95'])}  p99 {_ms(latency['p99'])}")
+
+    print("\nRole router (update boshidan oxirigacha, ms):")
+    print(f"  {'router':<42} {'count':>6} {'p50':>8} {'p95':>8} {'p99':>8}")
+    for role, summary in result['roles'].items():
+        print(f"  {role:<42} {summary['count']:>6} {_ms(summary['p50'])} {_ms(summary['p95'])} {_ms(summary['p99'])}")
+
+    print("\nHandler modules (ms):")
+    print(f"  {'module':<42} {'count':>6} {'p50':>8} {'p95':>8} {'p99':>8}")
+    for key, summary in result['routers'].items():
+        print(f"  {key:<42} {summary['count']:>6} {_ms(summary['p50'])} {_ms(summary['p95'])} {_ms(summary['p99'])}")
+
+    if result['api_calls']:
+        print("\nTelegram API calls: " + ", ".join(f"{name}={count}" for name, count in result['api_calls'].items()))
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Dispatcher throughput benchmark")
+    parser.add_argument('--updates', type=int, default=5000, help="O'lchanadigan update'lar soni")
+    parser.add_argument('--warmup', type=int, default=500, help="Isitish uchun update'lar soni")
+    parser.add_argument('--concurrency', type=int, default=1, help="Parallel feed_update soni")
+    parser.add_argument('--roles', nargs='*', choices=list(ROLE_KEYBOARD_MODULES), help="Faqat shu rollar")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--session-latency', type=float, default=0.0,
+                        help="FakeSession har bir API chaqiruvga qo'shadigan kechikish (sekund)")
+    parser.add_argument('--output', help="Natijani JSON faylga yozish")
+    parser.add_argument('--baseline', help="Solishtirish uchun oldingi natija (JSON)")
+    parser.add_argument('--max-regression', type=float, default=0.2,
+                        help="Ruxsat etilgan yomonlashish ulushi (0.2 = 20%%)")
+    parser.add_argument('--min-ups', type=float, default=0.0, help="Minimal updates/sec")
+    parser.add_argument('--verbose', action='store_true', help="Handler'lar print() chiqishini ko'rsatish")
+    args = parser.parse_args(argv)
+
+    with contextlib.ExitStack() as stack:
+        if not args.verbose:
+            devnull = stack.enter_context(open(os.devnull, 'w'))
+            stack.enter_context(contextlib.redirect_stdout(devnull))
+        result = asyncio.run(run_benchmark(
+            updates=args.updates,
+            concurrency=args.concurrency,
+            warmup=args.warmup,
+            roles=args.roles,
+            seed=args.seed,
+            session_latency=args.session_latency,
+        ))
+
+    print_report(result)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+
+    failures = []
+    if args.min_ups and result['updates_per_sec'] < args.min_ups:
+        failures.append(f"updates/sec {result['updates_per_sec']:.1f} < --min-ups {args.min_ups:.1f}")
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            failures += check_regression(result, json.load(f), args.max_regression)
+
+    if failures:
+        print("\n❌ Regression detected:")
+        for failure in failures:
+            print(f"  - {failure}")
+        return 1
+    print("\n✅ No regression")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,146 @@
+"""
+Synthetic Updates - Benchmark Workload Generator
+
+Har bir rol uchun menyu tugmalari matnlari va callback_data qiymatlari
+keyboards/*_buttons.py modullaridan to'planadi va ulardan soxta Message /
+CallbackQuery update'lari yasaladi.
+"""
+
+import importlib
+import inspect
+import itertools
+import random
+from datetime import datetime
+from typing import Dict, Iterable, List, Tuple
+
+from aiogram import Bot
+from aiogram.types import InlineKeyboardMarkup, ReplyKeyboardMarkup, Update
+
+ROLE_KEYBOARD_MODULES = {
+    'admin': 'keyboards.admin_buttons',
+    'manager': 'keyboards.manager_buttons',
+    'junior_manager': 'keyboards.junior_manager_buttons',
+    'controller': 'keyboards.controllers_buttons',
+    'technician': 'keyboards.technician_buttons',
+    'client': 'keyboards.client_buttons',
+    'call_center': 'keyboards.call_center_buttons',
+    'call_center_supervisor': 'keyboards.call_center_supervisor_buttons',
+    'warehouse': 'keyboards.warehouse_buttons',
+}
+
+LANGUAGE_PARAMS = ('lang', 'language')
+
+# Benchmark foydalanuvchilari uchun ID'lar (haqiqiy ID'lar bilan to'qnashmaydi)
+BENCH_USER_ID_BASE = 9_000_000_000
+
+
+def bench_user_ids(roles: Iterable[str]) -> Dict[str, int]:
+    """Har bir rol uchun bitta soxta foydalanuvchi ID"""
+    return {role: BENCH_USER_ID_BASE + index for index, role in enumerate(roles)}
+
+
+def _walk_markup(markup, texts: set, callbacks: set) -> None:
+    if isinstance(markup, ReplyKeyboardMarkup):
+        for button in itertools.chain.from_iterable(markup.keyboard):
+            texts.add(button.text)
+    elif isinstance(markup, InlineKeyboardMarkup):
+        for button in itertools.chain.from_iterable(markup.inline_keyboard):
+            if button.callback_data:
+                callbacks.add(button.callback_data)
+
+
+def collect_role_inputs(role: str) -> Tuple[List[str], List[str]]:
+    """
+    Rol klaviaturalaridagi tugma matnlari va callback_data qiymatlari.
+    Faqat argumentlarsiz (yoki faqat til argumenti bilan) chaqirsa bo'ladigan
+    klaviatura funksiyalari ishlatiladi.
+    """
+    module = importlib.import_module(ROLE_KEYBOARD_MODULES[role])
+    texts: set = set()
+    callbacks: set = set()
+    for name, func in inspect.getmembers(module, inspect.isfunction):
+        if func.__module__ != module.__name__ or name.startswith('_'):
+            continue
+        kwargs = {}
+        for param in inspect.signature(func).parameters.values():
+            if param.default is not inspect.Parameter.empty or param.kind in (param.VAR_POSITIONAL, param.VAR_KEYWORD):
+                continue
+            if param.name not in LANGUAGE_PARAMS:
+                break
+            kwargs[param.name] = 'uz'
+        else:
+            try:
+                _walk_markup(func(**kwargs), texts, callbacks)
+            except Exception:
+                pass
+    return sorted(texts), sorted(callbacks)
+
+
+class UpdateFactory:
+    """Soxta Message va CallbackQuery update'larini yaratish"""
+
+    def __init__(self, bot: Bot):
+        self.bot = bot
+        self._update_id = itertools.count(1)
+        self._message_id = itertools.count(1)
+
+    @staticmethod
+    def _user(user_id: int) -> dict:
+        return {'id': user_id, 'is_bot': False, 'first_name': 'Bench', 'language_code': 'uz'}
+
+    def _message(self, user_id: int, text: str) -> dict:
+        return {
+            'message_id': next(self._message_id),
+            'date': int(datetime.now().timestamp()),
+            'chat': {'id': user_id, 'type': 'private'},
+            'from': self._user(user_id),
+            'text': text,
+        }
+
+    def message(self, user_id: int, text: str) -> Update:
+        payload = {'update_id': next(self._update_id), 'message': self._message(user_id, text)}
+        return Update.model_validate(payload, context={'bot': self.bot})
+
+    def callback(self, user_id: int, data: str) -> Update:
+        update_id = next(self._update_id)
+        payload = {
+            'update_id': update_id,
+            'callback_query': {
+                'id': str(update_id),
+                'from': self._user(user_id),
+                'chat_instance': str(user_id),
+                'data': data,
+                'message': self._message(user_id, 'bench'),
+            },
+        }
+        return Update.model_validate(payload, context={'bot': self.bot})
+
+
+def build_workload(
+    factory: UpdateFactory,
+    user_ids: Dict[str, int],
+    total: int,
+    seed: int = 0,
+) -> List[Tuple[str, Update]]:
+    """
+    Barcha rollar bo'yicha teng taqsimlangan (rol, update) ro'yxati.
+    Har bir rolda /start, menyu tugmalari va callback'lar navbatma-navbat keladi.
+    """
+    inputs = []
+    for role, user_id in user_ids.items():
+        texts, callbacks = collect_role_inputs(role)
+        role_inputs = [('message', '/start')]
+        role_inputs += [('message', text) for text in texts]
+        role_inputs += [('callback', data) for data in callbacks]
+        inputs.append((role, user_id, itertools.cycle(role_inputs)))
+
+    workload = []
+    for role, user_id, role_inputs in itertools.islice(itertools.cycle(inputs), total):
+        kind, value = next(role_inputs)
+        if kind == 'message':
+            workload.append((role, factory.message(user_id, value)))
+        else:
+            workload.append((role, factory.callback(user_id, value)))
+
+    random.Random(seed).shuffle(workload)
+    return workload
@@ -0,0 +1,30 @@
+"""
+Database - Shared Async Data-Access Layer
+
+Barcha handler'lar uchun umumiy ma'lumotlar qatlami: ulanishlar pool'i
+(aiosqlite, asyncpg bilan mos interfeys), per-update identity map va
+read-through kesh va repository funksiyalari.
+"""
+
+from .pool import get_db_pool, close_db_pools, create_pool
+from .identity_map import IdentityMap, get_identity_map, identity_scope, identity_cached, load_once
+from .read_through import ReadThroughCache, application_cache
+from .users import get_user_by_telegram_id, get_user_lang, get_user_region, update_user, update_user_language
+
+__all__ = [
+    'get_db_pool',
+    'close_db_pools',
+    'create_pool',
+    'IdentityMap',
+    'get_identity_map',
+    'identity_scope',
+    'identity_cached',
+    'load_once',
+    'ReadThroughCache',
+    'application_cache',
+    'get_user_by_telegram_id',
+    'get_user_lang',
+    'get_user_region',
+    'update_user',
+    'update_user_language',
+]
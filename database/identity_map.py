@@ -0,0 +1,102 @@
+"""
+Identity Map - Per-update Row Cache
+
+Bitta update davomida bir xil foydalanuvchi yoki ariza qatori necha marta
+so'ralmasin, bazadan faqat bir marta olinadi. Xarita contextvars orqali
+saqlanadi: IdentityMapMiddleware har bir update uchun yangisini ochadi,
+shuning uchun ma'lumot update'lar orasida eskirib qolmaydi.
+
+Update kontekstidan tashqarida (fon vazifalari, startup) kesh ishlatilmaydi.
+"""
+
+import asyncio
+import functools
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterator, Optional, Tuple
+
+_current_map: ContextVar[Optional["IdentityMap"]] = ContextVar('identity_map', default=None)
+
+
+class IdentityMap:
+    """(tur, kalit) -> qator; parallel so'rovlar bitta yuklashni kutadi"""
+
+    def __init__(self):
+        self._rows: Dict[Tuple[str, Hashable], asyncio.Future] = {}
+        self.stats = {'hits': 0, 'loads': 0}
+
+    async def get_or_load(self, kind: str, key: Hashable, load: Callable[[], Awaitable[Any]]) -> Any:
+        entry = self._rows.get((kind, key))
+        if entry is not None:
+            self.stats['hits'] += 1
+            return await asyncio.shield(entry)
+
+        entry = self._rows[(kind, key)] = asyncio.get_running_loop().create_future()
+        self.stats['loads'] += 1
+        try:
+            row = await load()
+        except BaseException as e:
+            self._rows.pop((kind, key), None)
+            if isinstance(e, Exception):
+                entry.set_exception(e)
+                # Kutayotgan bo'lmasa "exception was never retrieved" bo'lmasligi uchun
+                entry.exception()
+            else:
+                entry.cancel()
+            raise
+        entry.set_result(row)
+        return row
+
+    def put(self, kind: str, key: Hashable, row: Any) -> None:
+        """Yozishdan keyin yangi qatorni xaritaga qo'yish"""
+        entry = asyncio.get_running_loop().create_future()
+        entry.set_result(row)
+        self._rows[(kind, key)] = entry
+
+    def forget(self, kind: str, key: Hashable) -> None:
+        self._rows.pop((kind, key), None)
+
+
+def get_identity_map() -> Optional[IdentityMap]:
+    """Joriy update'ning identity map'i (update tashqarisida None)"""
+    return _current_map.get()
+
+
+@contextmanager
+def identity_scope() -> Iterator[IdentityMap]:
+    """Yangi identity map ochish (har bir update uchun)"""
+    identity_map = IdentityMap()
+    token = _current_map.set(identity_map)
+    try:
+        yield identity_map
+    finally:
+        _current_map.reset(token)
+
+
+async def load_once(kind: str, key: Hashable, load: Callable[[], Awaitable[Any]]) -> Any:
+    """Joriy update ichida qatorni bir marta yuklash"""
+    identity_map = _current_map.get()
+    if identity_map is None:
+        return await load()
+    return await identity_map.get_or_load(kind, key, load)
+
+
+def remember(kind: str, key: Hashable, row: Any) -> None:
+    identity_map = _current_map.get()
+    if identity_map is not None:
+        identity_map.put(kind, key, row)
+
+
+def identity_cached(func: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+    """
+    Async qidiruv funksiyasi natijasini update davomida keshlash.
+    Kalit - funksiya nomi va uning argumentlari.
+    """
+    kind = f"{func.__module__}.{func.__qualname__}"
+
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        key = (args, tuple(sorted(kwargs.items())))
+        return await load_once(kind, key, lambda: func(*args, **kwargs))
+
+    return wrapper
@@ -0,0 +1,248 @@
+"""
+Database Pool - aiosqlite Backend with asyncpg-compatible Interface
+
+Lokal ishlash uchun aiosqlite ustidagi ulanishlar pool'i. Interfeys asyncpg
+bilan bir xil (pool.acquire(), conn.fetch/fetchrow/fetchval/execute, $1
+parametrlar), shuning uchun DATABASE_URL postgres:// bo'lsa xuddi shu kod
+asyncpg pool bilan ishlaydi.
+
+- Har bir DSN uchun bitta pool - get_db_pool() har safar yangi pool yaratmaydi
+- Ulanishlar kerak bo'lganda ochiladi (max_size gacha) va qayta ishlatiladi
+- SQLite uchun WAL rejimi va jadval sxemasi avtomatik yaratiladi
+"""
+
+import asyncio
+import logging
+import os
+import re
+import sqlite3
+from typing import Any, Dict, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DATABASE_URL = os.getenv('DATABASE_URL', 'sqlite:///alfaconnect_{region}.sqlite3')
+DEFAULT_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', 5))
+
+_PLACEHOLDER_RE = re.compile(r'\$(\d+)')
+
+SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    telegram_id INTEGER NOT NULL UNIQUE,
+    role TEXT NOT NULL DEFAULT 'client',
+    language TEXT NOT NULL DEFAULT 'uz',
+    full_name TEXT,
+    username TEXT,
+    phone_number TEXT,
+    address TEXT,
+    region TEXT,
+    is_active INTEGER NOT NULL DEFAULT 1,
+    created_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    updated_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+"""
+
+
+def _sqlite_query(query: str) -> str:
+    """asyncpg uslubidagi $1 parametrlarini SQLite ?1 ko'rinishiga o'tkazish"""
+    return _PLACEHOLDER_RE.sub(r'?\1', query)
+
+
+class SQLiteConnection:
+    """aiosqlite ulanishi ustidagi asyncpg-ga o'xshash wrapper"""
+
+    def __init__(self, conn):
+        self._conn = conn
+        self._in_transaction = False
+
+    async def execute(self, query: str, *args: Any) -> str:
+        cursor = await self._conn.execute(_sqlite_query(query), args)
+        rowcount = cursor.rowcount
+        await cursor.close()
+        if not self._in_transaction:
+            await self._conn.commit()
+        return f"{query.split(None, 1)[0].upper()} {rowcount}"
+
+    async def executemany(self, query: str, args: Sequence[Sequence[Any]]) -> None:
+        await self._conn.executemany(_sqlite_query(query), args)
+        if not self._in_transaction:
+            await self._conn.commit()
+
+    async def fetch(self, query: str, *args: Any) -> List[Dict[str, Any]]:
+        async with self._conn.execute(_sqlite_query(query), args) as cursor:
+            rows = await cursor.fetchall()
+        if not self._in_transaction and self._conn.in_transaction:
+            # INSERT/UPDATE ... RETURNING
+            await self._conn.commit()
+        return [dict(row) for row in rows]
+
+    async def fetchrow(self, query: str, *args: Any) -> Optional[Dict[str, Any]]:
+        rows = await self.fetch(query, *args)
+        return rows[0] if rows else None
+
+    async def fetchval(self, query: str, *args: Any, column: int = 0) -> Any:
+        row = await self.fetchrow(query, *args)
+        return list(row.values())[column] if row else None
+
+    def transaction(self) -> "_Transaction":
+        return _Transaction(self)
+
+
+class _Transaction:
+    def __init__(self, connection: SQLiteConnection):
+        self._connection = connection
+
+    async def __aenter__(self) -> SQLiteConnection:
+        await self._connection._conn.execute('BEGIN')
+        self._connection._in_transaction = True
+        return self._connection
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        self._connection._in_transaction = False
+        if exc_type is None:
+            await self._connection._conn.commit()
+        else:
+            await self._connection._conn.rollback()
+
+
+class _PoolAcquireContext:
+    """`await pool.acquire()` va `async with pool.acquire() as conn` ikkalasi uchun"""
+
+    def __init__(self, pool: "SQLitePool"):
+        self._pool = pool
+        self._connection: Optional[SQLiteConnection] = None
+
+    def __await__(self):
+        return self._pool._acquire().__await__()
+
+    async def __aenter__(self) -> SQLiteConnection:
+        self._connection = await self._pool._acquire()
+        return self._connection
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self._pool.release(self._connection)
+
+
+class SQLitePool:
+    """Cheklangan sondagi aiosqlite ulanishlari pool'i"""
+
+    def __init__(self, path: str, max_size: int = DEFAULT_POOL_SIZE):
+        self.path = path
+        self.max_size = max(1, max_size)
+        self._idle: asyncio.Queue = asyncio.Queue()
+        self._size = 0
+        self._closed = False
+
+    async def _connect(self) -> SQLiteConnection:
+        try:
+            import aiosqlite
+        except ImportError:
+            raise RuntimeError("SQLite backend requires the 'aiosqlite' package: pip install aiosqlite")
+
+        conn = await aiosqlite.connect(self.path)
+        conn.row_factory = sqlite3.Row
+        await conn.execute('PRAGMA journal_mode=WAL')
+        await conn.execute('PRAGMA synchronous=NORMAL')
+        await conn.execute('PRAGMA busy_timeout=5000')
+        return SQLiteConnection(conn)
+
+    async def init_schema(self) -> None:
+        async with self.acquire() as connection:
+            await connection._conn.executescript(SQLITE_SCHEMA)
+            await connection._conn.commit()
+
+    async def _acquire(self) -> SQLiteConnection:
+        if self._closed:
+            raise RuntimeError("Pool is closed")
+        if self._idle.empty() and self._size < self.max_size:
+            self._size += 1
+            try:
+                return await self._connect()
+            except Exception:
+                self._size -= 1
+                raise
+        return await self._idle.get()
+
+    def acquire(self) -> _PoolAcquireContext:
+        return _PoolAcquireContext(self)
+
+    async def release(self, connection: SQLiteConnection) -> None:
+        if self._closed:
+            await connection._conn.close()
+            return
+        self._idle.put_nowait(connection)
+
+    # asyncpg Pool kabi to'g'ridan-to'g'ri so'rovlar
+    async def execute(self, query: str, *args: Any) -> str:
+        async with self.acquire() as connection:
+            return await connection.execute(query, *args)
+
+    async def fetch(self, query: str, *args: Any) -> List[Dict[str, Any]]:
+        async with self.acquire() as connection:
+            return await connection.fetch(query, *args)
+
+    async def fetchrow(self, query: str, *args: Any) -> Optional[Dict[str, Any]]:
+        async with self.acquire() as connection:
+            return await connection.fetchrow(query, *args)
+
+    async def fetchval(self, query: str, *args: Any) -> Any:
+        async with self.acquire() as connection:
+            return await connection.fetchval(query, *args)
+
+    async def close(self) -> None:
+        self._closed = True
+        while not self._idle.empty():
+            connection = self._idle.get_nowait()
+            await connection._conn.close()
+        self._size = 0
+
+
+async def create_pool(dsn: str, max_size: int = DEFAULT_POOL_SIZE):
+    """DSN bo'yicha pool yaratish: sqlite:///path yoki postgres://..."""
+    if dsn.startswith(('postgres://', 'postgresql://')):
+        try:
+            import asyncpg
+        except ImportError:
+            raise RuntimeError("PostgreSQL backend requires the 'asyncpg' package: pip install asyncpg")
+        return await asyncpg.create_pool(dsn, min_size=1, max_size=max_size)
+
+    path = dsn[len('sqlite:///'):] if dsn.startswith('sqlite:///') else dsn
+    pool = SQLitePool(path, max_size=max_size)
+    await pool.init_schema()
+    return pool
+
+
+_pools: Dict[str, Any] = {}
+_pools_lock: Optional[asyncio.Lock] = None
+
+
+async def get_db_pool(region: str = 'toshkent'):
+    """
+    Region uchun umumiy pool. DATABASE_URL da {region} bo'lsa har bir region
+    alohida bazaga ega bo'ladi, aks holda barcha regionlar bitta pool'dan foydalanadi.
+    """
+    global _pools_lock
+    dsn = DEFAULT_DATABASE_URL.format(region=(region or 'toshkent').lower())
+    pool = _pools.get(dsn)
+    if pool is not None:
+        return pool
+
+    if _pools_lock is None:
+        _pools_lock = asyncio.Lock()
+    async with _pools_lock:
+        pool = _pools.get(dsn)
+        if pool is None:
+            pool = _pools[dsn] = await create_pool(dsn)
+            logger.info(f"Database pool created: {dsn}")
+    return pool
+
+
+async def close_db_pools() -> None:
+    """Bot to'xtaganda barcha pool'larni yopish"""
+    pools = list(_pools.values())
+    _pools.clear()
+    for pool in pools:
+        try:
+            await pool.close()
+        except Exception as e:
+            logger.error(f"Error closing database pool: {e}")
@@ -0,0 +1,159 @@
+"""
+Read-Through Cache - Cross-update Record Cache
+
+Identity map faqat bitta update ichida ishlaydi; ariza kartasini qayta-qayta
+ochish (oldinga/orqaga, yangilash) esa har safar bazaga boradi. Bu kesh
+update'lar orasida yozuvlarni qisqa muddat saqlaydi.
+
+- Har bir kalit uchun alohida TTL (masalan, yopilgan arizalar uzoqroq saqlanadi)
+- Single-flight: bir xil kalit uchun parallel so'rovlar bitta yuklashni kutadi
+- Yozishda invalidate(record_id) - shu yozuvga tegishli barcha kalitlar o'chiriladi;
+  yozuv paytida davom etayotgan yuklash natijasi keshga qo'yilmaydi
+- Hajm bo'yicha cheklangan LRU
+
+identity_cached bilan birga ishlatiladi - identity_cached tashqarida bo'ladi:
+
+    @identity_cached
+    @application_cache.cached()
+    async def get_service_request(request_id): ...
+"""
+
+import asyncio
+import functools
+import logging
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Set, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL = float(os.getenv('APPLICATION_CACHE_TTL', 30))
+DEFAULT_MAX_ENTRIES = int(os.getenv('APPLICATION_CACHE_SIZE', 10000))
+
+# Yakunlangan arizalar kamdan-kam o'zgaradi
+FINAL_STATUSES = ('completed', 'cancelled')
+
+Ttl = Union[float, Callable[[Any], float]]
+
+
+class ReadThroughCache:
+    """kalit -> (yozuv, amal qilish muddati); yozuv id'si bo'yicha invalidatsiya"""
+
+    def __init__(
+        self,
+        ttl: Ttl = DEFAULT_TTL,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        record_id: Callable[[Any], Hashable] = lambda row: row.get('id'),
+    ):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.record_id = record_id
+        self._entries: "OrderedDict[Hashable, Tuple[Any, float]]" = OrderedDict()
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        # record_id -> {kalit} (prefiks yoki region bilan olingan kalitlar ham)
+        self._keys: Dict[Hashable, Set[Hashable]] = {}
+        self._key_record: Dict[Hashable, Hashable] = {}
+        # record_id -> oxirgi invalidatsiya vaqti
+        self._invalidated: Dict[Hashable, float] = {}
+        self.stats = {'hits': 0, 'misses': 0, 'coalesced': 0, 'invalidations': 0}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _ttl_for(self, row: Any) -> float:
+        return self.ttl(row) if callable(self.ttl) else self.ttl
+
+    def _store(self, key: Hashable, row: Any) -> None:
+        self._drop(key)
+        record_id = self.record_id(row)
+        self._entries[key] = (row, time.monotonic() + self._ttl_for(row))
+        self._key_record[key] = record_id
+        self._keys.setdefault(record_id, set()).add(key)
+        while len(self._entries) > self.max_entries:
+            self._drop(next(iter(self._entries)))
+
+    def _drop(self, key: Hashable) -> None:
+        if self._entries.pop(key, None) is None:
+            return
+        record_id = self._key_record.pop(key)
+        keys = self._keys.get(record_id)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys[record_id]
+
+    async def get_or_load(self, key: Hashable, load: Callable[[], Awaitable[Any]]) -> Any:
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry[1] > time.monotonic():
+                self._entries.move_to_end(key)
+                self.stats['hits'] += 1
+                return entry[0]
+            self._drop(key)
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.stats['coalesced'] += 1
+            return await asyncio.shield(inflight)
+
+        self.stats['misses'] += 1
+        future = self._inflight[key] = asyncio.get_running_loop().create_future()
+        started = time.monotonic()
+        try:
+            row = await load()
+        except BaseException as e:
+            if isinstance(e, Exception):
+                future.set_exception(e)
+                # Kutayotgan bo'lmasa "exception was never retrieved" bo'lmasligi uchun
+                future.exception()
+            else:
+                future.cancel()
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+        # Topilmagan yozuvlar keshlanmaydi; yuklash paytida o'zgargan yozuv ham
+        if row is not None and self._invalidated.get(self.record_id(row), 0) < started:
+            self._store(key, row)
+        future.set_result(row)
+        return row
+
+    def invalidate(self, record_id: Hashable) -> None:
+        """Yozuv o'zgardi (status yangilandi) - unga tegishli barcha kalitlarni o'chirish"""
+        self.stats['invalidations'] += 1
+        self._invalidated[record_id] = time.monotonic()
+        for key in list(self._keys.get(record_id, ())):
+            self._drop(key)
+        # Eski yozuvlar ro'yxati cheksiz o'smasligi uchun
+        if len(self._invalidated) > self.max_entries:
+            horizon = time.monotonic() - 60
+            self._invalidated = {rid: at for rid, at in self._invalidated.items() if at > horizon}
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._keys.clear()
+        self._key_record.clear()
+
+    def cached(self) -> Callable[[Callable[..., Awaitable[Any]]], Callable[..., Awaitable[Any]]]:
+        """Async qidiruv funksiyasini keshlash. Kalit - funksiya nomi va argumentlari."""
+        def decorator(func: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+            kind = f"{func.__module__}.{func.__qualname__}"
+
+            @functools.wraps(func)
+            async def wrapper(*args, **kwargs):
+                key = (kind, args, tuple(sorted(kwargs.items())))
+                return await self.get_or_load(key, lambda: func(*args, **kwargs))
+
+            return wrapper
+
+        return decorator
+
+
+def application_ttl(row: Dict[str, Any]) -> float:
+    """Yakunlangan arizalar 10 barobar uzoqroq saqlanadi"""
+    return DEFAULT_TTL * 10 if row.get('current_status') in FINAL_STATUSES else DEFAULT_TTL
+
+
+# Ariza tafsilotlari uchun umumiy kesh (manager, controller)
+application_cache = ReadThroughCache(ttl=application_ttl)
@@ -0,0 +1,145 @@
+"""
+Users Repository
+
+Foydalanuvchi qatorlari bilan ishlash uchun yagona joy. Oldin har bir handler
+modulida o'zining get_user_by_telegram_id / get_user_lang mock'i bor edi.
+
+- Bir update ichida foydalanuvchi bazadan bir marta olinadi (identity map)
+- Botga birinchi marta kirgan foydalanuvchi avtomatik ro'yxatga olinadi;
+  ism va username joriy update'dagi Telegram profilidan olinadi
+- Rol manbai loader.ROLE_MAPPING (resolve_user_role): saqlangan rol undan
+  farq qilsa, qator yangilanadi - RoleFilter va handler'lar bir xil rolni ko'radi
+"""
+
+import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, Optional
+
+from database.identity_map import load_once, remember
+from database.pool import get_db_pool
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LANGUAGE = 'uz'
+DEFAULT_REGION = 'toshkent'
+
+# Joriy update'ning Telegram foydalanuvchisi (IdentityMapMiddleware o'rnatadi)
+_current_profile: ContextVar[Optional[Any]] = ContextVar('telegram_profile', default=None)
+
+# update_user orqali o'zgartirish mumkin bo'lgan ustunlar
+UPDATABLE_FIELDS = ('role', 'language', 'full_name', 'username', 'phone_number', 'address', 'region', 'is_active')
+
+
+def _to_user(row: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    if row is None:
+        return None
+    user = dict(row)
+    # Handler'lar ikkala nomni ham ishlatadi
+    user['phone'] = user.get('phone_number')
+    return user
+
+
+@contextmanager
+def telegram_profile_scope(telegram_user: Optional[Any]) -> Iterator[None]:
+    """Update davomida Telegram profilini (aiogram User) yangi foydalanuvchi yozuvi uchun saqlash"""
+    token = _current_profile.set(telegram_user)
+    try:
+        yield
+    finally:
+        _current_profile.reset(token)
+
+
+def _profile_for(telegram_id: int) -> Dict[str, Optional[str]]:
+    profile = _current_profile.get()
+    if profile is None or profile.id != telegram_id:
+        return {'full_name': None, 'username': None}
+    return {'full_name': profile.full_name, 'username': profile.username}
+
+
+async def _fetch_user(telegram_id: int, region: Optional[str]) -> Optional[Dict[str, Any]]:
+    pool = await get_db_pool(region or DEFAULT_REGION)
+    row = await pool.fetchrow("SELECT * FROM users WHERE telegram_id = $1", telegram_id)
+
+    # Imported here: utils.role_system imports loader
+    from utils.role_system import resolve_user_role
+    role = resolve_user_role(telegram_id)
+
+    if row is not None:
+        if row['role'] != role:
+            # ROLE_MAPPING o'zgargan - handler'lardagi user['role'] tekshiruvlari ham yangi rolni ko'rsin
+            row = await pool.fetchrow(
+                "UPDATE users SET role = $2, updated_at = CURRENT_TIMESTAMP WHERE telegram_id = $1 RETURNING *",
+                telegram_id,
+                role,
+            )
+            logger.info(f"User {telegram_id} role updated to {role}")
+        return _to_user(row)
+
+    profile = _profile_for(telegram_id)
+    row = await pool.fetchrow(
+        """
+        INSERT INTO users (telegram_id, role, language, full_name, username, region)
+        VALUES ($1, $2, $3, $4, $5, $6)
+        ON CONFLICT (telegram_id) DO UPDATE SET role = excluded.role
+        RETURNING *
+        """,
+        telegram_id,
+        role,
+        DEFAULT_LANGUAGE,
+        profile['full_name'],
+        profile['username'],
+        region or DEFAULT_REGION,
+    )
+    logger.info(f"User {telegram_id} registered with role {role}")
+    return _to_user(row)
+
+
+async def get_user_by_telegram_id(telegram_id: int, region: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """Foydalanuvchini Telegram ID bo'yicha olish (kerak bo'lsa ro'yxatga olish)"""
+    return await load_once('user', telegram_id, lambda: _fetch_user(telegram_id, region))
+
+
+async def get_user_lang(telegram_id: int) -> str:
+    """Foydalanuvchi tili"""
+    user = await get_user_by_telegram_id(telegram_id)
+    return (user or {}).get('language') or DEFAULT_LANGUAGE
+
+
+async def get_user_region(telegram_id: int) -> str:
+    """Foydalanuvchi regioni"""
+    user = await get_user_by_telegram_id(telegram_id)
+    return (user or {}).get('region') or DEFAULT_REGION
+
+
+async def update_user(telegram_id: int, region: Optional[str] = None, **fields: Any) -> Optional[Dict[str, Any]]:
+    """Foydalanuvchi ma'lumotlarini yangilash; yangilangan qatorni qaytaradi"""
+    unknown = set(fields) - set(UPDATABLE_FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown user fields: {', '.join(sorted(unknown))}")
+    if not fields:
+        return await get_user_by_telegram_id(telegram_id, region)
+
+    # Qator mavjudligiga ishonch hosil qilish
+    await get_user_by_telegram_id(telegram_id, region)
+
+    columns = list(fields)
+    assignments = ", ".join(f"{column} = ${index}" for index, column in enumerate(columns, start=2))
+    pool = await get_db_pool(region or DEFAULT_REGION)
+    row = await pool.fetchrow(
+        f"UPDATE users SET {assignments}, updated_at = CURRENT_TIMESTAMP WHERE telegram_id = $1 RETURNING *",
+        telegram_id,
+        *(fields[column] for column in columns),
+    )
+    user = _to_user(row)
+    remember('user', telegram_id, user)
+    return user
+
+
+async def update_user_language(telegram_id: int, language: str, region: Optional[str] = None) -> bool:
+    """Foydalanuvchi tilini saqlash"""
+    try:
+        return await update_user(telegram_id, region, language=language) is not None
+    except Exception as e:
+        logger.error(f"Error updating user language: {e}")
+        return False
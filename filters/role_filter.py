@@ -4,7 +4,7 @@ from utils.role_system import get_cached_role, cache_role
 from loader import get_user_role
 import logging
 import time
-from typing import Dict
+from typing import Dict, Optional
 
 logger = logging.getLogger(__name__)
 
@@ -55,7 +55,11 @@ class RoleFilter(BaseFilter):
         self._last_check_cache[user_id] = current_time
         return True
 
-    async def __call__(self, event: Message | CallbackQuery) -> bool:
+    async def __call__(self, event: Message | CallbackQuery, user_role: Optional[str] = None) -> bool:
+        # Fast path: role already resolved once for this update by RoleMiddleware
+        if user_role is not None:
+            return user_role in self.roles
+        
         try:
             user_id = event.from_user.id
             
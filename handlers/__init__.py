@@ -26,36 +26,40 @@ def setup_handlers(dp: Dispatcher):
         from handlers.call_center_supervisor import get_call_center_supervisor_router
         from handlers.warehouse import get_warehouse_router
         
+        from middlewares.role_middleware import RoleMiddleware
+        from utils.role_system import RoleGateRouter
+        
+        # Resolve the user's role once per update; role routers below are gated
+        # on it, so an update only enters the router trees its role can use
+        dp.update.outer_middleware(RoleMiddleware())
+        
+        def include_role_router(roles, router):
+            gate = RoleGateRouter(roles)
+            gate.include_router(router)
+            dp.include_router(gate)
+        
         # Include role-based routers in order of usage frequency
         # Client router should be included early since it's the most common
-        client_router = get_client_router()
-        dp.include_router(client_router)
+        include_role_router('client', get_client_router())
         
         # Include manager router early to ensure it gets priority for inbox handlers
-        manager_router = get_manager_router()
-        dp.include_router(manager_router)
+        include_role_router(['manager', 'junior_manager'], get_manager_router())
         
         # Include other role routers
-        call_center_router = get_call_center_router()
-        dp.include_router(call_center_router)
-        
-        call_center_supervisor_router = get_call_center_supervisor_router()
-        dp.include_router(call_center_supervisor_router)
-        
-        technician_router = get_technician_router()
-        dp.include_router(technician_router)
-        
-        junior_manager_router = get_junior_manager_router()
-        dp.include_router(junior_manager_router)
-        
-        controller_router = get_controller_router()
-        dp.include_router(controller_router)
+        # Call center router also contains the supervisor's call center screens
+        include_role_router(['call_center', 'call_center_supervisor'], get_call_center_router())
+        include_role_router('call_center_supervisor', get_call_center_supervisor_router())
+        include_role_router('technician', get_technician_router())
+        include_role_router('junior_manager', get_junior_manager_router())
+        include_role_router('controller', get_controller_router())
         
-        warehouse_router = get_warehouse_router()
-        dp.include_router(warehouse_router)
+        # Warehouse router also serves the "📦 Ombor bilan ishlash" integration for other roles
+        include_role_router(
+            ['warehouse', 'manager', 'junior_manager', 'controller', 'call_center', 'technician'],
+            get_warehouse_router()
+        )
         
-        admin_router = get_admin_router()
-        dp.include_router(admin_router)
+        include_role_router('admin', get_admin_router())
 
         
         print("✅ All handlers setup completed successfully")
@@ -14,21 +14,13 @@ from states.admin_states import AdminCallbackStates, AdminMainMenuStates
 # Keyboard imports
 from keyboards.admin_buttons import get_admin_main_menu
 
-# Mock functions to replace utils and database imports
-async def get_user_by_telegram_id(telegram_id: int) -> Dict[str, Any]:
-    """Mock user data"""
-    return {
-        'id': 1,
-        'telegram_id': telegram_id,
-        'role': 'client',
-        'language': 'uz',
-        'full_name': 'Test User',
-        'phone': '+998901234567',
-        'created_at': '2025-08-05 10:24:00'
-    }
+# Utils imports
+from utils.export_cache import bump_data_version
 
+# Mock functions to replace utils and database imports
 async def update_user_role(telegram_id: int, new_role: str) -> bool:
     """Mock update user role"""
+    bump_data_version()
     return True
 
 async def block_user(telegram_id: int) -> bool:
@@ -52,6 +44,7 @@ async def get_order_by_id(order_id: int) -> Dict[str, Any]:
 
 async def update_order_status(order_id: int, new_status: str) -> bool:
     """Mock update order status"""
+    bump_data_version()
     return True
 
 async def assign_order_to_technician(order_id: int, technician_id: int) -> bool:
@@ -1,10 +1,11 @@
 from aiogram import F, Router
-from aiogram.types import Message, CallbackQuery, BufferedInputFile, InlineKeyboardMarkup, InlineKeyboardButton
+from aiogram.types import Message, CallbackQuery, InlineKeyboardMarkup, InlineKeyboardButton
 from aiogram.fsm.context import FSMContext
 from datetime import datetime
 from keyboards.admin_buttons import get_admin_main_menu
 from states.admin_states import AdminMainMenuStates
-from utils.export_utils import create_export_file, get_available_export_types, get_available_export_formats
+from utils.export_utils import get_available_export_types, get_available_export_formats
+from utils.export_service import create_export_file_async
 from filters.role_filter import RoleFilter
 
 def get_admin_export_router():
@@ -265,22 +266,18 @@ def get_admin_export_router():
             
             try:
                 # Create export file
-                file_content, filename = create_export_file(export_type, format_type, "admin")
+                export_file = await create_export_file_async(export_type, format_type, "admin")
+                filename = export_file.filename
                 
                 # Get file size
-                file_content.seek(0, 2)  # Move to end
-                file_size = file_content.tell()
-                file_content.seek(0)  # Reset to beginning
+                file_size = export_file.size
                 
                 # Delete processing message
                 await processing_msg.delete()
                 
                 # Send only the file with all information in caption
                 await callback.message.answer_document(
-                    BufferedInputFile(
-                        file_content.read(),
-                        filename=filename
-                    ),
+                    export_file.as_input_file(),
                     caption=(
                         f"✅ {export_type_names[lang].get(export_type, export_type)} export muvaffaqiyatli yakunlandi!\n\n"
                         f"📄 Fayl nomi: {filename}\n"
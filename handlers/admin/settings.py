@@ -313,8 +313,7 @@ def get_admin_settings_router():
         await call.answer()
         
         try:
-            from utils.export_utils import create_export_file
-            from aiogram.types import BufferedInputFile
+            from utils.export_service import create_export_file_async
             
             processing_text = "Barcha ma'lumotlar eksport qilinmoqda..."
             processing_msg = await call.message.edit_text(processing_text)
@@ -327,18 +326,14 @@ def get_admin_settings_router():
             
             # Send each export file
             for export_type in export_types:
-                file_content, filename = create_export_file(export_type, "csv", "admin")
+                export_file = await create_export_file_async(export_type, "csv", "admin")
+                filename = export_file.filename
                 
                 # Get file size
-                file_content.seek(0, 2)  # Move to end
-                file_size = file_content.tell()
-                file_content.seek(0)  # Reset to beginning
+                file_size = export_file.size
                 
                 await call.message.answer_document(
-                    BufferedInputFile(
-                        file_content.read(),
-                        filename=filename
-                    ),
+                    export_file.as_input_file(),
                     caption=f"✅ {export_type.title()} export muvaffaqiyatli yakunlandi!\n\n"
                             f"📄 Fayl: {filename}\n"
                             f"📦 Hajm: {file_size:,} bayt\n"
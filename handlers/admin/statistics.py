@@ -503,29 +503,24 @@ def get_admin_statistics_router():
         await call.answer()
         
         try:
-            from utils.export_utils import create_export_file
-            from aiogram.types import BufferedInputFile
+            from utils.export_service import create_export_file_async
             
             processing_text = "Zayavkalar statistikasi eksport qilinmoqda..."
             await call.message.edit_text(processing_text)
             
             # Create export file
-            file_content, filename = create_export_file("statistics", "xlsx", "admin")
+            export_file = await create_export_file_async("statistics", "xlsx", "admin")
+            filename = export_file.filename
             
             # Get file size
-            file_content.seek(0, 2)  # Move to end
-            file_size = file_content.tell()
-            file_content.seek(0)  # Reset to beginning
+            file_size = export_file.size
             
             # Delete processing message
             await call.message.delete()
             
             # Send only the file with all information in caption
             await call.message.answer_document(
-                BufferedInputFile(
-                    file_content.read(),
-                    filename=filename
-                ),
+                export_file.as_input_file(),
                 caption=f"✅ Statistika export muvaffaqiyatli yakunlandi!\n\n"
                         f"📄 Fayl: {filename}\n"
                         f"📦 Hajm: {file_size:,} bayt\n"
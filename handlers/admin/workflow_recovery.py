@@ -7,7 +7,9 @@ from aiogram import F, Router
 from aiogram.types import Message, CallbackQuery, InlineKeyboardMarkup, InlineKeyboardButton
 from aiogram.fsm.context import FSMContext
 from aiogram.filters import StateFilter
+from aiogram.exceptions import TelegramBadRequest
 from functools import wraps
+import html
 import logging
 from datetime import datetime, timedelta
 from typing import Optional, Dict, Any
@@ -18,6 +20,8 @@ from keyboards.admin_buttons import get_workflow_recovery_keyboard
 # States imports
 from states.admin_states import AdminWorkflowRecoveryStates, AdminMainMenuStates
 from filters.role_filter import RoleFilter
+from utils.metrics import render_metrics_text
+from utils.notification_outbox import notification_outbox
 
 def get_admin_workflow_recovery_router():
     """Get admin workflow recovery router"""
@@ -42,30 +46,10 @@ def get_admin_workflow_recovery_router():
     @router.message(F.text.in_(["📊 Tizim holati", "📊 Состояние системы"]))
     async def system_status(message: Message):
         """Show system status"""
-        # Mock system status
-        system_status = {
-            'database': '🟢 Faol',
-            'cache': '🟢 Faol',
-            'notifications': '🟢 Faol',
-            'workflow_engine': '🟢 Faol',
-            'file_storage': '🟢 Faol',
-            'external_apis': '🟡 Sezuvchan',
-            'backup_system': '🟢 Faol',
-            'monitoring': '🟢 Faol'
-        }
-        
         text = (
             f"📊 <b>Tizim holati</b>\n\n"
             f"🕐 Yangilangan: {datetime.now().strftime('%d.%m.%Y %H:%M:%S')}\n\n"
-            f"🗄 <b>Ma'lumotlar bazasi:</b> {system_status['database']}\n"
-            f"💾 <b>Cache:</b> {system_status['cache']}\n"
-            f"📢 <b>Bildirishnomalar:</b> {system_status['notifications']}\n"
-            f"⚙️ <b>Workflow engine:</b> {system_status['workflow_engine']}\n"
-            f"📁 <b>Fayl saqlash:</b> {system_status['file_storage']}\n"
-            f"🌐 <b>Tashqi API:</b> {system_status['external_apis']}\n"
-            f"💾 <b>Backup tizimi:</b> {system_status['backup_system']}\n"
-            f"📈 <b>Monitoring:</b> {system_status['monitoring']}\n\n"
-            f"📊 <b>Umumiy holat:</b> 🟢 Tizim to'liq ishlayapti"
+            f"{render_metrics_text()}"
         )
         
         keyboard = InlineKeyboardMarkup(inline_keyboard=[
@@ -80,6 +64,12 @@ def get_admin_workflow_recovery_router():
                     text="🔧 Tizim sozlamalari",
                     callback_data="system_settings"
                 )
+            ],
+            [
+                InlineKeyboardButton(
+                    text="📮 Yetkazilmagan xabarlar",
+                    callback_data="outbox_dead_letters"
+                )
             ]
         ])
         
@@ -338,30 +328,10 @@ def get_admin_workflow_recovery_router():
         """Refresh system status"""
         await call.answer()
         
-        # Mock updated system status
-        system_status = {
-            'database': '🟢 Faol',
-            'cache': '🟢 Faol',
-            'notifications': '🟢 Faol',
-            'workflow_engine': '🟢 Faol',
-            'file_storage': '🟢 Faol',
-            'external_apis': '🟢 Faol',
-            'backup_system': '🟢 Faol',
-            'monitoring': '🟢 Faol'
-        }
-        
         text = (
             f"📊 <b>Yangilangan tizim holati</b>\n\n"
             f"🕐 Yangilangan: {datetime.now().strftime('%d.%m.%Y %H:%M:%S')}\n\n"
-            f"🗄 <b>Ma'lumotlar bazasi:</b> {system_status['database']}\n"
-            f"💾 <b>Cache:</b> {system_status['cache']}\n"
-            f"📢 <b>Bildirishnomalar:</b> {system_status['notifications']}\n"
-            f"⚙️ <b>Workflow engine:</b> {system_status['workflow_engine']}\n"
-            f"📁 <b>Fayl saqlash:</b> {system_status['file_storage']}\n"
-            f"🌐 <b>Tashqi API:</b> {system_status['external_apis']}\n"
-            f"💾 <b>Backup tizimi:</b> {system_status['backup_system']}\n"
-            f"📈 <b>Monitoring:</b> {system_status['monitoring']}\n\n"
-            f"📊 <b>Umumiy holat:</b> 🟢 Tizim to'liq ishlayapti"
+            f"{render_metrics_text()}"
         )
         
         keyboard = InlineKeyboardMarkup(inline_keyboard=[
@@ -376,12 +346,70 @@ def get_admin_workflow_recovery_router():
                     text="🔧 Tizim sozlamalari",
                     callback_data="system_settings"
                 )
+            ],
+            [
+                InlineKeyboardButton(
+                    text="📮 Yetkazilmagan xabarlar",
+                    callback_data="outbox_dead_letters"
+                )
             ]
         ])
         
         await call.message.edit_text(text, reply_markup=keyboard)
         await call.answer("Tizim holati yangilandi!")
 
+    @router.callback_query(F.data == "outbox_dead_letters")
+    async def outbox_dead_letters(call: CallbackQuery):
+        """Dead-letter: urinishlar tugagan bildirishnomalar"""
+        await call.answer()
+        
+        dead_letters = notification_outbox.dead_letters(limit=10)
+        text = f"📮 <b>Yetkazilmagan xabarlar</b>\n\n"
+        if not dead_letters:
+            text += "✅ Yetkazilmagan xabarlar yo'q"
+        for i, letter in enumerate(dead_letters, 1):
+            error = (letter['last_error'] or '-')[:100]
+            text += (
+                f"{i}. 👤 <code>{letter['chat_id']}</code> · {letter['method']}\n"
+                f"   🔑 {letter['dedup_key'] or '-'}\n"
+                f"   🔁 Urinishlar: {letter['attempts']}\n"
+                f"   ⏰ {datetime.fromtimestamp(letter['updated_at']).strftime('%d.%m.%Y %H:%M')}\n"
+                f"   ❌ {html.escape(error)}\n\n"
+            )
+        
+        buttons = []
+        if dead_letters:
+            buttons.append([
+                InlineKeyboardButton(text="🔁 Qayta yuborish", callback_data="outbox_requeue_dead"),
+                InlineKeyboardButton(text="🗑 Tozalash", callback_data="outbox_delete_dead")
+            ])
+        buttons.append([InlineKeyboardButton(text="🔄 Yangilash", callback_data="outbox_dead_letters")])
+        
+        try:
+            await call.message.edit_text(
+                text,
+                reply_markup=InlineKeyboardMarkup(inline_keyboard=buttons),
+                parse_mode='HTML'
+            )
+        except TelegramBadRequest as e:
+            # Yangilashda ro'yxat o'zgarmagan bo'lsa
+            if "message is not modified" not in str(e):
+                raise
+
+    @router.callback_query(F.data == "outbox_requeue_dead")
+    async def outbox_requeue_dead(call: CallbackQuery):
+        """Dead-letter xabarlarni qayta navbatga qo'yish"""
+        count = notification_outbox.requeue_dead()
+        await call.answer(f"🔁 {count} ta xabar qayta navbatga qo'yildi", show_alert=True)
+        await call.message.edit_text(f"✅ <b>{count} ta xabar qayta yuborilmoqda</b>", parse_mode='HTML')
+
+    @router.callback_query(F.data == "outbox_delete_dead")
+    async def outbox_delete_dead(call: CallbackQuery):
+        """Dead-letter xabarlarni o'chirish"""
+        count = notification_outbox.delete_dead()
+        await call.answer(f"🗑 {count} ta xabar o'chirildi", show_alert=True)
+        await call.message.edit_text(f"✅ <b>{count} ta yetkazilmagan xabar o'chirildi</b>", parse_mode='HTML')
+
     @router.callback_query(F.data == "recover_all_workflows")
     async def recover_all_workflows(call: CallbackQuery):
         """Recover all stuck workflows"""
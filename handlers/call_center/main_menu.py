@@ -14,12 +14,9 @@ from keyboards.call_center_buttons import call_center_main_menu_reply
 # States imports
 from states.call_center import CallCenterMainMenuStates
 from filters.role_filter import RoleFilter
+from database import get_user_lang
 
 # Mock functions to replace utils and database imports
-async def get_user_language(user_id: int) -> str:
-    """Mock user language"""
-    return 'uz'
-
 async def get_call_center_stats() -> Dict[str, Any]:
     """Mock call center statistics"""
     return {
@@ -42,7 +39,7 @@ def get_call_center_main_menu_router():
     @router.message(F.text.in_(["/start", "/callcenter", "📞 Call Center", " Колл-центр"]))
     async def call_center_start(message: Message, state: FSMContext):
         """Call center start"""
-        lang = await get_user_language(message.from_user.id)
+        lang = await get_user_lang(message.from_user.id)
         
         # Mock dashboard stats
         stats = await get_call_center_stats()
@@ -66,7 +63,7 @@ def get_call_center_main_menu_router():
     @router.message(F.text.in_(['🏠 Bosh sahifa', '🏠 Главная']))
     async def call_center_home(message: Message, state: FSMContext):
         """Call center home"""
-        lang = await get_user_language(message.from_user.id)
+        lang = await get_user_lang(message.from_user.id)
         
         # Mock dashboard stats
         stats = await get_call_center_stats()
@@ -90,7 +87,7 @@ def get_call_center_main_menu_router():
     @router.message(F.text.in_(['ℹ️ Yordam', 'ℹ️ Помощь']))
     async def call_center_help(message: Message, state: FSMContext):
         """Call center help"""
-        lang = await get_user_language(message.from_user.id)
+        lang = await get_user_lang(message.from_user.id)
         
         if lang == 'uz':
             help_text = (
@@ -123,7 +120,7 @@ def get_call_center_main_menu_router():
 
 async def show_call_center_main_menu(message: Message):
     """Show call center main menu"""
-    lang = await get_user_language(message.from_user.id)
+    lang = await get_user_lang(message.from_user.id)
     
     # Mock dashboard stats
     stats = await get_call_center_stats()
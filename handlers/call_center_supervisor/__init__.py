@@ -20,7 +20,11 @@ from .application_management import get_call_center_supervisor_application_manag
 from .feedback import get_call_center_supervisor_feedback_router
 from .inbox import get_call_center_supervisor_inbox_router
 from .language import get_call_center_supervisor_language_router
-from .notification_management import get_call_center_supervisor_notification_management_router
+from .notification_management import (
+    BroadcastDraftMiddleware,
+    get_call_center_supervisor_broadcast_router,
+    get_call_center_supervisor_notification_management_router,
+)
 from .orders import get_call_center_supervisor_orders_router
 from .staff_application_creation import get_call_center_supervisor_staff_application_creation_router
 from .statistics import get_call_center_supervisor_statistics_router
@@ -44,5 +48,8 @@ def get_call_center_supervisor_router():
     router.include_router(get_call_center_supervisor_statistics_router())
     router.include_router(get_call_center_supervisor_workflow_management_router())
     router.include_router(get_call_center_supervisor_export_router())
+    # Xabar matnini qabul qiluvchi oxirida - menyu tugmalari o'z handler'lariga boradi
+    router.include_router(get_call_center_supervisor_broadcast_router())
+    router.message.outer_middleware(BroadcastDraftMiddleware())
     
     return router 
@@ -20,43 +20,15 @@ from keyboards.call_center_supervisor_buttons import (
 # States imports
 from states.call_center_supervisor_states import CallCenterSupervisorApplicationStates
 from filters.role_filter import RoleFilter
+from database import get_user_by_telegram_id, get_user_lang
+from utils.phone_index import client_phone_index
 
 # Mock functions to replace utils and database imports
 # Removed duplicate get_role_router - using centralized version from utils.role_system
 
-async def get_user_by_telegram_id(telegram_id: int) -> Dict[str, Any]:
-    """Mock user data"""
-    return {
-        'id': 1,
-        'telegram_id': telegram_id,
-        'role': 'call_center_supervisor',
-        'language': 'uz',
-        'full_name': 'Test Supervisor'
-    }
-
-async def get_user_lang(user_id: int) -> str:
-    """Mock user language"""
-    return 'uz'
-
 async def search_clients_by_phone(phone: str) -> List[Dict[str, Any]]:
-    """Mock client search by phone"""
-    # Mock data - in real app this would query database
-    if phone.startswith('+998'):
-        return [
-            {
-                'id': 1,
-                'full_name': 'Test Client 1',
-                'phone': phone,
-                'address': 'Test Address 1'
-            },
-            {
-                'id': 2,
-                'full_name': 'Test Client 2', 
-                'phone': phone,
-                'address': 'Test Address 2'
-            }
-        ]
-    return []
+    """Client search by full or partial phone via the shared phone index"""
+    return client_phone_index.search(phone, limit=10)
 
 async def search_clients_by_name(name: str) -> List[Dict[str, Any]]:
     """Mock client search by name"""
@@ -74,6 +46,12 @@ async def search_clients_by_name(name: str) -> List[Dict[str, Any]]:
 
 async def get_client_by_id(client_id: int) -> Dict[str, Any]:
     """Mock get client by ID"""
+    if client_id in _created_clients:
+        return _created_clients[client_id]
+    # Qidiruv natijalari shu indeksdan - tanlangan mijoz ham undan olinadi
+    client = client_phone_index.get(client_id)
+    if client is not None:
+        return client
     # Mock data - in real app this would query database
     return {
         'id': client_id,
@@ -82,10 +60,18 @@ async def get_client_by_id(client_id: int) -> Dict[str, Any]:
         'address': f'Test Address {client_id}'
     }
 
+# Supervisor yaratgan mijozlar (mock)
+_created_clients: Dict[int, Dict[str, Any]] = {}
+
 async def create_new_client(client_data: Dict[str, Any]) -> int:
     """Mock create new client"""
     # Mock data - in real app this would insert into database
-    return 999  # Return mock client ID
+    client_id = 999 + len(_created_clients)
+    client = {'id': client_id, 'address': '', **client_data}
+    _created_clients[client_id] = client
+    # Keyingi qidiruvlarda telefon bo'yicha topilishi uchun
+    client_phone_index.add(client)
+    return client_id
 
 async def create_staff_application_as_supervisor(supervisor_id: int, client_id: int, application_type: str, details: Dict[str, Any]) -> int:
     """Mock create staff application"""
@@ -1,5 +1,5 @@
 from aiogram import F, Router
-from aiogram.types import Message, CallbackQuery, BufferedInputFile, InlineKeyboardMarkup, InlineKeyboardButton
+from aiogram.types import Message, CallbackQuery, InlineKeyboardMarkup, InlineKeyboardButton
 from aiogram.fsm.context import FSMContext
 from datetime import datetime
 from filters.role_filter import RoleFilter
@@ -10,7 +10,8 @@ from keyboards.call_center_supervisor_buttons import (
     get_supervisor_export_formats_keyboard,
     get_supervisor_export_back_types_keyboard
 )
-from utils.export_utils import create_export_file, get_available_export_types, get_available_export_formats
+from utils.export_utils import get_available_export_types, get_available_export_formats
+from utils.export_service import create_export_file_async
 
 def get_call_center_supervisor_export_router():
     """Call Center Supervisor export router"""
@@ -230,22 +231,18 @@ def get_call_center_supervisor_export_router():
             
             try:
                 # Create export file
-                file_content, filename = create_export_file(export_type, format_type, "call_center_supervisor")
+                export_file = await create_export_file_async(export_type, format_type, "call_center_supervisor")
+                filename = export_file.filename
                 
                 # Get file size
-                file_content.seek(0, 2)  # Move to end
-                file_size = file_content.tell()
-                file_content.seek(0)  # Reset to beginning
+                file_size = export_file.size
                 
                 # Delete processing message
                 await processing_msg.delete()
                 
                 # Send only the file with all information in caption
                 await callback.message.answer_document(
-                    BufferedInputFile(
-                        file_content.read(),
-                        filename=filename
-                    ),
+                    export_file.as_input_file(),
                     caption=(
                         f"✅ {export_type_names[lang].get(export_type, export_type)} export muvaffaqiyatli yakunlandi!\n\n"
                         f"📄 Fayl nomi: {filename}\n"
@@ -18,22 +18,9 @@ from keyboards.call_center_supervisor_buttons import (
 # States imports
 from states.call_center_supervisor_states import CallCenterSupervisorFeedbackStates
 from filters.role_filter import RoleFilter
+from database import get_user_by_telegram_id, get_user_lang
 
 # Mock functions to replace utils and database imports
-async def get_user_by_telegram_id(telegram_id: int):
-    """Mock user data"""
-    return {
-        'id': 1,
-        'telegram_id': telegram_id,
-        'role': 'call_center_supervisor',
-        'language': 'uz',
-        'full_name': 'Test Supervisor'
-    }
-
-async def get_user_lang(user_id: int) -> str:
-    """Mock user language"""
-    return 'uz'
-
 # Removed duplicate get_role_router - using centralized version from utils.role_system
 
 def get_call_center_supervisor_feedback_router():
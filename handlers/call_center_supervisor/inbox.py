@@ -19,23 +19,9 @@ from keyboards.call_center_supervisor_buttons import (
     get_supervisor_back_to_inbox_keyboard,
     get_supervisor_navigation_keyboard
 )
+from database import get_user_by_telegram_id
 
 # Mock functions to replace utils and database imports
-async def get_user_by_telegram_id(telegram_id: int):
-    """Mock user data"""
-    return {
-        'id': 1,
-        'telegram_id': telegram_id,
-        'role': 'call_center_supervisor',
-        'language': 'uz',
-        'full_name': 'Test Supervisor',
-        'phone_number': '+998901234567'
-    }
-
-async def get_user_lang(telegram_id: int):
-    """Mock get user language"""
-    return 'uz'
-
 async def get_supervisor_applications(user_id: int):
     """Mock get supervisor applications"""
     return [
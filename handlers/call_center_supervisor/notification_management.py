@@ -5,11 +5,15 @@ This module handles notification management functionality for call center superv
 including sending messages, announcements, and managing notifications.
 """
 
-from aiogram import F, Router
+from aiogram import BaseMiddleware, F, Router
+from aiogram.dispatcher.event.bases import UNHANDLED
 from aiogram.types import Message, CallbackQuery, InlineKeyboardMarkup, InlineKeyboardButton
 from aiogram.fsm.context import FSMContext
+from aiogram.filters import StateFilter
 from typing import Dict, Any, List, Optional
 from datetime import datetime
+import html
+import logging
 
 # Keyboard imports
 from keyboards.call_center_supervisor_buttons import (
@@ -18,24 +22,14 @@ from keyboards.call_center_supervisor_buttons import (
 )
 
 # States imports
-from states.call_center_supervisor_states import CallCenterSupervisorStates
+from states.call_center_supervisor_states import CallCenterSupervisorStates, CallCenterSupervisorNotificationStates
 from filters.role_filter import RoleFilter
+from database import get_user_by_telegram_id
+from utils.broadcast import NORMAL, URGENT, broadcast_engine
 
-# Mock functions to replace utils and database imports
-async def get_user_by_telegram_id(telegram_id: int):
-    """Mock user data"""
-    return {
-        'id': 1,
-        'telegram_id': telegram_id,
-        'role': 'call_center_supervisor',
-        'language': 'uz',
-        'full_name': 'Test Supervisor'
-    }
-
-async def get_user_lang(user_id: int) -> str:
-    """Mock user language"""
-    return 'uz'
+logger = logging.getLogger(__name__)
 
+# Mock functions to replace utils and database imports
 # Removed duplicate get_role_router - using centralized version from utils.role_system
 
 async def get_supervisor_notifications(supervisor_id: int):
@@ -63,15 +57,28 @@ async def get_call_center_staff_list(supervisor_id: int):
         {
             'id': 1,
             'full_name': 'Operator 1',
-            'role': 'call_center_operator'
+            'role': 'call_center_operator',
+            'telegram_id': 111111111
         },
         {
             'id': 2,
             'full_name': 'Operator 2',
-            'role': 'call_center_operator'
+            'role': 'call_center_operator',
+            'telegram_id': 222222222
         }
     ]
 
+# Holat -> (sarlavha, ustuvorlik yo'lagi)
+BROADCAST_KINDS = {
+    CallCenterSupervisorNotificationStates.sending_announcement.state: ("E'lon", NORMAL),
+    CallCenterSupervisorNotificationStates.team_message.state: ("Jamoa xabari", NORMAL),
+    CallCenterSupervisorNotificationStates.individual_message.state: ("Shaxsiy xabar", NORMAL),
+    CallCenterSupervisorNotificationStates.urgent_alert.state: ("Shoshilinch ogohlantirish", URGENT),
+}
+
+# Qoralama holatlari: xabar yozilmoqda yoki tasdiq kutilmoqda
+BROADCAST_DRAFT_STATES = (*BROADCAST_KINDS, CallCenterSupervisorNotificationStates.confirming_broadcast.state)
+
 def get_call_center_supervisor_notification_management_router():
     """Get router for call center supervisor notification management handlers"""
     router = Router()
@@ -95,7 +102,7 @@ def get_call_center_supervisor_notification_management_router():
             )
             
             await message.answer(text)
-            await state.set_state(CallCenterSupervisorStates.main_menu)
+            await state.set_state(CallCenterSupervisorNotificationStates.sending_announcement)
             await state.update_data(action="send_announcement")
             
         except Exception as e:
@@ -115,7 +122,7 @@ def get_call_center_supervisor_notification_management_router():
             )
             
             await message.answer(text)
-            await state.set_state(CallCenterSupervisorStates.main_menu)
+            await state.set_state(CallCenterSupervisorNotificationStates.team_message)
             await state.update_data(action="send_team_message")
             
         except Exception as e:
@@ -141,7 +148,7 @@ def get_call_center_supervisor_notification_management_router():
                 "Xabar yubormoqchi bo'lgan xodimni tanlang:"
             )
             
-            keyboard = get_supervisor_notification_keyboard(lang)
+            keyboard = _staff_selection_keyboard(staff_list)
             
             await message.answer(text, reply_markup=keyboard)
             
@@ -163,7 +170,7 @@ def get_call_center_supervisor_notification_management_router():
             )
             
             await message.answer(text)
-            await state.set_state(CallCenterSupervisorStates.main_menu)
+            await state.set_state(CallCenterSupervisorNotificationStates.urgent_alert)
             await state.update_data(action="send_urgent_alert")
             
         except Exception as e:
@@ -221,17 +228,192 @@ def get_call_center_supervisor_notification_management_router():
             )
             
             await callback.message.edit_text(text)
-            await state.set_state(CallCenterSupervisorStates.main_menu)
+            await state.set_state(CallCenterSupervisorNotificationStates.individual_message)
             await state.update_data(action="send_individual_message", target_staff_id=staff_id)
             await callback.answer()
             
         except Exception as e:
             await callback.answer("Xatolik yuz berdi", show_alert=True)
 
+    @router.callback_query(F.data.regexp(r"^broadcast_(pause|resume|cancel)_\d+$"))
+    async def handle_broadcast_control(callback: CallbackQuery):
+        """Ommaviy yuborishni to'xtatish / davom ettirish / bekor qilish"""
+        _, action, job_id = callback.data.split("_")
+        controls = {
+            'pause': (broadcast_engine.pause, "⏸ To'xtatildi"),
+            'resume': (broadcast_engine.resume, "▶️ Davom ettirilmoqda"),
+            'cancel': (broadcast_engine.cancel, "❌ Bekor qilindi"),
+        }
+        handler, done_text = controls[action]
+        if handler(int(job_id)):
+            await callback.answer(done_text)
+        else:
+            await callback.answer("Bu yuborish allaqachon yakunlangan", show_alert=True)
+
+    return router
+
+
+class _StateTrackingContext(FSMContext):
+    """set_state chaqirilganini (qiymat o'zgarmasa ham) eslab qoladigan FSMContext"""
+
+    def __init__(self, storage, key) -> None:
+        super().__init__(storage=storage, key=key)
+        self.state_set = False
+
+    async def set_state(self, state=None) -> None:
+        self.state_set = True
+        await super().set_state(state)
+
+
+class BroadcastDraftMiddleware(BaseMiddleware):
+    """Xabar yozish holatida menyu tugmasi bosilsa - qoralama bekor qilinadi"""
+
+    async def __call__(self, handler, event: Message, data: Dict[str, Any]) -> Any:
+        raw_state = data.get('raw_state')
+        state: Optional[FSMContext] = data.get('state')
+        if raw_state not in BROADCAST_DRAFT_STATES or state is None:
+            return await handler(event, data)
+
+        tracked = _StateTrackingContext(state.storage, state.key)
+        data['state'] = tracked
+        result = await handler(event, data)
+        # Qoralamani qabul qilgan yoki qayta boshlagan handler holatni o'zi o'rnatadi
+        # (masalan, "📢 E'lon yuborish" qayta bosilsa - xuddi shu holat);
+        # holatga tegmagan handler - boshqa menyu, qoralama bekor qilinadi
+        if result is not UNHANDLED and not tracked.state_set:
+            await tracked.set_state(CallCenterSupervisorStates.main_menu)
+            await tracked.update_data(action=None, target_staff_id=None, broadcast_draft=None)
+        return result
+
+
+def get_call_center_supervisor_broadcast_router():
+    """Xabar matnini qabul qilish va tasdiqlash - boshqa supervisor router'laridan keyin ulanadi"""
+    router = Router()
+
+    role_filter = RoleFilter("call_center_supervisor")
+    router.message.filter(role_filter)
+    router.callback_query.filter(role_filter)
+
+    @router.message(StateFilter(*BROADCAST_KINDS))
+    async def handle_broadcast_content(message: Message, state: FSMContext):
+        """Supervisor yozgan xabar (matn yoki media) - yuborishdan oldin tasdiqlash"""
+        try:
+            user = await get_user_by_telegram_id(message.from_user.id)
+            if not user or user['role'] != 'call_center_supervisor':
+                return
+            
+            current_state = await state.get_state()
+            data = await state.get_data()
+            title, _ = BROADCAST_KINDS[current_state]
+            
+            staff_list = await get_call_center_staff_list(user['id'])
+            if current_state == CallCenterSupervisorNotificationStates.individual_message.state:
+                staff_list = [s for s in staff_list if s['id'] == data.get('target_staff_id')]
+            staff_list = [s for s in staff_list if s.get('telegram_id')]
+            
+            if not staff_list:
+                await message.answer("Xodimlar topilmadi.")
+                return
+            
+            names = ", ".join(s['full_name'] for s in staff_list[:5])
+            if len(staff_list) > 5:
+                names += f" va yana {len(staff_list) - 5} ta"
+            text = (
+                f"👁 <b>{title}</b> - oldindan ko'rish\n\n"
+                f"Yuqoridagi xabar {len(staff_list)} ta xodimga yuboriladi:\n"
+                f"{html.escape(names)}\n\n"
+                f"Yuborilsinmi?"
+            )
+            keyboard = InlineKeyboardMarkup(inline_keyboard=[[
+                InlineKeyboardButton(text="✅ Yuborish", callback_data="broadcast_send"),
+                InlineKeyboardButton(text="❌ Bekor qilish", callback_data="broadcast_discard"),
+            ]])
+            
+            await message.reply(text, reply_markup=keyboard, parse_mode='HTML')
+            await state.update_data(broadcast_draft={
+                'kind': current_state,
+                'from_chat_id': message.chat.id,
+                'message_id': message.message_id,
+                'recipients': [s['telegram_id'] for s in staff_list],
+            })
+            await state.set_state(CallCenterSupervisorNotificationStates.confirming_broadcast)
+            
+        except Exception as e:
+            logger.error(f"Broadcast preview error: {e}")
+            await message.answer("Xatolik yuz berdi")
+
+    @router.callback_query(
+        F.data == "broadcast_send",
+        StateFilter(CallCenterSupervisorNotificationStates.confirming_broadcast)
+    )
+    async def handle_broadcast_send(callback: CallbackQuery, state: FSMContext):
+        """Tasdiqlangan xabarni xodimlarga nusxalash"""
+        try:
+            draft = (await state.get_data()).get('broadcast_draft')
+            if not draft:
+                await callback.answer("Xabar topilmadi", show_alert=True)
+                return
+            
+            title, priority = BROADCAST_KINDS[draft['kind']]
+            await state.set_state(CallCenterSupervisorStates.main_menu)
+            await state.update_data(action=None, target_staff_id=None, broadcast_draft=None)
+            await callback.message.edit_text(f"✅ {title}: {len(draft['recipients'])} ta xodimga yuborilmoqda")
+            await callback.answer()
+            
+            # Yuborish fonda; progress xabari shu chatda yangilanib turadi
+            await broadcast_engine.submit(
+                bot=callback.bot,
+                from_chat_id=draft['from_chat_id'],
+                message_id=draft['message_id'],
+                recipients=draft['recipients'],
+                priority=priority,
+                title=title,
+                progress_chat_id=callback.message.chat.id
+            )
+            
+        except Exception as e:
+            logger.error(f"Broadcast submit error: {e}")
+            await callback.answer("Xatolik yuz berdi", show_alert=True)
+
+    @router.callback_query(
+        F.data == "broadcast_discard",
+        StateFilter(CallCenterSupervisorNotificationStates.confirming_broadcast)
+    )
+    async def handle_broadcast_discard(callback: CallbackQuery, state: FSMContext):
+        """Qoralamani bekor qilish"""
+        await state.set_state(CallCenterSupervisorStates.main_menu)
+        await state.update_data(action=None, target_staff_id=None, broadcast_draft=None)
+        await callback.message.edit_text("❌ Xabar yuborish bekor qilindi")
+        await callback.answer()
+
+    @router.callback_query(F.data.in_(["broadcast_send", "broadcast_discard"]))
+    async def handle_stale_broadcast_confirmation(callback: CallbackQuery):
+        """Eski tasdiqlash tugmasi (qoralama allaqachon yuborilgan yoki bekor qilingan)"""
+        await callback.answer("Bu xabar endi dolzarb emas", show_alert=True)
+
     return router
 
 
 # Helper functions for notification management
+def _staff_selection_keyboard(staff_list: List[Dict[str, Any]]) -> InlineKeyboardMarkup:
+    """Xabar yuborish uchun xodim tanlash tugmalari"""
+    return InlineKeyboardMarkup(inline_keyboard=[
+        [
+            InlineKeyboardButton(
+                text=f"👤 {staff['full_name']} ({staff['role']})",
+                callback_data=f"ccs_select_staff_msg_{staff['id']}"
+            )
+        ] for staff in staff_list[:8]
+    ] + [
+        [
+            InlineKeyboardButton(
+                text="❌ Bekor qilish",
+                callback_data="ccs_cancel_staff_selection"
+            )
+        ]
+    ])
+
+
 async def _show_new_notifications(callback: CallbackQuery, supervisor_id: int):
     """Show new notifications"""
     try:
@@ -275,21 +457,7 @@ async def _show_staff_selection_for_message(callback: CallbackQuery, supervisor_
             "Xabar yubormoqchi bo'lgan xodimni tanlang:"
         )
         
-        keyboard = InlineKeyboardMarkup(inline_keyboard=[
-            [
-                InlineKeyboardButton(
-                    text=f"👤 {staff['full_name']} ({staff['role']})",
-                    callback_data=f"ccs_select_staff_msg_{staff['id']}"
-                )
-            ] for staff in staff_list[:8]
-        ] + [
-            [
-                InlineKeyboardButton(
-                    text="❌ Bekor qilish",
-                    callback_data="ccs_cancel_staff_selection"
-                )
-            ]
-        ])
+        keyboard = _staff_selection_keyboard(staff_list)
         
         await callback.message.edit_text(text, reply_markup=keyboard)
         await callback.answer()
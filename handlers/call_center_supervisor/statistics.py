@@ -545,8 +545,7 @@ async def _show_data_export_options(message: Message, lang: str):
         await callback.answer()
         
         try:
-            from utils.export_utils import create_export_file
-            from aiogram.types import BufferedInputFile
+            from utils.export_service import create_export_file_async
             
             export_type = callback.data.replace("ccs_export_", "").split("_")[0]
             format_type = callback.data.split("_")[-1]
@@ -562,19 +561,15 @@ async def _show_data_export_options(message: Message, lang: str):
             actual_export_type = export_mapping.get(export_type, "statistics")
             
             # Create export file
-            file_content, filename = create_export_file(actual_export_type, format_type, "call_center_supervisor")
+            export_file = await create_export_file_async(actual_export_type, format_type, "call_center_supervisor")
+            filename = export_file.filename
             
             # Get file size
-            file_content.seek(0, 2)  # Move to end
-            file_size = file_content.tell()
-            file_content.seek(0)  # Reset to beginning
+            file_size = export_file.size
             
             # Send only the file with all information in caption
             await callback.message.answer_document(
-                BufferedInputFile(
-                    file_content.read(),
-                    filename=filename
-                ),
+                export_file.as_input_file(),
                 caption=f"✅ {export_type.title()} export muvaffaqiyatli yakunlandi!\n\n"
                         f"📄 Fayl: {filename}\n"
                         f"📦 Hajm: {file_size:,} bayt\n"
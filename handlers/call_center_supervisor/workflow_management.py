@@ -17,22 +17,9 @@ from keyboards.call_center_supervisor_buttons import get_workflow_management_men
 # States imports
 from states.call_center_supervisor_states import CallCenterSupervisorWorkflowStates
 from filters.role_filter import RoleFilter
+from database import get_user_by_telegram_id
 
 # Mock functions to replace utils and database imports
-async def get_user_by_telegram_id(telegram_id: int):
-    """Mock user data"""
-    return {
-        'id': 1,
-        'telegram_id': telegram_id,
-        'role': 'call_center_supervisor',
-        'language': 'uz',
-        'full_name': 'Test Supervisor'
-    }
-
-async def get_user_lang(user_id: int) -> str:
-    """Mock user language"""
-    return 'uz'
-
 async def get_call_center_supervisor_orders(supervisor_id: int, limit: int = 50, status: str = None):
     """Mock get supervisor orders"""
     return [
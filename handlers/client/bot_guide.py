@@ -9,29 +9,7 @@ from aiogram import F
 from aiogram.types import Message
 from aiogram.fsm.context import FSMContext
 from filters.role_filter import RoleFilter
-
-# Mock database functions to replace database imports
-# Global mock storage for demonstration
-mock_user_data = {}
-
-async def get_user_by_telegram_id_redis(telegram_id: int):
-    """Mock user data from Redis"""
-    # Initialize mock data if not exists
-    if telegram_id not in mock_user_data:
-        mock_user_data[telegram_id] = {
-            'id': 1,
-            'telegram_id': telegram_id,
-            'role': 'client',
-            'language': 'uz',
-            'full_name': 'Test Client',
-            'phone_number': '+998901234567',
-            'phone': '+998901234567',
-            'address': 'Toshkent shahri, Chilanzor tumani, 15-uy',
-            'region': 'toshkent',
-            'created_at': '2024-01-01 10:00:00'
-        }
-    
-    return mock_user_data[telegram_id]
+from database import get_user_by_telegram_id
 
 # Mock audit logger
 class AuditLogger:
@@ -56,7 +34,7 @@ def get_client_bot_guide_router():
     @router.message(F.text.in_(["Bot qo'llanmasi", "Инструкция по использованию бота"]))
     async def bot_guide_handler(message: Message, state: FSMContext):
         try:
-            user = await get_user_by_telegram_id_redis(message.from_user.id)
+            user = await get_user_by_telegram_id(message.from_user.id)
             lang = user.get("language", "uz")
 
             guide_text = (
@@ -105,7 +83,7 @@ Maslahat: Har qanday vaqtda "🏠 Asosiy menyu" tugmasi orqali bosh sahifaga qay
     @router.message(F.text.in_(["🏠 Asosiy menyu", "🏠 Главное меню"]))
     async def back_to_main_menu_from_guide(message: Message, state: FSMContext):
         try:
-            user = await get_user_by_telegram_id_redis(message.from_user.id)
+            user = await get_user_by_telegram_id(message.from_user.id)
             lang = user.get("language", "uz")
             from keyboards.client_buttons import get_main_menu_keyboard
             await message.answer(
@@ -27,12 +27,33 @@ from keyboards.client_buttons import (
 )
 from states.client_states import ConnectionOrderStates
 from filters.role_filter import RoleFilter
+from database import get_user_by_telegram_id
+from utils.notification_outbox import notification_outbox
+from utils.notification_digest import new_order_digest
+from utils.application_status import application_created
 
 # Mock database functions to replace database imports
 async def create_connection_request(region_code: str, client_id: int, connection_type: str, tariff: str, address: str, phone: str, description: str, geo_location: str = None, telegram_id: int = None, full_name: str = None, username: str = None):
     """Mock create connection request"""
     request_id = f"UL_{telegram_id}_{int(datetime.now().timestamp())}"
     print(f"Mock: Created connection request {request_id} for client {client_id} in region {region_code}")
+    # Manager tugmalari (mgr_view_app_<id>) arizani indeksdan topadi
+    application_created(region_code, {
+        'id': request_id,
+        'workflow_type': 'connection_request',
+        'current_status': 'created',
+        'role_current': 'manager',
+        'client_id': client_id,
+        'contact_info': {
+            'full_name': full_name,
+            'phone': phone
+        },
+        'created_at': datetime.now(),
+        'description': description,
+        'location': address,
+        'priority': 'normal',
+        'region': region_code.title()
+    })
     return request_id
 
 async def get_managers_by_region(region: str):
@@ -52,19 +73,6 @@ async def get_managers_by_region(region: str):
         }
     ]
 
-async def get_user_by_telegram_id_redis(telegram_id: int):
-    """Mock user data from Redis"""
-    return {
-        'id': 1,
-        'telegram_id': telegram_id,
-        'role': 'client',
-        'language': 'uz',
-        'full_name': 'Test Client',
-        'phone_number': '+998901234567',
-        'phone': '+998901234567',
-        'username': 'testuser'
-    }
-
 # Mock utils classes
 class WorkflowEngine:
     async def create_workflow(self, workflow_type: str, client_id: int, data: dict, region_code: str):
@@ -109,7 +117,7 @@ class MockBot:
             'clients': 'clients_pool'
         }
     
-    async def send_message(self, chat_id: int, text: str, parse_mode: str = None):
+    async def send_message(self, chat_id: int, text: str, parse_mode: str = None, reply_markup=None):
         """Mock send message"""
         print(f"Mock: Sent message to {chat_id}: {text}")
 
@@ -141,7 +149,7 @@ def get_connection_order_router():
     async def start_connection_order_client(message: Message, state: FSMContext):
         """Client uchun yangi ulanish arizasi - AVVAL REGION TANLASH"""
         try:
-            user = await get_user_by_telegram_id_redis(message.from_user.id)
+            user = await get_user_by_telegram_id(message.from_user.id)
             if not user:
                 await message.answer("❌ Foydalanuvchi topilmadi. /start bosing.")
                 return
@@ -254,7 +262,7 @@ def get_connection_order_router():
             connection_type = callback.data.split("_")[-1]  # b2c yoki b2b
             await state.update_data(connection_type=connection_type)
             
-            user = await get_user_by_telegram_id_redis(callback.from_user.id)
+            user = await get_user_by_telegram_id(callback.from_user.id)
             if not user:
                 await callback.answer("Xatolik: Foydalanuvchi ma'lumotlari topilmadi.", show_alert=True)
                 return
@@ -296,7 +304,7 @@ def get_connection_order_router():
             tariff = "Standard" if callback.data == "tariff_standard" else "Yangi"
             await state.update_data(selected_tariff=tariff)
             
-            user = await get_user_by_telegram_id_redis(callback.from_user.id)
+            user = await get_user_by_telegram_id(callback.from_user.id)
             if not user:
                 await callback.answer("Xatolik: Foydalanuvchi ma'lumotlari topilmadi.", show_alert=True)
                 return
@@ -313,7 +321,7 @@ def get_connection_order_router():
     @router.message(StateFilter(ConnectionOrderStates.entering_address))
     async def get_connection_address_client(message: Message, state: FSMContext):
         try:
-            user = await get_user_by_telegram_id_redis(message.from_user.id)
+            user = await get_user_by_telegram_id(message.from_user.id)
             if not user:
                 await message.answer("Xatolik: Foydalanuvchi ma'lumotlari topilmadi. Iltimos, qaytadan kiriting.")
                 return
@@ -340,7 +348,7 @@ def get_connection_order_router():
             await callback.message.edit_reply_markup(reply_markup=None)
             
             if callback.data == "send_location_yes":
-                user = await get_user_by_telegram_id_redis(callback.from_user.id)
+                user = await get_user_by_telegram_id(callback.from_user.id)
                 if not user:
                     await callback.answer("Xatolik: Foydalanuvchi ma'lumotlari topilmadi.", show_alert=True)
                     return
@@ -393,7 +401,7 @@ def get_connection_order_router():
             data = await state.get_data()
             user_id = message_or_callback.from_user.id if hasattr(message_or_callback, 'from_user') else message_or_callback.message.from_user.id
             
-            user = await get_user_by_telegram_id_redis(user_id)
+            user = await get_user_by_telegram_id(user_id)
             region = data.get('selected_region', data.get('region', 'toshkent'))
             connection_type = data.get('connection_type', 'standard')
             tariff = data.get('selected_tariff', 'Standard')
@@ -441,7 +449,7 @@ def get_connection_order_router():
             await callback.answer("⏳ Zayavka yaratilmoaqda...")
             
             data = await state.get_data()
-            user = await get_user_by_telegram_id_redis(callback.from_user.id)
+            user = await get_user_by_telegram_id(callback.from_user.id)
             
             # Get region from state data - ensure it's correctly saved
             region = data.get('selected_region')
@@ -551,29 +559,22 @@ def get_connection_order_router():
                         f"{'='*30}"
                     )
                     
-                    await bot.send_message(
-                        chat_id=ZAYAVKA_GROUP_ID,
-                        text=group_msg,
-                        parse_mode='HTML'
+                    notification_outbox.enqueue(
+                        ZAYAVKA_GROUP_ID, group_msg, bot=bot,
+                        dedup_key=f"new_order:{request_id}:group", parse_mode='HTML'
                     )
                 except Exception as group_error:
-                    # Group notification error - handle silently
-                    pass
+                    logger.error(f"Group notification error: {group_error}")
             
             # Manager'larga qisqa xabar yuborish (1 qatorli)
             managers = await get_managers_by_region(region)
-            for manager in managers:
-                try:
-                    # Qisqa 1 qatorli xabar
-                    short_msg = f"🔌 Yangi ariza #{request_id} | {user.get('full_name')} | {region.title()} | {data.get('selected_tariff')}"
-                    
-                    await bot.send_message(
-                        chat_id=manager['telegram_id'],
-                        text=short_msg
-                    )
-                except Exception as notify_error:
-                    # Manager notification error - handle silently
-                    pass
+            # Qisqa 1 qatorli xabar - yuborish outbox'da, rate limit bilan;
+            # ko'p ariza kelganda manager'ga bitta digest boradi
+            short_msg = f"🔌 Yangi ariza #{request_id} | {user.get('full_name')} | {region.title()} | {data.get('selected_tariff')}"
+            new_order_digest.add_many(
+                [manager['telegram_id'] for manager in managers], request_id, short_msg, bot=bot,
+                dedup_key=f"new_order:{request_id}"
+            )
             
             # Success message with main menu button (only one message)
             from keyboards.client_buttons import get_main_menu_keyboard
@@ -635,7 +636,7 @@ def get_connection_order_router():
             # Start over from region selection
             await state.clear()
             
-            user = await get_user_by_telegram_id_redis(callback.from_user.id)
+            user = await get_user_by_telegram_id(callback.from_user.id)
             lang = user.get('language', 'uz')
             
             # User ma'lumotlarini saqlash
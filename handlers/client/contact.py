@@ -9,19 +9,9 @@ from aiogram.types import Message, CallbackQuery
 from aiogram.fsm.context import FSMContext
 from states.client_states import ContactStates, MainMenuStates
 from filters.role_filter import RoleFilter
+from database import get_user_by_telegram_id
 
 # Mock database functions to replace database imports
-async def get_user_by_telegram_id_redis(telegram_id: int):
-    """Mock user data from Redis"""
-    return {
-        'id': 1,
-        'telegram_id': telegram_id,
-        'role': 'client',
-        'language': 'uz',
-        'full_name': 'Test Client',
-        'phone_number': '+998901234567'
-    }
-
 # Mock audit logger
 class AuditLogger:
     async def log_action(self, user_id: int, action: str, details: dict):
@@ -44,7 +34,7 @@ def get_client_contact_router():
     async def contact_handler(message: Message, state: FSMContext):
         """Handle contact request"""
         try:
-            user = await get_user_by_telegram_id_redis(message.from_user.id)
+            user = await get_user_by_telegram_id(message.from_user.id)
             lang = user.get('language', 'uz')
             
             contact_text = (
@@ -85,7 +75,7 @@ def get_client_contact_router():
     async def contact_make_call(message: Message, state: FSMContext):
         """Send phone link and keep contact menu"""
         try:
-            user = await get_user_by_telegram_id_redis(message.from_user.id)
+            user = await get_user_by_telegram_id(message.from_user.id)
             lang = user.get('language', 'uz')
             phone_display = "+998 71 123 45 67"
             phone_link = "+998711234567"
@@ -110,7 +100,7 @@ def get_client_contact_router():
     async def contact_webapp_data(message: Message, state: FSMContext):
         """Handle WebApp chat payload"""
         try:
-            user = await get_user_by_telegram_id_redis(message.from_user.id)
+            user = await get_user_by_telegram_id(message.from_user.id)
             lang = user.get('language', 'uz')
             payload = message.web_app_data.data if message.web_app_data else ""
             ok_text = (
@@ -130,7 +120,7 @@ def get_client_contact_router():
     async def contact_back_to_main(message: Message, state: FSMContext):
         """Return to main menu"""
         try:
-            user = await get_user_by_telegram_id_redis(message.from_user.id)
+            user = await get_user_by_telegram_id(message.from_user.id)
             lang = user.get('language', 'uz')
             from keyboards.client_buttons import get_main_menu_keyboard
             text = (
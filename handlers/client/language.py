@@ -10,56 +10,7 @@ from aiogram.fsm.context import FSMContext
 from keyboards.client_buttons import get_language_keyboard, get_main_menu_keyboard
 from states.client_states import LanguageStates
 from filters.role_filter import RoleFilter
-
-# Mock database functions to replace database imports
-async def get_user_by_telegram_id_redis(telegram_id: int):
-    """Mock user data from Redis"""
-    return {
-        'id': 1,
-        'telegram_id': telegram_id,
-        'role': 'client',
-        'language': 'uz',
-        'full_name': 'Test Client',
-        'phone_number': '+998901234567',
-        'region': 'toshkent'
-    }
-
-async def get_db_pool(region: str):
-    """Mock database pool"""
-    print(f"Mock: Getting database pool for region {region}")
-    return MockPool()
-
-class MockPool:
-    """Mock database pool"""
-    async def acquire(self):
-        return MockConnection()
-    
-    async def close(self):
-        print("Mock: Closing database pool")
-
-class MockConnection:
-    """Mock database connection"""
-    async def __aenter__(self):
-        return self
-    
-    async def __aexit__(self, exc_type, exc_val, exc_tb):
-        pass
-    
-    async def fetchval(self, query: str, *args):
-        """Mock fetchval - always return success"""
-        print(f"Mock: Executing query: {query} with args: {args}")
-        return 1  # Return user ID to indicate success
-
-async def update_user_language(pool, telegram_id: int, language: str) -> bool:
-    """Mock update user language in database"""
-    try:
-        print(f"Mock: Updating language for user {telegram_id} to {language}")
-        # Simulate database update
-        return True
-        
-    except Exception as e:
-        print(f"Error updating user language: {e}")
-        return False
+from database import get_user_by_telegram_id, update_user_language
 
 # Mock audit logger
 class AuditLogger:
@@ -81,7 +32,7 @@ def get_client_language_router():
     async def client_language_handler(message: Message, state: FSMContext):
         """Client language handler"""
         try:
-            user = await get_user_by_telegram_id_redis(message.from_user.id)
+            user = await get_user_by_telegram_id(message.from_user.id)
             if not user:
                 await message.answer("Foydalanuvchi topilmadi.")
                 return
@@ -117,7 +68,7 @@ def get_client_language_router():
             selected_lang = callback.data.split("_")[1]
             
             # Get user and region from state
-            user = await get_user_by_telegram_id_redis(callback.from_user.id)
+            user = await get_user_by_telegram_id(callback.from_user.id)
             if not user:
                 await callback.answer("Foydalanuvchi topilmadi", show_alert=True)
                 return
@@ -125,11 +76,8 @@ def get_client_language_router():
             state_data = await state.get_data()
             region = state_data.get('user_region', user.get('region', 'toshkent')).lower()
             
-            # Get database pool
-            pool = await get_db_pool(region)
-            
             # Update user language in database
-            success = await update_user_language(pool, callback.from_user.id, selected_lang)
+            success = await update_user_language(callback.from_user.id, selected_lang, region)
             
             if success:
                 success_text = (
@@ -180,7 +128,7 @@ def get_client_language_router():
         try:
             await callback.answer()
             
-            user = await get_user_by_telegram_id_redis(callback.from_user.id)
+            user = await get_user_by_telegram_id(callback.from_user.id)
             lang = user.get('language', 'uz') if user else 'uz'
             
             cancel_text = (
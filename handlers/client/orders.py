@@ -8,7 +8,8 @@ from aiogram import Router, F
 from aiogram.types import Message, CallbackQuery, InlineKeyboardButton, InlineKeyboardMarkup
 from aiogram.fsm.context import FSMContext
 from aiogram.filters import StateFilter
-from datetime import datetime
+import bisect
+from datetime import datetime, timedelta
 from states.client_states import OrderStates
 from filters.role_filter import RoleFilter
 from keyboards.client_buttons import (
@@ -16,186 +17,115 @@ from keyboards.client_buttons import (
     get_back_to_orders_menu_keyboard,
     get_client_orders_navigation_keyboard
 )
+from database import get_db_pool, get_user_by_telegram_id
+from utils.pagination import CountCache, decode_cursor, encode_cursor
 
-# Mock database functions to replace database imports
-async def get_user_by_telegram_id_redis(telegram_id: int):
-    """Mock user data from Redis"""
-    return {
-        'id': 1,
-        'telegram_id': telegram_id,
-        'role': 'client',
-        'language': 'uz',
-        'full_name': 'Test Client',
-        'phone_number': '+998901234567',
-        'region': 'toshkent'
+# Mock orders data (created_at bo'yicha yangidan eskiga)
+MOCK_ORDERS = [
+    {
+        'id': '1',
+        'type': 'service',
+        'status': 'active',
+        'created_at': datetime.now() - timedelta(hours=1),
+        'description': 'Internet tezligi sekin',
+        'address': 'Chilanzor tumani, 15-uy',
+        'region': 'Toshkent shahri',
+        'request_id': '1'
+    },
+    {
+        'id': '2',
+        'type': 'connection',
+        'status': 'completed',
+        'created_at': datetime.now() - timedelta(days=1),
+        'description': 'Yangi ulanish',
+        'address': 'Zangiota tumani, 25-uy',
+        'region': 'Toshkent viloyati',
+        'request_id': '2'
+    },
+    {
+        'id': '3',
+        'type': 'service',
+        'status': 'pending',
+        'created_at': datetime.now() - timedelta(days=3),
+        'description': 'TV signal yo\'q',
+        'address': 'Andijon shahri, 8-uy',
+        'region': 'Andijon',
+        'request_id': '3'
+    },
+    {
+        'id': '4',
+        'type': 'connection',
+        'status': 'active',
+        'created_at': datetime.now() - timedelta(days=7),
+        'description': 'Uy internet ulanishi',
+        'address': 'Farg\'ona shahri, 12-uy',
+        'region': 'Farg\'ona',
+        'request_id': '4'
+    },
+    {
+        'id': '5',
+        'type': 'service',
+        'status': 'completed',
+        'created_at': datetime.now() - timedelta(days=14),
+        'description': 'Router muammosi',
+        'address': 'Samarqand shahri, 30-uy',
+        'region': 'Samarqand',
+        'request_id': '5'
     }
+]
 
-async def get_db_pool(region: str):
-    """Mock database pool"""
-    print(f"Mock: Getting database pool for region {region}")
-    return MockPool()
+# (created_at, id) bo'yicha o'sish tartibidagi kalitlar - (created_at, id) indeksining o'rnida
+_order_keys = sorted((order['created_at'], order['id']) for order in MOCK_ORDERS)
+_orders_by_key = {(order['created_at'], order['id']): order for order in MOCK_ORDERS}
 
-class MockPool:
-    """Mock database pool"""
-    async def acquire(self):
-        return MockConnection()
-    
-    async def close(self):
-        print("Mock: Closing database pool")
+# Foydalanuvchi buyurtmalari soni - har bir sahifada qayta sanalmaydi
+orders_count_cache = CountCache()
 
-class MockConnection:
-    """Mock database connection"""
-    async def __aenter__(self):
-        return self
-    
-    async def __aexit__(self, exc_type, exc_val, exc_tb):
-        pass
-    
-    async def fetchval(self, query: str, *args):
-        """Mock fetchval - return mock count"""
-        print(f"Mock: Executing count query: {query} with args: {args}")
-        return 5  # Return mock total count
+async def count_user_orders(pool, user_id: int) -> int:
+    """Mock count query (SELECT count(*) FROM service_requests WHERE client_id = $1)"""
+    return len(_order_keys)
+
+# Mock database functions to replace database imports
+async def get_user_orders(pool, user_id: int, cursor: str = None, direction: str = 'at', limit: int = 5):
+    """Mock get user orders with keyset (cursor) pagination
     
-    async def fetch(self, query: str, *args):
-        """Mock fetch - return mock orders"""
-        print(f"Mock: Executing orders query: {query} with args: {args}")
-        # Mock orders data
-        orders = [
-            {
-                'id': '1',
-                'type': 'service',
-                'status': 'active',
-                'created_at': datetime.now(),
-                'description': 'Internet tezligi sekin',
-                'address': 'Chilanzor tumani, 15-uy',
-                'state_data': '{"region": "Toshkent shahri"}'
-            },
-            {
-                'id': '2',
-                'type': 'connection',
-                'status': 'completed',
-                'created_at': datetime.now(),
-                'description': 'Yangi ulanish',
-                'address': 'Zangiota tumani, 25-uy',
-                'state_data': '{"region": "Toshkent viloyati"}'
-            },
-            {
-                'id': '3',
-                'type': 'service',
-                'status': 'pending',
-                'created_at': datetime.now(),
-                'description': 'TV signal yo\'q',
-                'address': 'Andijon shahri, 8-uy',
-                'state_data': '{"region": "Andijon"}'
-            },
-            {
-                'id': '4',
-                'type': 'connection',
-                'status': 'active',
-                'created_at': datetime.now(),
-                'description': 'Uy internet ulanishi',
-                'address': 'Farg\'ona shahri, 12-uy',
-                'state_data': '{"region": "Farg\'ona"}'
-            },
-            {
-                'id': '5',
-                'type': 'service',
-                'status': 'completed',
-                'created_at': datetime.now(),
-                'description': 'Router muammosi',
-                'address': 'Samarqand shahri, 30-uy',
-                'state_data': '{"region": "Samarqand"}'
-            }
-        ]
-        return orders
+    direction:
+    - 'at'     - kursordagi buyurtmadan boshlab (joriy sahifani qayta ochish)
+    - 'after'  - kursordan eskiroq buyurtmalar (keyingi sahifa)
+    - 'before' - kursordan yangiroq buyurtmalar (oldingi sahifa)
     
-    async def fetchrow(self, query: str, *args):
-        """Mock fetchrow - return mock order details"""
-        print(f"Mock: Executing order details query: {query} with args: {args}")
-        order_id = args[0] if args else '1'
-        return {
-            'id': order_id,
-            'type': 'service' if int(order_id) % 2 == 1 else 'connection',
-            'status': 'active',
-            'created_at': datetime.now(),
-            'description': 'Test order description',
-            'address': 'Test address',
-            'contact_info': '{"phone": "+998901234567"}',
-            'state_data': '{"region": "Test region"}',
-            'full_name': 'Test Client',
-            'phone': '+998901234567'
-        }
-
-async def get_user_orders(pool, user_id: int, page: int = 1, limit: int = 5):
-    """Mock get user orders from database with pagination"""
+    Real bazada: WHERE client_id = $1 AND (created_at, id) < ($2, $3)
+    ORDER BY created_at DESC, id DESC LIMIT $4 - OFFSET yo'q.
+    """
     try:
-        # Simulate database operations
-        print(f"Mock: Getting orders for user {user_id}, page {page}, limit {limit}")
+        key = decode_cursor(cursor)
         
-        # Mock orders data
-        orders = [
-            {
-                'id': '1',
-                'type': 'service',
-                'status': 'active',
-                'created_at': datetime.now(),
-                'description': 'Internet tezligi sekin',
-                'address': 'Chilanzor tumani, 15-uy',
-                'region': 'Toshkent shahri',
-                'request_id': '1'
-            },
-            {
-                'id': '2',
-                'type': 'connection',
-                'status': 'completed',
-                'created_at': datetime.now(),
-                'description': 'Yangi ulanish',
-                'address': 'Zangiota tumani, 25-uy',
-                'region': 'Toshkent viloyati',
-                'request_id': '2'
-            },
-            {
-                'id': '3',
-                'type': 'service',
-                'status': 'pending',
-                'created_at': datetime.now(),
-                'description': 'TV signal yo\'q',
-                'address': 'Andijon shahri, 8-uy',
-                'region': 'Andijon',
-                'request_id': '3'
-            },
-            {
-                'id': '4',
-                'type': 'connection',
-                'status': 'active',
-                'created_at': datetime.now(),
-                'description': 'Uy internet ulanishi',
-                'address': 'Farg\'ona shahri, 12-uy',
-                'region': 'Farg\'ona',
-                'request_id': '4'
-            },
-            {
-                'id': '5',
-                'type': 'service',
-                'status': 'completed',
-                'created_at': datetime.now(),
-                'description': 'Router muammosi',
-                'address': 'Samarqand shahri, 30-uy',
-                'region': 'Samarqand',
-                'request_id': '5'
-            }
-        ]
+        # Yangidan eskiga: kalitlar massividagi indeks kamayib boradi
+        if key is None:
+            end = len(_order_keys)
+        elif direction == 'before':
+            end = min(len(_order_keys), bisect.bisect_right(_order_keys, key) + limit)
+        elif direction == 'after':
+            end = bisect.bisect_left(_order_keys, key)
+        else:
+            end = bisect.bisect_right(_order_keys, key)
+        start = max(0, end - limit)
+        if direction == 'before' and key is not None:
+            start = max(start, bisect.bisect_right(_order_keys, key))
         
-        # Pagination
-        start = (page - 1) * limit
-        end = start + limit
-        paginated_orders = orders[start:end]
+        page_keys = _order_keys[start:end]
+        orders = [_orders_by_key[page_key] for page_key in reversed(page_keys)]
+        
+        total = await orders_count_cache.get_or_load(
+            user_id, lambda: count_user_orders(pool, user_id)
+        )
         
         return {
-            'orders': paginated_orders,
-            'total': len(orders),
-            'page': page,
-            'total_pages': (len(orders) + limit - 1) // limit
+            'orders': orders,
+            'total': total,
+            'cursor': encode_cursor(*page_keys[-1]) if page_keys else None,
+            'has_prev': end < len(_order_keys),
+            'has_next': start > 0
         }
         
     except Exception as e:
@@ -203,8 +133,9 @@ async def get_user_orders(pool, user_id: int, page: int = 1, limit: int = 5):
         return {
             'orders': [],
             'total': 0,
-            'page': 1,
-            'total_pages': 0
+            'cursor': None,
+            'has_prev': False,
+            'has_next': False
         }
 
 async def get_order_details(pool, order_id: str):
@@ -254,7 +185,7 @@ def get_orders_router():
         """Show user orders"""
         try:
             # Get user from Redis cache
-            user = await get_user_by_telegram_id_redis(message.from_user.id)
+            user = await get_user_by_telegram_id(message.from_user.id)
             if not user:
                 await message.answer("Xatolik: Foydalanuvchi ma'lumotlari topilmadi.")
                 return
@@ -268,7 +199,7 @@ def get_orders_router():
             pool = await get_db_pool(region)
             
             # Get user orders from database
-            orders_data = await get_user_orders(pool, user['id'], page=1)
+            orders_data = await get_user_orders(pool, user['id'])
             
             if not orders_data['orders']:
                 await message.answer("📋 Sizda hali buyurtmalar mavjud emas.")
@@ -298,7 +229,7 @@ def get_orders_router():
             await callback.answer()
             
             # Get user and region from state
-            user = await get_user_by_telegram_id_redis(callback.from_user.id)
+            user = await get_user_by_telegram_id(callback.from_user.id)
             if not user:
                 await callback.answer("Xatolik: Foydalanuvchi topilmadi", show_alert=True)
                 return
@@ -307,17 +238,16 @@ def get_orders_router():
             region = state_data.get('user_region', user.get('region', 'toshkent')).lower()
             pool = await get_db_pool(region)
             
-            data = callback.data.split("_")
+            # order_<action>_<index>_<cursor> - kursor base64url, "_" bo'lishi mumkin
+            data = callback.data.split("_", 3)
             action = data[1]
             
             if action == "next":
                 current_index = int(data[2])
-                current_page = int(data[3])
-                await show_next_order(callback, current_index, current_page, pool, user['id'])
+                await show_next_order(callback, current_index, data[3], pool, user['id'])
             elif action == "prev":
                 current_index = int(data[2])
-                current_page = int(data[3])
-                await show_previous_order(callback, current_index, current_page, pool, user['id'])
+                await show_previous_order(callback, current_index, data[3], pool, user['id'])
             elif action == "details":
                 order_id = data[2]  # Keep as string since our IDs are strings
                 order = await get_order_details(pool, order_id)
@@ -383,18 +313,17 @@ def get_orders_router():
             keyboard = None
             if orders_data:
                 total = orders_data['total']
-                current_page = orders_data['page']
-                total_pages = orders_data['total_pages']
+                cursor = orders_data['cursor']
                 
                 buttons = []
                 nav_buttons = []
                 
                 # Previous button
-                if index > 0:
+                if index > 0 or orders_data['has_prev']:
                     nav_buttons.append(
                         InlineKeyboardButton(
                             text="⬅️ Oldingi",
-                            callback_data=f"order_prev_{index}_{current_page}"
+                            callback_data=f"order_prev_{index}_{cursor}"
                         )
                     )
                 
@@ -407,11 +336,11 @@ def get_orders_router():
                 )
                 
                 # Next button
-                if index < len(orders_data['orders']) - 1:
+                if index < len(orders_data['orders']) - 1 or orders_data['has_next']:
                     nav_buttons.append(
                         InlineKeyboardButton(
                             text="Keyingi ➡️",
-                            callback_data=f"order_next_{index}_{current_page}"
+                            callback_data=f"order_next_{index}_{cursor}"
                         )
                     )
                 
@@ -436,10 +365,10 @@ def get_orders_router():
             else:
                 await callback.answer("❌ Xatolik yuz berdi", show_alert=True)
 
-    async def show_next_order(callback: CallbackQuery, current_index: int, current_page: int, pool, user_id: int):
+    async def show_next_order(callback: CallbackQuery, current_index: int, cursor: str, pool, user_id: int):
         """Show next order"""
         try:
-            orders_data = await get_user_orders(pool, user_id, page=current_page)
+            orders_data = await get_user_orders(pool, user_id, cursor=cursor)
             
             if current_index + 1 < len(orders_data['orders']):
                 # Show next order on same page
@@ -450,9 +379,12 @@ def get_orders_router():
                     current_index + 1,
                     pool
                 )
-            elif current_page < orders_data['total_pages']:
-                # Load next page
-                next_page_data = await get_user_orders(pool, user_id, page=current_page + 1)
+            elif orders_data['has_next']:
+                # Load next page (oxirgi buyurtmadan keyingilar)
+                last = orders_data['orders'][-1]
+                next_page_data = await get_user_orders(
+                    pool, user_id, cursor=encode_cursor(last['created_at'], last['id']), direction='after'
+                )
                 if next_page_data['orders']:
                     await show_order_details(
                         callback,
@@ -466,12 +398,12 @@ def get_orders_router():
             print(f"Error in show_next_order: {e}")
             await callback.answer("❌ Xatolik yuz berdi", show_alert=True)
 
-    async def show_previous_order(callback: CallbackQuery, current_index: int, current_page: int, pool, user_id: int):
+    async def show_previous_order(callback: CallbackQuery, current_index: int, cursor: str, pool, user_id: int):
         """Show previous order"""
         try:
-            orders_data = await get_user_orders(pool, user_id, page=current_page)
+            orders_data = await get_user_orders(pool, user_id, cursor=cursor)
             
-            if current_index > 0:
+            if 0 < current_index <= len(orders_data['orders']):
                 # Show previous order on same page
                 await show_order_details(
                     callback,
@@ -480,9 +412,9 @@ def get_orders_router():
                     current_index - 1,
                     pool
                 )
-            elif current_page > 1:
-                # Load previous page
-                prev_page_data = await get_user_orders(pool, user_id, page=current_page - 1)
+            elif orders_data['has_prev']:
+                # Load previous page (birinchi buyurtmadan oldingilar)
+                prev_page_data = await get_user_orders(pool, user_id, cursor=cursor, direction='before')
                 if prev_page_data['orders']:
                     await show_order_details(
                         callback,
@@ -17,133 +17,34 @@ from states.client_states import ProfileStates
 from filters.role_filter import RoleFilter
 from utils.logger import get_logger
 from datetime import datetime
-
-# Mock database functions to replace database imports
-# Global mock storage for demonstration
-mock_user_data = {}
-
-async def get_user_by_telegram_id_redis(telegram_id: int):
-    """Mock user data from Redis"""
-    # Initialize mock data if not exists
-    if telegram_id not in mock_user_data:
-        mock_user_data[telegram_id] = {
-            'id': 1,
-            'telegram_id': telegram_id,
-            'role': 'client',
-            'language': 'uz',
-            'full_name': 'Test Client',
-            'phone_number': '+998901234567',
-            'phone': '+998901234567',
-            'address': 'Toshkent shahri, Chilanzor tumani, 15-uy',
-            'region': 'toshkent',
-            'created_at': '2024-01-01 10:00:00'
-        }
-    
-    return mock_user_data[telegram_id]
-
-async def get_db_pool(region: str):
-    """Mock database pool"""
-    print(f"Mock: Getting database pool for region {region}")
-    return MockPool()
-
-class MockPool:
-    """Mock database pool"""
-    async def acquire(self):
-        return MockConnection()
-    
-    async def close(self):
-        print("Mock: Closing database pool")
-
-class MockConnection:
-    """Mock database connection"""
-    async def __aenter__(self):
-        return self
-    
-    async def __aexit__(self, exc_type, exc_val, exc_tb):
-        pass
-    
-    async def fetchrow(self, query: str, *args):
-        """Mock fetchrow - return mock user profile"""
-        print(f"Mock: Executing profile query: {query} with args: {args}")
-        return {
-            'id': 1,
-            'telegram_id': args[0] if args else 123456789,
-            'full_name': 'Test Client',
-            'username': 'testuser',
-            'phone': '+998901234567',
-            'role': 'client',
-            'language': 'uz',
-            'is_active': True,
-            'address': 'Toshkent shahri, Chilanzor tumani, 15-uy',
-            'created_at': '2024-01-01 10:00:00',
-            'updated_at': '2024-01-15 10:00:00'
-        }
-    
-    async def fetchval(self, query: str, *args):
-        """Mock fetchval - return mock update result"""
-        print(f"Mock: Executing update query: {query} with args: {args}")
-        return 1  # Return user ID to indicate success
+from database import get_db_pool, get_user_by_telegram_id, update_user
 
 async def get_user_profile_from_db(pool, telegram_id: int):
-    """Mock get user profile from database"""
+    """Get user profile from database"""
     try:
-        print(f"Mock: Getting user profile for {telegram_id}")
-        
-        # Get data from mock storage
-        user_data = mock_user_data.get(telegram_id, {})
+        user = await get_user_by_telegram_id(telegram_id)
+        if not user:
+            return None
         
-        # Mock user profile data with current values
-        profile = {
-            'id': user_data.get('id', 1),
-            'telegram_id': telegram_id,
-            'full_name': user_data.get('full_name', 'Test Client'),
-            'username': user_data.get('username', 'testuser'),
-            'phone': user_data.get('phone', '+998901234567'),
-            'role': user_data.get('role', 'client'),
-            'language': user_data.get('language', 'uz'),
-            'is_active': user_data.get('is_active', True),
-            'address': user_data.get('address', 'Toshkent shahri, Chilanzor tumani, 15-uy'),
-            'created_at': user_data.get('created_at', '2024-01-01 10:00:00'),
-            'updated_at': user_data.get('updated_at', '2024-01-15 10:00:00')
-        }
-        
-        return profile
+        # Bo'sh maydonlar uchun ko'rsatishdagi default qiymatlar ishlatiladi
+        return {key: value for key, value in user.items() if value is not None}
         
     except Exception as e:
         print(f"Error getting user profile: {e}")
         return None
 
 async def update_user_profile(pool, telegram_id: int, field: str, value: str):
-    """Mock update user profile in database"""
+    """Update user profile in database"""
     try:
-        print(f"Mock: Updating user {telegram_id} {field} to {value}")
-        
-        # Update mock storage
-        if telegram_id not in mock_user_data:
-            mock_user_data[telegram_id] = {}
-        
-        # Update the specific field based on the database field name
-        if field == 'full_name':
-            mock_user_data[telegram_id]['full_name'] = value
-        elif field == 'phone':
-            mock_user_data[telegram_id]['phone'] = value
-            mock_user_data[telegram_id]['phone_number'] = value
-        elif field == 'address':
-            mock_user_data[telegram_id]['address'] = value
-        
-        # Update timestamp
-        from datetime import datetime
-        mock_user_data[telegram_id]['updated_at'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        
-        print(f"Mock: Successfully updated {field} to {value} for user {telegram_id}")
-        print(f"Mock: Current user data: {mock_user_data[telegram_id]}")
-        
-        return True
+        # Profil maydoni -> users jadvali ustuni
+        column = 'phone_number' if field == 'phone' else field
+        return await update_user(telegram_id, **{column: value}) is not None
         
     except Exception as e:
         print(f"Error updating user profile: {e}")
         return False
 
+# Mock database functions to replace database imports
 async def get_user_statistics(pool, user_id: int):
     """Mock get user statistics from database"""
     try:
@@ -271,7 +172,7 @@ def get_client_profile_router():
         """Cabinet entry with reply keyboard"""
         try:
             # Get user from Redis cache
-            user = await get_user_by_telegram_id_redis(message.from_user.id)
+            user = await get_user_by_telegram_id(message.from_user.id)
             if not user:
                 await message.answer("Foydalanuvchi topilmadi.")
                 return
@@ -313,7 +214,7 @@ def get_client_profile_router():
         """View profile information"""
         try:
             # Get user from Redis cache first
-            user = await get_user_by_telegram_id_redis(message.from_user.id)
+            user = await get_user_by_telegram_id(message.from_user.id)
             if not user:
                 await message.answer("Foydalanuvchi topilmadi.")
                 return
@@ -400,7 +301,7 @@ def get_client_profile_router():
     async def edit_profile_menu(message: Message, state: FSMContext):
         """Show edit profile menu"""
         try:
-            user = await get_user_by_telegram_id_redis(message.from_user.id)
+            user = await get_user_by_telegram_id(message.from_user.id)
             if not user:
                 await message.answer("Foydalanuvchi topilmadi.")
                 return
@@ -429,7 +330,7 @@ def get_client_profile_router():
         try:
             await callback.answer()
             
-            user = await get_user_by_telegram_id_redis(callback.from_user.id)
+            user = await get_user_by_telegram_id(callback.from_user.id)
             if not user:
                 await callback.answer("Foydalanuvchi topilmadi.", show_alert=True)
                 return
@@ -465,7 +366,7 @@ def get_client_profile_router():
     async def process_profile_edit(message: Message, state: FSMContext):
         """Process profile edit input"""
         try:
-            user = await get_user_by_telegram_id_redis(message.from_user.id)
+            user = await get_user_by_telegram_id(message.from_user.id)
             if not user:
                 await message.answer("Foydalanuvchi topilmadi.")
                 return
@@ -565,7 +466,7 @@ def get_client_profile_router():
     async def back_to_main_menu(message: Message, state: FSMContext):
         """Return to main menu"""
         try:
-            user = await get_user_by_telegram_id_redis(message.from_user.id)
+            user = await get_user_by_telegram_id(message.from_user.id)
             lang = user.get('language', 'uz') if user else 'uz'
             
             back_text = (
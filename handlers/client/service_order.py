@@ -26,6 +26,10 @@ from keyboards.client_buttons import (
 )
 from states.client_states import OrderStates
 from filters.role_filter import RoleFilter
+from database import get_user_by_telegram_id
+from utils.application_status import application_created
+from utils.group_post import compose_group_post
+from utils.notification_outbox import notification_outbox
 
 # Mock database functions to replace database imports
 async def create_technical_service_request(region_code: str, client_id: int, description: str, phone: str, address: str, geo_location: dict = None, abonent_type: str = None, abonent_id: str = None, media_info: list = None, telegram_id: int = None, full_name: str = None, username: str = None, reason: str = None):
@@ -33,6 +37,7 @@ async def create_technical_service_request(region_code: str, client_id: int, des
     request_id = f"TX_{telegram_id}_{int(datetime.now().timestamp())}"
     print(f"Mock: Created technical service request {request_id} for client {client_id} in region {region_code}")
     print(f"Mock: Reason: {reason}")
+    application_created(region_code)
     return request_id
 
 async def get_controllers_by_region(region: str):
@@ -52,19 +57,6 @@ async def get_controllers_by_region(region: str):
         }
     ]
 
-async def get_user_by_telegram_id_redis(telegram_id: int):
-    """Mock user data from Redis"""
-    return {
-        'id': 1,
-        'telegram_id': telegram_id,
-        'role': 'client',
-        'language': 'uz',
-        'full_name': 'Test Client',
-        'phone_number': '+998901234567',
-        'phone': '+998901234567',
-        'username': 'testuser'
-    }
-
 # Mock utils classes
 class WorkflowEngine:
     async def create_workflow(self, workflow_type: str, client_id: int, data: dict, region_code: str):
@@ -106,13 +98,17 @@ class MockBot:
         """Mock send message"""
         print(f"Mock: Sent message to {chat_id}: {text}")
     
-    async def send_photo(self, chat_id: int, photo: str):
+    async def send_photo(self, chat_id: int, photo: str, caption: str = None, parse_mode: str = None):
         """Mock send photo"""
-        print(f"Mock: Sent photo to {chat_id}: {photo}")
+        print(f"Mock: Sent photo to {chat_id}: {photo} {caption or ''}")
     
-    async def send_video(self, chat_id: int, video: str):
+    async def send_video(self, chat_id: int, video: str, caption: str = None, parse_mode: str = None):
         """Mock send video"""
-        print(f"Mock: Sent video to {chat_id}: {video}")
+        print(f"Mock: Sent video to {chat_id}: {video} {caption or ''}")
+    
+    async def send_media_group(self, chat_id: int, media: list):
+        """Mock send media group"""
+        print(f"Mock: Sent media group to {chat_id}: {len(media)} items")
     
     async def send_location(self, chat_id: int, latitude: float, longitude: float):
         """Mock send location"""
@@ -143,7 +139,7 @@ def get_service_order_router():
     async def start_service_order(message: Message, state: FSMContext):
         """1. BOSHLASH - REGION TANLASH"""
         try:
-            user = await get_user_by_telegram_id_redis(message.from_user.id)
+            user = await get_user_by_telegram_id(message.from_user.id)
             if not user:
                 await message.answer("❌ Foydalanuvchi topilmadi. /start bosing.")
                 return
@@ -430,7 +426,7 @@ def get_service_order_router():
         """YAKUNLASH - 6 TA UTILS INTEGRATSIYA (reason field qo'shildi)"""
         try:
             data = await state.get_data()
-            user = await get_user_by_telegram_id_redis(data['telegram_id'])
+            user = await get_user_by_telegram_id(data['telegram_id'])
             
             # Get region from state data - ensure it's correctly saved
             region = data.get('selected_region')
@@ -523,40 +519,30 @@ def get_service_order_router():
                         f"{'='*30}"
                     )
                     
-                    # Xabar yuborish
-                    await bot.send_message(
-                        chat_id=ZAYAVKA_GROUP_ID,
-                        text=group_msg,
-                        parse_mode='HTML'
+                    # Matn + media bitta captioned xabar; lokatsiya alohida (faqat geo bo'lsa)
+                    post_calls = compose_group_post(
+                        group_msg,
+                        media=[(data.get('media_type'), data.get('media_id'))],
+                        location=(geo.latitude, geo.longitude) if geo else None
                     )
-                    
-                    # Media yuborish (reason field bilan)
-                    if data.get('media_id'):
-                        if data.get('media_type') == 'photo':
-                            await bot.send_photo(ZAYAVKA_GROUP_ID, photo=data['media_id'])
-                        elif data.get('media_type') == 'video':
-                            await bot.send_video(ZAYAVKA_GROUP_ID, video=data['media_id'])
-                    
-                    # Geolokatsiya yuborish (reason field bilan)
-                    if geo:
-                        await bot.send_location(ZAYAVKA_GROUP_ID, latitude=geo.latitude, longitude=geo.longitude)
+                    # Xabarlar outbox orqali, shu tartibda yuboriladi
+                    for index, (method, kwargs) in enumerate(post_calls):
+                        notification_outbox.enqueue_method(
+                            method, ZAYAVKA_GROUP_ID, bot=bot,
+                            dedup_key=f"service_order:{request_id}:group:{index}:{method}", **kwargs
+                        )
                     
                 except Exception as group_error:
                     logger.error(f"Group notification error: {group_error}")
             
             # Controller'larga qisqa xabar yuborish (reason field bilan)
             controllers = await get_controllers_by_region(region)
-            for controller in controllers:
-                try:
-                    # Qisqa xabar (reason field bilan)
-                    short_msg = f"🔧 Yangi texnik #{request_id} | {user.get('full_name')} | {region.title()} | {data.get('abonent_id')} | Sabab: {data.get('reason', '')[:50]}..."
-                    
-                    await bot.send_message(
-                        chat_id=controller['telegram_id'],
-                        text=short_msg
-                    )
-                except Exception as notify_error:
-                    logger.error(f"Controller notify error: {notify_error}")
+            # Qisqa xabar (reason field bilan) - yuborish outbox'da, rate limit bilan
+            short_msg = f"🔧 Yangi texnik #{request_id} | {user.get('full_name')} | {region.title()} | {data.get('abonent_id')} | Sabab: {data.get('reason', '')[:50]}..."
+            notification_outbox.enqueue_many(
+                [controller['telegram_id'] for controller in controllers], short_msg, bot=bot,
+                dedup_key=f"service_order:{request_id}"
+            )
             
             # 5. AUDIT LOGGER - muhim harakat (reason field bilan)
             try:
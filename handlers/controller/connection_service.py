@@ -28,6 +28,8 @@ from keyboards.controllers_buttons import (
     get_controller_tariff_selection_keyboard,
     get_application_creator_keyboard,
 )
+from database import get_user_by_telegram_id, get_user_region, identity_cached
+from utils.application_status import application_created
 
 # Mock data storage
 mock_users = {
@@ -84,11 +86,6 @@ mock_clients = [
 mock_service_requests = []
 
 # Mock database functions
-async def get_user_by_telegram_id(region: str, telegram_id: int):
-    """Mock get user by telegram ID"""
-    print(f"Mock: Getting user by telegram ID {telegram_id} in region {region}")
-    return mock_users.get(telegram_id)
-
 async def search_users(region: str, search_term: str):
     """Mock search users"""
     print(f"Mock: Searching users in region {region} with term '{search_term}'")
@@ -153,11 +150,13 @@ async def create_service_request(region: str, request_data: dict):
     
     # Add to mock storage
     mock_service_requests.append(request_data)
+    application_created(region)
     
     # Log the creation
     print(f"Mock: Service request created successfully: {request_data['id']}")
     return True
 
+@identity_cached
 async def get_service_request(region: str, request_id: str):
     """Mock get service request"""
     print(f"Mock: Getting service request {request_id} in region {region}")
@@ -176,12 +175,6 @@ class MockAuditLogger:
 audit_logger = MockAuditLogger()
 
 # Mock get user region function
-async def get_user_region(telegram_id: int):
-    """Mock get user region"""
-    print(f"Mock: Getting region for user {telegram_id}")
-    user = mock_users.get(telegram_id)
-    return user.get('region') if user else 'toshkent'
-
 logger = logging.getLogger(__name__)
 
 def get_controller_connection_service_router():
@@ -201,7 +194,7 @@ def get_controller_connection_service_router():
                 await message.answer("❌ Region aniqlanmadi")
                 return
                 
-            user = await get_user_by_telegram_id(region, message.from_user.id)
+            user = await get_user_by_telegram_id(message.from_user.id, region)
             if not user or user.get('role') != 'controller':
                 await message.answer("Sizda ruxsat yo'q.")
                 return
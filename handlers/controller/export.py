@@ -15,6 +15,7 @@ import csv
 import json
 import io
 from typing import List, Dict, Any
+from database import get_user_by_telegram_id, get_user_region
 
 # Mock data storage
 mock_users = {
@@ -141,11 +142,6 @@ mock_workload = [
 ]
 
 # Mock database functions
-async def get_user_by_telegram_id(region: str, telegram_id: int):
-    """Mock get user by telegram ID"""
-    print(f"Mock: Getting user by telegram ID {telegram_id} in region {region}")
-    return mock_users.get(telegram_id)
-
 async def get_available_technicians(region: str):
     """Mock get available technicians"""
     print(f"Mock: Getting available technicians in region {region}")
@@ -201,12 +197,6 @@ class MockAuditLogger:
 audit_logger = MockAuditLogger()
 
 # Mock get user region function
-async def get_user_region(telegram_id: int):
-    """Mock get user region"""
-    print(f"Mock: Getting region for user {telegram_id}")
-    user = mock_users.get(telegram_id)
-    return user.get('region') if user else 'toshkent'
-
 logger = logging.getLogger(__name__)
 
 def get_available_export_types(role: str) -> List[str]:
@@ -408,7 +398,7 @@ def get_controller_export_router():
                 await message.answer("❌ Region aniqlanmadi")
                 return
             
-            user = await get_user_by_telegram_id(region, message.from_user.id)
+            user = await get_user_by_telegram_id(message.from_user.id, region)
             if not user or user['role'] != 'controller':
                 await message.answer("Sizda controller huquqi yo'q.")
                 return
@@ -15,6 +15,8 @@ from aiogram.filters import StateFilter
 from states.controller_states import ControllerRequestStates
 from filters.role_filter import RoleFilter
 import logging
+from database import application_cache, get_user_by_telegram_id, get_user_region
+from utils.application_status import set_application_status
 
 logger = logging.getLogger(__name__)
 
@@ -196,16 +198,6 @@ audit_logger = MockAuditLogger()
 workflow_engine = MockWorkflowEngine()
 
 # Mock functions
-async def get_user_by_telegram_id(region: str, telegram_id: int):
-    """Mock get user by telegram ID"""
-    logger.info(f"Mock: Getting user by telegram ID {telegram_id} in region {region}")
-    return mock_users.get(telegram_id)
-
-async def get_user_region(telegram_id: int):
-    """Mock get user region"""
-    user = mock_users.get(telegram_id)
-    return user.get('region') if user else None
-
 async def get_controller_applications(region: str, controller_id: int):
     """Mock get controller applications"""
     logger.info(f"Mock: Getting controller applications for controller {controller_id} in region {region}")
@@ -227,9 +219,11 @@ async def assign_request_to_technician(region: str, request_id: str, technician_
     # Find and update the request
     for app in mock_controller_applications:
         if app['id'] == request_id:
-            app['assigned_to'] = technician_id
-            app['current_status'] = 'assigned_to_technician'
-            app['updated_at'] = datetime.now()
+            set_application_status(
+                app, 'assigned_to_technician',
+                assigned_to=technician_id,
+                updated_at=datetime.now()
+            )
             return True
     return False
 
@@ -240,7 +234,13 @@ async def update_service_request(region: str, request_id: str, update_data: dict
     # Find and update the request
     for app in mock_controller_applications:
         if app['id'] == request_id:
-            app.update(update_data)
+            fields = dict(update_data)
+            new_status = fields.pop('current_status', None)
+            if new_status is not None:
+                set_application_status(app, new_status, **fields)
+            else:
+                app.update(fields)
+                application_cache.invalidate(request_id)
             return True
     return False
 
@@ -263,7 +263,7 @@ def get_controller_inbox_router():
                 await message.answer("❌ Region aniqlanmadi")
                 return
             
-            user = await get_user_by_telegram_id(region, message.from_user.id)
+            user = await get_user_by_telegram_id(message.from_user.id, region)
             if not user or user['role'] != 'controller':
                 await message.answer("Sizda controller huquqi yo'q.")
                 return
@@ -452,7 +452,7 @@ def get_controller_inbox_router():
                 await callback.answer("Region aniqlanmadi", show_alert=True)
                 return
             
-            user = await get_user_by_telegram_id(region, callback.from_user.id)
+            user = await get_user_by_telegram_id(callback.from_user.id, region)
             lang = user.get('language', 'uz')
             
             # Get available technicians from mock data
@@ -518,7 +518,7 @@ def get_controller_inbox_router():
                 await callback.answer("Region aniqlanmadi", show_alert=True)
                 return
             
-            user = await get_user_by_telegram_id(region, callback.from_user.id)
+            user = await get_user_by_telegram_id(callback.from_user.id, region)
             lang = user.get('language', 'uz')
             controller_id = user['id']
             
@@ -604,7 +604,7 @@ def get_controller_inbox_router():
                 await callback.answer("Region aniqlanmadi", show_alert=True)
                 return
             
-            user = await get_user_by_telegram_id(region, callback.from_user.id)
+            user = await get_user_by_telegram_id(callback.from_user.id, region)
             lang = user.get('language', 'uz')
             controller_id = user['id']
             
@@ -671,7 +671,7 @@ def get_controller_inbox_router():
                 await callback.answer("Region aniqlanmadi", show_alert=True)
                 return
             
-            user = await get_user_by_telegram_id(region, callback.from_user.id)
+            user = await get_user_by_telegram_id(callback.from_user.id, region)
             lang = user.get('language', 'uz')
             controller_id = user['id']
             
@@ -736,7 +736,7 @@ def get_controller_inbox_router():
                 await callback.answer("Region aniqlanmadi", show_alert=True)
                 return
             
-            user = await get_user_by_telegram_id(region, callback.from_user.id)
+            user = await get_user_by_telegram_id(callback.from_user.id, region)
             lang = user.get('language', 'uz')
             controller_id = user['id']
             
@@ -12,6 +12,7 @@ from keyboards.controllers_buttons import controllers_main_menu
 from states.controller_states import ControllerSettingsStates
 from filters.role_filter import RoleFilter
 import logging
+from database import get_user_by_telegram_id, get_user_region, update_user_language
 
 logger = logging.getLogger(__name__)
 
@@ -49,27 +50,6 @@ class MockAuditLogger:
 audit_logger = MockAuditLogger()
 
 # Mock functions
-async def get_user_by_telegram_id(region: str, telegram_id: int):
-    """Mock get user by telegram ID"""
-    logger.info(f"Mock: Getting user by telegram ID {telegram_id} in region {region}")
-    return mock_users.get(telegram_id)
-
-async def get_user_region(telegram_id: int):
-    """Mock get user region"""
-    user = mock_users.get(telegram_id)
-    return user.get('region') if user else None
-
-async def update_user_language(region: str, user_id: int, language: str):
-    """Mock update user language"""
-    logger.info(f"Mock: Updating user {user_id} language to {language} in region {region}")
-    
-    # Find and update the user
-    for user in mock_users.values():
-        if user['id'] == user_id:
-            user['language'] = language
-            return True
-    return False
-
 async def get_controller_dashboard_stats(region: str):
     """Mock get controller dashboard statistics"""
     logger.info(f"Mock: Getting controller dashboard stats for region {region}")
@@ -96,7 +76,7 @@ def get_controller_language_router():
                 await message.answer("❌ Region aniqlanmadi")
                 return
             
-            user = await get_user_by_telegram_id(region, user_id)
+            user = await get_user_by_telegram_id(user_id, region)
             if not user or user['role'] != 'controller':
                 await message.answer("Sizda ruxsat yo'q.")
                 return
@@ -136,13 +116,13 @@ def get_controller_language_router():
                 await message.answer("❌ Region aniqlanmadi")
                 return
             
-            user = await get_user_by_telegram_id(region, user_id)
+            user = await get_user_by_telegram_id(user_id, region)
             if not user or user['role'] != 'controller':
                 await message.answer("Sizda controller huquqi yo'q.")
                 return
             
-            # Update language in mock data
-            success = await update_user_language(region, user['id'], 'uz')
+            # Update language in database
+            success = await update_user_language(user_id, 'uz', region)
             
             if success:
                 text = """✅ <b>Til muvaffaqiyatli o'zgartirildi!</b>
@@ -204,13 +184,13 @@ Bosh menyuga qaytish uchun tugmani bosing."""
                 await message.answer("❌ Регион не определен")
                 return
             
-            user = await get_user_by_telegram_id(region, user_id)
+            user = await get_user_by_telegram_id(user_id, region)
             if not user or user['role'] != 'controller':
                 await message.answer("У вас нет прав контроллера.")
                 return
             
-            # Update language in mock data
-            success = await update_user_language(region, user['id'], 'ru')
+            # Update language in database
+            success = await update_user_language(user_id, 'ru', region)
             
             if success:
                 text = """✅ <b>Язык успешно изменен!</b>
@@ -272,7 +252,7 @@ Bosh menyuga qaytish uchun tugmani bosing."""
                 await message.answer("❌ Region aniqlanmadi / Регион не определен")
                 return
             
-            user = await get_user_by_telegram_id(region, user_id)
+            user = await get_user_by_telegram_id(user_id, region)
             if not user or user['role'] != 'controller':
                 await message.answer("Sizda controller huquqi yo'q. / У вас нет прав контроллера.")
                 return
@@ -13,6 +13,7 @@ from typing import Dict, Any, List, Optional
 from datetime import datetime, timedelta
 from filters.role_filter import RoleFilter
 import logging
+from database import get_user_by_telegram_id, get_user_region
 
 logger = logging.getLogger(__name__)
 
@@ -128,16 +129,6 @@ class MockAuditLogger:
 audit_logger = MockAuditLogger()
 
 # Mock functions
-async def get_user_by_telegram_id(region: str, telegram_id: int):
-    """Mock get user by telegram ID"""
-    logger.info(f"Mock: Getting user by telegram ID {telegram_id} in region {region}")
-    return mock_users.get(telegram_id)
-
-async def get_user_region(telegram_id: int):
-    """Mock get user region"""
-    user = mock_users.get(telegram_id)
-    return user.get('region') if user else None
-
 async def get_monitoring_data(region: str, controller_id: int) -> Dict[str, Any]:
     """Get monitoring data from mock data"""
     try:
@@ -266,7 +257,7 @@ def get_controller_monitoring_router():
                 await message.answer("❌ Region aniqlanmadi")
                 return
             
-            user = await get_user_by_telegram_id(region, message.from_user.id)
+            user = await get_user_by_telegram_id(message.from_user.id, region)
             if not user or user['role'] != 'controller':
                 return
             
@@ -335,7 +326,7 @@ def get_controller_monitoring_router():
                 await callback.answer("Region aniqlanmadi", show_alert=True)
                 return
             
-            user = await get_user_by_telegram_id(region, callback.from_user.id)
+            user = await get_user_by_telegram_id(callback.from_user.id, region)
             lang = user.get('language', 'uz')
             controller_id = user['id']
             
@@ -401,7 +392,7 @@ def get_controller_monitoring_router():
                 await callback.answer("Region aniqlanmadi", show_alert=True)
                 return
             
-            user = await get_user_by_telegram_id(region, callback.from_user.id)
+            user = await get_user_by_telegram_id(callback.from_user.id, region)
             lang = user.get('language', 'uz')
             
             # Get system status from mock data
@@ -466,7 +457,7 @@ def get_controller_monitoring_router():
                 await callback.answer("Region aniqlanmadi", show_alert=True)
                 return
             
-            user = await get_user_by_telegram_id(region, callback.from_user.id)
+            user = await get_user_by_telegram_id(callback.from_user.id, region)
             lang = user.get('language', 'uz')
             controller_id = user['id']
             
@@ -522,7 +513,7 @@ def get_controller_monitoring_router():
                 await callback.answer("Region aniqlanmadi", show_alert=True)
                 return
             
-            user = await get_user_by_telegram_id(region, callback.from_user.id)
+            user = await get_user_by_telegram_id(callback.from_user.id, region)
             lang = user.get('language', 'uz')
             controller_id = user['id']
             
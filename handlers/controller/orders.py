@@ -12,6 +12,7 @@ from typing import Dict, Any, List, Optional
 from filters.role_filter import RoleFilter
 from datetime import datetime, timedelta
 import logging
+from database import get_user_by_telegram_id, get_user_region
 
 logger = logging.getLogger(__name__)
 
@@ -165,16 +166,6 @@ class MockAuditLogger:
 audit_logger = MockAuditLogger()
 
 # Mock functions
-async def get_user_by_telegram_id(region: str, telegram_id: int):
-    """Mock get user by telegram ID"""
-    logger.info(f"Mock: Getting user by telegram ID {telegram_id} in region {region}")
-    return mock_users.get(telegram_id)
-
-async def get_user_region(telegram_id: int):
-    """Mock get user region"""
-    user = mock_users.get(telegram_id)
-    return user.get('region') if user else None
-
 async def get_all_orders(region: str, controller_id: int, limit: int = 50):
     """Get all orders assigned to controller from mock data"""
     try:
@@ -384,7 +375,7 @@ def get_controller_orders_router():
                 await message.answer("❌ Region aniqlanmadi")
                 return
             
-            user = await get_user_by_telegram_id(region, user_id)
+            user = await get_user_by_telegram_id(user_id, region)
             if not user or user['role'] != 'controller':
                 await message.answer("Sizda controller huquqi yo'q.")
                 return
@@ -448,7 +439,7 @@ def get_controller_orders_router():
                 await callback.answer("Region aniqlanmadi", show_alert=True)
                 return
             
-            user = await get_user_by_telegram_id(region, callback.from_user.id)
+            user = await get_user_by_telegram_id(callback.from_user.id, region)
             lang = user.get('language', 'uz')
             controller_id = user['id']
             
@@ -501,7 +492,7 @@ def get_controller_orders_router():
                 await callback.answer("Region aniqlanmadi", show_alert=True)
                 return
             
-            user = await get_user_by_telegram_id(region, callback.from_user.id)
+            user = await get_user_by_telegram_id(callback.from_user.id, region)
             lang = user.get('language', 'uz')
             controller_id = user['id']
             
@@ -551,7 +542,7 @@ def get_controller_orders_router():
                 await callback.answer("Region aniqlanmadi", show_alert=True)
                 return
             
-            user = await get_user_by_telegram_id(region, callback.from_user.id)
+            user = await get_user_by_telegram_id(callback.from_user.id, region)
             lang = user.get('language', 'uz')
             controller_id = user['id']
             
@@ -600,7 +591,7 @@ def get_controller_orders_router():
                 await callback.answer("Region aniqlanmadi", show_alert=True)
                 return
             
-            user = await get_user_by_telegram_id(region, callback.from_user.id)
+            user = await get_user_by_telegram_id(callback.from_user.id, region)
             lang = user.get('language', 'uz')
             
             # Get comprehensive statistics from mock data
@@ -667,7 +658,7 @@ def get_controller_orders_router():
                 await callback.answer("Region aniqlanmadi", show_alert=True)
                 return
             
-            user = await get_user_by_telegram_id(region, callback.from_user.id)
+            user = await get_user_by_telegram_id(callback.from_user.id, region)
             lang = user.get('language', 'uz')
             
             # Update priority in mock data
@@ -717,7 +708,7 @@ def get_controller_orders_router():
                 await callback.answer("Region aniqlanmadi", show_alert=True)
                 return
             
-            user = await get_user_by_telegram_id(region, callback.from_user.id)
+            user = await get_user_by_telegram_id(callback.from_user.id, region)
             lang = user.get('language', 'uz')
             controller_id = user['id']
             
@@ -13,8 +13,11 @@ from keyboards.controllers_buttons import (
     get_realtime_monitoring_keyboard,
     get_realtime_refresh_keyboard
 )
+import asyncio
 import logging
 import random
+from database import application_cache, get_user_by_telegram_id, get_user_region, identity_cached
+from utils.timestamps import elapsed_seconds, normalize_timestamps
 
 logger = logging.getLogger(__name__)
 
@@ -129,18 +132,11 @@ mock_controller_requests = [
     }
 ]
 
-# Mock functions
-async def get_user_by_telegram_id(region: str, user_id: int):
-    """Mock get user by telegram ID"""
-    return {
-        'id': 1,
-        'telegram_id': user_id,
-        'role': 'controller',
-        'language': 'uz',
-        'full_name': 'Test Controller',
-        'phone_number': '+998901234567'
-    }
+# created_at yuklash vaqtida bir marta normallashtiriladi (datetime + created_ts)
+for _req in mock_controller_requests:
+    normalize_timestamps(_req)
 
+# Mock functions
 async def get_available_technicians(region: str):
     """Mock get available technicians"""
     return [tech for tech in mock_technician_workload if tech.get('assigned_count', 0) == 0]
@@ -161,6 +157,8 @@ async def get_technician_workload(region: str):
     """Mock get technician workload"""
     return mock_technician_workload
 
+@identity_cached
+@application_cache.cached()
 async def get_service_request(region: str, request_id: str):
     """Mock get service request"""
     for req in mock_controller_requests:
@@ -189,10 +187,6 @@ class MockRealtimeUpdater:
         logger.info("Mock: Realtime data updated")
 
 # Mock loader function
-async def get_user_region(user_id: int):
-    """Mock get user region"""
-    return 'toshkent'
-
 # Initialize mock objects
 audit_logger = MockAuditLogger()
 realtime_updater = MockRealtimeUpdater()
@@ -202,8 +196,11 @@ def calculate_time_duration(start_time: datetime, end_time: datetime = None) ->
     if end_time is None:
         end_time = datetime.now()
     
-    duration = end_time - start_time
-    total_seconds = int(duration.total_seconds())
+    return format_duration((end_time - start_time).total_seconds())
+
+def format_duration(seconds: float) -> str:
+    """Format duration in seconds as 'Xs Yd' / 'Y daqiqa'"""
+    total_seconds = int(seconds)
     
     hours = total_seconds // 3600
     minutes = (total_seconds % 3600) // 60
@@ -236,68 +233,66 @@ def get_status_emoji(duration_minutes: int) -> str:
 async def get_realtime_data(region: str, controller_id: int) -> Dict[str, Any]:
     """Get real-time data from mock data"""
     try:
-        # Get dashboard statistics
-        stats = await get_controller_dashboard_stats(region)
+        # Mustaqil so'rovlar bir vaqtda - yangilash bitta round-trip vaqtida
+        stats, controller_requests, tech_workload = await asyncio.gather(
+            get_controller_dashboard_stats(region),
+            get_controller_requests(region, controller_id),
+            get_technician_workload(region),
+        )
         
-        # Get controller's active requests
-        controller_requests = await get_controller_requests(region, controller_id)
+        # Bitta snapshot vaqti - barcha davomiyliklar shu vaqtga nisbatan
+        now = datetime.now()
         
-        # Get technician workload
-        tech_workload = await get_technician_workload(region)
-        
-        # Get available technicians
-        available_techs = await get_available_technicians(region)
-        
-        # Calculate statistics
-        active_technicians = len([t for t in tech_workload if t.get('assigned_count', 0) > 0])
+        # Technician statistics (bo'sh texniklar workload'dan olinadi - get_available_technicians shart emas)
         total_technicians = len(tech_workload)
-        available_technicians = len([t for t in tech_workload if t.get('assigned_count', 0) == 0])
-        busy_technicians = total_technicians - available_technicians
-        
-        # Get urgent requests
-        urgent_requests = []
-        for req in controller_requests:
-            if req.get('priority') == 'urgent' or req.get('priority') == 'high':
-                created_at = req.get('created_at')
-                if isinstance(created_at, str):
-                    created_at = datetime.fromisoformat(created_at)
-                
-                # Calculate current role minutes
-                current_role_minutes = 0
-                if created_at:
-                    current_role_minutes = int((datetime.now() - created_at).total_seconds() / 60)
-                
-                urgent_requests.append({
-                    'id': req.get('id'),
-                    'client_name': req.get('client_name', 'Noma\'lum'),
-                    'workflow_type': req.get('workflow_type', 'unknown'),
-                    'status': req.get('current_status'),
-                    'current_role_actor_name': req.get('technician_name', 'Tayinlanmagan'),
-                    'current_role_actor_role': req.get('current_assignee_role', 'controller'),
-                    'start_time': created_at,
-                    'current_role_start_time': created_at,
-                    'created_at': created_at.strftime('%Y-%m-%d %H:%M') if created_at else 'N/A',
-                    'location': req.get('location', 'Noma\'lum'),
-                    'priority': req.get('priority', 'normal'),
-                    'total_duration': calculate_time_duration(created_at) if created_at else 'N/A',
-                    'current_role_duration': calculate_time_duration(created_at) if created_at else 'N/A',
-                    'current_role_minutes': current_role_minutes
+        available_technicians = 0
+        active_technicians_list = []
+        for tech in tech_workload:
+            assigned_count = tech.get('assigned_count', 0)
+            in_progress_count = tech.get('in_progress_count', 0)
+            if assigned_count == 0:
+                available_technicians += 1
+            if assigned_count > 0 or in_progress_count > 0:
+                active_technicians_list.append({
+                    'id': tech.get('id'),
+                    'name': tech.get('full_name', 'Noma\'lum'),
+                    'phone': tech.get('phone', 'N/A'),
+                    'current_orders': assigned_count + in_progress_count,
+                    'completed_today': tech.get('completed_today', 0),
+                    'status': 'active' if in_progress_count > 0 else 'assigned',
+                    'last_activity': now.strftime('%H:%M')
                 })
+        active_technicians = total_technicians - available_technicians
+        busy_technicians = active_technicians
         
-        # Get normal requests
-        normal_requests = []
+        # Urgent/normal bo'linishi - bitta o'tishda
+        urgent_rows = []
+        normal_rows = []
+        pending_applications = 0
+        in_progress_applications = 0
         for req in controller_requests:
-            if req.get('priority') not in ['urgent', 'high']:
+            status = req.get('current_status')
+            if status == 'pending_assignment':
+                pending_applications += 1
+            elif status in ('assigned_to_technician', 'work_in_progress'):
+                in_progress_applications += 1
+            
+            if req.get('priority') in ('urgent', 'high'):
+                if len(urgent_rows) < 5:
+                    urgent_rows.append(req)
+            elif len(normal_rows) < 10:
+                normal_rows.append(req)
+        
+        # Davomiyliklar epoch maydonlardan, barcha qatorlar uchun birdaniga
+        now_ts = now.timestamp()
+        
+        def build_rows(rows):
+            elapsed = elapsed_seconds([req.get('created_ts') for req in rows], now_ts)
+            result = []
+            for req, seconds in zip(rows, elapsed):
                 created_at = req.get('created_at')
-                if isinstance(created_at, str):
-                    created_at = datetime.fromisoformat(created_at)
-                
-                # Calculate current role minutes
-                current_role_minutes = 0
-                if created_at:
-                    current_role_minutes = int((datetime.now() - created_at).total_seconds() / 60)
-                
-                normal_requests.append({
+                duration = format_duration(seconds) if seconds is not None else 'N/A'
+                result.append({
                     'id': req.get('id'),
                     'client_name': req.get('client_name', 'Noma\'lum'),
                     'workflow_type': req.get('workflow_type', 'unknown'),
@@ -309,24 +304,14 @@ async def get_realtime_data(region: str, controller_id: int) -> Dict[str, Any]:
                     'created_at': created_at.strftime('%Y-%m-%d %H:%M') if created_at else 'N/A',
                     'location': req.get('location', 'Noma\'lum'),
                     'priority': req.get('priority', 'normal'),
-                    'total_duration': calculate_time_duration(created_at) if created_at else 'N/A',
-                    'current_role_duration': calculate_time_duration(created_at) if created_at else 'N/A',
-                    'current_role_minutes': current_role_minutes
+                    'total_duration': duration,
+                    'current_role_duration': duration,
+                    'current_role_minutes': int(seconds / 60) if seconds is not None else 0
                 })
+            return result
         
-        # Get active technicians list
-        active_technicians_list = []
-        for tech in tech_workload:
-            if tech.get('assigned_count', 0) > 0 or tech.get('in_progress_count', 0) > 0:
-                active_technicians_list.append({
-                    'id': tech.get('id'),
-                    'name': tech.get('full_name', 'Noma\'lum'),
-                    'phone': tech.get('phone', 'N/A'),
-                    'current_orders': tech.get('assigned_count', 0) + tech.get('in_progress_count', 0),
-                    'completed_today': tech.get('completed_today', 0),
-                    'status': 'active' if tech.get('in_progress_count', 0) > 0 else 'assigned',
-                    'last_activity': datetime.now().strftime('%H:%M')
-                })
+        urgent_requests = build_rows(urgent_rows)
+        normal_requests = build_rows(normal_rows)
         
         return {
             'active_orders': stats.get('active_work', 0),
@@ -338,15 +323,15 @@ async def get_realtime_data(region: str, controller_id: int) -> Dict[str, Any]:
             'system_status': 'online',
             'system_uptime': '99.9%',
             'active_applications': len(controller_requests),
-            'pending_applications': len([r for r in controller_requests if r.get('current_status') == 'pending_assignment']),
-            'in_progress_applications': len([r for r in controller_requests if r.get('current_status') in ['assigned_to_technician', 'work_in_progress']]),
+            'pending_applications': pending_applications,
+            'in_progress_applications': in_progress_applications,
             'completed_applications': stats.get('completed_today', 0),
             'available_technicians': available_technicians,
             'busy_technicians': busy_technicians,
-            'urgent_requests': urgent_requests[:5],  # Limit to 5 urgent requests
-            'normal_requests': normal_requests[:10],  # Limit to 10 normal requests
+            'urgent_requests': urgent_requests,  # Limit to 5 urgent requests
+            'normal_requests': normal_requests,  # Limit to 10 normal requests
             'active_technicians_list': active_technicians_list,
-            'last_update': datetime.now().strftime('%H:%M:%S'),
+            'last_update': now.strftime('%H:%M:%S'),
             'performance_metrics': {
                 'satisfaction_score': '4.6/5.0',
                 'active_sessions': 15,
@@ -601,7 +586,7 @@ def get_realtime_monitoring_router():
                 await message.answer("❌ Region aniqlanmadi")
                 return
                 
-            user = await get_user_by_telegram_id(region, user_id)
+            user = await get_user_by_telegram_id(user_id, region)
             if not user or user['role'] != 'controller':
                 await message.answer("Sizda controller huquqi yo'q.")
                 return
@@ -1056,7 +1041,7 @@ def get_realtime_monitoring_router():
             await callback.answer("Sizning hududingiz topilmadi. Iltimos, boshqaruvchi bilan bog'laning.")
             return
         
-        controller_id = await get_user_by_telegram_id(callback.from_user.id)['id']
+        controller_id = (await get_user_by_telegram_id(callback.from_user.id))['id']
         detailed = await get_realtime_data(region, controller_id)
         total = len(detailed.get('urgent_requests', []))
         data = await state.get_data()
@@ -1122,7 +1107,7 @@ def get_realtime_monitoring_router():
             await callback.answer("Sizning hududingiz topilmadi. Iltimos, boshqaruvchi bilan bog'laning.")
             return
         
-        controller_id = await get_user_by_telegram_id(callback.from_user.id)['id']
+        controller_id = (await get_user_by_telegram_id(callback.from_user.id))['id']
         rt = await get_realtime_data(region, controller_id)
         total = len(rt.get('urgent_requests', []))
         data = await state.get_data()
@@ -1189,7 +1174,7 @@ def get_realtime_monitoring_router():
             await callback.answer("Sizning hududingiz topilmadi. Iltimos, boshqaruvchi bilan bog'laning.")
             return
         
-        controller_id = await get_user_by_telegram_id(callback.from_user.id)['id']
+        controller_id = (await get_user_by_telegram_id(callback.from_user.id))['id']
         detailed = await get_realtime_data(region, controller_id)
         total = len(detailed.get('urgent_requests_with_time', []))
         data = await state.get_data()
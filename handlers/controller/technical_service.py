@@ -23,6 +23,8 @@ from keyboards.controllers_buttons import (
     controller_confirmation_keyboard,
     get_application_creator_keyboard,
 )
+from database import get_user_by_telegram_id, get_user_region, identity_cached
+from utils.application_status import application_created
 
 logger = logging.getLogger(__name__)
 
@@ -93,16 +95,6 @@ mock_service_requests = {}
 mock_request_counter = 1000
 
 # Mock functions
-async def get_user_by_telegram_id(region: str, telegram_id: int):
-    """Mock get user by telegram ID"""
-    return mock_users.get(telegram_id, {
-        'id': 999,
-        'telegram_id': telegram_id,
-        'role': 'controller',
-        'region': region,
-        'full_name': 'Unknown User'
-    })
-
 async def search_users(region: str, search_term: str, search_type: str = 'phone'):
     """Mock search users"""
     try:
@@ -169,6 +161,7 @@ async def create_service_request(region: str, request_data: dict):
             'created_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
             'mock_id': mock_request_counter
         }
+        application_created(region)
         
         logger.info(f"Mock: Created service request {request_id}")
         return True
@@ -176,6 +169,7 @@ async def create_service_request(region: str, request_data: dict):
         logger.error(f"Error creating service request: {e}")
         return False
 
+@identity_cached
 async def get_service_request(request_id: str, region: str):
     """Mock get service request"""
     return mock_service_requests.get(request_id)
@@ -198,11 +192,6 @@ class MockAuditLogger:
 audit_logger = MockAuditLogger()
 
 # Mock user region function
-async def get_user_region(user_id: int):
-    """Mock get user region"""
-    user = mock_users.get(user_id, {})
-    return user.get('region', 'toshkent')
-
 def get_controller_technical_service_router():
     router = Router()
 
@@ -220,7 +209,7 @@ def get_controller_technical_service_router():
                 await message.answer("❌ Region aniqlanmadi")
                 return
                 
-            user = await get_user_by_telegram_id(region, message.from_user.id)
+            user = await get_user_by_telegram_id(message.from_user.id, region)
             if not user or user.get('role') != 'controller':
                 await message.answer("Sizda ruxsat yo'q.")
                 return
@@ -12,6 +12,7 @@ from filters.role_filter import RoleFilter
 from datetime import datetime, timedelta
 from typing import List, Dict, Any
 import logging
+from database import get_user_by_telegram_id, get_user_region
 
 logger = logging.getLogger(__name__)
 
@@ -127,16 +128,6 @@ mock_technician_workload = {
 }
 
 # Mock functions
-async def get_user_by_telegram_id(region: str, telegram_id: int):
-    """Mock get user by telegram ID"""
-    return mock_users.get(telegram_id, {
-        'id': 999,
-        'telegram_id': telegram_id,
-        'role': 'controller',
-        'region': region,
-        'full_name': 'Unknown User'
-    })
-
 async def get_available_technicians(region: str):
     """Mock get available technicians"""
     return [tech for tech in mock_technicians if tech['region'] == region and tech['is_active']]
@@ -194,11 +185,6 @@ class MockAuditLogger:
 audit_logger = MockAuditLogger()
 
 # Mock user region function
-async def get_user_region(user_id: int):
-    """Mock get user region"""
-    user = mock_users.get(user_id, {})
-    return user.get('region', 'toshkent')
-
 def get_controller_technicians_router():
     router = Router()
 
@@ -334,7 +320,7 @@ def get_controller_technicians_router():
                 await message.answer("❌ Region aniqlanmadi")
                 return
             
-            user = await get_user_by_telegram_id(region, message.from_user.id)
+            user = await get_user_by_telegram_id(message.from_user.id, region)
             if not user or user.get('role') != 'controller':
                 await message.answer("Sizda controller huquqi yo'q.")
                 return
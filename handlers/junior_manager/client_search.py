@@ -19,6 +19,8 @@ from datetime import datetime
 from filters.role_filter import RoleFilter
 from states.junior_manager_states import JuniorManagerApplicationStates
 import logging
+from database import get_user_by_telegram_id, get_user_lang
+from utils.phone_index import client_phone_index
 
 logger = logging.getLogger(__name__)
 
@@ -109,6 +111,9 @@ MOCK_CLIENTS = [
     }
 ]
 
+# Telefon bo'yicha qidirish uchun umumiy indeksga yuklash
+client_phone_index.add_many(MOCK_CLIENTS)
+
 # Mock service requests data
 mock_service_requests = {
     1: [
@@ -138,21 +143,6 @@ mock_service_requests = {
 }
 
 # Mock functions to replace database calls
-async def get_user_by_telegram_id(user_id: int):
-    """Mock get user by telegram ID"""
-    # If user not in mock data, create a default junior_manager user for testing
-    if user_id not in mock_users:
-        mock_users[user_id] = {
-            'id': len(mock_users) + 1,
-            'telegram_id': user_id,
-            'role': 'junior_manager',
-            'language': 'uz',
-            'full_name': f'Junior Manager {user_id}',
-            'phone_number': '+998900000000',
-            'region': 'toshkent'
-        }
-    return mock_users.get(user_id)
-
 async def search_clients_universal(query: str, region: str = 'toshkent'):
     """Mock universal client search"""
     try:
@@ -176,13 +166,9 @@ async def search_clients_universal(query: str, region: str = 'toshkent'):
         return []
 
 async def search_clients_by_phone(phone: str, region: str = 'toshkent'):
-    """Mock search clients by phone"""
+    """Search clients by full or partial phone via the shared phone index"""
     try:
-        results = []
-        for client in MOCK_CLIENTS:
-            if phone in client.get('phone', ''):
-                results.append(client)
-        return results[:5]
+        return client_phone_index.search(phone, limit=5)
     except Exception as e:
         logger.error(f"Mock: Error searching by phone: {e}")
         return []
@@ -222,6 +208,7 @@ async def create_client(client_data: Dict[str, Any], region: str = 'toshkent'):
             'region': region
         }
         MOCK_CLIENTS.append(new_client)
+        client_phone_index.add(new_client)
         return new_client
     except Exception as e:
         logger.error(f"Mock: Error creating client: {e}")
@@ -233,6 +220,8 @@ async def update_client(client_id: int, update_data: Dict[str, Any], region: str
         for i, client in enumerate(MOCK_CLIENTS):
             if client.get('id') == client_id:
                 MOCK_CLIENTS[i].update(update_data)
+                if 'phone' in update_data:
+                    client_phone_index.add(MOCK_CLIENTS[i])
                 return MOCK_CLIENTS[i]
         return None
     except Exception as e:
@@ -247,11 +236,6 @@ async def get_service_requests_by_client(region: str, client_id: int):
         logger.error(f"Mock: Error getting service requests: {e}")
         return []
 
-async def get_user_lang(user_id: int):
-    """Mock get user language"""
-    user = await get_user_by_telegram_id(user_id)
-    return user.get('language', 'uz') if user else 'uz'
-
 # Create router
 router = Router(name="junior_manager_client_search")
 
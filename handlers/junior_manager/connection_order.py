@@ -27,6 +27,8 @@ from keyboards.junior_manager_buttons import (
 )
 import logging
 from typing import Dict, Any
+from database import get_user_by_telegram_id, get_user_lang
+from utils.application_status import application_created
 
 logger = logging.getLogger(__name__)
 
@@ -128,10 +130,6 @@ class MockWorkflowEngine:
 mock_workflow_engine = MockWorkflowEngine()
 
 # Mock functions to replace database calls
-async def get_user_by_telegram_id(user_id: int):
-    """Mock get user by telegram ID"""
-    return mock_users.get(user_id)
-
 async def search_clients_by_phone(phone: str, region: str = 'toshkent'):
     """Mock search clients by phone"""
     try:
@@ -196,6 +194,7 @@ async def create_service_request(region: str, request_data: Dict[str, Any]):
         request_data['region'] = region
         
         mock_service_requests[request_id] = request_data
+        application_created(region)
         
         logger.info(f"Mock: Created service request {request_id} in region {region}")
         return request_id
@@ -244,11 +243,6 @@ async def create_on_assignment(region_code: str, application_id: str, assigned_r
         logger.error(f"Mock: Error creating inbox notification: {e}")
         return False
 
-async def get_user_lang(user_id: int):
-    """Mock get user language"""
-    user = await get_user_by_telegram_id(user_id)
-    return user.get('language', 'uz') if user else 'uz'
-
 async def get_text(key: str, lang: str = 'uz'):
     """Mock get text by key and language"""
     # Simple mock text function
@@ -20,6 +20,8 @@ from filters.role_filter import RoleFilter
 from states.junior_manager_states import JuniorManagerInboxStates
 import logging
 import uuid
+from database import get_user_by_telegram_id, get_user_lang, identity_cached
+from utils.application_status import set_application_status
 
 logger = logging.getLogger(__name__)
 
@@ -163,10 +165,6 @@ class MockWorkflowEngine:
 mock_workflow_engine = MockWorkflowEngine()
 
 # Mock functions to replace database calls
-async def get_user_by_telegram_id(user_id: int):
-    """Mock get user by telegram ID"""
-    return mock_users.get(user_id)
-
 async def get_role_inbox(region_code: str, role: str, recipient_id: int, limit: int = 50):
     """Mock get role inbox messages"""
     try:
@@ -241,6 +239,7 @@ async def get_junior_manager_requests(region: str, manager_id: int):
         logger.error(f"Mock: Error getting junior manager requests: {e}")
         return []
 
+@identity_cached
 async def get_service_request(region: str, request_id: str):
     """Mock get service request"""
     try:
@@ -265,10 +264,12 @@ async def assign_service_request(region_code: str, request_id: str, assignee_id:
     """Mock assign service request"""
     try:
         if request_id in mock_service_requests:
-            mock_service_requests[request_id]['assigned_to'] = assignee_id
-            mock_service_requests[request_id]['assigned_role'] = assignee_role
-            mock_service_requests[request_id]['assigned_at'] = datetime.now().isoformat()
-            mock_service_requests[request_id]['current_status'] = 'assigned_to_controller'
+            set_application_status(
+                mock_service_requests[request_id], 'assigned_to_controller',
+                assigned_to=assignee_id,
+                assigned_role=assignee_role,
+                assigned_at=datetime.now().isoformat()
+            )
             
             logger.info(f"Mock: Assigned request {request_id} to {assignee_role} {assignee_id}")
             return True
@@ -287,11 +288,6 @@ async def get_service_requests_by_assignee(region: str, assignee_id: int):
         logger.error(f"Mock: Error getting service requests by assignee: {e}")
         return []
 
-async def get_user_lang(user_id: int):
-    """Mock get user language"""
-    user = await get_user_by_telegram_id(user_id)
-    return user.get('language', 'uz') if user else 'uz'
-
 async def get_text(key: str, lang: str = 'uz'):
     """Mock get text by key and language"""
     # Simple mock text function
@@ -15,6 +15,7 @@ from keyboards.junior_manager_buttons import (
 from states.junior_manager_states import JuniorManagerLanguageStates
 from filters.role_filter import RoleFilter
 import logging
+from database import get_user_by_telegram_id, get_user_lang, update_user_language
 
 logger = logging.getLogger(__name__)
 
@@ -54,35 +55,6 @@ class MockAuditLogger:
 audit_logger = MockAuditLogger()
 
 # Mock functions to replace database calls
-async def get_user_by_telegram_id(user_id: int):
-    """Mock get user by telegram ID"""
-    return mock_users.get(user_id)
-
-async def update_user_language(user_id: int, new_language: str):
-    """Mock update user language"""
-    try:
-        if user_id in mock_users:
-            mock_users[user_id]['language'] = new_language
-            
-            # Update language settings
-            if user_id in mock_language_settings:
-                mock_language_settings[user_id]['language'] = new_language
-                mock_language_settings[user_id]['updated_at'] = '2024-01-15 10:00:00'
-            else:
-                mock_language_settings[user_id] = {
-                    'user_id': mock_users[user_id]['id'],
-                    'language': new_language,
-                    'region': mock_users[user_id].get('region', 'toshkent'),
-                    'updated_at': '2024-01-15 10:00:00'
-                }
-            
-            logger.info(f"Mock: Updated language for user {user_id} to {new_language}")
-            return True
-        return False
-    except Exception as e:
-        logger.error(f"Mock: Error updating user language: {e}")
-        return False
-
 async def update_user_in_db(region_code: str, user_id: int, updates: dict):
     """Mock update user in database"""
     try:
@@ -97,11 +69,6 @@ async def update_user_in_db(region_code: str, user_id: int, updates: dict):
         logger.error(f"Mock: Error updating user in regional DB: {e}")
         return False
 
-async def get_user_lang(user_id: int):
-    """Mock get user language"""
-    user = await get_user_by_telegram_id(user_id)
-    return user.get('language', 'uz') if user else 'uz'
-
 async def get_text(key: str, lang: str = 'uz'):
     """Mock get text by key and language"""
     # Simple mock text function
@@ -19,6 +19,7 @@ from keyboards.junior_manager_buttons import (
 )
 import logging
 import uuid
+from database import get_user_by_telegram_id, get_user_lang, identity_cached
 
 logger = logging.getLogger(__name__)
 
@@ -149,10 +150,6 @@ class MockWorkflowEngine:
 mock_workflow_engine = MockWorkflowEngine()
 
 # Mock functions to replace database calls
-async def get_user_by_telegram_id(user_id: int):
-    """Mock get user by telegram ID"""
-    return mock_users.get(user_id)
-
 async def get_junior_manager_requests(region: str, manager_id: int):
     """Mock get junior manager requests"""
     try:
@@ -174,6 +171,7 @@ async def get_service_requests_by_assignee(region: str, assignee_id: int):
         logger.error(f"Mock: Error getting service requests by assignee: {e}")
         return []
 
+@identity_cached
 async def get_service_request(region: str, request_id: str):
     """Mock get service request"""
     try:
@@ -204,11 +202,6 @@ async def create_on_assignment(region_code: str, application_id: str, assigned_r
         logger.error(f"Mock: Error creating inbox notification: {e}")
         return False
 
-async def get_user_lang(user_id: int):
-    """Mock get user language"""
-    user = await get_user_by_telegram_id(user_id)
-    return user.get('language', 'uz') if user else 'uz'
-
 async def format_date(date_obj, lang: str = 'uz'):
     """Mock format date"""
     try:
@@ -17,6 +17,7 @@ from keyboards.junior_manager_buttons import (
 from typing import Dict, Any, List, Optional
 from datetime import datetime, date, timedelta
 import logging
+from database import get_user_by_telegram_id, get_user_lang
 
 logger = logging.getLogger(__name__)
 
@@ -170,10 +171,6 @@ class MockAuditLogger:
 audit_logger = MockAuditLogger()
 
 # Mock functions to replace database calls
-async def get_user_by_telegram_id(user_id: int):
-    """Mock get user by telegram ID"""
-    return mock_users.get(user_id)
-
 async def get_junior_manager_statistics(region: str, user_id: int, start_date: date, end_date: date):
     """Mock get junior manager statistics"""
     try:
@@ -251,11 +248,6 @@ async def get_service_requests_by_assignee(region: str, assignee_id: int):
         logger.error(f"Mock: Error getting service requests by assignee: {e}")
         return []
 
-async def get_user_lang(user_id: int):
-    """Mock get user language"""
-    user = await get_user_by_telegram_id(user_id)
-    return user.get('language', 'uz') if user else 'uz'
-
 async def format_date(date_obj, lang: str = 'uz'):
     """Mock format date"""
     try:
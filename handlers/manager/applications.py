@@ -11,20 +11,12 @@ from aiogram.types import Message
 from aiogram.fsm.context import FSMContext
 from filters.role_filter import RoleFilter
 import logging
+from database import get_user_by_telegram_id
+from utils.application_stats import application_counters
 
 logger = logging.getLogger(__name__)
 
 # Mock data storage
-mock_application_stats = {
-    'total': 25,
-    'completed': 18,
-    'active': 5,
-    'new': 2,
-    'cancelled': 0,
-    'today': 3,
-    'this_week': 12
-}
-
 mock_recent_applications = [
     {
         'id': 'req_001_2024_01_15',
@@ -59,27 +51,13 @@ mock_recent_applications = [
 ]
 
 mock_tracker_stats = {
-    'total': 25,
-    'completed': 18,
-    'completion_rate': 72,
     'avg_rating': 4.6
 }
 
 # Mock functions
-async def get_user_by_telegram_id(region: str, user_id: int):
-    """Mock get user by telegram ID"""
-    return {
-        'id': 1,
-        'telegram_id': user_id,
-        'role': 'manager',
-        'language': 'uz',
-        'full_name': 'Test Manager',
-        'phone_number': '+998901234567'
-    }
-
 async def get_application_statistics(region: str, manager_id: int = None):
-    """Mock get application statistics"""
-    return mock_application_stats
+    """Get application statistics from the precomputed counters"""
+    return application_counters.summary()
 
 async def get_manager_applications(region: str, manager_id: int = None, limit: int = 10):
     """Mock get manager applications"""
@@ -88,8 +66,14 @@ async def get_manager_applications(region: str, manager_id: int = None, limit: i
 class MockApplicationTracker:
     """Mock application tracker"""
     async def get_statistics(self):
-        """Mock get statistics"""
-        return mock_tracker_stats
+        """Get statistics from the precomputed counters"""
+        summary = application_counters.summary()
+        return {
+            'total': summary['total'],
+            'completed': summary['completed'],
+            'completion_rate': summary['completion_rate'],
+            **mock_tracker_stats
+        }
 
 class MockAuditLogger:
     """Mock audit logger"""
@@ -123,7 +107,7 @@ def get_manager_applications_router():
             user_id = message.from_user.id
             
             # Get user info
-            user = await get_user_by_telegram_id('toshkent', user_id)
+            user = await get_user_by_telegram_id(user_id, 'toshkent')
             if not user:
                 await message.answer("❌ Foydalanuvchi topilmadi")
                 return
@@ -193,7 +177,7 @@ Qaysi arizalarni ko'rmoqchisiz?"""
             user_id = message.from_user.id
             
             # Get user info
-            user = await get_user_by_telegram_id('toshkent', user_id)
+            user = await get_user_by_telegram_id(user_id, 'toshkent')
             if not user:
                 await message.answer("❌ Foydalanuvchi topilmadi")
                 return
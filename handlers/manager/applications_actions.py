@@ -11,6 +11,7 @@ from aiogram.fsm.context import FSMContext
 from typing import Dict, Any, List, Optional
 from filters.role_filter import RoleFilter
 import logging
+from database import get_user_by_telegram_id
 
 logger = logging.getLogger(__name__)
 
@@ -73,18 +74,6 @@ mock_users = {
 }
 
 # Mock functions
-async def get_user_by_telegram_id(telegram_id: int):
-    """Mock get user data"""
-    for user in mock_users.values():
-        if user.get('telegram_id') == telegram_id:
-            return user
-    return None
-
-async def get_user_lang(telegram_id: int):
-    """Mock get user language"""
-    user = await get_user_by_telegram_id(telegram_id)
-    return user.get('language', 'uz') if user else 'uz'
-
 async def get_users_by_role(role: str):
     """Mock get users by role"""
     return [user for user in mock_users.values() if user.get('role') == role]
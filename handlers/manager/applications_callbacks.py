@@ -18,6 +18,8 @@ from typing import Dict, Any, List, Optional
 from datetime import datetime
 from filters.role_filter import RoleFilter
 import logging
+from database import application_cache, get_user_by_telegram_id, get_user_lang, identity_cached
+from utils.application_index import application_index
 
 logger = logging.getLogger(__name__)
 
@@ -101,18 +103,6 @@ mock_users = {
 }
 
 # Mock functions
-async def get_user_by_telegram_id(telegram_id: int):
-    """Mock get user data"""
-    for user in mock_users.values():
-        if user.get('telegram_id') == telegram_id:
-            return user
-    return None
-
-async def get_user_lang(telegram_id: int):
-    """Mock get user language"""
-    user = await get_user_by_telegram_id(telegram_id)
-    return user.get('language', 'uz') if user else 'uz'
-
 async def answer_and_cleanup(callback: CallbackQuery, text: str, **kwargs):
     """Mock answer and cleanup"""
     try:
@@ -136,6 +126,8 @@ class MockWorkflowAccessControl:
             return []
 
 # Mock service request
+@identity_cached
+@application_cache.cached()
 async def get_service_request(request_id: str):
     """Mock get service request"""
     try:
@@ -143,7 +135,8 @@ async def get_service_request(request_id: str):
         for app in mock_applications:
             if app.get('id') == request_id or app.get('id').startswith(request_id):
                 return app
-        return None
+        # Mijoz yaratgan yangi arizalar (UL_...) indeksda
+        return application_index.get(request_id)
     except Exception as e:
         logger.error(f"Mock: Error getting service request: {e}")
         return None
@@ -274,7 +267,7 @@ def get_manager_applications_callbacks_router():
             logger.error(f"Error in handle_application_action: {e}")
             await callback.answer("Xatolik yuz berdi", show_alert=True)
     
-    async def display_application(callback: CallbackQuery, state: FSMContext, applications: List[Dict], index: int, user: Dict):
+    async def display_application(callback: CallbackQuery, state: FSMContext, applications: List[Dict], index: int, user: Dict, new_message: bool = False):
         """Display application details using mock data"""
         try:
             app = applications[index]
@@ -345,7 +338,10 @@ def get_manager_applications_callbacks_router():
                 lang=user.get('language', 'uz')
             )
             
-            await callback.message.edit_text(text, reply_markup=keyboard, parse_mode='HTML')
+            if new_message:
+                await callback.message.answer(text, reply_markup=keyboard, parse_mode='HTML')
+            else:
+                await callback.message.edit_text(text, reply_markup=keyboard, parse_mode='HTML')
             
         except Exception as e:
             logger.error(f"Error in display_application: {e}")
@@ -713,6 +709,30 @@ def get_manager_applications_callbacks_router():
             logger.error(f"Error in back_to_main_callback: {e}")
             await callback.answer("Xatolik yuz berdi", show_alert=True)
 
+    @router.callback_query(F.data.startswith("mgr_view_app_"))
+    async def view_application_by_link(callback: CallbackQuery, state: FSMContext):
+        """Yangi ariza xabari / digest tugmasidan arizani ochish"""
+        try:
+            user = await get_user_by_telegram_id(callback.from_user.id)
+            if not user:
+                await callback.answer("Foydalanuvchi topilmadi", show_alert=True)
+                return
+            
+            request_id = callback.data.replace("mgr_view_app_", "")
+            request = await get_service_request(request_id)
+            if not request:
+                await callback.answer("❌ Ariza topilmadi", show_alert=True)
+                return
+            
+            await callback.answer()
+            await state.update_data(applications=[request], current_index=0)
+            # Digest xabari o'zgarmasin - ariza alohida xabarda ochiladi
+            await display_application(callback, state, [request], 0, user, new_message=True)
+            
+        except Exception as e:
+            logger.error(f"Error in view_application_by_link: {e}")
+            await callback.answer("Xatolik yuz berdi", show_alert=True)
+
     @router.callback_query(F.data.startswith("mgr_word_doc_"))
     async def manager_generate_word(callback: CallbackQuery):
         """Manager uchun Word hujjat yaratish"""
@@ -119,11 +119,6 @@ async def find_user_by_telegram_id(telegram_id: int):
             return user
     return None
 
-async def get_user_lang(telegram_id: int):
-    """Mock get user language"""
-    user = await find_user_by_telegram_id(telegram_id)
-    return user.get('language', 'uz') if user else 'uz'
-
 # Mock workflow access control
 class MockWorkflowAccessControl:
     """Mock workflow access control"""
@@ -13,6 +13,8 @@ from typing import Dict, Any, List, Optional
 from datetime import datetime
 from filters.role_filter import RoleFilter
 import logging
+from database import get_user_by_telegram_id
+from utils.search_index import SearchIndex
 
 logger = logging.getLogger(__name__)
 
@@ -114,32 +116,47 @@ async def find_user_by_telegram_id(telegram_id: int):
             return user
     return None
 
-async def get_user_by_telegram_id(telegram_id: int):
-    """Mock get user data"""
-    return await find_user_by_telegram_id(telegram_id)
+# Qidiruv indeksi: maydon -> og'irlik (ID va kontakt ma'lumotlari muhimroq)
+APPLICATION_SEARCH_FIELDS = {
+    'id': 5.0,
+    'full_name': 3.0,
+    'phone': 3.0,
+    'location': 2.0,
+    'description': 1.0,
+    'region': 1.0,
+}
+
+applications_by_id = {app['id']: app for app in mock_applications}
+search_index = SearchIndex(APPLICATION_SEARCH_FIELDS)
+
+def index_application(app: Dict[str, Any]):
+    """Ariza yaratilganda yoki tahrirlanganda qidiruv indeksini yangilash"""
+    applications_by_id[app['id']] = app
+    contact_info = app.get('contact_info') or {}
+    search_index.add(app['id'], {
+        'id': app['id'],
+        'full_name': contact_info.get('full_name'),
+        'phone': contact_info.get('phone'),
+        'location': app.get('location'),
+        'description': app.get('description'),
+        'region': app.get('region'),
+    })
 
-async def get_user_lang(telegram_id: int):
-    """Mock get user language"""
-    user = await find_user_by_telegram_id(telegram_id)
-    return user.get('language', 'uz') if user else 'uz'
+def remove_application_from_index(application_id: str):
+    """Ariza o'chirilganda qidiruv indeksidan olib tashlash"""
+    applications_by_id.pop(application_id, None)
+    search_index.remove(application_id)
 
-async def search_applications(query: str, region: str = 'toshkent'):
-    """Mock search applications"""
+for _app in mock_applications:
+    index_application(_app)
+
+async def search_applications(query: str, region: str = 'toshkent', fields: Optional[List[str]] = None):
+    """Search applications via the inverted index (ranked)"""
     try:
-        query_lower = query.lower()
-        results = []
-        
-        for app in mock_applications:
-            # Search in various fields
-            if (query_lower in app['id'].lower() or
-                query_lower in app['contact_info']['full_name'].lower() or
-                query_lower in app['contact_info']['phone'].lower() or
-                query_lower in app['description'].lower() or
-                query_lower in app['location'].lower() or
-                query_lower in app.get('region', '').lower()):
-                results.append(app)
-        
-        return results
+        return [
+            applications_by_id[app_id]
+            for app_id, _ in search_index.search(query, fields=fields)
+        ]
         
     except Exception as e:
         logger.error(f"Mock: Error searching applications: {e}")
@@ -253,7 +270,7 @@ def get_manager_applications_search_router():
             region = state_data.get('search_region', 'toshkent')
             
             # Search in mock data
-            results = await search_applications(search_query, region)
+            results = await search_applications(search_query, region, fields=['id'])
             
             if not results:
                 text = f"🔍 <b>Qidirish natijasi</b>\n\nID: {search_query}\n\n❌ Arizalar topilmadi"
@@ -289,7 +306,7 @@ def get_manager_applications_search_router():
             region = state_data.get('search_region', 'toshkent')
             
             # Search in mock data
-            results = await search_applications(search_query, region)
+            results = await search_applications(search_query, region, fields=['phone'])
             
             if not results:
                 text = f"🔍 <b>Qidirish natijasi</b>\n\n📞 Telefon: {search_query}\n\n❌ Arizalar topilmadi"
@@ -325,7 +342,7 @@ def get_manager_applications_search_router():
             region = state_data.get('search_region', 'toshkent')
             
             # Search in mock data
-            results = await search_applications(search_query, region)
+            results = await search_applications(search_query, region, fields=['full_name'])
             
             if not results:
                 text = f"🔍 <b>Qidirish natijasi</b>\n\n👤 Ism: {search_query}\n\n❌ Arizalar topilmadi"
@@ -361,7 +378,7 @@ def get_manager_applications_search_router():
             region = state_data.get('search_region', 'toshkent')
             
             # Search in mock data
-            results = await search_applications(search_query, region)
+            results = await search_applications(search_query, region, fields=['location', 'region'])
             
             if not results:
                 text = f"🔍 <b>Qidirish natijasi</b>\n\n📍 Manzil: {search_query}\n\n❌ Arizalar topilmadi"
@@ -22,6 +22,8 @@ from keyboards.controllers_buttons import (
     controller_geolocation_keyboard,
     get_controller_tariff_selection_keyboard,
 )
+from database import get_user_by_telegram_id
+from utils.application_status import application_created
 
 logger = logging.getLogger(__name__)
 
@@ -88,13 +90,6 @@ mock_users = {
 mock_service_requests = []
 
 # Mock functions
-async def get_user_by_telegram_id(region: str, user_id: int):
-    """Mock get user by telegram ID"""
-    for user in mock_users.values():
-        if user.get('telegram_id') == user_id:
-            return user
-    return None
-
 async def get_user_by_phone(region: str, phone: str):
     """Mock get user by phone"""
     for client in mock_clients:
@@ -151,6 +146,7 @@ async def create_service_request(region: str, request_data: dict):
         **request_data,
         'created_at': datetime.now()
     })
+    application_created(region)
     
     return request_id
 
@@ -554,7 +550,7 @@ def get_manager_connection_order_router():
             costs = calculate_connection_cost(connection_type, tariff)
             
             # Get manager info using mock function
-            manager = await get_user_by_telegram_id(region, callback.from_user.id)
+            manager = await get_user_by_telegram_id(callback.from_user.id, region)
             manager_id = manager.get('id') if manager else None
             
             # Prepare request data - MIJOZ NOMIDAN yaratiladi
@@ -16,6 +16,7 @@ import logging
 import io
 import csv
 import json
+from database import get_user_by_telegram_id
 
 logger = logging.getLogger(__name__)
 
@@ -237,13 +238,6 @@ def create_pdf_content(data, export_type):
     return create_word_content(data, export_type)
 
 # Mock user functions
-async def get_user_by_telegram_id(region: str, user_id: int):
-    """Mock get user by telegram ID"""
-    for user in mock_users.values():
-        if user.get('telegram_id') == user_id:
-            return user
-    return None
-
 def get_manager_export_router():
     """Manager export router"""
     router = Router()
@@ -262,7 +256,7 @@ def get_manager_export_router():
             lang = 'uz'
             
             # Get user from mock data
-            user = await get_user_by_telegram_id(region, message.from_user.id)
+            user = await get_user_by_telegram_id(message.from_user.id, region)
             if not user:
                 await message.answer("❌ Foydalanuvchi topilmadi")
                 return
@@ -506,7 +500,7 @@ def get_manager_export_router():
                 file_content, filename = create_export_file(export_type, format_type, "manager")
                 
                 # Log export action using mock audit logger
-                user = await get_user_by_telegram_id(region, callback.from_user.id)
+                user = await get_user_by_telegram_id(callback.from_user.id, region)
                 if user:
                     await audit_logger.log_manager_action(
                         manager_id=user.get('id'),
@@ -14,6 +14,10 @@ from datetime import datetime, timedelta
 from filters.role_filter import RoleFilter
 import logging
 import json
+from database import get_user_by_telegram_id
+from utils.application_index import application_index
+from utils.application_status import set_application_status
+from utils.application_stats import application_counters
 
 logger = logging.getLogger(__name__)
 
@@ -123,27 +127,26 @@ class MockApplicationTracker:
     """Mock application tracker"""
     async def get_statistics(self):
         """Mock get statistics"""
-        return {
-            'total': len(mock_applications),
-            'completed': 1,
-            'in_progress': 1,
-            'created': 1,
-            'pending': 1,
-            'assigned': 1
-        }
+        return application_counters.summary()
 
 # Initialize mock instances
 audit_logger = MockAuditLogger()
 application_tracker = MockApplicationTracker()
 
-# Mock functions
-async def get_user_by_telegram_id(region: str, user_id: int):
-    """Mock get user by telegram ID"""
-    for user in mock_users.values():
-        if user.get('telegram_id') == user_id:
-            return user
-    return None
+# Filtrlash uchun ikkilamchi indekslar (status, priority, workflow_type, region, created_at)
+application_index.add_many(mock_applications)
+
+# Statistika hisoblagichlari (status x workflow_type x region x kun)
+for _app in mock_applications:
+    application_counters.record_created(_app)
+
+async def _load_applications_for_stats():
+    # Reconciliation asl yozuvlardan o'qiydi - indeks yoki hisoblagichlar nusxasidan emas
+    return list(mock_applications)
+
+application_counters.set_source(_load_applications_for_stats)
 
+# Mock functions
 async def get_user(region: str, user_id: int):
     """Mock get user by ID"""
     # Return mock client data
@@ -157,66 +160,35 @@ async def get_user(region: str, user_id: int):
     return mock_clients.get(user_id)
 
 async def get_filtered_applications(region: str, filters: dict):
-    """Get filtered applications from mock data"""
+    """Get filtered applications using the application index"""
     try:
-        # Extract filter parameters
-        status_filter = filters.get('status')
-        priority_filter = filters.get('priority')
-        date_from = filters.get('date_from')
-        date_to = filters.get('date_to')
-        workflow_type = filters.get('workflow_type')
-        search_term = filters.get('search_term')
+        # Hash indekslar kesishmasi + created_at oralig'i
+        applications = application_index.query(
+            status=filters.get('status'),
+            priority=filters.get('priority'),
+            workflow_type=filters.get('workflow_type'),
+            region=filters.get('region'),
+            date_from=filters.get('date_from'),
+            date_to=filters.get('date_to'),
+        )
         
-        # Start with all applications
-        applications = mock_applications.copy()
-        
-        # Apply filters
-        filtered = []
-        for app in applications:
-            # Status filter
-            if status_filter and app.get('current_status') != status_filter:
-                continue
-            
-            # Priority filter
-            if priority_filter and app.get('priority') != priority_filter:
-                continue
-            
-            # Date filter
-            if date_from or date_to:
-                created_at = app.get('created_at')
-                if isinstance(created_at, str):
-                    created_at = datetime.fromisoformat(created_at.replace('Z', '+00:00'))
-                
-                if date_from and created_at < date_from:
-                    continue
-                if date_to and created_at > date_to:
-                    continue
-            
-            # Workflow type filter
-            if workflow_type and app.get('workflow_type') != workflow_type:
-                continue
-            
-            # Search term filter
-            if search_term:
-                search_lower = search_term.lower()
-                if not any(search_lower in str(value).lower() for value in [
+        # Search term filter (faqat indeksdan o'tgan arizalar bo'yicha)
+        search_term = filters.get('search_term')
+        if search_term:
+            search_lower = search_term.lower()
+            applications = [
+                app for app in applications
+                if any(search_lower in str(value).lower() for value in [
                     app.get('id', ''),
                     app.get('description', ''),
                     app.get('location', ''),
                     app.get('contact_info', {}).get('full_name', ''),
                     app.get('contact_info', {}).get('phone', '')
-                ]):
-                    continue
-            
-            # Get client info
-            client_name = 'Unknown'
-            client_phone = 'N/A'
-            if app.get('client_id'):
-                client = await get_user(region, app['client_id'])
-                if client:
-                    client_name = client.get('full_name', 'Unknown')
-                    client_phone = client.get('phone', 'N/A')
-            
+                ])
+            ]
+        
+        filtered = []
+        for app in applications:
             # Parse contact info if exists
             contact_info = {}
             if app.get('contact_info'):
@@ -225,6 +197,15 @@ async def get_filtered_applications(region: str, filters: dict):
                 except:
                     contact_info = {}
             
+            # Get client info (faqat kontakt ma'lumoti to'liq bo'lmasa)
+            client_name = 'Unknown'
+            client_phone = 'N/A'
+            if app.get('client_id') and not (contact_info.get('full_name') and contact_info.get('phone')):
+                client = await get_user(region, app['client_id'])
+                if client:
+                    client_name = client.get('full_name', 'Unknown')
+                    client_phone = client.get('phone', 'N/A')
+            
             # Format application data
             app_data = {
                 'id': app.get('id', ''),
@@ -234,7 +215,7 @@ async def get_filtered_applications(region: str, filters: dict):
                     'full_name': contact_info.get('full_name', client_name),
                     'phone': contact_info.get('phone', client_phone)
                 },
-                'created_at': app.get('created_at', datetime.now()),
+                'created_at': app['created_at'],
                 'description': app.get('description', 'Tavsif yo\'q'),
                 'location': app.get('location', 'Manzil ko\'rsatilmagan'),
                 'priority': app.get('priority', 'normal'),
@@ -249,6 +230,14 @@ async def get_filtered_applications(region: str, filters: dict):
         logger.error(f"Error getting filtered applications: {e}")
         return []
 
+async def update_application_status(application_id: str, new_status: str) -> bool:
+    """Ariza holatini o'zgartirish (indeks va kesh set_application_status'da yangilanadi)"""
+    for app in mock_applications:
+        if app['id'] == application_id:
+            set_application_status(app, new_status)
+            return True
+    return False
+
 def get_manager_filters_router():
     """Router for filters functionality"""
     router = Router()
@@ -267,7 +256,7 @@ def get_manager_filters_router():
             region = state_data.get('region', 'toshkent')
             
             # Get user from mock data
-            user = await get_user_by_telegram_id(region, message.from_user.id)
+            user = await get_user_by_telegram_id(message.from_user.id, region)
             if not user or user['role'] not in ['manager', 'junior_manager']:
                 await message.answer("❌ Sizda ruxsat yo'q")
                 return
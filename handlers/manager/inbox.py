@@ -15,19 +15,10 @@ import asyncio
 
 # Role filter import
 from filters.role_filter import RoleFilter
+from database import get_user_by_telegram_id
 
 # === MOCKLAR ===
 
-async def get_user_by_telegram_id(telegram_id: int):
-    return {
-        "id": 1,
-        "telegram_id": telegram_id,
-        "role": "manager",
-        "language": "uz",
-        "full_name": "Test Manager",
-        "phone_number": "+998901234567",
-    }
-
 async def get_users_by_role(role: str):
     if role != "junior_manager":
         return []
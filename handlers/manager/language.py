@@ -13,6 +13,8 @@ import logging
 
 from keyboards.manager_buttons import get_manager_main_keyboard
 from states.manager_states import ManagerMainMenuStates
+from database import get_user_by_telegram_id, update_user_language
+from utils.application_stats import application_counters
 
 logger = logging.getLogger(__name__)
 
@@ -30,14 +32,6 @@ mock_users = {
 }
 
 # Mock application statistics
-mock_statistics = {
-    'total_requests': 15,
-    'created_count': 8,
-    'in_progress_count': 4,
-    'completed_count': 3,
-    'cancelled_count': 0
-}
-
 # Mock utility classes
 class MockAuditLogger:
     """Mock audit logger"""
@@ -51,32 +45,21 @@ class MockAuditLogger:
 audit_logger = MockAuditLogger()
 
 # Mock functions
-async def get_user_by_telegram_id(region: str, user_id: int):
-    """Mock get user by telegram ID"""
-    for user in mock_users.values():
-        if user.get('telegram_id') == user_id:
-            return user
-    return None
-
-async def update_user_language(region: str, user_id: int, language: str):
-    """Mock update user language"""
-    logger.info(f"Mock: Updating user {user_id} language to {language} in region {region}")
-    # Update mock user data
-    for user in mock_users.values():
-        if user.get('id') == user_id:
-            user['language'] = language
-            break
-    return True
-
 async def update_user_activity(region: str, user_id: int):
     """Mock update user activity"""
     logger.info(f"Mock: Updating user {user_id} activity in region {region}")
     return True
 
 async def get_application_statistics(region: str, user_id: int):
-    """Mock get application statistics"""
-    logger.info(f"Mock: Getting statistics for user {user_id} in region {region}")
-    return mock_statistics
+    """Overall application statistics from the precomputed counters"""
+    stats = application_counters.summary()
+    return {
+        'total_requests': stats['total'],
+        'created_count': stats.get('created', 0),
+        'in_progress_count': stats.get('in_progress', 0),
+        'completed_count': stats.get('completed', 0),
+        'cancelled_count': stats.get('cancelled', 0)
+    }
 
 def get_manager_language_router():
     """Get manager language router with mock data"""
@@ -96,7 +79,7 @@ def get_manager_language_router():
             region = state_data.get('region', 'toshkent')
             
             # Get user from mock data
-            user = await get_user_by_telegram_id(region, message.from_user.id)
+            user = await get_user_by_telegram_id(message.from_user.id, region)
             if not user or user['role'] not in ['manager', 'junior_manager']:
                 await message.answer("❌ Sizda ruxsat yo'q")
                 return
@@ -164,15 +147,15 @@ def get_manager_language_router():
             region = state_data.get('region', 'toshkent')
             
             # Get user from mock data
-            user = await get_user_by_telegram_id(region, callback.from_user.id)
+            user = await get_user_by_telegram_id(callback.from_user.id, region)
             if not user or user['role'] not in ['manager', 'junior_manager']:
                 await callback.answer("❌ Xatolik: Foydalanuvchi ma'lumotlari topilmadi.", show_alert=True)
                 return
             
             selected_lang = callback.data.split('_')[-1]
             
-            # Update user language using mock function
-            success = await update_user_language(region, user['id'], selected_lang)
+            # Update user language in database
+            success = await update_user_language(callback.from_user.id, selected_lang, region)
             
             if not success:
                 await callback.answer("❌ Tilni o'zgartirishda xatolik", show_alert=True)
@@ -237,7 +220,7 @@ def get_manager_language_router():
             region = state_data.get('region', 'toshkent')
             
             # Get user from mock data
-            user = await get_user_by_telegram_id(region, callback.from_user.id)
+            user = await get_user_by_telegram_id(callback.from_user.id, region)
             if not user or user['role'] not in ['manager', 'junior_manager']:
                 return
             
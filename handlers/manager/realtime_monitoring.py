@@ -18,6 +18,7 @@ from keyboards.manager_buttons import (
 import logging
 import json
 from typing import List, Dict, Any, Optional
+from database import get_user_by_telegram_id
 
 logger = logging.getLogger(__name__)
 
@@ -180,15 +181,6 @@ def get_status_emoji(duration_minutes: int) -> str:
         return '🔴'
 
 # Mock functions for database operations
-async def get_user_by_telegram_id(telegram_id: int) -> Dict:
-    """Mock function to find user by telegram ID"""
-    return {
-        'id': telegram_id,
-        'full_name': f'Manager {telegram_id}',
-        'language': 'uz',
-        'role': 'manager'
-    }
-
 async def get_user(region: str, user_id: int) -> Dict:
     """Mock function to get user by ID"""
     return MOCK_USERS.get(user_id, {'full_name': 'Unknown', 'role': 'unknown'})
@@ -358,7 +350,7 @@ def get_manager_realtime_monitoring_router():
             # Use hardcoded values for now
             user_region = 'toshkent'
             
-            user = await get_user_by_telegram_id(user_region, message.from_user.id)
+            user = await get_user_by_telegram_id(message.from_user.id, user_region)
             if not user or user['role'] != 'manager':
                 error_text = "Sizda ruxsat yo'q."
                 await message.answer(error_text)
@@ -13,130 +13,109 @@ from filters.role_filter import RoleFilter
 import logging
 import json
 from typing import List, Dict, Any, Optional
+from database import get_user_by_telegram_id
+from utils.staff_rollup import empty_performance, staff_rollup
+from utils.timestamps import normalize_timestamps
 
 
-async def get_user_by_telegram_id(region: str, telegram_id: int) -> Optional[dict]:
-    """
-    Mock function to get user info by telegram_id for a given region.
-    In a real implementation, this would query the database.
-    """
-    # Example mock data for demonstration
-    mock_users = [
-        {
-            "id": 201,
-            "telegram_id": 123456789,
-            "role": "manager",
-            "region": "toshkent",
-            "full_name": "Manager 1",
-            "language": "uz"
-        },
-        {
-            "id": 202,
-            "telegram_id": 987654321,
-            "role": "junior_manager",
-            "region": "toshkent",
-            "full_name": "Junior Manager 1",
-            "language": "uz"
-        },
-        {
-            "id": 203,
-            "telegram_id": 555555555,
-            "role": "technician",
-            "region": "toshkent",
-            "full_name": "Technician 1",
-            "language": "uz"
-        }
+logger = logging.getLogger(__name__)
+
+# Mock data - bazadan kelgandek ISO satrlar; yuklashda bir marta normallashtiriladi
+_now = datetime.now()
+
+mock_staff = {
+    'technician': [
+        {'id': 301, 'full_name': 'Texnik Aliyev', 'phone': '+998901110001', 'last_activity': (_now - timedelta(minutes=2)).isoformat()},
+        {'id': 302, 'full_name': 'Texnik Karimov', 'phone': '+998901110002', 'last_activity': (_now - timedelta(hours=3)).isoformat()},
+        {'id': 303, 'full_name': 'Texnik Rahimov', 'phone': '+998901110003', 'last_activity': (_now - timedelta(minutes=1)).isoformat()},
+    ],
+    'controller': [
+        {'id': 401, 'full_name': 'Nazoratchi Yusupov', 'phone': '+998901110004', 'last_activity': (_now - timedelta(minutes=4)).isoformat()},
+    ],
+    'junior_manager': [
+        {'id': 202, 'full_name': 'Junior Manager 1', 'phone': '+998901110005', 'last_activity': (_now - timedelta(days=1)).isoformat()},
+    ],
+    'call_center': [
+        {'id': 501, 'full_name': 'Operator Saidova', 'phone': '+998901110006', 'last_activity': (_now - timedelta(minutes=3)).isoformat()},
+    ],
+}
+
+def _build_mock_staff_applications() -> List[Dict[str, Any]]:
+    """Har bir xodim uchun bir necha ariza (created_at/updated_at ISO satr ko'rinishida)"""
+    statuses = ['completed', 'completed', 'in_progress', 'assigned', 'cancelled']
+    workflow_types = ['connection_request', 'technical_service', 'call_center_direct']
+    priorities = ['high', 'medium', 'low']
+    applications = []
+    staff_ids = [staff['id'] for members in mock_staff.values() for staff in members]
+    for n in range(40):
+        created = _now - timedelta(days=n % 7, hours=n)
+        applications.append({
+            'id': f'req_{n + 1:03d}',
+            'current_assignee_id': staff_ids[n % len(staff_ids)],
+            'current_status': statuses[n % len(statuses)],
+            'workflow_type': workflow_types[n % len(workflow_types)],
+            'priority': priorities[n % len(priorities)],
+            'created_at': created.isoformat(),
+            'updated_at': (created + timedelta(hours=1 + n % 5)).isoformat(),
+        })
+    return applications
+
+# Vaqt maydonlari yuklash vaqtida datetime + epoch (*_ts) ko'rinishiga keltiriladi
+mock_staff_applications = [normalize_timestamps(app) for app in _build_mock_staff_applications()]
+for _members in mock_staff.values():
+    for _staff in _members:
+        normalize_timestamps(_staff)
+
+class MockAuditLogger:
+    """Mock audit logger"""
+    async def log_manager_action(self, manager_id: int, action: str, details: dict = None):
+        """Mock log manager action"""
+        logger.info(f"Mock: Manager {manager_id} performed action: {action}")
+
+audit_logger = MockAuditLogger()
+
+async def get_manager_applications(region: str, manager_id: int = None, status_filter: str = None, limit: int = 50, offset: int = 0) -> List[Dict[str, Any]]:
+    """Mock get applications (optionally by assignee and status)"""
+    applications = [
+        app for app in mock_staff_applications
+        if (manager_id is None or app['current_assignee_id'] == manager_id)
+        and (status_filter is None or app['current_status'] == status_filter)
     ]
-    for user in mock_users:
-        if user["telegram_id"] == telegram_id and user["region"] == region:
-            return user
+    return applications[offset:offset + limit]
+
+async def get_staff_by_role(region: str, role: str) -> List[Dict[str, Any]]:
+    """Mock get staff members by role"""
+    return [dict(staff) for staff in mock_staff.get(role, [])]
+
+async def get_user(region: str, user_id: int) -> Optional[Dict[str, Any]]:
+    """Mock get user by ID"""
+    for role, members in mock_staff.items():
+        for staff in members:
+            if staff['id'] == user_id:
+                return {**staff, 'role': role}
     return None
 
-logger = logging.getLogger(__name__)
+async def _load_staff_facts(region: str) -> List[Dict[str, Any]]:
+    """Mock: rollup uchun regiondagi barcha arizalar"""
+    return mock_staff_applications
+
+staff_rollup.set_source(_load_staff_facts)
 
 # Calculate staff performance metrics
 async def calculate_staff_performance(region: str, staff_id: int, period_days: int = 7) -> Dict[str, Any]:
-    """Calculate performance metrics for a staff member"""
+    """Calculate performance metrics for a staff member (barcha xodimlar uchun keshlangan rollup'dan)"""
     try:
-        end_date = datetime.now()
-        start_date = end_date - timedelta(days=period_days)
-        
-        # Get applications assigned to this staff
-        applications = await get_manager_applications(
-            region=region,
-            manager_id=staff_id,
-            limit=100,
-            offset=0
-        )
-        
-        # Calculate metrics
-        total_tasks = len(applications)
-        completed_tasks = sum(1 for app in applications if app.get('current_status') == 'completed')
-        in_progress = sum(1 for app in applications if app.get('current_status') in ['in_progress', 'assigned'])
-        cancelled = sum(1 for app in applications if app.get('current_status') == 'cancelled')
-        
-        # Calculate completion rate
-        success_rate = round((completed_tasks / total_tasks * 100) if total_tasks > 0 else 0, 1)
-        
-        # Calculate average completion time (in hours)
-        completion_times = []
-        for app in applications:
-            if app.get('current_status') == 'completed' and app.get('created_at') and app.get('updated_at'):
-                created = app['created_at']
-                updated = app['updated_at']
-                if isinstance(created, str):
-                    created = datetime.fromisoformat(created.replace('Z', '+00:00'))
-                if isinstance(updated, str):
-                    updated = datetime.fromisoformat(updated.replace('Z', '+00:00'))
-                hours = (updated - created).total_seconds() / 3600
-                completion_times.append(hours)
-        
-        avg_completion_hours = round(sum(completion_times) / len(completion_times), 1) if completion_times else 0
-        
-        # Group by task type
-        tasks_by_type = {}
-        for app in applications:
-            task_type = app.get('workflow_type', 'other')
-            tasks_by_type[task_type] = tasks_by_type.get(task_type, 0) + 1
-        
-        # Today's metrics
-        today = datetime.now().date()
-        completed_today = sum(1 for app in applications 
-                             if app.get('current_status') == 'completed' 
-                             and app.get('updated_at')
-                             and (datetime.fromisoformat(str(app['updated_at']).replace('Z', '+00:00')).date() == today if isinstance(app['updated_at'], str) else app['updated_at'].date() == today))
-        
-        return {
-            'total_tasks': total_tasks,
-            'completed_tasks': completed_tasks,
-            'in_progress': in_progress,
-            'cancelled': cancelled,
-            'success_rate': success_rate,
-            'avg_completion_hours': avg_completion_hours,
-            'tasks_by_type': tasks_by_type,
-            'completed_today': completed_today,
-            'period_days': period_days
-        }
-        
+        return await staff_rollup.performance(region, staff_id, period_days)
     except Exception as e:
         logger.error(f"Error calculating staff performance: {e}")
-        return {
-            'total_tasks': 0,
-            'completed_tasks': 0,
-            'in_progress': 0,
-            'cancelled': 0,
-            'success_rate': 0,
-            'avg_completion_hours': 0,
-            'tasks_by_type': {},
-            'completed_today': 0,
-            'period_days': period_days
-        }
+        return empty_performance(period_days)
 
 # Get online staff members
 async def get_online_staff(region: str) -> List[Dict[str, Any]]:
     """Get currently online staff members"""
     try:
         online_staff = []
+        now_ts = datetime.now().timestamp()
         
         # Get all staff by roles
         for role in ['technician', 'controller', 'junior_manager', 'call_center']:
@@ -144,12 +123,8 @@ async def get_online_staff(region: str) -> List[Dict[str, Any]]:
             
             for staff in staff_members:
                 # Check if online (last activity within 5 minutes)
-                if staff.get('last_activity'):
-                    last_activity = staff['last_activity']
-                    if isinstance(last_activity, str):
-                        last_activity = datetime.fromisoformat(last_activity.replace('Z', '+00:00'))
-                    
-                    if (datetime.now() - last_activity).total_seconds() < 300:  # 5 minutes
+                if staff.get('last_activity_ts'):
+                    if now_ts - staff['last_activity_ts'] < 300:  # 5 minutes
                         staff['is_online'] = True
                         staff['role_display'] = get_role_display(role)
                         online_staff.append(staff)
@@ -177,31 +152,8 @@ def get_role_display(role: str) -> str:
 async def calculate_workload_distribution(region: str) -> Dict[str, Any]:
     """Calculate workload distribution across staff"""
     try:
-        workload = {}
-        
-        # Get all active applications
-        all_applications = await get_manager_applications(
-            region=region,
-            status_filter='in_progress',
-            limit=200,
-            offset=0
-        )
-        
-        # Group by assignee
-        for app in all_applications:
-            assignee_id = app.get('current_assignee_id')
-            if assignee_id:
-                if assignee_id not in workload:
-                    workload[assignee_id] = {
-                        'total': 0,
-                        'high_priority': 0,
-                        'medium_priority': 0,
-                        'low_priority': 0
-                    }
-                
-                workload[assignee_id]['total'] += 1
-                priority = app.get('priority', 'medium')
-                workload[assignee_id][f'{priority}_priority'] += 1
+        # in_progress arizalar xodim x prioritet bo'yicha rollup'da hisoblangan
+        workload = await staff_rollup.workload(region)
         
         # Get staff info for each assignee
         result = []
@@ -247,7 +199,7 @@ def get_manager_staff_activity_router():
             region = state_data.get('region', 'toshkent')
             
             # Get manager info
-            manager = await get_user_by_telegram_id(region, message.from_user.id)
+            manager = await get_user_by_telegram_id(message.from_user.id, region)
             if not manager:
                 await message.answer("❌ Manager topilmadi")
                 return
@@ -480,12 +432,8 @@ def get_manager_staff_activity_router():
                     }
                     
                     # Check if online
-                    if staff.get('last_activity'):
-                        last_activity = staff['last_activity']
-                        if isinstance(last_activity, str):
-                            last_activity = datetime.fromisoformat(last_activity.replace('Z', '+00:00'))
-                        
-                        if (datetime.now() - last_activity).total_seconds() < 300:  # 5 minutes
+                    if staff.get('last_activity_ts'):
+                        if datetime.now().timestamp() - staff['last_activity_ts'] < 300:  # 5 minutes
                             staff_detail['is_online'] = True
                     
                     staff_list.append(staff_detail)
@@ -23,6 +23,7 @@ from keyboards.manager_buttons import (
 )
 from states.manager_states import ManagerStatusStates
 from filters.role_filter import RoleFilter
+from utils.application_status import set_application_status
 
 logger = logging.getLogger(__name__)
 
@@ -150,10 +151,12 @@ async def update_application_status_with_history(request_id: int, new_status: st
     # Find and update application
     for app in MOCK_APPLICATIONS:
         if app['id'] == request_id:
-            app['current_status'] = new_status
-            app['updated_at'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            app['updated_by'] = updated_by
-            app['comments'] = comments
+            set_application_status(
+                app, new_status,
+                updated_at=datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                updated_by=updated_by,
+                comments=comments
+            )
             return True
     return False
 
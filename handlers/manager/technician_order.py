@@ -25,6 +25,8 @@ from keyboards.controllers_buttons import (
     controller_geolocation_keyboard,
 )
 from states.manager_states import ManagerClientSearchStates, ManagerServiceOrderStates
+from database import get_user_by_telegram_id
+from utils.application_status import application_created
 
 # Mock data instead of database imports
 logger = logging.getLogger(__name__)
@@ -115,22 +117,13 @@ async def search_client_by_abonent_id(abonent_id: str, region: str = 'toshkent')
         logger.error(f"Error getting user by abonent ID: {e}")
         return []
 
-async def get_user_by_telegram_id(region: str, telegram_id: int):
-    """Mock manager user data"""
-    return {
-        'id': 999,
-        'full_name': 'Manager User',
-        'telegram_id': telegram_id,
-        'role': 'manager',
-        'region': region
-    }
-
 # Mock service request functions
 async def create_service_request(region: str, request_data: dict):
     """Create mock service request"""
     global mock_request_counter
     mock_request_counter += 1
     logger.info(f"Mock service request created: {mock_request_counter}")
+    application_created(region)
     return mock_request_counter
 
 # Mock audit logger
@@ -475,7 +468,7 @@ def get_manager_technical_service_router():
             costs = calculate_technical_service_cost(abonent_type, problem_type)
             
             # Get manager info
-            manager = await get_user_by_telegram_id(region, callback.from_user.id)
+            manager = await get_user_by_telegram_id(callback.from_user.id, region)
             manager_id = manager.get('id') if manager else None
             
             # Prepare request data - MIJOZ NOMIDAN yaratiladi
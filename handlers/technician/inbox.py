@@ -25,23 +25,9 @@ from typing import Dict, Any, List, Optional
 from datetime import datetime, timedelta
 from filters.role_filter import RoleFilter
 from states.technician_states import TechnicianStates
+from database import get_user_by_telegram_id, get_user_lang
 
 # Mock functions to replace utils and database imports
-async def get_user_by_telegram_id(telegram_id: int):
-    """Mock user data"""
-    return {
-        'id': 1,
-        'telegram_id': telegram_id,
-        'role': 'technician',
-        'language': 'uz',
-        'full_name': 'Test Technician',
-        'phone_number': '+998901234567'
-    }
-
-async def get_user_lang(telegram_id: int):
-    """Mock get user language"""
-    return 'uz'
-
 async def get_technician_applications(user_id: int):
     """Mock get technician applications"""
     now = datetime.now()
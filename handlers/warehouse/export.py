@@ -1,5 +1,5 @@
 from aiogram import F, Router
-from aiogram.types import Message, CallbackQuery, BufferedInputFile, InlineKeyboardMarkup, InlineKeyboardButton
+from aiogram.types import Message, CallbackQuery, InlineKeyboardMarkup, InlineKeyboardButton
 from aiogram.fsm.context import FSMContext
 from datetime import datetime
 from keyboards.warehouse_buttons import (
@@ -9,7 +9,8 @@ from keyboards.warehouse_buttons import (
     get_warehouse_export_back_types_keyboard
 )
 from states.warehouse_states import WarehouseExportStates, WarehouseMainMenuStates
-from utils.export_utils import create_export_file, get_available_export_types, get_available_export_formats
+from utils.export_utils import get_available_export_types, get_available_export_formats
+from utils.export_service import create_export_file_async
 from filters.role_filter import RoleFilter
 
 def get_warehouse_export_router():
@@ -179,7 +180,8 @@ def get_warehouse_export_router():
                 )
                 
                 # Create export file
-                file_content, filename = create_export_file(export_type, format_type, "warehouse")
+                export_file = await create_export_file_async(export_type, format_type, "warehouse")
+                filename = export_file.filename
                 
                 # Update progress
                 await processing_msg.edit_text(
@@ -188,19 +190,14 @@ def get_warehouse_export_router():
                 )
                 
                 # Get file size
-                file_content.seek(0, 2)  # Move to end
-                file_size = file_content.tell()
-                file_content.seek(0)  # Reset to beginning
+                file_size = export_file.size
                 
                 # Delete processing message
                 await processing_msg.delete()
                 
                 # Send only the file with all information in caption
                 await callback.message.answer_document(
-                    BufferedInputFile(
-                        file_content.read(),
-                        filename=filename
-                    ),
+                    export_file.as_input_file(),
                     caption=f"✅ {export_type_names.get(export_type, export_type)} export muvaffaqiyatli yakunlandi!\n\n"
                             f"📄 Fayl nomi: {filename}\n"
                             f"📦 Fayl hajmi: {file_size:,} bayt\n"
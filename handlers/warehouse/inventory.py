@@ -6,6 +6,7 @@ from keyboards.warehouse_buttons import warehouse_inventory_menu, inventory_acti
 from states.warehouse_states import WarehouseInventoryStates, WarehouseMainMenuStates
 from aiogram.utils.keyboard import InlineKeyboardBuilder
 from filters.role_filter import RoleFilter
+from utils.export_cache import bump_data_version
 
 # Paginatsiya uchun yordamchi funksiya
 def build_pagination_keyboard(page: int, total_pages: int, lang: str) -> InlineKeyboardMarkup:
@@ -858,6 +859,7 @@ async def add_new_inventory_item(item_data: dict):
     """Add new inventory item (mock function like other modules)"""
     try:
         # Mock add (like other modules)
+        bump_data_version('warehouse')
         return 1  # Return new item ID
     except Exception as e:
         return None
@@ -866,6 +868,7 @@ async def update_inventory_item_data(item_id: int, update_data: dict):
     """Update inventory item data (mock function like other modules)"""
     try:
         # Mock update (like other modules)
+        bump_data_version('warehouse')
         return True
     except Exception as e:
         return False
@@ -432,11 +432,3 @@ async def update_warehouse_user_language(user_id: int, language: str):
         return True
     except Exception as e:
         return False
-
-async def get_user_lang(user_id: int):
-    """Get user language (mock function like other modules)"""
-    try:
-        # Mock language (like other modules)
-        return 'uz'
-    except Exception as e:
-        return 'uz'
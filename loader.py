@@ -12,33 +12,18 @@ import sys
 import logging
 from dotenv import load_dotenv
 from aiogram import Bot, Dispatcher
-from aiogram.fsm.storage.memory import MemoryStorage
 from aiogram.types import Message, CallbackQuery
 from aiogram.fsm.context import FSMContext
 
-# Logger sozlash - batafsil
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(),  # Terminal uchun
-        logging.FileHandler('testbot_errors.log', encoding='utf-8'),  # Xatoliklar uchun
-        logging.FileHandler('testbot_activity.log', encoding='utf-8')  # Faollik uchun
-    ]
-)
-logger = logging.getLogger(__name__)
-
-# Qo'shimcha logger'lar
-activity_logger = logging.getLogger('activity')
-activity_logger.setLevel(logging.INFO)
-activity_handler = logging.FileHandler('testbot_activity.log', encoding='utf-8')
-activity_formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
-activity_handler.setFormatter(activity_formatter)
-activity_logger.addHandler(activity_handler)
+from utils.logger import setup_logging
 
 # Load environment variables
 load_dotenv()
 
+# Logger sozlash - navbat orqali, bitta fon thread yozadi (terminal + fayllar)
+setup_logging()
+logger = logging.getLogger(__name__)
+
 # Bot configuration
 BOT_TOKEN = os.getenv('BOT_TOKEN')
 ADMIN_IDS = [int(id.strip()) for id in os.getenv('ADMIN_IDS', '').split(',') if id.strip()]
@@ -52,15 +37,50 @@ DB_USER = os.getenv('DB_USER', 'postgres')
 DB_PASSWORD = os.getenv('DB_PASSWORD', '')
 DB_NAME = os.getenv('DB_NAME', 'alfaconnect_db')
 
-# Role IDs
-MANAGER_ID = int(os.getenv('MANAGER_ID', 0)) if os.getenv('MANAGER_ID') else None
-CLIENT_ID = int(os.getenv('CLIENT_ID', 0)) if os.getenv('CLIENT_ID') else None
-JUNIOR_MANAGER_ID = int(os.getenv('JUNIOR_MANAGER_ID', 0)) if os.getenv('JUNIOR_MANAGER_ID') else None
-CONTROLLER_ID = int(os.getenv('CONTROLLER_ID', 0)) if os.getenv('CONTROLLER_ID') else None
-TECHNICIAN_ID = int(os.getenv('TECHNICIAN_ID', 0)) if os.getenv('TECHNICIAN_ID') else None
-WAREHOUSE_ID = int(os.getenv('WAREHOUSE_ID', 0)) if os.getenv('WAREHOUSE_ID') else None
-CALL_CENTER_SUPERVISOR_ID = int(os.getenv('CALL_CENTER_SUPERVISOR_ID', 0)) if os.getenv('CALL_CENTER_SUPERVISOR_ID') else None
-CALL_CENTER_ID = int(os.getenv('CALL_CENTER_ID', 0)) if os.getenv('CALL_CENTER_ID') else None
+# FSM storage configuration: memory | sqlite | redis
+FSM_STORAGE = os.getenv('FSM_STORAGE', 'memory')
+FSM_STORAGE_PATH = os.getenv('FSM_STORAGE_PATH', 'fsm_storage.sqlite3')
+FSM_REDIS_URL = os.getenv('FSM_REDIS_URL', 'redis://localhost:6379/0')
+FSM_STATE_TTL = int(os.getenv('FSM_STATE_TTL', 24 * 60 * 60))
+FSM_CACHE_SIZE = int(os.getenv('FSM_CACHE_SIZE', 0))  # 0 - jarayonlar o'rtasida xavfsiz
+FSM_FLUSH_INTERVAL = float(os.getenv('FSM_FLUSH_INTERVAL', 1.0))
+
+# Runtime mode: polling | webhook
+BOT_MODE = os.getenv('BOT_MODE', 'polling').lower()
+WEBHOOK_URL = os.getenv('WEBHOOK_URL', '')
+WEBHOOK_PATH = os.getenv('WEBHOOK_PATH', '/webhook')
+WEBHOOK_SECRET = os.getenv('WEBHOOK_SECRET') or None
+WEBHOOK_HOST = os.getenv('WEBHOOK_HOST', '0.0.0.0')
+WEBHOOK_PORT = int(os.getenv('WEBHOOK_PORT', 8080))
+WEBHOOK_MAX_CONCURRENCY = int(os.getenv('WEBHOOK_MAX_CONCURRENCY', 50))
+WEBHOOK_QUEUE_SIZE = int(os.getenv('WEBHOOK_QUEUE_SIZE', 1000))
+WEBHOOK_DRAIN_TIMEOUT = float(os.getenv('WEBHOOK_DRAIN_TIMEOUT', 30))
+
+# Role IDs - each role accepts a comma-separated list in <ROLE>_ID or <ROLE>_IDS
+def _parse_role_ids(name: str) -> list:
+    """Parse user IDs for a role from <name>_ID and <name>_IDS env variables"""
+    raw = f"{os.getenv(f'{name}_ID', '')},{os.getenv(f'{name}_IDS', '')}"
+    return [int(id.strip()) for id in raw.split(',') if id.strip()]
+
+ROLE_USER_IDS = {
+    'manager': _parse_role_ids('MANAGER'),
+    'client': _parse_role_ids('CLIENT'),
+    'junior_manager': _parse_role_ids('JUNIOR_MANAGER'),
+    'controller': _parse_role_ids('CONTROLLER'),
+    'technician': _parse_role_ids('TECHNICIAN'),
+    'warehouse': _parse_role_ids('WAREHOUSE'),
+    'call_center_supervisor': _parse_role_ids('CALL_CENTER_SUPERVISOR'),
+    'call_center': _parse_role_ids('CALL_CENTER'),
+}
+
+MANAGER_ID = ROLE_USER_IDS['manager'][0] if ROLE_USER_IDS['manager'] else None
+CLIENT_ID = ROLE_USER_IDS['client'][0] if ROLE_USER_IDS['client'] else None
+JUNIOR_MANAGER_ID = ROLE_USER_IDS['junior_manager'][0] if ROLE_USER_IDS['junior_manager'] else None
+CONTROLLER_ID = ROLE_USER_IDS['controller'][0] if ROLE_USER_IDS['controller'] else None
+TECHNICIAN_ID = ROLE_USER_IDS['technician'][0] if ROLE_USER_IDS['technician'] else None
+WAREHOUSE_ID = ROLE_USER_IDS['warehouse'][0] if ROLE_USER_IDS['warehouse'] else None
+CALL_CENTER_SUPERVISOR_ID = ROLE_USER_IDS['call_center_supervisor'][0] if ROLE_USER_IDS['call_center_supervisor'] else None
+CALL_CENTER_ID = ROLE_USER_IDS['call_center'][0] if ROLE_USER_IDS['call_center'] else None
 
 # Initialize bot and dispatcher
 # Use a default token if not provided (for testing)
@@ -73,41 +93,91 @@ except Exception as e:
     print(f"Warning: Could not initialize bot: {e}")
     bot = None
 
-storage = MemoryStorage()
+from utils.fsm_storage import create_storage
+
+storage = create_storage(
+    FSM_STORAGE,
+    path=FSM_STORAGE_PATH,
+    redis_url=FSM_REDIS_URL,
+    state_ttl=FSM_STATE_TTL,
+    cache_size=FSM_CACHE_SIZE,
+    flush_interval=FSM_FLUSH_INTERVAL,
+)
 dp = Dispatcher(storage=storage)
 
+# Bot to'xtaganda yozilmagan FSM holatlarini saqlash
+dp.shutdown.register(storage.close)
+
+# Export worker'larini oldindan ishga tushirish va to'xtatish
+from utils.export_service import warm_up_export_service, shutdown_export_service
+
+dp.startup.register(warm_up_export_service)
+dp.shutdown.register(shutdown_export_service)
+
 # Middleware'larni qo'shish
 from middlewares.logger_middleware import LoggerMiddleware
 from middlewares.error_middleware import ErrorMiddleware
+from middlewares.metrics_middleware import MetricsMiddleware, ApiMetricsMiddleware
+from middlewares.identity_map_middleware import IdentityMapMiddleware
+
+# Har bir update uchun yangi identity map (bir qator - bitta so'rov)
+dp.update.outer_middleware(IdentityMapMiddleware())
 
 dp.message.middleware(LoggerMiddleware())
 dp.callback_query.middleware(LoggerMiddleware())
 dp.message.middleware(ErrorMiddleware())
 dp.callback_query.middleware(ErrorMiddleware())
+dp.message.middleware(MetricsMiddleware())
+dp.callback_query.middleware(MetricsMiddleware())
+
+# Telegram API chaqiruvlari latency'si
+if bot is not None:
+    bot.session.middleware(ApiMetricsMiddleware())
 
-# Role mapping
+from utils.metrics import start_metrics_exporter, stop_metrics_exporter
+
+dp.startup.register(start_metrics_exporter)
+dp.shutdown.register(stop_metrics_exporter)
+
+# Ariza statistikasi hisoblagichlarini davriy tekshirish (reconciliation)
+from utils.application_stats import start_stats_reconciliation, stop_stats_reconciliation
+
+dp.startup.register(start_stats_reconciliation)
+dp.shutdown.register(stop_stats_reconciliation)
+
+# Yangi ariza digestlari - outbox yopilishidan oldin flush qilinadi
+from utils.notification_digest import stop_new_order_digest
+
+dp.shutdown.register(stop_new_order_digest)
+
+# Bildirishnomalar navbati (rate-limited fan-out)
+from utils.notification_outbox import start_notification_outbox, stop_notification_outbox
+
+dp.startup.register(start_notification_outbox)
+dp.shutdown.register(stop_notification_outbox)
+
+# Supervisor e'lonlari - ommaviy yuborish ishlari
+from utils.broadcast import stop_broadcast_engine
+
+dp.shutdown.register(stop_broadcast_engine)
+
+# Ma'lumotlar bazasi pool'larini yopish
+from database import close_db_pools
+
+dp.shutdown.register(close_db_pools)
+
+# Role mapping (reverse index: user ID -> role). Admins take precedence.
 ROLE_MAPPING = {
-    MANAGER_ID: 'manager',
-    CLIENT_ID: 'client',
-    JUNIOR_MANAGER_ID: 'junior_manager',
-    CONTROLLER_ID: 'controller',
-    TECHNICIAN_ID: 'technician',
-    WAREHOUSE_ID: 'warehouse',
-    CALL_CENTER_SUPERVISOR_ID: 'call_center_supervisor',
-    CALL_CENTER_ID: 'call_center'
+    user_id: role_name
+    for role_name, user_ids in ROLE_USER_IDS.items()
+    for user_id in user_ids
 }
+ROLE_MAPPING.update({admin_id: 'admin' for admin_id in ADMIN_IDS})
 
 def get_user_role(user_id: int) -> str:
     """Get user role based on user ID"""
-    if user_id in ADMIN_IDS:
-        return 'admin'
-    
-    for role_id, role_name in ROLE_MAPPING.items():
-        if role_id and user_id == role_id:
-            return role_name
-    
     # Default role for testing
-    return 'client'
+    return ROLE_MAPPING.get(user_id, 'client')
 
 # Global bot instance for use in handlers
 def get_bot():
@@ -123,10 +193,15 @@ async def setup_bot():
         from handlers import setup_handlers
         setup_handlers(dp)
         
+        # Background expiry for the role cache
+        from utils.role_system import start_role_cache_expiry, stop_role_cache_expiry
+        dp.startup.register(start_role_cache_expiry)
+        dp.shutdown.register(stop_role_cache_expiry)
+        
         print("✅ Bot setup completed successfully")
         print(f"🤖 Bot ID: {BOT_ID}")
         print(f"👥 Admin IDs: {ADMIN_IDS}")
-        print(f"📋 Role mapping: {ROLE_MAPPING}")
+        print(f"📋 Role mapping: { {role: len(ids) for role, ids in ROLE_USER_IDS.items()} }")
         
     except ImportError as e:
         logger.error(f"Import Error in setup_bot: {e}", exc_info=True)
@@ -151,12 +226,34 @@ async def setup_bot():
         traceback.print_exc()
         raise
 
+async def start_webhook():
+    """Start the bot in webhook mode"""
+    from utils.webhook import WebhookRuntime
+
+    if not WEBHOOK_URL:
+        raise ValueError("WEBHOOK_URL is required when BOT_MODE=webhook")
+
+    print("🚀 Starting bot (webhook)...")
+    runtime = WebhookRuntime(
+        dp,
+        bot,
+        path=WEBHOOK_PATH,
+        secret_token=WEBHOOK_SECRET,
+        max_concurrency=WEBHOOK_MAX_CONCURRENCY,
+        queue_size=WEBHOOK_QUEUE_SIZE,
+        drain_timeout=WEBHOOK_DRAIN_TIMEOUT,
+    )
+    await runtime.run(WEBHOOK_URL, host=WEBHOOK_HOST, port=WEBHOOK_PORT)
+
 async def start_bot():
     """Start the bot"""
     try:
         await setup_bot()
-        print("🚀 Starting bot...")
-        await dp.start_polling(bot)
+        if BOT_MODE == 'webhook':
+            await start_webhook()
+        else:
+            print("🚀 Starting bot (polling)...")
+            await dp.start_polling(bot)
     except ImportError as e:
         logger.error(f"Import Error in start_bot: {e}", exc_info=True)
         print(f"❌ Import Error in start_bot: {e}")
@@ -8,32 +8,16 @@ import asyncio
 import traceback
 import sys
 import logging
-from loader import start_bot
+from loader import start_bot, BOT_MODE
 
-# Logger sozlash - batafsil
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(),  # Terminal uchun
-        logging.FileHandler('testbot_errors.log', encoding='utf-8'),  # Xatoliklar uchun
-        logging.FileHandler('testbot_activity.log', encoding='utf-8')  # Faollik uchun
-    ]
-)
+# Logger loader.py da sozlanadi (setup_logging)
 logger = logging.getLogger(__name__)
 
-# Qo'shimcha logger'lar
-activity_logger = logging.getLogger('activity')
-activity_logger.setLevel(logging.INFO)
-activity_handler = logging.FileHandler('testbot_activity.log', encoding='utf-8')
-activity_formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
-activity_handler.setFormatter(activity_formatter)
-activity_logger.addHandler(activity_handler)
-
 if __name__ == "__main__":
     print("🚀 Starting Alfa Connect Bot...")
     print("📋 Loading configuration...")
     print("🔧 Setting up handlers...")
+    print(f"📡 Update mode: {BOT_MODE} (BOT_MODE=polling|webhook)")
     
     try:
         asyncio.run(start_bot())
@@ -6,5 +6,8 @@ Bu modul testbot uchun middleware'larni o'z ichiga oladi.
 
 from .logger_middleware import LoggerMiddleware
 from .error_middleware import ErrorMiddleware
+from .role_middleware import RoleMiddleware
+from .metrics_middleware import MetricsMiddleware, ApiMetricsMiddleware
+from .identity_map_middleware import IdentityMapMiddleware
 
-__all__ = ['LoggerMiddleware', 'ErrorMiddleware'] 
\ No newline at end of file
+__all__ = ['LoggerMiddleware', 'ErrorMiddleware', 'RoleMiddleware', 'MetricsMiddleware', 'ApiMetricsMiddleware', 'IdentityMapMiddleware'] 
\ No newline at end of file
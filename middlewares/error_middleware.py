@@ -2,7 +2,6 @@ from aiogram import BaseMiddleware
 from aiogram.types import Message, CallbackQuery
 from typing import Callable, Dict, Any, Union
 import logging
-import traceback
 
 logger = logging.getLogger(__name__)
 
@@ -17,19 +16,9 @@ class ErrorMiddleware(BaseMiddleware):
             return await handler(event, data)
         except Exception as e:
             user = event.from_user
-            error_msg = f"[{user.id}] {user.full_name} - Error in handler: {str(e)}"
             
-            # Terminalga chiqarish
-            print(f"❌ {error_msg}")
-            print(f"📁 Error type: {type(e).__name__}")
-            print(f"🔍 Error location: {e.__traceback__.tb_frame.f_code.co_filename}")
-            print(f"📄 Line number: {e.__traceback__.tb_lineno}")
-            print(f"📋 Full traceback:")
-            traceback.print_exc()
-            
-            # Logger orqali yozish
-            logger.error(error_msg, exc_info=True)
-            logger.error(f"[{user.id}] Full traceback: {traceback.format_exc()}")
+            # Logger orqali yozish (to'liq traceback faqat shu yerda, bir marta)
+            logger.error("[%s] %s - Error in handler: %s", user.id, user.full_name, e, exc_info=True)
             
             # Foydalanuvchiga xabar yuborish
             try:
@@ -38,6 +27,6 @@ class ErrorMiddleware(BaseMiddleware):
                 elif isinstance(event, CallbackQuery):
                     await event.answer("❌ Xatolik yuz berdi", show_alert=True)
             except Exception as callback_error:
-                logger.error(f"[{user.id}] Error sending error message: {callback_error}")
+                logger.error("[%s] Error sending error message: %s", user.id, callback_error)
             
-            raise 
\ No newline at end of file
+            raise
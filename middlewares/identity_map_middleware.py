@@ -0,0 +1,23 @@
+from aiogram import BaseMiddleware
+from aiogram.types import TelegramObject
+from typing import Callable, Dict, Any
+
+from database.identity_map import identity_scope
+from database.users import telegram_profile_scope
+
+class IdentityMapMiddleware(BaseMiddleware):
+    """
+    Open a fresh identity map for every update, so each user or application
+    row is loaded from the database at most once per update. The sender's
+    Telegram profile is kept for the update too, so a first-time user is
+    registered under their real name.
+    """
+
+    async def __call__(
+        self,
+        handler: Callable,
+        event: TelegramObject,
+        data: Dict[str, Any]
+    ) -> Any:
+        with identity_scope(), telegram_profile_scope(data.get('event_from_user')):
+            return await handler(event, data)
@@ -0,0 +1,66 @@
+from aiogram import BaseMiddleware
+from aiogram.client.session.middlewares.base import BaseRequestMiddleware, NextRequestMiddlewareType
+from aiogram.methods import TelegramMethod
+from aiogram.types import TelegramObject
+from typing import Callable, Dict, Any
+import time
+
+from utils.metrics import metrics
+
+class MetricsMiddleware(BaseMiddleware):
+    """
+    Record latency, in-flight count and errors per handler and per handler
+    module (router). Registered as an inner middleware, so the matched
+    handler is already known.
+    """
+
+    async def __call__(
+        self,
+        handler: Callable,
+        event: TelegramObject,
+        data: Dict[str, Any]
+    ) -> Any:
+        handler_object = data.get('handler')
+        callback = getattr(handler_object, 'callback', None)
+        router_key = getattr(callback, '__module__', None) or 'unknown'
+        handler_key = f"{router_key}.{getattr(callback, '__name__', 'unknown')}"
+        
+        handler_window = metrics.handler_window(handler_key)
+        router_window = metrics.router_window(router_key)
+        handler_window.in_flight += 1
+        router_window.in_flight += 1
+        started = time.perf_counter()
+        error = False
+        try:
+            return await handler(event, data)
+        except Exception:
+            error = True
+            raise
+        finally:
+            elapsed = time.perf_counter() - started
+            handler_window.in_flight -= 1
+            router_window.in_flight -= 1
+            handler_window.observe(elapsed, error)
+            router_window.observe(elapsed, error)
+
+class ApiMetricsMiddleware(BaseRequestMiddleware):
+    """Record Telegram Bot API call latency per method"""
+
+    async def __call__(
+        self,
+        make_request: NextRequestMiddlewareType,
+        bot: Any,
+        method: TelegramMethod,
+    ) -> Any:
+        window = metrics.api_window(type(method).__name__)
+        window.in_flight += 1
+        started = time.perf_counter()
+        error = False
+        try:
+            return await make_request(bot, method)
+        except Exception:
+            error = True
+            raise
+        finally:
+            window.in_flight -= 1
+            window.observe(time.perf_counter() - started, error)
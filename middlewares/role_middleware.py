@@ -0,0 +1,26 @@
+from aiogram import BaseMiddleware
+from aiogram.types import TelegramObject
+from typing import Callable, Dict, Any
+
+class RoleMiddleware(BaseMiddleware):
+    """
+    Resolve the user's role once per update and store it in handler data as
+    `user_role`. RoleGateRouter and RoleFilter read it instead of repeating
+    the lookup in every router.
+    """
+
+    def __init__(self):
+        # Imported here: utils.role_system imports loader, which imports this package
+        from utils.role_system import resolve_user_role
+        self._resolve_user_role = resolve_user_role
+
+    async def __call__(
+        self,
+        handler: Callable,
+        event: TelegramObject,
+        data: Dict[str, Any]
+    ) -> Any:
+        user = data.get('event_from_user')
+        if user is not None:
+            data['user_role'] = self._resolve_user_role(user.id)
+        return await handler(event, data)
@@ -76,4 +76,5 @@ class CallCenterSupervisorNotificationStates(StatesGroup):
     sending_announcement = State()
     team_message = State()
     individual_message = State()
-    urgent_alert = State() 
\ No newline at end of file
+    urgent_alert = State()
+    confirming_broadcast = State()
\ No newline at end of file
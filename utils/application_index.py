@@ -0,0 +1,201 @@
+"""
+Application Index - Secondary Indexes for Filtering
+
+Bu modul arizalarni filtrlash uchun xotiradagi ikkilamchi indekslarni saqlaydi.
+Har bir filtr bosilganda butun ro'yxatni ko'chirib, chiziqli ko'rib chiqish
+o'rniga natija indekslar kesishmasi orqali hisoblanadi.
+
+- Hash indekslar: current_status, priority, workflow_type, region -> {id}
+- created_at bo'yicha saralangan indeks (bisect) - sana oralig'i so'rovlari
+- created_at faqat qo'shilganda bir marta parse qilinadi (datetime + created_ts epoch)
+- Status o'zgarganda indekslar darhol yangilanadi (utils.application_status)
+"""
+
+import bisect
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from utils.timestamps import to_datetime
+
+INDEXED_FIELDS = ('current_status', 'priority', 'workflow_type', 'region')
+
+
+class ApplicationIndex:
+    """Arizalar uchun hash + saralangan created_at indekslari"""
+
+    def __init__(self, applications: Optional[Iterable[Dict[str, Any]]] = None):
+        self._records: Dict[Any, Dict[str, Any]] = {}
+        self._hash: Dict[str, Dict[Any, Set[Any]]] = {field: {} for field in INDEXED_FIELDS}
+        # (timestamp, seq) bo'yicha saralangan; seq - id'lar turidan qat'i nazar taqqoslash uchun
+        self._created: List[Tuple[float, int]] = []
+        self._keys: Dict[Any, Tuple[float, int]] = {}
+        self._ids: Dict[int, Any] = {}
+        self._seq = 0
+
+        if applications:
+            self.add_many(applications)
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __contains__(self, app_id: Any) -> bool:
+        return app_id in self._records
+
+    def get(self, app_id: Any) -> Optional[Dict[str, Any]]:
+        return self._records.get(app_id)
+
+    # --- Yozish ---
+
+    def _index_field(self, field: str, value: Any, app_id: Any) -> None:
+        self._hash[field].setdefault(value, set()).add(app_id)
+
+    def _unindex_field(self, field: str, value: Any, app_id: Any) -> None:
+        bucket = self._hash[field].get(value)
+        if bucket is not None:
+            bucket.discard(app_id)
+            if not bucket:
+                del self._hash[field][value]
+
+    def _insert(self, app: Dict[str, Any]) -> Tuple[Dict[str, Any], Tuple[float, int]]:
+        app_id = app['id']
+        if app_id in self._records:
+            self.remove(app_id)
+
+        record = dict(app)
+        record['created_at'] = to_datetime(record.get('created_at')) or datetime.now()
+        record['created_ts'] = record['created_at'].timestamp()
+        self._records[app_id] = record
+
+        for field in INDEXED_FIELDS:
+            self._index_field(field, record.get(field), app_id)
+
+        self._seq += 1
+        key = (record['created_ts'], self._seq)
+        self._keys[app_id] = key
+        self._ids[self._seq] = app_id
+        return record, key
+
+    def add(self, app: Dict[str, Any]) -> Dict[str, Any]:
+        """Arizani qo'shish yoki almashtirish; normallashtirilgan yozuvni qaytaradi"""
+        record, key = self._insert(app)
+        bisect.insort(self._created, key)
+        return record
+
+    def add_many(self, applications: Iterable[Dict[str, Any]]) -> None:
+        """Ko'p arizani birdaniga yuklash - saralash oxirida bir marta"""
+        batch = {app['id']: app for app in applications}
+        # Eski yozuvlar saralangan ro'yxat hali buzilmasdan olib tashlanadi
+        for app_id in batch:
+            self.remove(app_id)
+        for app in batch.values():
+            _, key = self._insert(app)
+            self._created.append(key)
+        self._created.sort()
+
+    def remove(self, app_id: Any) -> bool:
+        record = self._records.pop(app_id, None)
+        if record is None:
+            return False
+
+        for field in INDEXED_FIELDS:
+            self._unindex_field(field, record.get(field), app_id)
+
+        key = self._keys.pop(app_id)
+        position = bisect.bisect_left(self._created, key)
+        del self._created[position]
+        del self._ids[key[1]]
+        return True
+
+    def update(self, app_id: Any, **fields: Any) -> bool:
+        """Indekslangan yoki oddiy maydonlarni yangilash"""
+        record = self._records.get(app_id)
+        if record is None:
+            return False
+
+        if 'created_at' in fields:
+            self.add({**record, **fields})
+            return True
+
+        for field, value in fields.items():
+            if field in self._hash and record.get(field) != value:
+                self._unindex_field(field, record.get(field), app_id)
+                self._index_field(field, value, app_id)
+            record[field] = value
+        return True
+
+    def update_status(self, app_id: Any, new_status: str) -> bool:
+        """Ariza holati o'zgarganda chaqiriladi"""
+        return self.update(app_id, current_status=new_status)
+
+    # --- O'qish ---
+
+    def counts(self, field: str) -> Dict[Any, int]:
+        """Maydon qiymatlari bo'yicha arizalar soni"""
+        return {value: len(ids) for value, ids in self._hash[field].items()}
+
+    def _date_slice(self, date_from: Optional[datetime], date_to: Optional[datetime]) -> Tuple[int, int]:
+        start, end = 0, len(self._created)
+        if date_from is not None:
+            start = bisect.bisect_left(self._created, (to_datetime(date_from).timestamp(), -1))
+        if date_to is not None:
+            end = bisect.bisect_right(self._created, (to_datetime(date_to).timestamp(), self._seq + 1))
+        return start, end
+
+    def query(
+        self,
+        status: Optional[str] = None,
+        priority: Optional[str] = None,
+        workflow_type: Optional[str] = None,
+        region: Optional[str] = None,
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None,
+        newest_first: bool = True,
+    ) -> List[Dict[str, Any]]:
+        """Filtrlarga mos arizalar (created_at bo'yicha saralangan)"""
+        criteria = {
+            'current_status': status,
+            'priority': priority,
+            'workflow_type': workflow_type,
+            'region': region,
+        }
+        buckets = []
+        for field, value in criteria.items():
+            if value is None:
+                continue
+            bucket = self._hash[field].get(value)
+            if not bucket:
+                return []
+            buckets.append(bucket)
+
+        start, end = self._date_slice(date_from, date_to)
+        if start >= end:
+            return []
+
+        if buckets:
+            # Eng kichik to'plamdan boshlab kesishma
+            buckets.sort(key=len)
+            candidates = set(buckets[0])
+            for bucket in buckets[1:]:
+                candidates &= bucket
+                if not candidates:
+                    return []
+
+            if len(candidates) < end - start:
+                keys = sorted(self._keys[app_id] for app_id in candidates)
+                if start > 0 or end < len(self._created):
+                    low, high = self._created[start], self._created[end - 1]
+                    keys = [key for key in keys if low <= key <= high]
+            else:
+                keys = [key for key in self._created[start:end] if self._ids[key[1]] in candidates]
+        else:
+            keys = self._created[start:end]
+
+        ids = [self._ids[seq] for _, seq in keys]
+        if newest_first:
+            ids.reverse()
+        return [self._records[app_id] for app_id in ids]
+
+
+# Arizalar filtri uchun umumiy indeks; ma'lumot manbai (manager/filters) yuklaydi,
+# status o'zgarishlari utils.application_status orqali keladi
+application_index = ApplicationIndex()
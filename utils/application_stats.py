@@ -0,0 +1,206 @@
+"""
+Application Stats - Incrementally Maintained Counters
+
+Bu modul arizalar statistikasini har safar arizalarni ko'rib chiqmasdan,
+oldindan hisoblangan hisoblagichlardan o'qish uchun xizmat qiladi.
+
+- Kalit: status x workflow_type x region x kun (created_at sanasi)
+- Har bir o'zgarish barcha 16 ta "wildcard" kombinatsiyaga yoziladi, shuning
+  uchun istalgan kesim (masalan, faqat status yoki status + region) O(1) o'qiladi
+- Yangilash sinxron (await yo'q) - event loop ichida bo'linmas, ya'ni
+  tranzaksion: o'quvchi hech qachon yarim yangilangan holatni ko'rmaydi
+- Davriy reconciliation: manba ma'lumotlardan qayta hisoblab, farqni
+  (drift) log qiladi va tuzatadi
+"""
+
+import asyncio
+import logging
+import os
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from itertools import product
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+ANY = '*'
+
+# Ekranlarda ko'rsatiladigan status guruhlari
+STATUS_GROUPS = {
+    'new': ('created', 'new'),
+    'active': ('assigned', 'in_progress', 'pending'),
+    'completed': ('completed',),
+    'cancelled': ('cancelled',),
+}
+
+DEFAULT_RECONCILE_INTERVAL = float(os.getenv('STATS_RECONCILE_INTERVAL', 300))
+
+CellKey = Tuple[str, str, str, str]
+
+
+def _day(value: Any) -> str:
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    if isinstance(value, datetime):
+        value = value.date()
+    return (value or date.today()).isoformat()
+
+
+class ApplicationCounters:
+    """status x workflow_type x region x kun bo'yicha hisoblagichlar"""
+
+    def __init__(self):
+        self._counts: Dict[CellKey, int] = defaultdict(int)
+        # app_id -> (status, workflow_type, region, kun) - oxirgi ma'lum holat
+        self._applications: Dict[Any, CellKey] = {}
+        self._statuses: set = set()
+        self._source: Optional[Callable[[], Awaitable[Iterable[Dict[str, Any]]]]] = None
+        self.stats = {'reconciliations': 0, 'drift_corrections': 0}
+
+    def __len__(self) -> int:
+        return len(self._applications)
+
+    # --- Yozish ---
+
+    def _apply(self, cell: CellKey, delta: int) -> None:
+        # Har bir o'lchov yoki aniq qiymat, yoki '*' - jami 16 ta yacheyka
+        for key in product(*((value, ANY) for value in cell)):
+            self._counts[key] += delta
+            if not self._counts[key]:
+                del self._counts[key]
+
+    @staticmethod
+    def _cell(app: Dict[str, Any]) -> CellKey:
+        return (
+            app.get('current_status') or 'unknown',
+            app.get('workflow_type') or 'unknown',
+            app.get('region') or 'unknown',
+            _day(app.get('created_at')),
+        )
+
+    def record_created(self, app: Dict[str, Any]) -> None:
+        """Yangi ariza (yoki qayta yuklangan ariza) - eski holati bo'lsa almashtiriladi"""
+        self.remove(app['id'])
+        cell = self._cell(app)
+        self._statuses.add(cell[0])
+        self._applications[app['id']] = cell
+        self._apply(cell, 1)
+
+    def record_transition(self, app_id: Any, new_status: str) -> bool:
+        """Status o'zgarishi: eski yacheykadan ayirib, yangisiga qo'shish"""
+        cell = self._applications.get(app_id)
+        if cell is None:
+            return False
+        if cell[0] == new_status:
+            return True
+        new_cell = (new_status,) + cell[1:]
+        self._statuses.add(new_status)
+        self._apply(cell, -1)
+        self._apply(new_cell, 1)
+        self._applications[app_id] = new_cell
+        return True
+
+    def remove(self, app_id: Any) -> bool:
+        cell = self._applications.pop(app_id, None)
+        if cell is None:
+            return False
+        self._apply(cell, -1)
+        return True
+
+    # --- O'qish ---
+
+    def count(
+        self,
+        status: Optional[str] = None,
+        workflow_type: Optional[str] = None,
+        region: Optional[str] = None,
+        day: Any = None,
+    ) -> int:
+        """Bitta kesim bo'yicha son (None - barcha qiymatlar)"""
+        key = (
+            status or ANY,
+            workflow_type or ANY,
+            region or ANY,
+            _day(day) if day is not None else ANY,
+        )
+        return self._counts.get(key, 0)
+
+    def count_days(self, days: int, **filters: Any) -> int:
+        """Oxirgi `days` kun (bugun ham kiradi) bo'yicha son"""
+        today = date.today()
+        return sum(self.count(day=today - timedelta(days=offset), **filters) for offset in range(days))
+
+    def by_status(self, **filters: Any) -> Dict[str, int]:
+        """Har bir status bo'yicha son"""
+        result = {status: self.count(status=status, **filters) for status in self._statuses}
+        return {status: value for status, value in result.items() if value}
+
+    def summary(self, region: Optional[str] = None, day: Any = None) -> Dict[str, Any]:
+        """Statistika ekranlari uchun tayyor ko'rsatkichlar"""
+        filters = {'region': region, 'day': day}
+        result = {'total': self.count(**filters), **self.by_status(**filters)}
+        for group, statuses in STATUS_GROUPS.items():
+            result[group] = sum(self.count(status=status, **filters) for status in statuses)
+        result['today'] = self.count(region=region, day=date.today())
+        result['this_week'] = self.count_days(7, region=region)
+        result['completion_rate'] = round(result['completed'] / result['total'] * 100) if result['total'] else 0
+        return result
+
+    # --- Reconciliation ---
+
+    def set_source(self, source: Callable[[], Awaitable[Iterable[Dict[str, Any]]]]) -> None:
+        """Reconciliation uchun haqiqiy ma'lumotlar manbai"""
+        self._source = source
+
+    def reconcile(self, applications: Iterable[Dict[str, Any]]) -> Dict[CellKey, int]:
+        """Manba ma'lumotlardan qayta hisoblash; farq qilgan yacheykalarni qaytaradi"""
+        fresh = ApplicationCounters()
+        for app in applications:
+            fresh.record_created(app)
+
+        drift = {
+            key: fresh._counts.get(key, 0) - self._counts.get(key, 0)
+            for key in set(fresh._counts) | set(self._counts)
+            if fresh._counts.get(key, 0) != self._counts.get(key, 0)
+        }
+        self._counts = fresh._counts
+        self._applications = fresh._applications
+        self._statuses |= fresh._statuses
+        self.stats['reconciliations'] += 1
+        if drift:
+            self.stats['drift_corrections'] += 1
+            logger.warning(f"Application stats drift corrected: {len(drift)} cells")
+        return drift
+
+    async def reconcile_from_source(self) -> Dict[CellKey, int]:
+        if self._source is None:
+            return {}
+        return self.reconcile(await self._source())
+
+
+application_counters = ApplicationCounters()
+
+_reconcile_task: Optional[asyncio.Task] = None
+
+
+async def _reconcile_loop(interval: float) -> None:
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await application_counters.reconcile_from_source()
+        except Exception as e:
+            logger.error(f"Application stats reconciliation error: {e}")
+
+
+async def start_stats_reconciliation(interval: float = DEFAULT_RECONCILE_INTERVAL) -> None:
+    """Hisoblagichlarni davriy ravishda manba bilan solishtirish"""
+    global _reconcile_task
+    if _reconcile_task is None or _reconcile_task.done():
+        _reconcile_task = asyncio.create_task(_reconcile_loop(interval))
+
+
+async def stop_stats_reconciliation() -> None:
+    global _reconcile_task
+    if _reconcile_task is not None:
+        _reconcile_task.cancel()
+        _reconcile_task = None
@@ -0,0 +1,53 @@
+"""
+Application Status - Single Status-change Entry Point
+
+Ariza holatini o'zgartiradigan barcha joylar (manager, kichik menejer,
+controller) yozuvni shu funksiya orqali yangilaydi. Shunda holatdan
+hosil bo'ladigan ma'lumotlar har bir o'zgarishda birga yangilanadi:
+
+- Filtr indeksi (application_index) - status bo'yicha hash indeks
+- Statistika hisoblagichlari (application_counters) - eski yacheykadan yangisiga
+- Ariza tafsilotlari keshi (application_cache)
+- Xodimlar faoliyati rollup'i (staff_rollup) - keyingi o'qishda qayta hisoblanadi
+
+Yangi ariza yaratilganda application_created(region, ariza) chaqiriladi -
+ariza yozuvi berilsa, u indeksga qo'shiladi va id bo'yicha topiladi.
+
+Indeksga yoki hisoblagichlarga yuklanmagan ariza o'tkazib yuboriladi.
+"""
+
+import logging
+from typing import Any, Dict, Optional
+
+from database import application_cache
+from utils.application_index import application_index
+from utils.application_stats import application_counters
+from utils.staff_rollup import staff_rollup
+
+logger = logging.getLogger(__name__)
+
+
+def set_application_status(app: Dict[str, Any], new_status: str, **fields: Any) -> Dict[str, Any]:
+    """Ariza yozuvida holatni (va qo'shimcha maydonlarni) o'zgartirish; yangilangan yozuvni qaytaradi"""
+    app_id = app['id']
+    old_status = app.get('current_status')
+    app.update(fields)
+    app['current_status'] = new_status
+
+    if app_id in application_index:
+        application_index.update(app_id, current_status=new_status, **fields)
+    application_counters.record_transition(app_id, new_status)
+    application_cache.invalidate(app_id)
+    # Yozuvdagi region nomi rollup kalitiga (region kodi) mos kelmasligi mumkin - hammasi tozalanadi
+    staff_rollup.invalidate()
+
+    if old_status != new_status:
+        logger.info(f"Application {app_id} status: {old_status} -> {new_status}")
+    return app
+
+
+def application_created(region: Optional[str] = None, app: Optional[Dict[str, Any]] = None) -> None:
+    """Yangi ariza yaratildi - indeksga qo'shish va region (kodi) bo'yicha rollup'ni eskirgan deb belgilash"""
+    if app is not None:
+        application_index.add(app)
+    staff_rollup.invalidate(region)
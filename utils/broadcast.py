@@ -0,0 +1,315 @@
+"""
+Broadcast - Prioritized Fan-out Jobs
+
+Bu modul supervisor e'lonlari, jamoa xabarlari va shoshilinch
+ogohlantirishlarni ko'p qabul qiluvchilarga yuboradi.
+
+- Ustuvorlik yo'laklari: URGENT ishlar NORMAL ishlardan oldin - har bir
+  yuborishdan oldin navbatdagi qabul qiluvchi eng yuqori yo'lakdan olinadi,
+  shuning uchun shoshilinch ogohlantirish katta e'lonni kutmaydi
+- Asl xabar copy_message bilan nusxalanadi - media qayta yuklanmaydi
+- Parallel yuborish umumiy Telegram limiti ichida (telegram_rate_limiter)
+- Progress xabari jonli yangilanadi: yuborildi / xato / qoldi
+- Ishni to'xtatib turish (pause), davom ettirish va bekor qilish mumkin
+"""
+
+import asyncio
+import itertools
+import logging
+import os
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Iterable, List, Optional
+
+from aiogram.exceptions import TelegramBadRequest, TelegramForbiddenError, TelegramRetryAfter
+from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup
+
+from utils.notification_outbox import TokenBucket, telegram_rate_limiter
+
+logger = logging.getLogger(__name__)
+
+URGENT = 0
+NORMAL = 1
+LANE_NAMES = {URGENT: '🚨 Shoshilinch', NORMAL: '📢 Oddiy'}
+
+DEFAULT_CONCURRENCY = int(os.getenv('BROADCAST_CONCURRENCY', 8))
+PROGRESS_INTERVAL = 2.0  # sekund - progress xabari shundan tez-tez tahrirlanmaydi
+MAX_ATTEMPTS = 3
+KEEP_FINISHED = 50  # Xotirada saqlanadigan tugagan ishlar
+
+STATUS_NAMES = {
+    'queued': '⏳ Navbatda',
+    'running': '📤 Yuborilmoqda',
+    'paused': '⏸ To\'xtatilgan',
+    'cancelled': '❌ Bekor qilindi',
+    'done': '✅ Yakunlandi',
+}
+
+
+class BroadcastJob:
+    """Bitta xabarni ko'p chatga nusxalash ishi"""
+
+    def __init__(
+        self,
+        job_id: int,
+        bot: Any,
+        from_chat_id: int,
+        message_id: int,
+        recipients: Iterable[int],
+        priority: int = NORMAL,
+        title: str = '',
+        progress_chat_id: Optional[int] = None,
+    ):
+        self.id = job_id
+        self.bot = bot
+        self.from_chat_id = from_chat_id
+        self.message_id = message_id
+        self.recipients: Deque[int] = deque(dict.fromkeys(recipients))
+        self.total = len(self.recipients)
+        self.priority = priority
+        self.title = title
+        self.progress_chat_id = progress_chat_id
+        self.progress_message_id: Optional[int] = None
+        self.status = 'queued'
+        self.sent = 0
+        self.failed = 0
+        self.in_flight = 0
+        self.created_at = time.monotonic()
+        self.finished_at: Optional[float] = None
+        self._progress_at = 0.0
+        self._progress_text = ''
+        self._progress_lock = asyncio.Lock()
+
+    @property
+    def remaining(self) -> int:
+        return len(self.recipients) + self.in_flight
+
+    @property
+    def active(self) -> bool:
+        return self.status in ('queued', 'running')
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ('cancelled', 'done')
+
+    def render(self) -> str:
+        done = self.sent + self.failed
+        percent = round(done / self.total * 100) if self.total else 100
+        filled = percent // 10
+        return (
+            f"{LANE_NAMES.get(self.priority, '')} <b>{self.title or 'Xabar yuborish'}</b> #{self.id}\n\n"
+            f"{STATUS_NAMES.get(self.status, self.status)}\n"
+            f"{'▓' * filled}{'░' * (10 - filled)} {percent}%\n\n"
+            f"✅ Yuborildi: {self.sent}\n"
+            f"❌ Xato: {self.failed}\n"
+            f"⏳ Qoldi: {self.remaining}\n"
+            f"👥 Jami: {self.total}"
+        )
+
+    def controls(self) -> Optional[InlineKeyboardMarkup]:
+        if self.finished:
+            return None
+        toggle = (
+            InlineKeyboardButton(text="▶️ Davom ettirish", callback_data=f"broadcast_resume_{self.id}")
+            if self.status == 'paused' else
+            InlineKeyboardButton(text="⏸ To'xtatish", callback_data=f"broadcast_pause_{self.id}")
+        )
+        return InlineKeyboardMarkup(inline_keyboard=[[
+            toggle,
+            InlineKeyboardButton(text="❌ Bekor qilish", callback_data=f"broadcast_cancel_{self.id}"),
+        ]])
+
+
+class BroadcastEngine:
+    """Ustuvorlik yo'laklari bilan ommaviy yuborish"""
+
+    def __init__(self, concurrency: int = DEFAULT_CONCURRENCY, bucket: Optional[TokenBucket] = None):
+        self.concurrency = concurrency
+        self._bucket = bucket or telegram_rate_limiter
+        self._jobs: Dict[int, BroadcastJob] = {}
+        self._ids = itertools.count(1)
+        self._wakeup: Optional[asyncio.Event] = None
+        self._workers: List[asyncio.Task] = []
+
+    # --- Ishlar ---
+
+    async def submit(
+        self,
+        bot: Any,
+        from_chat_id: int,
+        message_id: int,
+        recipients: Iterable[int],
+        priority: int = NORMAL,
+        title: str = '',
+        progress_chat_id: Optional[int] = None,
+    ) -> BroadcastJob:
+        """Yangi ish; progress_chat_id berilsa progress xabari yuboriladi va yangilanib turadi"""
+        job = BroadcastJob(next(self._ids), bot, from_chat_id, message_id, recipients, priority, title, progress_chat_id)
+        self._jobs[job.id] = job
+        self._prune()
+        if progress_chat_id is not None:
+            try:
+                progress = await bot.send_message(
+                    progress_chat_id, job.render(), parse_mode='HTML', reply_markup=job.controls()
+                )
+                job.progress_message_id = getattr(progress, 'message_id', None)
+            except Exception as e:
+                logger.warning(f"Broadcast #{job.id}: progress message failed: {e}")
+        if not job.total:
+            self._finish(job, 'done')
+        self._ensure_workers()
+        self._wakeup.set()
+        return job
+
+    def get(self, job_id: int) -> Optional[BroadcastJob]:
+        return self._jobs.get(job_id)
+
+    def jobs(self) -> List[BroadcastJob]:
+        return sorted(self._jobs.values(), key=lambda job: (job.finished, job.priority, job.created_at))
+
+    def pause(self, job_id: int) -> bool:
+        job = self._jobs.get(job_id)
+        if job is None or not job.active:
+            return False
+        job.status = 'paused'
+        self._schedule_progress(job, force=True)
+        return True
+
+    def resume(self, job_id: int) -> bool:
+        job = self._jobs.get(job_id)
+        if job is None or job.status != 'paused':
+            return False
+        if not job.recipients and not job.in_flight:
+            # To'xtatilgan paytda oxirgi yuborishlar tugagan - navbatda hech kim yo'q
+            self._finish(job, 'done')
+            return True
+        job.status = 'running'
+        self._schedule_progress(job, force=True)
+        self._wakeup.set()
+        return True
+
+    def cancel(self, job_id: int) -> bool:
+        job = self._jobs.get(job_id)
+        if job is None or job.finished:
+            return False
+        job.recipients.clear()
+        self._finish(job, 'cancelled')
+        return True
+
+    def _finish(self, job: BroadcastJob, status: str) -> None:
+        job.status = status
+        job.finished_at = time.monotonic()
+        logger.info(f"Broadcast #{job.id} {status}: sent={job.sent}, failed={job.failed}, total={job.total}")
+        self._schedule_progress(job, force=True)
+
+    def _prune(self) -> None:
+        finished = [job for job in self._jobs.values() if job.finished]
+        for job in sorted(finished, key=lambda job: job.finished_at)[:-KEEP_FINISHED or None]:
+            del self._jobs[job.id]
+
+    # --- Rejalashtirish ---
+
+    def _next(self) -> Optional[BroadcastJob]:
+        """Eng yuqori yo'lakdagi, eng eski faol ish (navbatda qabul qiluvchisi bor)"""
+        candidates = [job for job in self._jobs.values() if job.active and job.recipients]
+        if not candidates:
+            return None
+        return min(candidates, key=lambda job: (job.priority, job.created_at))
+
+    def _ensure_workers(self) -> None:
+        if self._wakeup is None:
+            self._wakeup = asyncio.Event()
+        self._workers = [task for task in self._workers if not task.done()]
+        while len(self._workers) < self.concurrency:
+            self._workers.append(asyncio.create_task(self._worker()))
+
+    async def _worker(self) -> None:
+        while True:
+            job = self._next()
+            if job is None:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+
+            await self._bucket.acquire()
+            # Kutish paytida ish to'xtatilgan yoki kuchliroq ish kelgan bo'lishi mumkin
+            job = self._next()
+            if job is None:
+                continue
+            chat_id = job.recipients.popleft()
+            job.status = 'running'
+            job.in_flight += 1
+            try:
+                delivered = await self._copy(job, chat_id)
+            finally:
+                job.in_flight -= 1
+            if delivered:
+                job.sent += 1
+            else:
+                job.failed += 1
+
+            # To'xtatilgan ishning oxirgi yuborishi ham ishni yakunlaydi
+            if not job.finished and not job.recipients and not job.in_flight:
+                self._finish(job, 'done')
+            else:
+                # Bekor qilingan ishning oxirgi javobi - yakuniy sonlar ko'rinsin
+                self._schedule_progress(job, force=job.finished and not job.in_flight)
+
+    async def _copy(self, job: BroadcastJob, chat_id: int) -> bool:
+        for attempt in range(1, MAX_ATTEMPTS + 1):
+            try:
+                await job.bot.copy_message(chat_id=chat_id, from_chat_id=job.from_chat_id, message_id=job.message_id)
+                return True
+            except TelegramRetryAfter as e:
+                await asyncio.sleep(e.retry_after)
+            except (TelegramForbiddenError, TelegramBadRequest) as e:
+                logger.info(f"Broadcast #{job.id}: {chat_id} rejected: {e}")
+                return False
+            except Exception as e:
+                logger.warning(f"Broadcast #{job.id}: {chat_id} attempt {attempt} failed: {e}")
+                await asyncio.sleep(attempt)
+        return False
+
+    # --- Progress ---
+
+    def _schedule_progress(self, job: BroadcastJob, force: bool = False) -> None:
+        if job.progress_message_id is None:
+            return
+        now = time.monotonic()
+        if not force and now - job._progress_at < PROGRESS_INTERVAL:
+            return
+        job._progress_at = now
+        asyncio.create_task(self._update_progress(job))
+
+    async def _update_progress(self, job: BroadcastJob) -> None:
+        # Tahrirlar ketma-ket - oxirgi holat eski holat bilan ustma-ust yozilmaydi
+        async with job._progress_lock:
+            text = job.render()
+            if text == job._progress_text:
+                return
+            job._progress_text = text
+            try:
+                await job.bot.edit_message_text(
+                    text=text,
+                    chat_id=job.progress_chat_id,
+                    message_id=job.progress_message_id,
+                    parse_mode='HTML',
+                    reply_markup=job.controls(),
+                )
+            except TelegramBadRequest:
+                # "message is not modified" yoki xabar o'chirilgan
+                pass
+            except Exception as e:
+                logger.warning(f"Broadcast #{job.id}: progress update failed: {e}")
+
+    async def close(self) -> None:
+        for task in self._workers:
+            task.cancel()
+        self._workers = []
+
+
+broadcast_engine = BroadcastEngine()
+
+
+async def stop_broadcast_engine() -> None:
+    await broadcast_engine.close()
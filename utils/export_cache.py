@@ -0,0 +1,218 @@
+"""
+Export Cache - LRU/TTL Implementation
+
+Bu modul tayyor export fayllarini keshlaydi. Bir xil (rol, export turi, format)
+so'rovi bir necha daqiqa ichida qayta kelsa, fayl qayta yaratilmasdan keshdan
+beriladi.
+
+- Kalit: rol + export turi + format + ma'lumotlar versiyasi (sha256)
+- Hajm bo'yicha cheklangan LRU va TTL
+- Ixtiyoriy diskka saqlash (EXPORT_CACHE_DIR) - bot qayta ishga tushganda ham ishlaydi
+- Ma'lumot o'zgarganda bump_data_version() chaqiriladi va eski natijalar ishlatilmaydi
+- Diskka saqlashda versiyalar ham shu papkada (data_versions.json) - restart'dan
+  keyin eski versiya kaliti bilan oldingi fayl qaytmaydi
+"""
+
+import hashlib
+import json
+import logging
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL = int(os.getenv('EXPORT_CACHE_TTL', 300))  # 5 daqiqa
+DEFAULT_MAX_BYTES = int(os.getenv('EXPORT_CACHE_MAX_BYTES', 64 * 1024 * 1024))
+DEFAULT_CACHE_DIR = os.getenv('EXPORT_CACHE_DIR') or None
+
+# Rol bo'yicha ma'lumotlar versiyasi; '*' - barcha rollar uchun umumiy versiya
+_data_versions: Dict[str, int] = {'*': 0}
+_versions_mtime: Optional[float] = None
+
+
+def _versions_path() -> Optional[str]:
+    return os.path.join(DEFAULT_CACHE_DIR, 'data_versions.json') if DEFAULT_CACHE_DIR else None
+
+
+def _load_versions() -> None:
+    """Disk keshi bilan birga saqlangan versiyalarni o'qish (fayl o'zgargan bo'lsa)"""
+    global _versions_mtime
+    path = _versions_path()
+    if path is None:
+        return
+    try:
+        mtime = os.path.getmtime(path)
+        if mtime == _versions_mtime:
+            return
+        with open(path, 'r', encoding='utf-8') as f:
+            stored = json.load(f)
+        _data_versions.update({key: int(value) for key, value in stored.items()})
+        _versions_mtime = mtime
+    except FileNotFoundError:
+        return
+    except (OSError, ValueError, AttributeError) as e:
+        logger.warning(f"Export data versions read failed: {e}")
+
+
+def _save_versions() -> None:
+    global _versions_mtime
+    path = _versions_path()
+    if path is None:
+        return
+    try:
+        os.makedirs(DEFAULT_CACHE_DIR, exist_ok=True)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(_data_versions, f)
+        os.replace(tmp_path, path)
+        _versions_mtime = os.path.getmtime(path)
+    except OSError as e:
+        logger.warning(f"Export data versions write failed: {e}")
+
+
+def bump_data_version(role: Optional[str] = None) -> None:
+    """Ma'lumot o'zgarganda chaqiriladi - tegishli export keshini eskirtiradi"""
+    _load_versions()
+    key = role or '*'
+    _data_versions[key] = _data_versions.get(key, 0) + 1
+    _save_versions()
+
+
+def get_data_version(role: str) -> str:
+    """Rol uchun joriy ma'lumotlar versiyasi"""
+    _load_versions()
+    return f"{_data_versions['*']}.{_data_versions.get(role, 0)}"
+
+
+def make_cache_key(role: str, export_type: str, format_type: str, data_version: str) -> str:
+    """Kesh kaliti (content-addressed)"""
+    raw = f"{role}|{export_type}|{format_type}|{data_version}"
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+
+class ExportCache:
+    """Hajm bo'yicha cheklangan LRU + TTL export keshi"""
+
+    def __init__(
+        self,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        ttl: int = DEFAULT_TTL,
+        cache_dir: Optional[str] = DEFAULT_CACHE_DIR,
+    ):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.cache_dir = cache_dir
+
+        # key -> (content, filename, created_at)
+        self._entries: "OrderedDict[str, Tuple[bytes, str, float]]" = OrderedDict()
+        self._size = 0
+
+        self.stats = {'hits': 0, 'misses': 0, 'disk_hits': 0, 'evictions': 0, 'expired': 0}
+
+        if self.cache_dir:
+            os.makedirs(self.cache_dir, exist_ok=True)
+
+    # --- Xotira ---
+
+    def _evict(self) -> None:
+        while self._size > self.max_bytes and self._entries:
+            _, (content, _, _) = self._entries.popitem(last=False)
+            self._size -= len(content)
+            self.stats['evictions'] += 1
+
+    def _store(self, key: str, content: bytes, filename: str, created_at: float) -> None:
+        if len(content) > self.max_bytes:
+            return
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._size -= len(old[0])
+        self._entries[key] = (content, filename, created_at)
+        self._size += len(content)
+        self._evict()
+
+    # --- Disk ---
+
+    def _disk_paths(self, key: str) -> Tuple[str, str]:
+        return os.path.join(self.cache_dir, f"{key}.bin"), os.path.join(self.cache_dir, f"{key}.json")
+
+    def _disk_get(self, key: str) -> Optional[Tuple[bytes, str, float]]:
+        data_path, meta_path = self._disk_paths(key)
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            if time.time() - meta['created_at'] > self.ttl:
+                self._disk_delete(key)
+                return None
+            with open(data_path, 'rb') as f:
+                return f.read(), meta['filename'], meta['created_at']
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def _disk_put(self, key: str, content: bytes, filename: str, created_at: float) -> None:
+        data_path, meta_path = self._disk_paths(key)
+        try:
+            tmp_path = data_path + '.tmp'
+            with open(tmp_path, 'wb') as f:
+                f.write(content)
+            os.replace(tmp_path, data_path)
+            with open(meta_path, 'w', encoding='utf-8') as f:
+                json.dump({'filename': filename, 'created_at': created_at}, f)
+        except OSError as e:
+            logger.warning(f"Export cache disk write failed: {e}")
+
+    def _disk_delete(self, key: str) -> None:
+        for path in self._disk_paths(key):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    # --- Ochiq API ---
+
+    def get(self, key: str) -> Optional[Tuple[bytes, str]]:
+        """Keshdan olish; topilmasa yoki eskirgan bo'lsa None"""
+        entry = self._entries.get(key)
+        if entry is not None:
+            if time.time() - entry[2] > self.ttl:
+                self._entries.pop(key, None)
+                self._size -= len(entry[0])
+                self.stats['expired'] += 1
+                if self.cache_dir:
+                    self._disk_delete(key)
+            else:
+                self._entries.move_to_end(key)
+                self.stats['hits'] += 1
+                return entry[0], entry[1]
+
+        if self.cache_dir:
+            entry = self._disk_get(key)
+            if entry is not None:
+                self._store(key, *entry)
+                self.stats['hits'] += 1
+                self.stats['disk_hits'] += 1
+                return entry[0], entry[1]
+
+        self.stats['misses'] += 1
+        return None
+
+    def put(self, key: str, content: bytes, filename: str) -> None:
+        """Natijani keshga yozish"""
+        created_at = time.time()
+        self._store(key, content, filename, created_at)
+        if self.cache_dir:
+            self._disk_put(key, content, filename, created_at)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._size = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        total = self.stats['hits'] + self.stats['misses']
+        return {
+            **self.stats,
+            'entries': len(self._entries),
+            'size_bytes': self._size,
+            'hit_rate': round(self.stats['hits'] / total * 100, 2) if total else 0.0,
+        }
@@ -0,0 +1,298 @@
+"""
+Export Service - Async Process Pool Implementation
+
+Bu modul export fayllarini (Excel, Word, PDF, CSV) event loop'ni bloklamasdan
+alohida jarayonlarda yaratadi. create_export_file sinxron va og'ir (openpyxl,
+python-docx, reportlab), shuning uchun handler'lar uni to'g'ridan-to'g'ri
+chaqirmasdan create_export_file_async orqali ishlatadi.
+
+- Cheklangan ProcessPoolExecutor (worker'lar oldindan "isitiladi")
+- Har bir format uchun alohida parallel ishlash limiti
+- Timeout: muddati o'tgan ish bekor qilinadi, osilib qolgan jarayonlar to'xtatiladi;
+  pool qayta yaratilganda shu pool'dagi boshqa (aybsiz) exportlar yangi pool'ga
+  qayta yuboriladi
+- Worker'lar fork emas, forkserver/spawn bilan yaratiladi (EXPORT_MP_CONTEXT):
+  fork logging'ning QueueListener thread'ini nusxalamaydi va worker loglari yo'qoladi
+- Worker faylni vaqtinchalik papkaga yozib, faqat yo'lini qaytaradi - baytlar
+  jarayonlar o'rtasida pickle qilinmaydi; handler faylni diskdan (FSInputFile)
+  yuboradi, ExportFile yo'qolganda fayl o'chiriladi
+- Kichik natijalar (EXPORT_CACHE_ITEM_MAX_BYTES gacha) ExportCache orqali
+  keshlanadi (utils/export_cache.py); kattalari xotiraga o'qilmaydi
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import shutil
+import tempfile
+import time
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Optional, Tuple
+
+from aiogram.types import BufferedInputFile, FSInputFile, InputFile
+
+from utils.export_cache import ExportCache, get_data_version, make_cache_key
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_WORKERS = int(os.getenv('EXPORT_MAX_WORKERS', min(4, os.cpu_count() or 1)))
+DEFAULT_TIMEOUT = float(os.getenv('EXPORT_TIMEOUT', 120))
+DEFAULT_MP_CONTEXT = os.getenv(
+    'EXPORT_MP_CONTEXT',
+    'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+)
+EXPORT_TMP_DIR = os.getenv('EXPORT_TMP_DIR') or os.path.join(tempfile.gettempdir(), 'alfa_exports')
+CACHE_ITEM_MAX_BYTES = int(os.getenv('EXPORT_CACHE_ITEM_MAX_BYTES', 2 * 1024 * 1024))
+TMP_FILE_MAX_AGE = 3600  # Yuborilmay qolgan (masalan, qulash sabab) vaqtinchalik fayllar muddati
+MAX_RESUBMITS = 1  # Boshqa export sabab pool qayta yaratilsa, necha marta qayta yuboriladi
+
+# Bir vaqtda nechta export har bir formatda bajarilishi mumkin
+DEFAULT_FORMAT_LIMITS = {
+    'csv': 4,
+    'xlsx': 2,
+    'docx': 2,
+    'pdf': 2,
+}
+
+
+class ExportTimeoutError(Exception):
+    """Export belgilangan vaqt ichida tugamadi"""
+
+
+def _init_worker() -> None:
+    """Worker jarayonida og'ir kutubxonalarni oldindan import qilish"""
+    import utils.export_utils  # noqa: F401
+
+
+def _warmup() -> int:
+    return os.getpid()
+
+
+def _render_export(export_type: str, format_type: str, role: str) -> Tuple[str, str, int]:
+    """Worker jarayonida export faylini yaratish va diskka yozish: (yo'l, fayl nomi, hajm)"""
+    from utils.export_utils import create_export_file
+
+    file_content, filename = create_export_file(export_type, format_type, role)
+    try:
+        file_content.seek(0)
+        os.makedirs(EXPORT_TMP_DIR, exist_ok=True)
+        fd, path = tempfile.mkstemp(suffix=os.path.splitext(filename)[1], dir=EXPORT_TMP_DIR)
+        with os.fdopen(fd, 'wb') as out:
+            shutil.copyfileobj(file_content, out)
+        return path, filename, os.path.getsize(path)
+    finally:
+        file_content.close()
+
+
+def _remove_file(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def _cancelled_by_pool(future: asyncio.Future) -> bool:
+    """Ish pool tomonidan bekor qilingan, handler task'ining o'zi bekor qilinmagan"""
+    task = asyncio.current_task()
+    return future.cancelled() and (task is None or task.cancelling() == 0)
+
+
+class ExportFile:
+    """Tayyor export: diskdagi vaqtinchalik fayl yoki keshdan olingan baytlar"""
+
+    __slots__ = ('filename', 'size', 'path', 'content', '_finalizer', '__weakref__')
+
+    def __init__(self, filename: str, size: int, path: Optional[str] = None, content: Optional[bytes] = None):
+        self.filename = filename
+        self.size = size
+        self.path = path
+        self.content = content
+        # Obyekt yo'qolganda (handler tugaganda) vaqtinchalik fayl o'chiriladi
+        self._finalizer = weakref.finalize(self, _remove_file, path) if path else None
+
+    def as_input_file(self) -> InputFile:
+        """answer_document uchun: disk fayli oqim bilan, kesh baytlari to'g'ridan-to'g'ri"""
+        if self.path is not None:
+            return FSInputFile(self.path, filename=self.filename)
+        return BufferedInputFile(self.content, filename=self.filename)
+
+    def read_bytes(self) -> bytes:
+        if self.content is not None:
+            return self.content
+        with open(self.path, 'rb') as f:
+            return f.read()
+
+    def cleanup(self) -> None:
+        if self._finalizer is not None:
+            self._finalizer()
+
+
+class ExportService:
+    """create_export_file ni process pool'da bajaruvchi async servis"""
+
+    def __init__(
+        self,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        timeout: float = DEFAULT_TIMEOUT,
+        format_limits: Optional[Dict[str, int]] = None,
+        cache: Optional[ExportCache] = None,
+        mp_context: str = DEFAULT_MP_CONTEXT,
+        cache_item_max_bytes: int = CACHE_ITEM_MAX_BYTES,
+    ):
+        self.max_workers = max(1, max_workers)
+        self.timeout = timeout
+        self.mp_context = mp_context
+        self.cache_item_max_bytes = cache_item_max_bytes
+        self.format_limits = {**DEFAULT_FORMAT_LIMITS, **(format_limits or {})}
+        self.cache = cache
+
+        self._pool: Optional[ProcessPoolExecutor] = None
+        # Har bir qayta yaratishda oshadi - ish qaysi pool'da ishlaganini bilish uchun
+        self._generation = 0
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+
+        self.stats = {'completed': 0, 'failed': 0, 'timeouts': 0, 'pool_restarts': 0, 'resubmitted': 0}
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            context = multiprocessing.get_context(self.mp_context)
+            if self.mp_context == 'forkserver':
+                # Server jarayoni faqat og'ir kutubxonalarni yuklaydi, bot holatini emas
+                context.set_forkserver_preload(['utils.export_utils'])
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.max_workers, mp_context=context, initializer=_init_worker
+            )
+        return self._pool
+
+    def _get_semaphore(self, format_type: str) -> asyncio.Semaphore:
+        if format_type not in self._semaphores:
+            self._semaphores[format_type] = asyncio.Semaphore(self.format_limits.get(format_type, 1))
+        return self._semaphores[format_type]
+
+    def _restart_pool(self, generation: int) -> None:
+        """Osilib qolgan worker'larni to'xtatib, pool'ni qayta yaratish"""
+        if generation != self._generation:
+            # Bu pool allaqachon boshqa ish tomonidan almashtirilgan
+            return
+        pool, self._pool = self._pool, None
+        self._generation += 1
+        if pool is None:
+            return
+        self.stats['pool_restarts'] += 1
+        processes = list(getattr(pool, '_processes', {}).values())
+        # Navbatdagi ishlar bekor qilinmaydi - ular BrokenProcessPool oladi va qayta yuboriladi
+        pool.shutdown(wait=False, cancel_futures=False)
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+
+    @staticmethod
+    def _purge_stale_files() -> None:
+        """Oldingi ishga tushirishdan qolgan eski export fayllarini o'chirish"""
+        try:
+            entries = list(os.scandir(EXPORT_TMP_DIR))
+        except FileNotFoundError:
+            return
+        cutoff = time.time() - TMP_FILE_MAX_AGE
+        for entry in entries:
+            try:
+                if entry.is_file() and entry.stat().st_mtime < cutoff:
+                    os.remove(entry.path)
+            except OSError:
+                pass
+
+    async def warm_up(self) -> None:
+        """Barcha worker jarayonlarini oldindan ishga tushirish"""
+        await asyncio.to_thread(self._purge_stale_files)
+        loop = asyncio.get_running_loop()
+        pool = self._get_pool()
+        started = time.perf_counter()
+        try:
+            pids = await asyncio.gather(
+                *(loop.run_in_executor(pool, _warmup) for _ in range(self.max_workers))
+            )
+            logger.info(
+                f"Export pool warmed up: {len(set(pids))} workers in {time.perf_counter() - started:.2f}s"
+            )
+        except Exception as e:
+            logger.error(f"Export pool warm-up failed: {e}", exc_info=True)
+
+    async def create_export(self, export_type: str, format_type: str, role: str) -> ExportFile:
+        """Export faylini yaratish (create_export_file bilan bir xil tarkib)"""
+        if not role:
+            raise ValueError("Role parameter is required for export")
+
+        cache_key = None
+        if self.cache is not None:
+            cache_key = make_cache_key(role, export_type, format_type, get_data_version(role))
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                content, filename = cached
+                return ExportFile(filename, len(content), content=content)
+
+        loop = asyncio.get_running_loop()
+        async with self._get_semaphore(format_type):
+            for attempt in range(MAX_RESUBMITS + 1):
+                generation = self._generation
+                future = loop.run_in_executor(self._get_pool(), _render_export, export_type, format_type, role)
+                try:
+                    path, filename, size = await asyncio.wait_for(future, timeout=self.timeout)
+                    break
+                except asyncio.TimeoutError:
+                    self.stats['timeouts'] += 1
+                    logger.error(f"Export timeout: {role}/{export_type}/{format_type} > {self.timeout}s")
+                    self._restart_pool(generation)
+                    raise ExportTimeoutError(f"Export {self.timeout:g} soniyada tugamadi")
+                except (BrokenProcessPool, asyncio.CancelledError) as e:
+                    # Pool boshqa exportning timeout'i yoki worker qulashi sabab to'xtatilgan
+                    if isinstance(e, asyncio.CancelledError) and not _cancelled_by_pool(future):
+                        raise
+                    self._restart_pool(generation)
+                    if attempt < MAX_RESUBMITS:
+                        self.stats['resubmitted'] += 1
+                        logger.warning(f"Export pool restarted, resubmitting {role}/{export_type}/{format_type}")
+                        continue
+                    self.stats['failed'] += 1
+                    raise
+                except Exception:
+                    self.stats['failed'] += 1
+                    raise
+
+        self.stats['completed'] += 1
+        export_file = ExportFile(filename, size, path=path)
+        if cache_key is not None and size <= self.cache_item_max_bytes:
+            self.cache.put(cache_key, await asyncio.to_thread(export_file.read_bytes), filename)
+        return export_file
+
+    async def shutdown(self) -> None:
+        pool, self._pool = self._pool, None
+        if pool is not None:
+            await asyncio.to_thread(pool.shutdown, True, cancel_futures=True)
+
+
+_export_service: Optional[ExportService] = None
+
+
+def get_export_service() -> ExportService:
+    """Global export servisini olish"""
+    global _export_service
+    if _export_service is None:
+        _export_service = ExportService(cache=ExportCache())
+    return _export_service
+
+
+async def create_export_file_async(export_type: str, format_type: str, role: str = None) -> ExportFile:
+    """create_export_file ning event loop'ni bloklamaydigan varianti; fayl diskda"""
+    return await get_export_service().create_export(export_type, format_type, role)
+
+
+async def warm_up_export_service() -> None:
+    await get_export_service().warm_up()
+
+
+async def shutdown_export_service() -> None:
+    if _export_service is not None:
+        await _export_service.shutdown()
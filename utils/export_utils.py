@@ -10,8 +10,9 @@ This module provides comprehensive export functionality using:
 
 import csv
 import io
+import tempfile
 from datetime import datetime
-from typing import Dict, List, Any, Tuple
+from typing import Dict, List, Any, Tuple, IO
 from openpyxl import Workbook
 from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
 from openpyxl.utils import get_column_letter
@@ -28,7 +29,10 @@ from reportlab.pdfbase import pdfmetrics
 from reportlab.pdfbase.ttfonts import TTFont
 
 # Import our role-specific data generator
-from utils.role_data import get_role_data
+from utils.role_data import get_role_data, iter_role_data
+
+# CSV export is kept in memory up to this size, then spilled to a temp file on disk
+CSV_SPOOL_MAX_SIZE = 5 * 1024 * 1024
 
 def format_number(value: Any) -> str:
     """Format numbers with thousand separators"""
@@ -36,17 +40,17 @@ def format_number(value: Any) -> str:
         return f"{value:,}".replace(",", " ")
     return str(value)
 
-def export_to_csv(export_type: str, role: str = None) -> io.BytesIO:
-    """Export data to CSV format"""
-    output = io.BytesIO()
-    wrapper = io.TextIOWrapper(output, encoding='utf-8-sig', newline='')
-    writer = csv.writer(wrapper)
-    
+def export_to_csv(export_type: str, role: str = None) -> IO[bytes]:
+    """Export data to CSV format, streaming rows into a spooled temp file"""
     # Get role-specific data
     if not role:
         raise ValueError("Role parameter is required for export")
     
-    data, headers = get_role_data(role, export_type)
+    data, headers = iter_role_data(role, export_type)
+    
+    output = tempfile.SpooledTemporaryFile(max_size=CSV_SPOOL_MAX_SIZE, mode='w+b')
+    wrapper = io.TextIOWrapper(output, encoding='utf-8-sig', newline='')
+    writer = csv.writer(wrapper)
     
     # Determine title based on role and export type
     titles = {
@@ -95,18 +99,19 @@ def export_to_csv(export_type: str, role: str = None) -> io.BytesIO:
     writer.writerow(headers)
     
     # Write data based on type
-    if isinstance(data, list):
-        # List data (orders, users, etc.)
+    if not isinstance(data, dict):
+        # Row iterator (orders, users, etc.) - written one row at a time
         for item in data:
+            values = list(item.values())
             row = []
-            for header in headers:
-                # Map header to data key
-                value = item.get(list(item.keys())[headers.index(header)]) if headers.index(header) < len(item) else "-"
+            for i in range(len(headers)):
+                # Map header to data value by position
+                value = values[i] if i < len(values) else "-"
                 if isinstance(value, (int, float)) and not isinstance(value, bool):
                     value = format_number(value)
                 row.append(value)
             writer.writerow(row)
-    elif isinstance(data, dict):
+    else:
         # Dictionary data (statistics, reports, etc.)
         if "overall_metrics" in data or "system_info" in data or any(isinstance(v, dict) for v in data.values()):
             # Complex nested structure
@@ -584,7 +589,7 @@ def export_to_pdf(export_type: str, role: str = None) -> io.BytesIO:
     output.seek(0)
     return output
 
-def create_export_file(export_type: str, format_type: str, role: str = None) -> Tuple[io.BytesIO, str]:
+def create_export_file(export_type: str, format_type: str, role: str = None) -> Tuple[IO[bytes], str]:
     """Create export file with real data using appropriate libraries"""
     if not role:
         raise ValueError("Role parameter is required for export")
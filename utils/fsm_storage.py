@@ -0,0 +1,388 @@
+"""
+FSM Storage - Persistent Implementation
+
+Bu modul aiogram FSM holatlari uchun doimiy (persistent) storage'larni taqdim etadi.
+MemoryStorage o'rniga ishlatiladi, shunda bot qayta ishga tushganda yoki bir nechta
+jarayonda ishlaganda yarim to'ldirilgan arizalar yo'qolmaydi.
+
+Tuzilishi:
+- CachedStorage - aiogram BaseStorage interfeysi, oldida LRU kesh, orqasida
+  write-behind (yozuvlarni to'plab yozish) va TTL bo'yicha eskirish
+- SQLiteBackend - lokal fayl (sqlite3) backend
+- RedisBackend - Redis protokoli orqali ishlaydigan backend (Redis yoki
+  unga mos lokal server)
+"""
+
+import asyncio
+import logging
+import pickle
+import sqlite3
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+from aiogram.fsm.state import State
+from aiogram.fsm.storage.base import BaseStorage, StorageKey, StateType
+from aiogram.fsm.storage.memory import MemoryStorage
+
+logger = logging.getLogger(__name__)
+
+# Default sozlamalar
+DEFAULT_STATE_TTL = 24 * 60 * 60  # 24 soat faol bo'lmagan sessiya o'chiriladi
+DEFAULT_CACHE_SIZE = 0  # LRU keshdagi maksimal kalitlar soni; 0 - kesh o'chirilgan (bir nechta jarayon uchun xavfsiz)
+DEFAULT_FLUSH_INTERVAL = 1.0  # Write-behind flush oralig'i (sekund)
+DEFAULT_BATCH_SIZE = 200  # Shuncha "dirty" yozuv yig'ilsa darhol flush qilinadi
+
+# (state, data, updated_at)
+Record = Tuple[Optional[str], Dict[str, Any], float]
+
+
+def build_storage_key(key: StorageKey, prefix: str = "fsm") -> str:
+    """StorageKey dan satr kalit yasash"""
+    parts = [prefix, str(key.bot_id)]
+    business_connection_id = getattr(key, 'business_connection_id', None)
+    if business_connection_id:
+        parts.append(str(business_connection_id))
+    parts.append(str(key.chat_id))
+    if key.thread_id:
+        parts.append(str(key.thread_id))
+    parts.append(str(key.user_id))
+    parts.append(key.destiny)
+    return ":".join(parts)
+
+
+def _state_to_str(state: StateType) -> Optional[str]:
+    """State obyektini satrga aylantirish"""
+    if isinstance(state, State):
+        return state.state
+    return state
+
+
+class SQLiteBackend:
+    """Lokal SQLite fayl backend. Barcha I/O alohida thread'da bajariladi."""
+
+    def __init__(self, path: str = "fsm_storage.sqlite3"):
+        self.path = path
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = asyncio.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS fsm_records ("
+                "key TEXT PRIMARY KEY, state TEXT, data BLOB, updated_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_fsm_updated_at ON fsm_records(updated_at)")
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def _load(self, key: str) -> Optional[Record]:
+        row = self._connect().execute(
+            "SELECT state, data, updated_at FROM fsm_records WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        return row[0], pickle.loads(row[1]) if row[1] else {}, row[2]
+
+    def _save_many(self, records: Dict[str, Record], ttl: int) -> None:
+        conn = self._connect()
+        upserts = []
+        deletes = []
+        for key, (state, data, updated_at) in records.items():
+            if state is None and not data:
+                deletes.append((key,))
+            else:
+                upserts.append((key, state, pickle.dumps(data), updated_at))
+        with conn:
+            if upserts:
+                conn.executemany(
+                    "INSERT INTO fsm_records (key, state, data, updated_at) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT(key) DO UPDATE SET state = excluded.state, "
+                    "data = excluded.data, updated_at = excluded.updated_at",
+                    upserts,
+                )
+            if deletes:
+                conn.executemany("DELETE FROM fsm_records WHERE key = ?", deletes)
+
+    def _purge_expired(self, ttl: int) -> int:
+        conn = self._connect()
+        with conn:
+            cursor = conn.execute("DELETE FROM fsm_records WHERE updated_at < ?", (time.time() - ttl,))
+        return cursor.rowcount
+
+    def _close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    async def load(self, key: str) -> Optional[Record]:
+        async with self._lock:
+            return await asyncio.to_thread(self._load, key)
+
+    async def save_many(self, records: Dict[str, Record], ttl: int) -> None:
+        async with self._lock:
+            await asyncio.to_thread(self._save_many, records, ttl)
+
+    async def purge_expired(self, ttl: int) -> int:
+        async with self._lock:
+            return await asyncio.to_thread(self._purge_expired, ttl)
+
+    async def close(self) -> None:
+        async with self._lock:
+            await asyncio.to_thread(self._close)
+
+
+class RedisBackend:
+    """
+    Redis protokoli orqali ishlaydigan backend.
+    TTL Redis'ning o'zida (PEXPIRE) boshqariladi, shuning uchun purge kerak emas.
+    """
+
+    def __init__(self, url: str = "redis://localhost:6379/0"):
+        try:
+            from redis.asyncio import Redis
+        except ImportError as e:
+            raise RuntimeError("RedisBackend uchun 'redis' paketi kerak: pip install redis") from e
+        self.url = url
+        self._redis = Redis.from_url(url)
+
+    async def load(self, key: str) -> Optional[Record]:
+        raw = await self._redis.get(key)
+        if raw is None:
+            return None
+        return pickle.loads(raw)
+
+    async def save_many(self, records: Dict[str, Record], ttl: int) -> None:
+        async with self._redis.pipeline(transaction=False) as pipe:
+            for key, record in records.items():
+                state, data, _ = record
+                if state is None and not data:
+                    pipe.delete(key)
+                else:
+                    pipe.set(key, pickle.dumps(record), px=int(ttl * 1000))
+            await pipe.execute()
+
+    async def purge_expired(self, ttl: int) -> int:
+        return 0
+
+    async def close(self) -> None:
+        if hasattr(self._redis, 'aclose'):
+            await self._redis.aclose()
+        else:
+            await self._redis.close()
+
+
+class CachedStorage(BaseStorage):
+    """
+    FSM storage: LRU kesh + write-behind + TTL.
+
+    O'qishlar avval keshdan olinadi; yozuvlar keshga yoziladi va "dirty" deb
+    belgilanadi, fon task ularni to'plab backend'ga yozadi. Bir nechta bot
+    jarayoni bitta backend'ni ishlatganda lokal kesh boshqa jarayon yozuvlarini
+    ko'rmaydi, shuning uchun default cache_size=0: har bir o'qish backend'dan,
+    har bir yozuv darhol backend'ga (write-through). Kesh va write-behind faqat
+    bitta jarayon (yoki sticky yo'naltirish) bo'lganda yoqiladi.
+    """
+
+    def __init__(
+        self,
+        backend: Any,
+        state_ttl: int = DEFAULT_STATE_TTL,
+        cache_size: int = DEFAULT_CACHE_SIZE,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ):
+        self.backend = backend
+        self.state_ttl = state_ttl
+        self.cache_size = cache_size
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+
+        self._cache: "OrderedDict[str, Record]" = OrderedDict()
+        self._dirty: Dict[str, Record] = {}
+        self._flush_event: Optional[asyncio.Event] = None
+        self._flush_task: Optional[asyncio.Task] = None
+        self._flush_lock: Optional[asyncio.Lock] = None
+        self._last_purge = time.time()
+        self._closed = False
+
+        self.stats = {'hits': 0, 'misses': 0, 'flushes': 0, 'flushed_records': 0, 'expired': 0}
+
+    # --- Kesh yordamchilari ---
+
+    def _is_expired(self, record: Record) -> bool:
+        return time.time() - record[2] > self.state_ttl
+
+    def _cache_put(self, key: str, record: Record) -> None:
+        if self.cache_size <= 0:
+            return
+        self._cache[key] = record
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_size:
+            old_key, _ = self._cache.popitem(last=False)
+            logger.debug(f"FSM cache evicted: {old_key}")
+
+    async def _get_record(self, key: StorageKey) -> Optional[Record]:
+        str_key = build_storage_key(key)
+
+        # Hali backend'ga yozilmagan yozuv eng yangi hisoblanadi
+        record = self._dirty.get(str_key)
+        if record is None:
+            record = self._cache.get(str_key)
+            if record is not None:
+                self._cache.move_to_end(str_key)
+                self.stats['hits'] += 1
+            else:
+                self.stats['misses'] += 1
+                record = await self.backend.load(str_key)
+                if record is not None:
+                    self._cache_put(str_key, record)
+
+        if record is not None and self._is_expired(record):
+            self.stats['expired'] += 1
+            self._cache.pop(str_key, None)
+            self._write(str_key, (None, {}, time.time()))
+            return None
+        return record
+
+    def _write(self, str_key: str, record: Record) -> None:
+        self._cache_put(str_key, record)
+        self._dirty[str_key] = record
+        self._ensure_flusher()
+        if len(self._dirty) >= self.batch_size:
+            self._flush_event.set()
+
+    async def _write_through(self) -> None:
+        # Keshsiz rejimda boshqa jarayonlar yozuvni darhol ko'rishi kerak
+        if self.cache_size <= 0:
+            await self.flush()
+
+    # --- Write-behind ---
+
+    def _ensure_flusher(self) -> None:
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_event = asyncio.Event()
+            self._flush_lock = asyncio.Lock()
+            self._flush_task = asyncio.create_task(self._flush_loop())
+
+    async def _flush_loop(self) -> None:
+        while not self._closed:
+            try:
+                await asyncio.wait_for(self._flush_event.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._flush_event.clear()
+            try:
+                await self.flush()
+                if time.time() - self._last_purge > min(self.state_ttl, 3600):
+                    self._last_purge = time.time()
+                    purged = await self.backend.purge_expired(self.state_ttl)
+                    self._purge_cache()
+                    if purged:
+                        logger.info(f"FSM storage: {purged} ta eskirgan sessiya o'chirildi")
+            except Exception as e:
+                logger.error(f"FSM storage flush error: {e}", exc_info=True)
+
+    def _purge_cache(self) -> None:
+        expired = [key for key, record in self._cache.items() if self._is_expired(record)]
+        for key in expired:
+            self._cache.pop(key, None)
+
+    async def flush(self) -> None:
+        """Barcha dirty yozuvlarni backend'ga bitta batch qilib yozish"""
+        if not self._dirty:
+            return
+        lock = self._flush_lock or asyncio.Lock()
+        async with lock:
+            batch, self._dirty = self._dirty, {}
+            if not batch:
+                return
+            try:
+                await self.backend.save_many(batch, self.state_ttl)
+            except Exception:
+                # Yozilmagan yozuvlarni qaytarish (yangiroqlarini bosmaslik sharti bilan)
+                for key, record in batch.items():
+                    self._dirty.setdefault(key, record)
+                raise
+            self.stats['flushes'] += 1
+            self.stats['flushed_records'] += len(batch)
+
+    # --- BaseStorage interfeysi ---
+
+    async def set_state(self, key: StorageKey, state: StateType = None) -> None:
+        record = await self._get_record(key)
+        data = record[1] if record else {}
+        self._write(build_storage_key(key), (_state_to_str(state), data, time.time()))
+        await self._write_through()
+
+    async def get_state(self, key: StorageKey) -> Optional[str]:
+        record = await self._get_record(key)
+        return record[0] if record else None
+
+    async def set_data(self, key: StorageKey, data: Mapping[str, Any]) -> None:
+        if not isinstance(data, dict):
+            raise ValueError(f"Data must be a dict or dict-like object, got {type(data).__name__}")
+        record = await self._get_record(key)
+        state = record[0] if record else None
+        self._write(build_storage_key(key), (state, data.copy(), time.time()))
+        await self._write_through()
+
+    async def get_data(self, key: StorageKey) -> Dict[str, Any]:
+        record = await self._get_record(key)
+        return record[1].copy() if record else {}
+
+    async def close(self) -> None:
+        self._closed = True
+        if self._flush_task is not None and not self._flush_task.done():
+            self._flush_event.set()
+            self._flush_task.cancel()
+            try:
+                await self._flush_task
+            except asyncio.CancelledError:
+                pass
+        try:
+            await self.flush()
+        finally:
+            await self.backend.close()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Kesh va flush statistikasi"""
+        total = self.stats['hits'] + self.stats['misses']
+        return {
+            **self.stats,
+            'cache_size': len(self._cache),
+            'pending_writes': len(self._dirty),
+            'hit_rate': round(self.stats['hits'] / total * 100, 2) if total else 0.0,
+        }
+
+
+def create_storage(
+    storage_type: str = "memory",
+    path: str = "fsm_storage.sqlite3",
+    redis_url: str = "redis://localhost:6379/0",
+    state_ttl: int = DEFAULT_STATE_TTL,
+    cache_size: int = DEFAULT_CACHE_SIZE,
+    flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+) -> BaseStorage:
+    """Sozlamaga qarab FSM storage yaratish: memory | sqlite | redis"""
+    storage_type = (storage_type or "memory").lower()
+
+    if storage_type == "sqlite":
+        backend = SQLiteBackend(path)
+    elif storage_type == "redis":
+        backend = RedisBackend(redis_url)
+    else:
+        if storage_type != "memory":
+            logger.warning(f"Unknown FSM storage type '{storage_type}', falling back to memory")
+        return MemoryStorage()
+
+    return CachedStorage(
+        backend,
+        state_ttl=state_ttl,
+        cache_size=cache_size,
+        flush_interval=flush_interval,
+    )
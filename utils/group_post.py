@@ -0,0 +1,79 @@
+"""
+Group Post - Text + Media Composer
+
+Bu modul guruhga yuboriladigan ariza postini iloji boricha kam Telegram API
+chaqiruvlariga yig'adi.
+
+- Media yo'q - bitta send_message
+- Bitta media va matn caption'ga sig'sa - bitta send_photo/send_video (caption bilan)
+- 2-10 media - bitta send_media_group, caption birinchi elementda
+- Matn caption chegarasidan (1024 belgi) uzun bo'lsa - alohida send_message + media
+- Lokatsiya caption'ga qo'shib bo'lmaydi - alohida send_location, faqat geo bo'lsa
+"""
+
+import re
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from aiogram.types import InputMediaPhoto, InputMediaVideo
+
+CAPTION_LIMIT = 1024
+MEDIA_GROUP_LIMIT = 10
+
+_TAG_RE = re.compile(r'<[^>]+>')
+
+# (bot metodi, argumentlar)
+PostCall = Tuple[str, Dict[str, Any]]
+
+MEDIA_METHODS = {
+    'photo': ('send_photo', InputMediaPhoto),
+    'video': ('send_video', InputMediaVideo),
+}
+
+
+def caption_length(text: str, parse_mode: Optional[str] = None) -> int:
+    """Telegram caption uzunligi - HTML teglar hisobga olinmaydi, UTF-16 birliklarda (emoji = 2)"""
+    if parse_mode == 'HTML':
+        text = _TAG_RE.sub('', text).replace('&lt;', '<').replace('&gt;', '>').replace('&amp;', '&')
+    return len(text.encode('utf-16-le')) // 2
+
+
+def compose_group_post(
+    text: str,
+    media: Sequence[Tuple[str, str]] = (),
+    location: Optional[Tuple[float, float]] = None,
+    parse_mode: Optional[str] = 'HTML',
+) -> List[PostCall]:
+    """
+    Post uchun API chaqiruvlari ro'yxati.
+    media - [(turi, file_id)], turi 'photo' yoki 'video'; location - (lat, lon)
+    """
+    media = [(kind, file_id) for kind, file_id in media if kind in MEDIA_METHODS and file_id]
+    fits = caption_length(text, parse_mode) <= CAPTION_LIMIT
+    calls: List[PostCall] = []
+
+    if not media or not fits:
+        calls.append(('send_message', {'text': text, 'parse_mode': parse_mode}))
+    caption = {'caption': text, 'parse_mode': parse_mode} if media and fits else {}
+
+    if len(media) == 1:
+        kind, file_id = media[0]
+        method = MEDIA_METHODS[kind][0]
+        calls.append((method, {kind: file_id, **caption}))
+    else:
+        for start in range(0, len(media), MEDIA_GROUP_LIMIT):
+            chunk = media[start:start + MEDIA_GROUP_LIMIT]
+            items = [
+                MEDIA_METHODS[kind][1](media=file_id, **(caption if start == 0 and i == 0 else {}))
+                for i, (kind, file_id) in enumerate(chunk)
+            ]
+            if len(items) == 1:
+                # Oxirgi bo'lakda bitta media qolsa media group bo'lmaydi
+                kind, file_id = chunk[0]
+                calls.append((MEDIA_METHODS[kind][0], {kind: file_id}))
+            else:
+                calls.append(('send_media_group', {'media': items}))
+
+    if location is not None:
+        latitude, longitude = location
+        calls.append(('send_location', {'latitude': latitude, 'longitude': longitude}))
+    return calls
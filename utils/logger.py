@@ -2,12 +2,23 @@
 Logger Utility - Testbot
 
 Bu modul testbot uchun maxsus logger funksiyalarini taqdim etadi.
+
+Barcha log yozuvlari QueueHandler orqali navbatga qo'yiladi va bitta fon
+thread (QueueListener) ularni terminal va fayllarga yozadi, shuning uchun
+event loop disk I/O bilan bloklanmaydi.
 """
 
+import atexit
+import gzip
+import json
 import logging
-import traceback
+import logging.handlers
+import os
+import queue
+import shutil
+import threading
 from datetime import datetime
-from typing import Optional, Any
+from typing import Optional, Any, Dict
 
 # Asosiy logger
 logger = logging.getLogger(__name__)
@@ -18,90 +29,196 @@ activity_logger = logging.getLogger('activity')
 # Error logger
 error_logger = logging.getLogger('error')
 
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_queue_handler: Optional["DroppingQueueHandler"] = None
+_setup_lock = threading.Lock()
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that never blocks: when the queue is full the record is dropped and counted"""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """Har bir log yozuvini bitta JSON qator sifatida formatlash"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            'time': datetime.fromtimestamp(record.created).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        if record.exc_info:
+            payload['exc_info'] = self.formatException(record.exc_info)
+        return json.dumps(payload, ensure_ascii=False)
+
+
+def _gzip_rotator(source: str, dest: str) -> None:
+    """Aylantirilgan log faylini gzip bilan siqish"""
+    with open(source, 'rb') as f_in, gzip.open(dest, 'wb') as f_out:
+        shutil.copyfileobj(f_in, f_out)
+    os.remove(source)
+
+
+def _rotating_file_handler(filename: str, max_bytes: int, backup_count: int) -> logging.Handler:
+    handler = logging.handlers.RotatingFileHandler(
+        filename, maxBytes=max_bytes, backupCount=backup_count, encoding='utf-8', delay=True
+    )
+    handler.namer = lambda name: name + '.gz'
+    handler.rotator = _gzip_rotator
+    return handler
+
+
+def setup_logging(
+    level: Optional[str] = None,
+    json_lines: Optional[bool] = None,
+    errors_file: str = 'testbot_errors.log',
+    activity_file: str = 'testbot_activity.log',
+    max_bytes: int = 10 * 1024 * 1024,
+    backup_count: int = 5,
+    queue_size: int = 10000,
+) -> None:
+    """
+    Queue-based logging ni sozlash. Bir necha marta chaqirilsa ham handler'lar
+    faqat bir marta qo'shiladi.
+    """
+    global _listener, _queue_handler
+
+    with _setup_lock:
+        if _listener is not None:
+            return
+
+        level = level or os.getenv('LOG_LEVEL', 'INFO')
+        if json_lines is None:
+            json_lines = os.getenv('LOG_FORMAT', 'text').lower() == 'json'
+
+        def formatter(fmt: str) -> logging.Formatter:
+            return JsonLinesFormatter() if json_lines else logging.Formatter(fmt)
+
+        # Terminal uchun
+        console_handler = logging.StreamHandler()
+        console_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+
+        # Xatoliklar uchun
+        errors_handler = _rotating_file_handler(errors_file, max_bytes, backup_count)
+        errors_handler.setLevel(logging.ERROR)
+        errors_handler.setFormatter(formatter(LOG_FORMAT))
+
+        # Faollik uchun
+        activity_handler = _rotating_file_handler(activity_file, max_bytes, backup_count)
+        activity_handler.setFormatter(formatter(LOG_FORMAT))
+
+        log_queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        _queue_handler = DroppingQueueHandler(log_queue)
+
+        root = logging.getLogger()
+        root.setLevel(level)
+        for handler in list(root.handlers):
+            root.removeHandler(handler)
+        root.addHandler(_queue_handler)
+        activity_logger.setLevel(logging.INFO)
+
+        _listener = logging.handlers.QueueListener(
+            log_queue, console_handler, errors_handler, activity_handler, respect_handler_level=True
+        )
+        _listener.start()
+        atexit.register(shutdown_logging)
+
+
+def shutdown_logging() -> None:
+    """Navbatdagi barcha yozuvlarni yozib, fon thread'ni to'xtatish"""
+    global _listener
+    with _setup_lock:
+        if _listener is not None:
+            _listener.stop()
+            for handler in _listener.handlers:
+                handler.close()
+            _listener = None
+
+
+def get_logging_stats() -> Dict[str, Any]:
+    """Log navbati holati va tashlab yuborilgan yozuvlar soni"""
+    if _queue_handler is None:
+        return {'queued': 0, 'dropped': 0}
+    return {
+        'queued': _queue_handler.queue.qsize(),
+        'dropped': _queue_handler.dropped,
+    }
+
 def get_logger(name: str):
     """Get logger for specific module"""
     return logging.getLogger(name)
 
 def log_user_activity(user_id: int, user_name: str, action: str, details: Optional[str] = None):
     """Foydalanuvchi faolligini log qilish"""
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    log_message = f"[{timestamp}] User {user_id} ({user_name}) - {action}"
+    log_message = f"User {user_id} ({user_name}) - {action}"
     if details:
         log_message += f" - {details}"
     
-    print(f"📝 {log_message}")
     activity_logger.info(log_message)
 
 def log_error(user_id: Optional[int], user_name: Optional[str], error: Exception, context: str = ""):
     """Xatolikni log qilish"""
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     error_type = type(error).__name__
     error_msg = str(error)
     
-    log_message = f"[{timestamp}] ERROR - User {user_id} ({user_name}) - {error_type}: {error_msg}"
+    log_message = f"ERROR - User {user_id} ({user_name}) - {error_type}: {error_msg}"
     if context:
         log_message += f" - Context: {context}"
     
-    print(f"❌ {log_message}")
-    print(f"📁 Error type: {error_type}")
-    print(f"🔍 Error location: {error.__traceback__.tb_frame.f_code.co_filename}")
-    print(f"📄 Line number: {error.__traceback__.tb_lineno}")
-    print(f"📋 Full traceback:")
-    traceback.print_exc()
-    
     error_logger.error(log_message, exc_info=True)
 
 def log_handler_start(handler_name: str, user_id: int, user_name: str):
     """Handler boshlanishini log qilish"""
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    log_message = f"[{timestamp}] Handler START - {handler_name} - User {user_id} ({user_name})"
+    log_message = f"Handler START - {handler_name} - User {user_id} ({user_name})"
     
-    print(f"🚀 {log_message}")
     activity_logger.info(log_message)
 
 def log_handler_end(handler_name: str, user_id: int, user_name: str, success: bool = True):
     """Handler tugashini log qilish"""
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     status = "SUCCESS" if success else "FAILED"
-    log_message = f"[{timestamp}] Handler END - {handler_name} - User {user_id} ({user_name}) - {status}"
+    log_message = f"Handler END - {handler_name} - User {user_id} ({user_name}) - {status}"
     
-    print(f"✅ {log_message}" if success else f"❌ {log_message}")
     activity_logger.info(log_message)
 
 def log_database_operation(operation: str, table: str, user_id: Optional[int] = None, details: Optional[str] = None):
     """Ma'lumotlar bazasi operatsiyalarini log qilish"""
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    log_message = f"[{timestamp}] DB {operation} - Table: {table}"
+    log_message = f"DB {operation} - Table: {table}"
     if user_id:
         log_message += f" - User: {user_id}"
     if details:
         log_message += f" - Details: {details}"
     
-    print(f"🗄️ {log_message}")
     activity_logger.info(log_message)
 
 def log_state_change(user_id: int, user_name: str, old_state: Optional[str], new_state: str):
     """FSM holat o'zgarishini log qilish"""
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    log_message = f"[{timestamp}] STATE CHANGE - User {user_id} ({user_name}) - {old_state} → {new_state}"
+    log_message = f"STATE CHANGE - User {user_id} ({user_name}) - {old_state} → {new_state}"
     
-    print(f"🔄 {log_message}")
     activity_logger.info(log_message)
 
 def log_role_access(user_id: int, user_name: str, role: str, action: str):
     """Rol kirishini log qilish"""
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    log_message = f"[{timestamp}] ROLE ACCESS - User {user_id} ({user_name}) - Role: {role} - Action: {action}"
+    log_message = f"ROLE ACCESS - User {user_id} ({user_name}) - Role: {role} - Action: {action}"
     
-    print(f"👤 {log_message}")
     activity_logger.info(log_message)
 
 def log_system_event(event: str, details: Optional[str] = None):
     """Tizim hodisasini log qilish"""
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    log_message = f"[{timestamp}] SYSTEM - {event}"
+    log_message = f"SYSTEM - {event}"
     if details:
         log_message += f" - {details}"
     
-    print(f"⚙️ {log_message}")
     activity_logger.info(log_message) 
\ No newline at end of file
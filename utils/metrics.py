@@ -0,0 +1,237 @@
+"""
+Metrics - Handler and Telegram API Latency Metrics
+
+Bu modul handler'lar, router'lar va Telegram API chaqiruvlari uchun kechikish
+(latency), in-flight, xatoliklar statistikasini yig'adi.
+
+- Har bir kalit uchun cheklangan rolling window (deque(maxlen)) - append
+  atomar, lock kerak emas
+- p50/p95/p99 so'nggi WINDOW_SECONDS ichidagi namunalar bo'yicha hisoblanadi
+- Prometheus text formatidagi faylga davriy yozish (METRICS_FILE)
+"""
+
+import asyncio
+import logging
+import math
+import os
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+WINDOW_SECONDS = 300  # Percentile'lar so'nggi 5 daqiqa bo'yicha
+WINDOW_SAMPLES = 2048  # Har bir kalit uchun saqlanadigan maksimal namunalar
+QUANTILES = (0.5, 0.95, 0.99)
+
+
+class RollingWindow:
+    """So'nggi namunalar oynasi: (vaqt, qiymat) juftliklari"""
+
+    __slots__ = ('samples', 'count', 'errors', 'in_flight')
+
+    def __init__(self, maxlen: int = WINDOW_SAMPLES):
+        self.samples: Deque[Tuple[float, float]] = deque(maxlen=maxlen)
+        self.count = 0
+        self.errors = 0
+        self.in_flight = 0
+
+    def observe(self, seconds: float, error: bool = False) -> None:
+        self.samples.append((time.time(), seconds))
+        self.count += 1
+        if error:
+            self.errors += 1
+
+    def recent(self, window: float = WINDOW_SECONDS) -> List[float]:
+        since = time.time() - window
+        return [value for ts, value in list(self.samples) if ts >= since]
+
+    def summary(self, window: float = WINDOW_SECONDS) -> Dict[str, Any]:
+        values = sorted(self.recent(window))
+        result = {
+            'count': self.count,
+            'errors': self.errors,
+            'error_rate': round(self.errors / self.count * 100, 2) if self.count else 0.0,
+            'in_flight': self.in_flight,
+            'window_count': len(values),
+        }
+        for q in QUANTILES:
+            result[f'p{int(q * 100)}'] = _quantile(values, q)
+        return result
+
+
+def _quantile(sorted_values: List[float], q: float) -> float:
+    """Nearest-rank percentile (sekundlarda)"""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, math.ceil(q * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+class MetricsRegistry:
+    """Handler, router va Telegram API metrikalari"""
+
+    def __init__(self, window_samples: int = WINDOW_SAMPLES):
+        self.window_samples = window_samples
+        self.handlers: Dict[str, RollingWindow] = {}
+        self.routers: Dict[str, RollingWindow] = {}
+        self.api_calls: Dict[str, RollingWindow] = {}
+        self.started_at = time.time()
+
+    def _window(self, group: Dict[str, RollingWindow], key: str) -> RollingWindow:
+        window = group.get(key)
+        if window is None:
+            window = group[key] = RollingWindow(self.window_samples)
+        return window
+
+    def handler_window(self, key: str) -> RollingWindow:
+        return self._window(self.handlers, key)
+
+    def router_window(self, key: str) -> RollingWindow:
+        return self._window(self.routers, key)
+
+    def api_window(self, key: str) -> RollingWindow:
+        return self._window(self.api_calls, key)
+
+    def reset(self) -> None:
+        """Barcha yig'ilgan metrikalarni tozalash"""
+        self.handlers.clear()
+        self.routers.clear()
+        self.api_calls.clear()
+        self.started_at = time.time()
+
+    def totals(self) -> Dict[str, Any]:
+        """Barcha handler'lar bo'yicha umumiy ko'rsatkichlar"""
+        merged = RollingWindow(maxlen=self.window_samples * 4)
+        for window in self.handlers.values():
+            merged.count += window.count
+            merged.errors += window.errors
+            merged.in_flight += window.in_flight
+            merged.samples.extend(window.samples)
+        return merged.summary()
+
+    def top(self, group: Dict[str, RollingWindow], limit: int = 5, by: str = 'p95') -> List[Tuple[str, Dict[str, Any]]]:
+        summaries = [(key, window.summary()) for key, window in list(group.items())]
+        summaries = [item for item in summaries if item[1]['window_count']]
+        summaries.sort(key=lambda item: item[1][by], reverse=True)
+        return summaries[:limit]
+
+    def to_prometheus(self) -> str:
+        """Prometheus text exposition format"""
+        lines: List[str] = []
+        groups = (
+            ('alfa_handler_latency_seconds', 'handler', self.handlers),
+            ('alfa_router_latency_seconds', 'router', self.routers),
+            ('alfa_telegram_api_latency_seconds', 'method', self.api_calls),
+        )
+        for metric, label, group in groups:
+            lines.append(f"# TYPE {metric} summary")
+            for key, window in sorted(list(group.items())):
+                summary = window.summary()
+                values = window.recent()
+                for q in QUANTILES:
+                    lines.append(f'{metric}{{{label}="{key}",quantile="{q}"}} {summary[f"p{int(q * 100)}"]:.6f}')
+                lines.append(f'{metric}_sum{{{label}="{key}"}} {sum(values):.6f}')
+                lines.append(f'{metric}_count{{{label}="{key}"}} {len(values)}')
+            name = metric.replace('_latency_seconds', '')
+            lines.append(f"# TYPE {name}_requests_total counter")
+            for key, window in sorted(list(group.items())):
+                lines.append(f'{name}_requests_total{{{label}="{key}"}} {window.count}')
+            lines.append(f"# TYPE {name}_errors_total counter")
+            for key, window in sorted(list(group.items())):
+                lines.append(f'{name}_errors_total{{{label}="{key}"}} {window.errors}')
+            lines.append(f"# TYPE {name}_in_flight gauge")
+            for key, window in sorted(list(group.items())):
+                lines.append(f'{name}_in_flight{{{label}="{key}"}} {window.in_flight}')
+        lines.append("# TYPE alfa_uptime_seconds gauge")
+        lines.append(f"alfa_uptime_seconds {time.time() - self.started_at:.0f}")
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus_file(self, path: str) -> None:
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(self.to_prometheus())
+        os.replace(tmp_path, path)
+
+
+metrics = MetricsRegistry()
+
+
+def _ms(seconds: float) -> str:
+    return f"{seconds * 1000:.0f} ms"
+
+
+def render_metrics_text() -> str:
+    """Admin "Tizim holati" ekrani uchun HTML matn"""
+    totals = metrics.totals()
+    uptime = int(time.time() - metrics.started_at)
+    lines = [
+        f"⏱ <b>Ishlash vaqti:</b> {uptime // 3600} soat {uptime % 3600 // 60} daqiqa",
+        f"📨 <b>Update'lar:</b> {totals['count']} ta (oxirgi 5 daqiqada: {totals['window_count']})",
+        f"⚙️ <b>Hozir bajarilmoqda:</b> {totals['in_flight']} ta",
+        f"❌ <b>Xatoliklar:</b> {totals['errors']} ta ({totals['error_rate']}%)",
+        f"📈 <b>Handler latency:</b> p50 {_ms(totals['p50'])} · p95 {_ms(totals['p95'])} · p99 {_ms(totals['p99'])}",
+    ]
+
+    slow_routers = metrics.top(metrics.routers, limit=3)
+    if slow_routers:
+        lines.append("\n🐢 <b>Eng sekin modullar (p95):</b>")
+        for key, summary in slow_routers:
+            lines.append(f"• {key.replace('handlers.', '')}: {_ms(summary['p95'])} ({summary['window_count']} ta)")
+
+    api_calls = metrics.top(metrics.api_calls, limit=3, by='window_count')
+    if api_calls:
+        lines.append("\n🌐 <b>Telegram API:</b>")
+        for key, summary in api_calls:
+            lines.append(
+                f"• {key}: p50 {_ms(summary['p50'])} · p95 {_ms(summary['p95'])}"
+                f" ({summary['window_count']} ta, xato {summary['error_rate']}%)"
+            )
+
+    # Imported here: utils.metrics stays free of aiogram imports
+    from utils.notification_outbox import notification_outbox
+    outbox = notification_outbox.summary()
+    if outbox['enqueued'] or outbox['dead']:
+        lines.append(
+            f"\n📬 <b>Bildirishnomalar:</b> {outbox['sent']} yuborildi · {outbox['pending']} navbatda"
+            f" · {outbox['failed']} xato · 429: {outbox['rate_limited']} · dead-letter: {outbox['dead']}"
+        )
+
+    from utils.notification_digest import new_order_digest
+    digest = new_order_digest.summary()
+    if digest['digests']:
+        lines.append(
+            f"🗂 <b>Digestlar:</b> {digest['digests']} ta · tejaldi {digest['saved']} xabar"
+            f" ({digest['saved_percent']}%) · yig'ilmoqda {digest['pending']}"
+        )
+
+    return "\n".join(lines)
+
+
+_exporter_task: Optional[asyncio.Task] = None
+
+
+async def _exporter_loop(path: str, interval: float) -> None:
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await asyncio.to_thread(metrics.write_prometheus_file, path)
+        except Exception as e:
+            logger.error(f"Metrics export error: {e}")
+
+
+async def start_metrics_exporter() -> None:
+    """METRICS_FILE ko'rsatilgan bo'lsa, metrikalarni davriy ravishda faylga yozish"""
+    global _exporter_task
+    path = os.getenv('METRICS_FILE')
+    if not path or (_exporter_task is not None and not _exporter_task.done()):
+        return
+    interval = float(os.getenv('METRICS_INTERVAL', 15))
+    _exporter_task = asyncio.create_task(_exporter_loop(path, interval))
+
+
+async def stop_metrics_exporter() -> None:
+    global _exporter_task
+    if _exporter_task is not None:
+        _exporter_task.cancel()
+        _exporter_task = None
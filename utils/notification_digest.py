@@ -0,0 +1,177 @@
+"""
+Notification Digest - Burst Coalescing for Manager Alerts
+
+Buyurtmalar ko'paygan paytda har bir manager har bir yangi ariza uchun alohida
+"🔌 Yangi ariza #..." xabarini oladi - bu rate limit'ni tez tugatadi. Bu modul
+xabarlarni qabul qiluvchi bo'yicha yig'adi.
+
+- Oddiy oqimda (oyna ichida DIGEST_THRESHOLD tadan kam) xabar darhol outbox'ga ketadi
+- Chegara oshsa, shu chat uchun DIGEST_WINDOW sekund davomida xabarlar yig'iladi
+  va bitta digest yuboriladi: "N ta yangi ariza" ro'yxati + har bir ariza tugmasi
+- Oynada bitta xabar qolsa, u asl ko'rinishida yuboriladi
+- Tejalgan xabarlar soni: new_order_digest.stats['saved']
+- Yig'ilgan xabarlar xotirada - shutdown'da flush_all() bilan outbox'ga o'tadi
+"""
+
+import asyncio
+import html
+import logging
+import os
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup
+
+from utils.notification_outbox import NotificationOutbox, notification_outbox
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WINDOW = float(os.getenv('DIGEST_WINDOW', 10))  # sekund; 0 - yig'ish o'chirilgan
+DEFAULT_THRESHOLD = int(os.getenv('DIGEST_THRESHOLD', 3))  # oyna ichida shundan ko'pi yig'iladi
+MAX_DIGEST_ITEMS = 10  # Digestda ko'rsatiladigan qatorlar va tugmalar
+BUTTONS_PER_ROW = 2
+
+# (ariza id, qisqa qator, bot, dedup_key, qo'shimcha argumentlar)
+DigestEntry = Tuple[str, str, Any, Optional[str], Dict[str, Any]]
+
+
+class BurstCoalescer:
+    """Qabul qiluvchi bo'yicha adaptiv yig'uvchi: kam oqim - darhol, portlash - digest"""
+
+    def __init__(
+        self,
+        outbox: NotificationOutbox,
+        window: float = DEFAULT_WINDOW,
+        threshold: int = DEFAULT_THRESHOLD,
+        title: str = "🔌 <b>{count} ta yangi ariza</b>",
+        callback_prefix: str = 'mgr_view_app_',
+    ):
+        self.outbox = outbox
+        self.window = window
+        self.threshold = threshold
+        self.title = title
+        self.callback_prefix = callback_prefix
+        self._recent: Dict[int, Deque[float]] = {}
+        self._buffers: Dict[int, List[DigestEntry]] = {}
+        self._timers: Dict[int, asyncio.TimerHandle] = {}
+        self.stats = {
+            'immediate': 0,
+            'buffered': 0,
+            'digests': 0,
+            'saved': 0,
+        }
+
+    def add(
+        self,
+        chat_id: int,
+        item_id: Any,
+        text: str,
+        bot: Any = None,
+        dedup_key: Optional[str] = None,
+        **kwargs: Any,
+    ) -> bool:
+        """Bitta xabar; oqim tinch bo'lsa darhol outbox'ga, aks holda digest buferiga"""
+        now = time.monotonic()
+        recent = self._recent.setdefault(chat_id, deque())
+        while recent and recent[0] <= now - self.window:
+            recent.popleft()
+        recent.append(now)
+
+        buffer = self._buffers.get(chat_id)
+        if buffer is None and (self.window <= 0 or len(recent) <= self.threshold):
+            self.stats['immediate'] += 1
+            return self.outbox.enqueue(chat_id, text, bot=bot, dedup_key=dedup_key, **kwargs)
+
+        if buffer is None:
+            buffer = self._buffers[chat_id] = []
+            self._timers[chat_id] = asyncio.get_running_loop().call_later(self.window, self.flush, chat_id)
+        elif dedup_key is not None and any(entry[3] == dedup_key for entry in buffer):
+            return False
+        buffer.append((str(item_id), text, bot, dedup_key, kwargs))
+        self.stats['buffered'] += 1
+        return True
+
+    def add_many(
+        self,
+        chat_ids: List[int],
+        item_id: Any,
+        text: str,
+        bot: Any = None,
+        dedup_key: Optional[str] = None,
+        **kwargs: Any,
+    ) -> int:
+        """Bir nechta chatga; dedup_key enqueue_many'dagidek "<dedup_key>:<chat_id>" bo'ladi"""
+        return sum(
+            self.add(chat_id, item_id, text, bot=bot, dedup_key=f"{dedup_key}:{chat_id}" if dedup_key else None, **kwargs)
+            for chat_id in dict.fromkeys(chat_ids)
+        )
+
+    def flush(self, chat_id: int) -> None:
+        """Chat buferini outbox'ga o'tkazish (taymer yoki shutdown)"""
+        timer = self._timers.pop(chat_id, None)
+        if timer is not None:
+            timer.cancel()
+        buffer = self._buffers.pop(chat_id, None)
+        if not buffer:
+            return
+
+        if len(buffer) == 1:
+            _, text, bot, dedup_key, kwargs = buffer[0]
+            self.outbox.enqueue(chat_id, text, bot=bot, dedup_key=dedup_key, **kwargs)
+            return
+
+        ids = [entry[0] for entry in buffer]
+        self.outbox.enqueue(
+            chat_id,
+            self.render(buffer),
+            bot=buffer[-1][2],
+            dedup_key=f"digest:{chat_id}:{ids[0]}:{ids[-1]}:{len(ids)}",
+            parse_mode='HTML',
+            reply_markup=self.keyboard(ids),
+        )
+        self.stats['digests'] += 1
+        self.stats['saved'] += len(buffer) - 1
+        logger.info(f"Digest for {chat_id}: {len(buffer)} notifications in one message")
+
+    def flush_all(self) -> None:
+        for chat_id in list(self._buffers):
+            self.flush(chat_id)
+
+    def render(self, buffer: List[DigestEntry]) -> str:
+        lines = [self.title.format(count=len(buffer)), '']
+        lines.extend(f"• {html.escape(text)}" for _, text, *_ in buffer[:MAX_DIGEST_ITEMS])
+        if len(buffer) > MAX_DIGEST_ITEMS:
+            lines.append(f"… va yana {len(buffer) - MAX_DIGEST_ITEMS} ta")
+        return "\n".join(lines)
+
+    def keyboard(self, ids: List[str]) -> InlineKeyboardMarkup:
+        buttons = [
+            InlineKeyboardButton(text=f"📋 #{item_id}", callback_data=f"{self.callback_prefix}{item_id}")
+            for item_id in ids[:MAX_DIGEST_ITEMS]
+        ]
+        return InlineKeyboardMarkup(inline_keyboard=[
+            buttons[start:start + BUTTONS_PER_ROW] for start in range(0, len(buttons), BUTTONS_PER_ROW)
+        ])
+
+    @property
+    def pending(self) -> int:
+        return sum(len(buffer) for buffer in self._buffers.values())
+
+    def summary(self) -> Dict[str, Any]:
+        total = self.stats['immediate'] + self.stats['buffered']
+        return {
+            **self.stats,
+            'pending': self.pending,
+            'saved_percent': round(self.stats['saved'] / total * 100, 1) if total else 0.0,
+        }
+
+
+# Manager'larga yangi ariza xabarlari (client/connection_order)
+new_order_digest = BurstCoalescer(notification_outbox)
+
+
+async def stop_new_order_digest() -> None:
+    """Yig'ilgan xabarlarni outbox yopilishidan oldin navbatga o'tkazish"""
+    new_order_digest.flush_all()
+    logger.info(f"Digest stats: {new_order_digest.summary()}")
@@ -0,0 +1,505 @@
+"""
+Notification Outbox - Rate-limited Telegram Fan-out
+
+Handler'lar xabarlarni navbatga qo'yadi va darhol qaytadi; yuborishni fon
+vazifasi Telegram cheklovlariga rioya qilgan holda bajaradi.
+
+- Umumiy token bucket: ~30 xabar/sekund (OUTBOX_RATE)
+- Har bir chat uchun: 1 xabar/sekund, guruhlar uchun qo'shimcha 20 xabar/daqiqa
+- Bitta chatga xabarlar navbat tartibida: chatga yuborish tugamaguncha keyingisi
+  kutadi, xato bilan qayta urinishda esa chat qayta urinish vaqtigacha ushlab turiladi
+- Chegaralar ichida parallel yuborish (OUTBOX_CONCURRENCY)
+- 429 (TelegramRetryAfter) - retry_after o'tgach qayta yuboriladi va
+  urinishlar soniga qo'shilmaydi; tarmoq xatolari - eksponensial kutish bilan cheklangan marta
+- Bot bloklangan / chat topilmagan - qayta urinilmaydi
+- Yetkazish statistikasi: notification_outbox.stats, summary()
+
+Doimiy navbat (OUTBOX_DB, SQLite):
+- Har bir xabar yuborilishidan oldin diskka yoziladi; bot qayta ishga
+  tushganda yuborilmagan xabarlar tiklanadi
+- dedup_key (masalan, "new_order:<request_id>:<chat_id>") - bir xil xabar
+  ikki marta navbatga qo'yilmaydi, restart'dan keyin ham
+- Qayta urinishlar: eksponensial kutish + jitter; urinishlar tugasa
+  xabar dead-letter holatiga o'tadi (admin "Tizim holati" ekranida ko'rinadi)
+- Yozuvlar kichik va WAL rejimida - event loop ichida sinxron bajariladi
+"""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import os
+import pickle
+import random
+import sqlite3
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Set, Tuple
+
+from aiogram.exceptions import TelegramBadRequest, TelegramForbiddenError, TelegramRetryAfter
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RATE = float(os.getenv('OUTBOX_RATE', 30))
+DEFAULT_CONCURRENCY = int(os.getenv('OUTBOX_CONCURRENCY', 8))
+DEFAULT_MAX_ATTEMPTS = int(os.getenv('OUTBOX_MAX_ATTEMPTS', 5))
+DEFAULT_DB_PATH = os.getenv('OUTBOX_DB', 'notification_outbox.sqlite3')
+DEFAULT_RETENTION = 7 * 24 * 60 * 60  # yuborilgan yozuvlar (dedup uchun) 7 kun saqlanadi
+
+BACKOFF_BASE = 2.0  # sekund
+BACKOFF_CAP = 300.0
+
+CHAT_INTERVAL = 1.0  # sekund - bitta chatga ketma-ket xabarlar orasida
+GROUP_PER_MINUTE = 20
+
+
+class TokenBucket:
+    """Oddiy token bucket: rate token/sekund, capacity - ruxsat etilgan portlash"""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity or rate
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self) -> None:
+        self._refill()
+        while self._tokens < 1:
+            await asyncio.sleep((1 - self._tokens) / self.rate)
+            self._refill()
+        self._tokens -= 1
+
+
+def backoff_delay(attempts: int, base: float = BACKOFF_BASE, cap: float = BACKOFF_CAP) -> float:
+    """Eksponensial kutish + jitter: [d/2, d], d = min(cap, base * 2^(n-1))"""
+    delay = min(cap, base * 2 ** max(attempts - 1, 0))
+    return delay / 2 + random.uniform(0, delay / 2)
+
+
+class OutboxItem:
+    """Navbatdagi bitta xabar"""
+
+    __slots__ = ('chat_id', 'method', 'kwargs', 'bot', 'attempts', 'enqueued_at', 'row_id', 'dedup_key')
+
+    def __init__(self, chat_id: int, method: str, kwargs: Dict[str, Any], bot: Any = None, dedup_key: Optional[str] = None):
+        self.chat_id = chat_id
+        self.method = method
+        self.kwargs = kwargs
+        self.bot = bot
+        self.attempts = 0
+        self.enqueued_at = time.monotonic()
+        self.row_id: Optional[int] = None
+        self.dedup_key = dedup_key
+
+
+class SQLiteOutboxStore:
+    """Xabarlar jurnali: pending -> sent | dead"""
+
+    def __init__(self, path: str = DEFAULT_DB_PATH):
+        self.path = path
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS outbox ("
+                "id INTEGER PRIMARY KEY AUTOINCREMENT, dedup_key TEXT UNIQUE, "
+                "chat_id INTEGER NOT NULL, method TEXT NOT NULL, payload BLOB NOT NULL, "
+                "status TEXT NOT NULL DEFAULT 'pending', attempts INTEGER NOT NULL DEFAULT 0, "
+                "next_attempt_at REAL NOT NULL, last_error TEXT, "
+                "created_at REAL NOT NULL, updated_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_outbox_status ON outbox(status, next_attempt_at)")
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def add(self, item: OutboxItem) -> Optional[int]:
+        """Yangi xabarni yozish; dedup_key avval uchragan bo'lsa None"""
+        now = time.time()
+        conn = self._connect()
+        with conn:
+            cursor = conn.execute(
+                "INSERT OR IGNORE INTO outbox (dedup_key, chat_id, method, payload, next_attempt_at, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (item.dedup_key, item.chat_id, item.method, pickle.dumps(item.kwargs), now, now, now),
+            )
+        return cursor.lastrowid if cursor.rowcount else None
+
+    def mark_sent(self, row_id: int) -> None:
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE outbox SET status = 'sent', last_error = NULL, updated_at = ? WHERE id = ?",
+                (time.time(), row_id),
+            )
+
+    def mark_retry(self, row_id: int, attempts: int, next_attempt_at: float, error: str) -> None:
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE outbox SET attempts = ?, next_attempt_at = ?, last_error = ?, updated_at = ? WHERE id = ?",
+                (attempts, next_attempt_at, error, time.time(), row_id),
+            )
+
+    def mark_dead(self, row_id: int, attempts: int, error: str) -> None:
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE outbox SET status = 'dead', attempts = ?, last_error = ?, updated_at = ? WHERE id = ?",
+                (attempts, error, time.time(), row_id),
+            )
+
+    def _items(self, rows: List[Tuple]) -> List[Tuple[OutboxItem, float]]:
+        items = []
+        for row_id, dedup_key, chat_id, method, payload, attempts, next_attempt_at in rows:
+            item = OutboxItem(chat_id, method, pickle.loads(payload), dedup_key=dedup_key)
+            item.row_id = row_id
+            item.attempts = attempts
+            items.append((item, next_attempt_at))
+        return items
+
+    def load_pending(self) -> List[Tuple[OutboxItem, float]]:
+        """Yuborilmagan xabarlar va ularning navbatdagi urinish vaqti (time.time())"""
+        rows = self._connect().execute(
+            "SELECT id, dedup_key, chat_id, method, payload, attempts, next_attempt_at "
+            "FROM outbox WHERE status = 'pending' ORDER BY id"
+        ).fetchall()
+        return self._items(rows)
+
+    def dead_letters(self, limit: int = 10) -> List[Dict[str, Any]]:
+        rows = self._connect().execute(
+            "SELECT id, dedup_key, chat_id, method, attempts, last_error, updated_at "
+            "FROM outbox WHERE status = 'dead' ORDER BY updated_at DESC LIMIT ?",
+            (limit,),
+        ).fetchall()
+        keys = ('id', 'dedup_key', 'chat_id', 'method', 'attempts', 'last_error', 'updated_at')
+        return [dict(zip(keys, row)) for row in rows]
+
+    def counts(self) -> Dict[str, int]:
+        rows = self._connect().execute("SELECT status, COUNT(*) FROM outbox GROUP BY status").fetchall()
+        return dict(rows)
+
+    def requeue_dead(self) -> List[Tuple[OutboxItem, float]]:
+        """Dead-letter xabarlarni qayta navbatga qaytarish (urinishlar noldan)"""
+        now = time.time()
+        conn = self._connect()
+        with conn:
+            rows = conn.execute(
+                "SELECT id, dedup_key, chat_id, method, payload, 0, ? FROM outbox WHERE status = 'dead' ORDER BY id",
+                (now,),
+            ).fetchall()
+            conn.execute(
+                "UPDATE outbox SET status = 'pending', attempts = 0, next_attempt_at = ?, updated_at = ? WHERE status = 'dead'",
+                (now, now),
+            )
+        return self._items(rows)
+
+    def delete_dead(self) -> int:
+        with self._connect() as conn:
+            cursor = conn.execute("DELETE FROM outbox WHERE status = 'dead'")
+        return cursor.rowcount
+
+    def purge_sent(self, retention: float = DEFAULT_RETENTION) -> int:
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "DELETE FROM outbox WHERE status = 'sent' AND updated_at < ?", (time.time() - retention,)
+            )
+        return cursor.rowcount
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+class NotificationOutbox:
+    """Rate-limited xabarlar navbati"""
+
+    def __init__(
+        self,
+        rate: float = DEFAULT_RATE,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+        chat_interval: float = CHAT_INTERVAL,
+        group_per_minute: int = GROUP_PER_MINUTE,
+        store: Optional[SQLiteOutboxStore] = None,
+        bucket: Optional[TokenBucket] = None,
+    ):
+        self.bot: Any = None
+        self.store = store
+        self.max_attempts = max_attempts
+        self.chat_interval = chat_interval
+        self.group_per_minute = group_per_minute
+        # Portlashsiz tekis tezlik - birinchi sekundda ham ~rate ta xabar
+        self._bucket = bucket or TokenBucket(rate, capacity=1)
+        self._concurrency = concurrency
+        self._slots: Optional[asyncio.Semaphore] = None
+        # (tayyor bo'lish vaqti, tartib raqami, xabar)
+        self._heap: List[Tuple[float, int, OutboxItem]] = []
+        self._seq = itertools.count()
+        self._chat_ready: Dict[int, float] = {}
+        self._group_sent: Dict[int, Deque[float]] = {}
+        # chat_id -> shu chatga yuborish tugashini kutayotgan xabarlar (navbat tartibida)
+        self._busy: Dict[int, List[OutboxItem]] = {}
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._sending: Set[asyncio.Task] = set()
+        self.stats = {
+            'enqueued': 0,
+            'sent': 0,
+            'failed': 0,
+            'retried': 0,
+            'rate_limited': 0,
+            'duplicates': 0,
+        }
+        self._latency_total = 0.0
+        self._purged_at = 0.0
+        self._restored = False
+
+    # --- Navbatga qo'yish ---
+
+    def enqueue(self, chat_id: int, text: str, bot: Any = None, dedup_key: Optional[str] = None, **kwargs: Any) -> bool:
+        """send_message'ni navbatga qo'yish (kutmasdan qaytadi)"""
+        return self.enqueue_method('send_message', chat_id, bot=bot, dedup_key=dedup_key, text=text, **kwargs)
+
+    def enqueue_many(self, chat_ids: List[int], text: str, bot: Any = None, dedup_key: Optional[str] = None, **kwargs: Any) -> int:
+        """Bir nechta chatga; dedup_key berilsa har bir qabul qiluvchi uchun "<dedup_key>:<chat_id>" """
+        return sum(
+            self.enqueue(chat_id, text, bot=bot, dedup_key=f"{dedup_key}:{chat_id}" if dedup_key else None, **kwargs)
+            for chat_id in dict.fromkeys(chat_ids)
+        )
+
+    def enqueue_method(self, method: str, chat_id: int, bot: Any = None, dedup_key: Optional[str] = None, **kwargs: Any) -> bool:
+        """Istalgan bot.<method>(chat_id=..., **kwargs) chaqiruvini navbatga qo'yish; dublikat bo'lsa False"""
+        self._ensure_running()
+        item = OutboxItem(chat_id, method, kwargs, bot, dedup_key)
+        if self.store is not None:
+            try:
+                item.row_id = self.store.add(item)
+            except Exception as e:
+                # Jurnal ishlamasa ham xabar xotiradagi navbat orqali yuboriladi
+                logger.error(f"Outbox store error: {e}")
+            else:
+                if item.row_id is None:
+                    self.stats['duplicates'] += 1
+                    return False
+        self.stats['enqueued'] += 1
+        self._push(item, time.monotonic())
+        return True
+
+    def _push(self, item: OutboxItem, ready_at: float) -> None:
+        heapq.heappush(self._heap, (ready_at, next(self._seq), item))
+        self._wakeup.set()
+
+    # --- Chat cheklovlari ---
+
+    def _chat_ready_at(self, chat_id: int, now: float) -> float:
+        ready_at = self._chat_ready.get(chat_id, 0.0)
+        sent = self._group_sent.get(chat_id)
+        if sent:
+            while sent and sent[0] <= now - 60:
+                sent.popleft()
+            if len(sent) >= self.group_per_minute:
+                ready_at = max(ready_at, sent[0] + 60)
+        return ready_at
+
+    def _reserve_chat(self, chat_id: int, now: float) -> None:
+        self._chat_ready[chat_id] = now + self.chat_interval
+        # Manfiy ID - guruh yoki kanal
+        if chat_id < 0:
+            self._group_sent.setdefault(chat_id, deque()).append(now)
+
+    # --- Yuborish ---
+
+    def _ensure_running(self) -> None:
+        if self._task is None or self._task.done():
+            self._wakeup = asyncio.Event()
+            self._slots = asyncio.Semaphore(self._concurrency)
+            self._task = asyncio.create_task(self._run())
+
+    async def _run(self) -> None:
+        while True:
+            if not self._heap:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+
+            ready_at = self._heap[0][0]
+            now = time.monotonic()
+            if ready_at > now:
+                # Erta tayyor bo'ladigan yangi xabar kelsa uyg'onamiz
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), ready_at - now)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            _, _, item = heapq.heappop(self._heap)
+            parked = self._busy.get(item.chat_id)
+            if parked is not None:
+                parked.append(item)
+                continue
+            chat_ready = self._chat_ready_at(item.chat_id, now)
+            if chat_ready > now:
+                self._push(item, chat_ready)
+                continue
+
+            await self._bucket.acquire()
+            await self._slots.acquire()
+            self._reserve_chat(item.chat_id, time.monotonic())
+            self._busy[item.chat_id] = []
+            task = asyncio.create_task(self._deliver(item))
+            self._sending.add(task)
+            task.add_done_callback(self._sending.discard)
+
+    async def _deliver(self, item: OutboxItem) -> None:
+        item.attempts += 1
+        try:
+            bot = item.bot or self.bot
+            if bot is None:
+                raise RuntimeError("Outbox uchun bot ulanmagan")
+            await getattr(bot, item.method)(chat_id=item.chat_id, **item.kwargs)
+            self.stats['sent'] += 1
+            self._latency_total += time.monotonic() - item.enqueued_at
+            self._store_call('mark_sent', item)
+        except TelegramRetryAfter as e:
+            # 429 - yetkazish xatosi emas, urinish hisoblanmaydi
+            item.attempts -= 1
+            self.stats['rate_limited'] += 1
+            delay = e.retry_after + random.uniform(0, 1)
+            self._retry(item, delay, f"429, retry_after={e.retry_after}")
+        except (TelegramForbiddenError, TelegramBadRequest) as e:
+            # Bot bloklangan yoki chat topilmagan - qayta urinish foydasiz
+            self._fail(item, str(e))
+        except Exception as e:
+            self._retry(item, backoff_delay(item.attempts), str(e))
+        finally:
+            self._slots.release()
+            # Kutayotgan xabarlar asl tartibda qaytadi; chat ushlab turilgan bo'lsa - shu vaqtgacha
+            now = time.monotonic()
+            for parked in self._busy.pop(item.chat_id, ()):
+                self._push(parked, now)
+
+    def _retry(self, item: OutboxItem, delay: float, reason: str) -> None:
+        if item.attempts >= self.max_attempts:
+            self._fail(item, f"{item.attempts} attempts: {reason}")
+            return
+        self.stats['retried'] += 1
+        logger.info(f"Outbox: retrying {item.method} to {item.chat_id} in {delay:.1f}s ({reason})")
+        self._store_call('mark_retry', item, item.attempts, time.time() + delay, reason)
+        retry_at = time.monotonic() + delay
+        # Keyingi xabarlar (post media, lokatsiya) shu xabardan oldin ketmasin
+        self._chat_ready[item.chat_id] = max(self._chat_ready.get(item.chat_id, 0.0), retry_at)
+        self._push(item, retry_at)
+
+    def _fail(self, item: OutboxItem, reason: str) -> None:
+        self.stats['failed'] += 1
+        logger.error(f"Outbox: {item.method} to {item.chat_id} moved to dead letters: {reason}")
+        self._store_call('mark_dead', item, item.attempts, reason)
+
+    def _store_call(self, method: str, item: OutboxItem, *args: Any) -> None:
+        if self.store is None or item.row_id is None:
+            return
+        try:
+            getattr(self.store, method)(item.row_id, *args)
+            if method == 'mark_sent' and time.monotonic() - self._purged_at > 3600:
+                self._purged_at = time.monotonic()
+                self.store.purge_sent()
+        except Exception as e:
+            logger.error(f"Outbox store error: {e}")
+
+    # --- Jurnal ---
+
+    def restore(self) -> int:
+        """Restart'dan keyin yuborilmagan xabarlarni navbatga qaytarish"""
+        if self.store is None or self._restored:
+            return 0
+        self._restored = True
+        self._ensure_running()
+        items = self.store.load_pending()
+        self._push_restored(items)
+        if items:
+            logger.info(f"Outbox: restored {len(items)} pending notifications")
+        return len(items)
+
+    def _push_restored(self, items: List[Tuple[OutboxItem, float]]) -> None:
+        now, wall = time.monotonic(), time.time()
+        for item, next_attempt_at in items:
+            self._push(item, now + max(0.0, next_attempt_at - wall))
+
+    def dead_letters(self, limit: int = 10) -> List[Dict[str, Any]]:
+        return self.store.dead_letters(limit) if self.store is not None else []
+
+    def requeue_dead(self) -> int:
+        if self.store is None:
+            return 0
+        self._ensure_running()
+        items = self.store.requeue_dead()
+        self._push_restored(items)
+        return len(items)
+
+    def delete_dead(self) -> int:
+        return self.store.delete_dead() if self.store is not None else 0
+
+    # --- Holat ---
+
+    @property
+    def pending(self) -> int:
+        return len(self._heap) + len(self._sending) + sum(len(items) for items in self._busy.values())
+
+    def summary(self) -> Dict[str, Any]:
+        sent = self.stats['sent']
+        return {
+            **self.stats,
+            'pending': self.pending,
+            'dead': self.store.counts().get('dead', 0) if self.store is not None else 0,
+            'avg_delivery_seconds': round(self._latency_total / sent, 2) if sent else 0.0,
+        }
+
+    async def drain(self, timeout: float = 10) -> bool:
+        """Navbat bo'shaguncha kutish (shutdown uchun)"""
+        deadline = time.monotonic() + timeout
+        while self.pending and time.monotonic() < deadline:
+            await asyncio.sleep(0.05)
+        return not self.pending
+
+    async def close(self, timeout: float = 10) -> None:
+        if self._task is None:
+            return
+        if not await self.drain(timeout):
+            # Jurnaldagi xabarlar keyingi ishga tushishda yuboriladi
+            logger.warning(f"Outbox closed with {self.pending} undelivered notifications")
+        self._task.cancel()
+        for task in list(self._sending):
+            task.cancel()
+        self._task = None
+        logger.info(f"Outbox stats: {self.summary()}")
+        if self.store is not None:
+            self.store.close()
+
+
+# Bot bo'yicha umumiy limit - outbox va ommaviy xabarlar (utils.broadcast) bitta bucket'dan oladi
+telegram_rate_limiter = TokenBucket(DEFAULT_RATE, capacity=1)
+
+notification_outbox = NotificationOutbox(
+    store=SQLiteOutboxStore() if DEFAULT_DB_PATH else None,
+    bucket=telegram_rate_limiter,
+)
+
+
+async def start_notification_outbox(bot: Any = None) -> None:
+    """Outbox'ni loader'dagi bot bilan ishga tushirish va jurnaldan tiklash"""
+    if bot is not None:
+        notification_outbox.bot = bot
+    notification_outbox.restore()
+
+
+async def stop_notification_outbox() -> None:
+    await notification_outbox.close()
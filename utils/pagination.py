@@ -0,0 +1,97 @@
+"""
+Pagination - Keyset Cursors and Cached Counts
+
+Bu modul ro'yxatlarni OFFSET o'rniga (created_at, id) kaliti bo'yicha
+sahifalash uchun yordamchi funksiyalarni o'z ichiga oladi.
+
+- Kursor shaffof emas (opaque): binar (vaqt + id) base64url satr; UUID id bilan
+  ham 34 belgi - callback_data (64 bayt) ichiga sig'adi
+- Chuqur sahifalar birinchi sahifa bilan bir xil narxda - WHERE (created_at, id) < kursor
+- Umumiy son taxminiy va TTL bilan keshlanadi - har bir sahifada COUNT qilinmaydi
+"""
+
+import base64
+import struct
+import time
+import uuid
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+DEFAULT_COUNT_TTL = 60  # sekund
+
+
+_MICROS = struct.Struct('>q')
+
+
+def _pack_id(row_id: Any) -> bytes:
+    # Tur belgisi + ixcham ko'rinish: UUID - 16 bayt, butun son - 8 bayt, qolgani - utf-8
+    text = str(row_id)
+    try:
+        if text.lstrip('-').isdigit():
+            return b'i' + _MICROS.pack(int(text))
+    except struct.error:
+        pass
+    try:
+        parsed = uuid.UUID(text)
+        if str(parsed) == text:
+            return b'u' + parsed.bytes
+    except ValueError:
+        pass
+    return b's' + text.encode('utf-8')
+
+
+def _unpack_id(raw: bytes) -> str:
+    kind, body = raw[:1], raw[1:]
+    if kind == b'i':
+        return str(_MICROS.unpack(body)[0])
+    if kind == b'u':
+        return str(uuid.UUID(bytes=body))
+    if kind == b's':
+        return body.decode('utf-8')
+    raise ValueError(f"Unknown cursor id type: {kind!r}")
+
+
+def encode_cursor(created_at: datetime, row_id: Any) -> str:
+    """(created_at, id) kalitini callback_data uchun qisqa satrga aylantirish"""
+    micros = round(created_at.timestamp() * 1_000_000)
+    raw = _MICROS.pack(micros) + _pack_id(row_id)
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[Tuple[datetime, str]]:
+    """Kursorni (created_at, id) ga qaytarish; noto'g'ri bo'lsa None"""
+    if not cursor:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        (micros,) = _MICROS.unpack(raw[:_MICROS.size])
+        row_id = _unpack_id(raw[_MICROS.size:])
+        seconds, micro = divmod(micros, 1_000_000)
+        return datetime.fromtimestamp(seconds).replace(microsecond=micro), row_id
+    except (ValueError, UnicodeDecodeError, struct.error):
+        return None
+
+
+class CountCache:
+    """Taxminiy umumiy sonlar uchun TTL kesh"""
+
+    def __init__(self, ttl: float = DEFAULT_COUNT_TTL):
+        self.ttl = ttl
+        self._entries: Dict[Any, Tuple[int, float]] = {}
+
+    async def get_or_load(self, key: Any, loader: Callable[[], Awaitable[int]]) -> int:
+        entry = self._entries.get(key)
+        if entry is not None and time.monotonic() - entry[1] < self.ttl:
+            return entry[0]
+        value = await loader()
+        self._entries[key] = (value, time.monotonic())
+        return value
+
+    def adjust(self, key: Any, delta: int) -> None:
+        """Yangi yozuv qo'shilganda/o'chirilganda keshni qayta hisoblamasdan tuzatish"""
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries[key] = (max(0, entry[0] + delta), entry[1])
+
+    def invalidate(self, key: Any) -> None:
+        self._entries.pop(key, None)
@@ -0,0 +1,159 @@
+"""
+Phone Index - Normalized Phone Number Lookup
+
+Bu modul mijozlarni telefon raqami (to'liq yoki qisman) bo'yicha topish uchun
+umumiy indeksni taqdim etadi. Call center va junior manager oqimlari bitta
+indeksdan foydalanadi.
+
+- Raqamlar E.164 ko'rinishiga keltiriladi: "90 123-45-67", "8 (90) 1234567",
+  "998901234567" -> "+998901234567"
+- Prefiks qidiruv: saralangan massiv + bisect ("+99890", "90 12")
+- Suffiks qidiruv: teskari yozilgan raqamlar massivi ("oxirgi 7 raqam")
+- Natijalar soni cheklangan - qidiruv vaqti abonentlar soniga bog'liq emas
+- get(client_id) - qidiruvda tanlangan mijozni xuddi shu yozuvlardan olish
+"""
+
+import bisect
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+COUNTRY_CODE = '998'
+NATIONAL_LENGTH = 9  # 90 123 45 67
+
+_NON_DIGITS = re.compile(r'\D')
+
+
+def phone_digits(phone: Any) -> str:
+    return _NON_DIGITS.sub('', str(phone or ''))
+
+
+def normalize_phone(phone: Any) -> Optional[str]:
+    """Telefon raqamini E.164 formatiga keltirish; noto'g'ri bo'lsa None"""
+    digits = phone_digits(phone)
+    if len(digits) == NATIONAL_LENGTH:
+        digits = COUNTRY_CODE + digits
+    elif len(digits) == NATIONAL_LENGTH + 1 and digits.startswith('8'):
+        # Eski format: 8 (90) 123-45-67
+        digits = COUNTRY_CODE + digits[1:]
+    if not 10 <= len(digits) <= 15:
+        return None
+    return '+' + digits
+
+
+class PhoneIndex:
+    """Telefon raqamlari bo'yicha prefiks/suffiks indeks"""
+
+    def __init__(self):
+        # (raqamlar, seq) - saralangan; suffiks uchun raqamlar teskari yoziladi
+        self._prefix: List[Tuple[str, int]] = []
+        self._suffix: List[Tuple[str, int]] = []
+        self._records: Dict[int, Dict[str, Any]] = {}
+        self._keys: Dict[Any, Tuple[str, int]] = {}
+        # client id -> yozuv (telefoni yo'q mijozlar ham)
+        self._clients: Dict[Any, Dict[str, Any]] = {}
+        self._seq = 0
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    # --- Yozish ---
+
+    def add(self, client: Dict[str, Any], phone_field: str = 'phone') -> bool:
+        """Mijozni indeksga qo'shish yoki yangilash (kalit - client['id'])"""
+        self.remove(client['id'])
+        self._clients[client['id']] = client
+        phone = normalize_phone(client.get(phone_field))
+        if phone is None:
+            return False
+
+        self._seq += 1
+        digits = phone[1:]
+        bisect.insort(self._prefix, (digits, self._seq))
+        bisect.insort(self._suffix, (digits[::-1], self._seq))
+        self._records[self._seq] = client
+        self._keys[client['id']] = (digits, self._seq)
+        return True
+
+    def add_many(self, clients: List[Dict[str, Any]], phone_field: str = 'phone') -> None:
+        """Ko'p mijozni yuklash - saralash oxirida bir marta"""
+        # Eski yozuvlar saralangan massivlar hali buzilmasdan olib tashlanadi
+        for client in clients:
+            self.remove(client['id'])
+        for client in clients:
+            self._clients[client['id']] = client
+            phone = normalize_phone(client.get(phone_field))
+            if phone is None:
+                continue
+            self._seq += 1
+            digits = phone[1:]
+            self._prefix.append((digits, self._seq))
+            self._suffix.append((digits[::-1], self._seq))
+            self._records[self._seq] = client
+            self._keys[client['id']] = (digits, self._seq)
+        self._prefix.sort()
+        self._suffix.sort()
+
+    def remove(self, client_id: Any) -> bool:
+        self._clients.pop(client_id, None)
+        key = self._keys.pop(client_id, None)
+        if key is None:
+            return False
+        digits, seq = key
+        del self._prefix[bisect.bisect_left(self._prefix, key)]
+        del self._suffix[bisect.bisect_left(self._suffix, (digits[::-1], seq))]
+        del self._records[seq]
+        return True
+
+    # --- Qidirish ---
+
+    def get(self, client_id: Any) -> Optional[Dict[str, Any]]:
+        """Indeksga qo'shilgan mijoz yozuvi (id bo'yicha)"""
+        return self._clients.get(client_id)
+
+    @staticmethod
+    def _range(array: List[Tuple[str, int]], prefix: str, limit: int) -> List[int]:
+        result = []
+        index = bisect.bisect_left(array, (prefix,))
+        while index < len(array) and len(result) < limit:
+            key, seq = array[index]
+            if not key.startswith(prefix):
+                break
+            result.append(seq)
+            index += 1
+        return result
+
+    def lookup(self, phone: Any) -> List[Dict[str, Any]]:
+        """To'liq raqam bo'yicha aniq moslik"""
+        normalized = normalize_phone(phone)
+        if normalized is None:
+            return []
+        digits = normalized[1:]
+        result = []
+        index = bisect.bisect_left(self._prefix, (digits,))
+        while index < len(self._prefix) and self._prefix[index][0] == digits:
+            result.append(self._records[self._prefix[index][1]])
+            index += 1
+        return result
+
+    def search(self, query: Any, limit: int = 10, min_digits: int = 3) -> List[Dict[str, Any]]:
+        """Qisman raqam bo'yicha qidirish: avval prefiks, keyin suffiks mosliklar"""
+        raw = str(query or '').strip()
+        digits = phone_digits(raw)
+        if len(digits) < min_digits:
+            return []
+
+        seqs: List[int] = []
+        if raw.startswith('+') or digits.startswith(COUNTRY_CODE):
+            seqs += self._range(self._prefix, digits, limit)
+        else:
+            if len(digits) <= NATIONAL_LENGTH:
+                # "90 123" - operator kodidan boshlangan milliy raqam
+                seqs += self._range(self._prefix, COUNTRY_CODE + digits, limit)
+            # "1234567" - oxirgi raqamlar
+            seqs += self._range(self._suffix, digits[::-1], limit)
+
+        return [self._records[seq] for seq in dict.fromkeys(seqs)][:limit]
+
+
+# Mijozlar uchun umumiy indeks (call center, junior manager)
+client_phone_index = PhoneIndex()
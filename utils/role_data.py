@@ -7,13 +7,14 @@ Each role has its own specific data structure and content.
 
 import random
 from datetime import datetime, timedelta
-from typing import Dict, List, Any
+from itertools import islice
+from typing import Dict, List, Any, Iterator
 from faker import Faker
 
 fake = Faker(['uz_UZ', 'ru_RU'])
 
 # Export limits for performance
-MAX_EXPORT_ROWS = 1000  # Maximum rows for single export
+MAX_EXPORT_ROWS = 1000  # Maximum rows for single in-memory export (Excel, Word, PDF)
 
 # Common data pools
 TECHNICIAN_NAMES = [
@@ -41,14 +42,17 @@ EQUIPMENT_TYPES = [
     "Connector RJ45", "Connector F-type", "Switch", "Optical converter"
 ]
 
-# Manager Role Data
-def generate_manager_orders_data(count: int = 100) -> List[Dict[str, Any]]:
-    """Generate orders data for Manager role"""
-    orders = []
-    start_date = datetime.now() - timedelta(days=30)
-    
+def _descending_dates(count: int, span: timedelta, end: datetime = None) -> Iterator[datetime]:
+    """Yield `count` dates from `end` backwards over `span`, newest first"""
+    end = end or datetime.now()
+    step = span / max(count, 1)
     for i in range(count):
-        order_date = start_date + timedelta(days=random.randint(0, 30), hours=random.randint(0, 23))
+        yield end - step * (i + random.random())
+
+# Manager Role Data
+def iter_manager_orders_data(count: int = 100) -> Iterator[Dict[str, Any]]:
+    """Yield orders for Manager role lazily, newest first"""
+    for i, order_date in enumerate(_descending_dates(count, timedelta(days=30))):
         status = random.choice(STATUSES)
         
         order = {
@@ -65,9 +69,11 @@ def generate_manager_orders_data(count: int = 100) -> List[Dict[str, Any]]:
             "comment": fake.sentence() if random.random() > 0.5 else "-",
             "amount": f"{random.randint(50, 500) * 1000:,} so'm" if status == "Bajarilgan" else "-"
         }
-        orders.append(order)
-    
-    return sorted(orders, key=lambda x: x["created_date"], reverse=True)
+        yield order
+
+def generate_manager_orders_data(count: int = 100) -> List[Dict[str, Any]]:
+    """Generate orders data for Manager role"""
+    return list(iter_manager_orders_data(count))
 
 def generate_manager_statistics_data() -> Dict[str, Any]:
     """Generate statistics data for Manager role"""
@@ -157,13 +163,9 @@ def generate_manager_reports_data() -> Dict[str, Any]:
     }
 
 # Controller Role Data
-def generate_controller_orders_data(count: int = 120) -> List[Dict[str, Any]]:
-    """Generate orders data for Controller role with quality metrics"""
-    orders = []
-    start_date = datetime.now() - timedelta(days=30)
-    
-    for i in range(count):
-        order_date = start_date + timedelta(days=random.randint(0, 30), hours=random.randint(0, 23))
+def iter_controller_orders_data(count: int = 120) -> Iterator[Dict[str, Any]]:
+    """Yield orders for Controller role with quality metrics lazily, newest first"""
+    for i, order_date in enumerate(_descending_dates(count, timedelta(days=30))):
         status = random.choice(STATUSES)
         
         order = {
@@ -181,9 +183,11 @@ def generate_controller_orders_data(count: int = 120) -> List[Dict[str, Any]]:
             "client_feedback": random.choice(["Juda yaxshi", "Yaxshi", "Qoniqarli", "Yomon"]) if status == "Bajarilgan" else "-",
             "issues_found": random.randint(0, 3) if status == "Bajarilgan" else 0
         }
-        orders.append(order)
-    
-    return sorted(orders, key=lambda x: x["created_date"], reverse=True)
+        yield order
+
+def generate_controller_orders_data(count: int = 120) -> List[Dict[str, Any]]:
+    """Generate orders data for Controller role with quality metrics"""
+    return list(iter_controller_orders_data(count))
 
 def generate_controller_quality_data() -> Dict[str, Any]:
     """Generate quality control data for Controller role"""
@@ -238,14 +242,9 @@ def generate_controller_technicians_data(count: int = 45) -> List[Dict[str, Any]
     return sorted(technicians, key=lambda x: float(x["quality_score"]), reverse=True)
 
 # Call Center Supervisor Role Data
-def generate_ccs_orders_data(count: int = 150) -> List[Dict[str, Any]]:
-    """Generate orders data for Call Center Supervisor role"""
-    orders = []
-    start_date = datetime.now() - timedelta(days=30)
-    
-    for i in range(count):
-        order_date = start_date + timedelta(days=random.randint(0, 30), hours=random.randint(0, 23))
-        
+def iter_ccs_orders_data(count: int = 150) -> Iterator[Dict[str, Any]]:
+    """Yield orders for Call Center Supervisor role lazily, newest first"""
+    for i, order_date in enumerate(_descending_dates(count, timedelta(days=30))):
         order = {
             "id": f"Z-{3000 + i}",
             "client_name": fake.name(),
@@ -260,9 +259,11 @@ def generate_ccs_orders_data(count: int = 150) -> List[Dict[str, Any]]:
             "client_mood": random.choice(["Juda mamnun", "Mamnun", "Neytral", "Norozi"]),
             "follow_up_required": random.choice(["Ha", "Yo'q"])
         }
-        orders.append(order)
-    
-    return sorted(orders, key=lambda x: x["created_date"], reverse=True)
+        yield order
+
+def generate_ccs_orders_data(count: int = 150) -> List[Dict[str, Any]]:
+    """Generate orders data for Call Center Supervisor role"""
+    return list(iter_ccs_orders_data(count))
 
 def generate_ccs_users_data(count: int = 30) -> List[Dict[str, Any]]:
     """Generate call center staff data for Call Center Supervisor role"""
@@ -286,17 +287,15 @@ def generate_ccs_users_data(count: int = 30) -> List[Dict[str, Any]]:
     
     return sorted(staff, key=lambda x: x["name"])
 
-def generate_ccs_feedback_data(count: int = 50) -> List[Dict[str, Any]]:
-    """Generate customer feedback data for Call Center Supervisor role"""
-    feedback_list = []
-    
-    for i in range(count):
+def iter_ccs_feedback_data(count: int = 50) -> Iterator[Dict[str, Any]]:
+    """Yield customer feedback for Call Center Supervisor role lazily, newest first"""
+    for i, feedback_date in enumerate(_descending_dates(count, timedelta(days=30))):
         feedback = {
             "id": f"F-{400 + i}",
             "client_name": fake.name(),
             "order_id": f"Z-{random.randint(1000, 3000)}",
             "operator": random.choice(OPERATOR_NAMES),
-            "date": (datetime.now() - timedelta(days=random.randint(0, 30))).strftime("%Y-%m-%d %H:%M"),
+            "date": feedback_date.strftime("%Y-%m-%d %H:%M"),
             "rating": random.randint(1, 5),
             "category": random.choice(["Xizmat sifati", "Operator muomalasi", "Texnik masala", "Narx", "Boshqa"]),
             "comment": fake.sentence(),
@@ -304,9 +303,11 @@ def generate_ccs_feedback_data(count: int = 50) -> List[Dict[str, Any]]:
             "response_time": f"{random.randint(5, 120)} daqiqa",
             "resolution": random.choice(["Mijoz qoniqdi", "Qisman hal qilindi", "Hal qilinmadi", "-"])
         }
-        feedback_list.append(feedback)
-    
-    return sorted(feedback_list, key=lambda x: x["date"], reverse=True)
+        yield feedback
+
+def generate_ccs_feedback_data(count: int = 50) -> List[Dict[str, Any]]:
+    """Generate customer feedback data for Call Center Supervisor role"""
+    return list(iter_ccs_feedback_data(count))
 
 def generate_ccs_workflow_data() -> Dict[str, Any]:
     """Generate workflow data for Call Center Supervisor role"""
@@ -334,12 +335,12 @@ def generate_ccs_workflow_data() -> Dict[str, Any]:
     }
 
 # Admin Role Data
-def generate_admin_users_data(count: int = 100) -> List[Dict[str, Any]]:
-    """Generate all system users data for Admin role"""
-    users = []
+def iter_admin_users_data(count: int = 100) -> Iterator[Dict[str, Any]]:
+    """Yield all system users for Admin role lazily, newest first"""
     roles = ["Admin", "Manager", "Controller", "Call Center Supervisor", "Operator", "Texnik", "Warehouse"]
+    created_dates = _descending_dates(count, timedelta(days=700), datetime.now() - timedelta(days=30))
     
-    for i in range(count):
+    for i, created_date in enumerate(created_dates):
         role = random.choice(roles)
         
         user = {
@@ -351,13 +352,15 @@ def generate_admin_users_data(count: int = 100) -> List[Dict[str, Any]]:
             "email": fake.email(),
             "region": random.choice(REGIONS),
             "status": random.choice(["Faol", "Bloklangan", "Ta'tilda"]),
-            "created_date": (datetime.now() - timedelta(days=random.randint(30, 730))).strftime("%Y-%m-%d"),
+            "created_date": created_date.strftime("%Y-%m-%d"),
             "last_login": (datetime.now() - timedelta(hours=random.randint(0, 168))).strftime("%Y-%m-%d %H:%M"),
             "permissions": random.choice(["To'liq", "Cheklangan", "Faqat ko'rish"])
         }
-        users.append(user)
-    
-    return sorted(users, key=lambda x: x["created_date"], reverse=True)
+        yield user
+
+def generate_admin_users_data(count: int = 100) -> List[Dict[str, Any]]:
+    """Generate all system users data for Admin role"""
+    return list(iter_admin_users_data(count))
 
 def generate_admin_system_data() -> Dict[str, Any]:
     """Generate system settings and configuration data for Admin role"""
@@ -393,15 +396,12 @@ def generate_admin_system_data() -> Dict[str, Any]:
         }
     }
 
-def generate_admin_logs_data(count: int = 200) -> List[Dict[str, Any]]:
-    """Generate system logs data for Admin role"""
-    logs = []
+def iter_admin_logs_data(count: int = 200) -> Iterator[Dict[str, Any]]:
+    """Yield system logs for Admin role lazily, newest first"""
     log_types = ["Login", "Logout", "Error", "Warning", "Info", "Security", "API", "Database"]
     log_levels = ["INFO", "WARNING", "ERROR", "CRITICAL"]
     
-    for i in range(count):
-        log_time = datetime.now() - timedelta(minutes=random.randint(0, 10080))  # Last week
-        
+    for i, log_time in enumerate(_descending_dates(count, timedelta(days=7))):  # Last week
         log = {
             "id": f"L-{10000 + i}",
             "timestamp": log_time.strftime("%Y-%m-%d %H:%M:%S"),
@@ -413,9 +413,11 @@ def generate_admin_logs_data(count: int = 200) -> List[Dict[str, Any]]:
             "details": fake.sentence() if random.random() > 0.5 else "-",
             "duration": f"{random.randint(10, 5000)} ms"
         }
-        logs.append(log)
-    
-    return sorted(logs, key=lambda x: x["timestamp"], reverse=True)
+        yield log
+
+def generate_admin_logs_data(count: int = 200) -> List[Dict[str, Any]]:
+    """Generate system logs data for Admin role"""
+    return list(iter_admin_logs_data(count))
 
 # Warehouse Role Data (keeping existing structure)
 def generate_warehouse_inventory_data(count: int = 100) -> List[Dict[str, Any]]:
@@ -447,11 +449,9 @@ def generate_warehouse_inventory_data(count: int = 100) -> List[Dict[str, Any]]:
     
     return sorted(inventory, key=lambda x: x["name"])
 
-def generate_warehouse_issued_items_data(count: int = 150) -> List[Dict[str, Any]]:
-    """Generate issued items data for Warehouse role"""
-    issued_items = []
-    
-    for i in range(count):
+def iter_warehouse_issued_items_data(count: int = 150) -> Iterator[Dict[str, Any]]:
+    """Yield issued items for Warehouse role lazily, newest first"""
+    for i, issue_date in enumerate(_descending_dates(count, timedelta(days=30))):
         quantity = random.randint(1, 50)
         unit_price = random.randint(10000, 500000)
         
@@ -466,13 +466,15 @@ def generate_warehouse_issued_items_data(count: int = 150) -> List[Dict[str, Any
             "technician": random.choice(TECHNICIAN_NAMES),
             "client_name": fake.name(),
             "client_address": f"{random.choice(REGIONS)}, {fake.street_address()}",
-            "issue_date": (datetime.now() - timedelta(days=random.randint(0, 30))).strftime("%Y-%m-%d %H:%M"),
+            "issue_date": issue_date.strftime("%Y-%m-%d %H:%M"),
             "return_date": "-",
             "status": random.choice(["Berildi", "Qaytarildi", "Yo'qolgan", "Shikastlangan"])
         }
-        issued_items.append(item)
-    
-    return sorted(issued_items, key=lambda x: x["issue_date"], reverse=True)
+        yield item
+
+def generate_warehouse_issued_items_data(count: int = 150) -> List[Dict[str, Any]]:
+    """Generate issued items data for Warehouse role"""
+    return list(iter_warehouse_issued_items_data(count))
 
 def generate_warehouse_statistics_data() -> Dict[str, Any]:
     """Generate statistics data for Warehouse role"""
@@ -554,39 +556,43 @@ def get_export_headers(export_type: str, role: str = None) -> List[str]:
     return headers_map.get(export_type, headers_map.get("orders"))
 
 # Main data generation function
-def get_role_data(role: str, export_type: str) -> tuple:
-    """Get data and headers for specific role and export type"""
+def iter_role_data(role: str, export_type: str) -> tuple:
+    """
+    Get data and headers for specific role and export type.
+    List data is returned as a lazy row iterator (newest first) so that
+    streaming exports (CSV) never hold the whole dataset in memory.
+    """
     
     # Manager role
     if role == "manager":
         if export_type == "orders":
-            return generate_manager_orders_data(), get_export_headers("manager_orders")
+            return iter_manager_orders_data(), get_export_headers("manager_orders")
         elif export_type == "statistics":
             return generate_manager_statistics_data(), get_export_headers("manager_statistics")
         elif export_type == "users":
-            return generate_manager_users_data(), get_export_headers("manager_users")
+            return iter(generate_manager_users_data()), get_export_headers("manager_users")
         elif export_type == "reports":
             return generate_manager_reports_data(), get_export_headers("manager_reports")
     
     # Controller role
     elif role == "controller":
         if export_type == "orders":
-            return generate_controller_orders_data(), get_export_headers("controller_orders")
+            return iter_controller_orders_data(), get_export_headers("controller_orders")
         elif export_type == "quality":
             return generate_controller_quality_data(), get_export_headers("controller_quality")
         elif export_type == "users" or export_type == "technicians":
-            return generate_controller_technicians_data(), get_export_headers("controller_users")
+            return iter(generate_controller_technicians_data()), get_export_headers("controller_users")
         elif export_type == "statistics":
             return generate_controller_quality_data(), get_export_headers("controller_quality")
     
     # Call Center Supervisor role
     elif role == "call_center_supervisor":
         if export_type == "orders":
-            return generate_ccs_orders_data(), get_export_headers("ccs_orders")
+            return iter_ccs_orders_data(), get_export_headers("ccs_orders")
         elif export_type == "users":
-            return generate_ccs_users_data(), get_export_headers("ccs_users")
+            return iter(generate_ccs_users_data()), get_export_headers("ccs_users")
         elif export_type == "feedback":
-            return generate_ccs_feedback_data(), get_export_headers("ccs_feedback")
+            return iter_ccs_feedback_data(), get_export_headers("ccs_feedback")
         elif export_type == "workflow":
             return generate_ccs_workflow_data(), get_export_headers("ccs_workflow")
         elif export_type == "statistics":
@@ -599,13 +605,13 @@ def get_role_data(role: str, export_type: str) -> tuple:
     # Admin role
     elif role == "admin":
         if export_type == "users":
-            return generate_admin_users_data(), get_export_headers("admin_users")
+            return iter_admin_users_data(), get_export_headers("admin_users")
         elif export_type == "orders":
-            return generate_manager_orders_data(200), get_export_headers("admin_orders")  # Reuse manager orders with more data
+            return iter_manager_orders_data(200), get_export_headers("admin_orders")  # Reuse manager orders with more data
         elif export_type == "system":
             return generate_admin_system_data(), get_export_headers("admin_system")
         elif export_type == "logs":
-            return generate_admin_logs_data(), get_export_headers("admin_logs")
+            return iter_admin_logs_data(), get_export_headers("admin_logs")
         elif export_type == "statistics":
             return {
                 "users": len(generate_admin_users_data(10)),
@@ -617,16 +623,23 @@ def get_role_data(role: str, export_type: str) -> tuple:
     # Warehouse role
     elif role == "warehouse":
         if export_type == "inventory":
-            return generate_warehouse_inventory_data(), get_export_headers("warehouse_inventory")
+            return iter(generate_warehouse_inventory_data()), get_export_headers("warehouse_inventory")
         elif export_type == "issued_items":
-            return generate_warehouse_issued_items_data(), get_export_headers("warehouse_issued")
+            return iter_warehouse_issued_items_data(), get_export_headers("warehouse_issued")
         elif export_type == "orders":
-            return generate_warehouse_issued_items_data(), get_export_headers("warehouse_issued")
+            return iter_warehouse_issued_items_data(), get_export_headers("warehouse_issued")
         elif export_type == "statistics":
             return generate_warehouse_statistics_data(), get_export_headers("warehouse_statistics")
     
     # Default fallback
-    return generate_manager_orders_data(50), get_export_headers("orders")
+    return iter_manager_orders_data(50), get_export_headers("orders")
+
+def get_role_data(role: str, export_type: str) -> tuple:
+    """Get data and headers for specific role and export type (materialized)"""
+    data, headers = iter_role_data(role, export_type)
+    if not isinstance(data, (dict, list)):
+        data = list(islice(data, MAX_EXPORT_ROWS))
+    return data, headers
 
 def validate_export_data(data: Any, headers: List[str]) -> bool:
     """Validate export data before processing"""
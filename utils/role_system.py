@@ -6,51 +6,161 @@ for the Alfa Connect bot.
 """
 
 from aiogram import Router, F
+from aiogram.dispatcher.event.bases import UNHANDLED
 from aiogram.types import Message, CallbackQuery
 from aiogram.fsm.context import FSMContext
 from loader import get_user_role, get_bot
+import asyncio
+import logging
 import time
-from typing import Dict, Optional
+from collections import OrderedDict, deque
+from typing import Any, Deque, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+class RoleCache:
+    """
+    Bounded LRU + TTL cache for user roles.
+    Expired entries are removed by a background task (see start_role_cache_expiry)
+    so memory stays bounded even for users who never come back.
+    """
+
+    def __init__(self, max_size: int = 100000, ttl: int = 300):
+        self.max_size = max_size
+        self.ttl = ttl
+        # user_id -> (role, expires_at), ordered by recent use
+        self._entries: "OrderedDict[int, Tuple[str, float]]" = OrderedDict()
+        # (expires_at, user_id) in insertion order - TTL is fixed, so this is sorted by expiry
+        self._expiry_queue: Deque[Tuple[float, int]] = deque()
+        self.stats = {'hits': 0, 'misses': 0, 'evictions': 0, 'expired': 0}
+
+    def get(self, user_id: int) -> Optional[str]:
+        entry = self._entries.get(user_id)
+        if entry is None:
+            self.stats['misses'] += 1
+            return None
+        if entry[1] <= time.time():
+            del self._entries[user_id]
+            self.stats['expired'] += 1
+            self.stats['misses'] += 1
+            return None
+        self._entries.move_to_end(user_id)
+        self.stats['hits'] += 1
+        return entry[0]
+
+    def set(self, user_id: int, role: str) -> None:
+        expires_at = time.time() + self.ttl
+        self._entries[user_id] = (role, expires_at)
+        self._entries.move_to_end(user_id)
+        self._expiry_queue.append((expires_at, user_id))
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.stats['evictions'] += 1
+
+    def invalidate(self, user_id: Optional[int] = None) -> None:
+        if user_id is None:
+            self._entries.clear()
+            self._expiry_queue.clear()
+        else:
+            self._entries.pop(user_id, None)
+
+    def expire(self) -> int:
+        """Remove all expired entries; cost is proportional to the number expired"""
+        now = time.time()
+        removed = 0
+        queue = self._expiry_queue
+        while queue and queue[0][0] <= now:
+            expires_at, user_id = queue.popleft()
+            entry = self._entries.get(user_id)
+            # Skip stale queue items for users re-cached later
+            if entry is not None and entry[1] == expires_at:
+                del self._entries[user_id]
+                removed += 1
+        self.stats['expired'] += removed
+        return removed
+
+    def get_stats(self) -> Dict[str, Any]:
+        total = self.stats['hits'] + self.stats['misses']
+        return {
+            **self.stats,
+            'size': len(self._entries),
+            'max_size': self.max_size,
+            'hit_rate': round(self.stats['hits'] / total * 100, 2) if total else 0.0,
+        }
 
 # Global role cache to reduce database queries
-_role_cache: Dict[int, str] = {}
-_role_cache_timestamps: Dict[int, float] = {}
 _cache_duration = 300  # 5 minutes
+_role_cache = RoleCache(max_size=100000, ttl=_cache_duration)
+_expiry_task: Optional[asyncio.Task] = None
 
 def invalidate_role_cache(user_id: int = None):
     """Invalidate role cache for specific user or all users"""
-    global _role_cache, _role_cache_timestamps
-    
+    _role_cache.invalidate(user_id)
     if user_id is None:
-        _role_cache.clear()
-        _role_cache_timestamps.clear()
         print("Global role cache cleared")
     else:
-        _role_cache.pop(user_id, None)
-        _role_cache_timestamps.pop(user_id, None)
         print(f"Role cache cleared for user: {user_id}")
 
 def get_cached_role(user_id: int) -> Optional[str]:
     """Get cached role if available and not expired"""
-    global _role_cache, _role_cache_timestamps
-    
-    if user_id in _role_cache:
-        timestamp = _role_cache_timestamps.get(user_id, 0)
-        if time.time() - timestamp < _cache_duration:
-            return _role_cache[user_id]
-        else:
-            # Remove expired cache
-            _role_cache.pop(user_id, None)
-            _role_cache_timestamps.pop(user_id, None)
-    
-    return None
+    return _role_cache.get(user_id)
 
 def cache_role(user_id: int, role: str):
     """Cache user role with timestamp"""
-    global _role_cache, _role_cache_timestamps
-    
-    _role_cache[user_id] = role
-    _role_cache_timestamps[user_id] = time.time()
+    _role_cache.set(user_id, role)
+
+def get_role_cache_stats() -> Dict[str, Any]:
+    """Role cache size and hit-rate statistics"""
+    return _role_cache.get_stats()
+
+async def _role_cache_expiry_loop(interval: float):
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            removed = _role_cache.expire()
+            if removed:
+                logger.debug(f"Role cache: {removed} expired entries removed")
+        except Exception as e:
+            logger.error(f"Role cache expiry error: {e}")
+
+async def start_role_cache_expiry(interval: float = 60):
+    """Start background expiry of the role cache"""
+    global _expiry_task
+    if _expiry_task is None or _expiry_task.done():
+        _expiry_task = asyncio.create_task(_role_cache_expiry_loop(interval))
+
+async def stop_role_cache_expiry():
+    """Stop background expiry of the role cache"""
+    global _expiry_task
+    if _expiry_task is not None:
+        _expiry_task.cancel()
+        _expiry_task = None
+
+class RoleGateRouter(Router):
+    """
+    Router that only propagates events whose resolved role is allowed.
+    The role is resolved once per update by RoleMiddleware and passed as
+    `user_role`; mismatching updates skip the whole subtree without
+    evaluating any of its filters.
+    """
+
+    def __init__(self, roles: str | list, name: Optional[str] = None):
+        self.roles = frozenset([roles] if isinstance(roles, str) else roles)
+        super().__init__(name=name or f"{'_'.join(sorted(self.roles))}_gate")
+
+    async def propagate_event(self, update_type: str, event: Any, **kwargs: Any) -> Any:
+        user_role = kwargs.get('user_role')
+        if user_role is not None and user_role not in self.roles:
+            return UNHANDLED
+        return await super().propagate_event(update_type, event, **kwargs)
+
+def resolve_user_role(user_id: int) -> str:
+    """Get user role from cache, falling back to role lookup"""
+    role = _role_cache.get(user_id)
+    if role is None:
+        role = get_user_role(user_id)
+        _role_cache.set(user_id, role)
+    return role
 
 def get_role_router(role: str):
     """Get router for specific role - centralized function to avoid duplicates"""
@@ -0,0 +1,232 @@
+"""
+Search Index - Inverted Full-Text Index with Trigrams
+
+Bu modul arizalar bo'yicha qidirish uchun xotiradagi teskari (inverted)
+indeksni taqdim etadi. Qidiruv vaqti arxiv hajmiga chiziqli bog'liq emas:
+so'rov tokenlari lug'at bo'yicha topiladi, hujjatlar esa faqat postings
+ro'yxatlaridan olinadi.
+
+- Matn normallashtiriladi: kichik harf, o'zbek kirill -> lotin, apostroflar
+  (ʻ ʼ ‘ ’ `) olib tashlanadi - "Oʻzbekiston", "O'zbekiston", "Ўзбекистон" bir xil
+- Qisman moslik: lug'atdagi tokenlar uchun trigram indeks (3+ belgi),
+  qisqa so'rovlar uchun saralangan lug'at bo'yicha prefiks qidiruv
+- Tokenlar 1-2 belgili bo'laklari bilan ham indekslanadi - qisqa so'rov
+  ("li", "90") token ichidan ham topiladi
+- Natijalar maydon og'irligi va moslik turi (to'liq/prefiks/qism) bo'yicha
+  tartiblanadi
+- Hujjat qo'shilganda/tahrirlanganda indeks bosqichma-bosqich yangilanadi
+"""
+
+import bisect
+import re
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+# O'zbek (va rus) kirill harflarini lotinga o'girish
+CYRILLIC_TO_LATIN = {
+    'а': 'a', 'б': 'b', 'в': 'v', 'г': 'g', 'ғ': 'g', 'д': 'd', 'е': 'e', 'ё': 'yo',
+    'ж': 'j', 'з': 'z', 'и': 'i', 'й': 'y', 'к': 'k', 'қ': 'q', 'л': 'l', 'м': 'm',
+    'н': 'n', 'о': 'o', 'п': 'p', 'р': 'r', 'с': 's', 'т': 't', 'у': 'u', 'ў': 'o',
+    'ф': 'f', 'х': 'x', 'ҳ': 'h', 'ц': 'ts', 'ч': 'ch', 'ш': 'sh', 'щ': 'sh', 'ъ': '',
+    'ы': 'i', 'ь': '', 'э': 'e', 'ю': 'yu', 'я': 'ya',
+}
+_TRANSLATION = str.maketrans({
+    **CYRILLIC_TO_LATIN,
+    'ʻ': '', 'ʼ': '', '‘': '', '’': '', '`': '', "'": '',
+})
+
+_TOKEN_RE = re.compile(r'[a-z0-9]+')
+_PHONE_QUERY_RE = re.compile(r'^[\d\s+()\-]+$')
+
+# Moslik turi koeffitsientlari
+EXACT_MATCH = 3.0
+PREFIX_MATCH = 2.0
+SUBSTRING_MATCH = 1.0
+
+
+def normalize_text(text: Any) -> str:
+    """Qidiruv uchun matnni normallashtirish (kirill -> lotin, apostroflarsiz)"""
+    if text is None:
+        return ''
+    return str(text).lower().translate(_TRANSLATION)
+
+
+def tokenize(text: Any) -> List[str]:
+    return _TOKEN_RE.findall(normalize_text(text))
+
+
+def trigrams(token: str) -> Set[str]:
+    return {token[i:i + 3] for i in range(len(token) - 2)}
+
+
+class SearchIndex:
+    """Maydon og'irliklari bilan teskari indeks"""
+
+    def __init__(self, field_weights: Dict[str, float], min_substring: int = 3):
+        self.field_weights = field_weights
+        self.min_substring = min_substring
+
+        # token -> maydon -> {doc_id}
+        self._postings: Dict[str, Dict[str, Set[Any]]] = {}
+        # trigram -> {token}
+        self._trigrams: Dict[str, Set[str]] = {}
+        # Tokenlarning min_substring'dan qisqa bo'laklari -> {token}
+        self._fragments: Dict[str, Set[str]] = {}
+        # Qisqa so'rovlar uchun saralangan lug'at - kerak bo'lganda qayta quriladi
+        self._vocabulary: List[str] = []
+        self._vocabulary_dirty = False
+        # doc_id -> {(token, maydon)}
+        self._documents: Dict[Any, Set[Tuple[str, str]]] = {}
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    # --- Yozish ---
+
+    def _short_fragments(self, token: str) -> Set[str]:
+        return {
+            token[i:i + size]
+            for size in range(1, self.min_substring)
+            for i in range(len(token) - size + 1)
+        }
+
+    def _add_token(self, token: str) -> None:
+        self._vocabulary_dirty = True
+        for gram in trigrams(token):
+            self._trigrams.setdefault(gram, set()).add(token)
+        for fragment in self._short_fragments(token):
+            self._fragments.setdefault(fragment, set()).add(token)
+
+    @staticmethod
+    def _unlink(table: Dict[str, Set[str]], keys: Iterable[str], token: str) -> None:
+        for key in keys:
+            tokens = table.get(key)
+            if tokens is not None:
+                tokens.discard(token)
+                if not tokens:
+                    del table[key]
+
+    def _drop_token(self, token: str) -> None:
+        del self._postings[token]
+        self._vocabulary_dirty = True
+        self._unlink(self._trigrams, trigrams(token), token)
+        self._unlink(self._fragments, self._short_fragments(token), token)
+
+    def add(self, doc_id: Any, fields: Dict[str, Any]) -> None:
+        """Hujjatni indekslash (mavjud bo'lsa yangilanadi)"""
+        self.remove(doc_id)
+
+        entries: Set[Tuple[str, str]] = set()
+        for field, value in fields.items():
+            if field not in self.field_weights:
+                continue
+            tokens = tokenize(value)
+            # Bo'lib yozilgan raqamlar ("+998 90 123 45 67") yaxlit ham indekslanadi
+            joined = ''.join(tokens)
+            if len(tokens) > 1 and joined.isdigit():
+                tokens.append(joined)
+            entries.update((token, field) for token in tokens)
+
+        for token, field in entries:
+            by_field = self._postings.get(token)
+            if by_field is None:
+                by_field = self._postings[token] = {}
+                self._add_token(token)
+            by_field.setdefault(field, set()).add(doc_id)
+
+        self._documents[doc_id] = entries
+
+    def remove(self, doc_id: Any) -> bool:
+        entries = self._documents.pop(doc_id, None)
+        if entries is None:
+            return False
+
+        for token, field in entries:
+            by_field = self._postings.get(token)
+            if by_field is None:
+                continue
+            docs = by_field.get(field)
+            if docs is not None:
+                docs.discard(doc_id)
+                if not docs:
+                    del by_field[field]
+            if not by_field:
+                self._drop_token(token)
+        return True
+
+    # --- Qidirish ---
+
+    def _prefix_tokens(self, prefix: str) -> List[str]:
+        if self._vocabulary_dirty:
+            self._vocabulary = sorted(self._postings)
+            self._vocabulary_dirty = False
+        start = bisect.bisect_left(self._vocabulary, prefix)
+        end = bisect.bisect_left(self._vocabulary, prefix + '\uffff')
+        return self._vocabulary[start:end]
+
+    def _matching_tokens(self, term: str) -> Dict[str, float]:
+        """So'rov tokeniga mos lug'at tokenlari va moslik koeffitsienti"""
+        if len(term) < self.min_substring:
+            matches = {token: PREFIX_MATCH for token in self._prefix_tokens(term)}
+            # "li" - token ichidagi bo'lak, "90" - telefon raqami ichida
+            for token in self._fragments.get(term, ()):
+                matches.setdefault(token, SUBSTRING_MATCH)
+        else:
+            grams = sorted(trigrams(term), key=lambda gram: len(self._trigrams.get(gram, ())))
+            candidates = set(self._trigrams.get(grams[0], ()))
+            for gram in grams[1:]:
+                if not candidates:
+                    break
+                candidates &= self._trigrams.get(gram, set())
+            matches = {}
+            for token in candidates:
+                if token.startswith(term):
+                    matches[token] = PREFIX_MATCH
+                elif term in token:
+                    matches[token] = SUBSTRING_MATCH
+
+        if term in matches:
+            matches[term] = EXACT_MATCH
+        return matches
+
+    def _posting_size(self, matches: Dict[str, float]) -> int:
+        return sum(len(docs) for token in matches for docs in self._postings[token].values())
+
+    def _query_terms(self, query: str) -> List[str]:
+        if _PHONE_QUERY_RE.match(query.strip()):
+            digits = ''.join(ch for ch in query if ch.isdigit())
+            return [digits] if digits else []
+        return list(dict.fromkeys(tokenize(query)))
+
+    def search(self, query: str, fields: Optional[Iterable[str]] = None, limit: Optional[int] = None) -> List[Tuple[Any, float]]:
+        """So'rovdagi barcha tokenlarga mos hujjatlar: [(doc_id, score)] kamayish tartibida"""
+        terms = self._query_terms(query)
+        if not terms:
+            return []
+        allowed = set(fields) if fields else set(self.field_weights)
+
+        scores: Optional[Dict[Any, float]] = None
+        # Kamroq mos keladigan tokendan boshlash - kesishma tezroq kichrayadi
+        term_matches = sorted((self._matching_tokens(term) for term in terms), key=self._posting_size)
+        for matches in term_matches:
+            term_scores: Dict[Any, float] = {}
+            for token, factor in matches.items():
+                for field, docs in self._postings[token].items():
+                    if field not in allowed:
+                        continue
+                    weight = self.field_weights[field] * factor
+                    if scores is not None:
+                        # Faqat oldingi tokenlarga mos hujjatlar (kichikroq to'plam bo'yicha)
+                        docs = [d for d in scores if d in docs] if len(scores) < len(docs) else [d for d in docs if d in scores]
+                    for doc_id in docs:
+                        if weight > term_scores.get(doc_id, 0.0):
+                            term_scores[doc_id] = weight
+
+            if scores is None:
+                scores = term_scores
+            else:
+                scores = {doc_id: scores[doc_id] + score for doc_id, score in term_scores.items()}
+            if not scores:
+                return []
+
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+        return ranked[:limit] if limit else ranked
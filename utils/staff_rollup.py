@@ -0,0 +1,262 @@
+"""
+Staff Rollup - Columnar Staff Performance Metrics
+
+Bu modul xodimlar faoliyati ko'rsatkichlarini barcha xodimlar va barcha
+davrlar (1/7/30 kun) uchun bitta o'tishda hisoblaydi. Natija yangi hodisa
+kelguncha (yoki max_age o'tguncha) keshlanadi, shuning uchun "👥 Xodimlar
+faoliyati" ekrani 1000+ xodimda ham har bir xodim uchun O(1) o'qiladi.
+
+- Ariza faktlari ustunli massivlarga yuklanadi: assignee, status, workflow,
+  priority, created_ts, updated_ts
+- Hisob NumPy bilan vektorlashtiriladi (np.bincount, requirements.txt);
+  NumPy bo'lmagan muhitda xuddi shu natija oddiy Python sikli bilan hisoblanadi
+- Vaqt maydonlari epoch (`*_ts`) ko'rinishida bo'lishi kerak - qarang utils.timestamps
+"""
+
+import logging
+import os
+import time
+from datetime import date, datetime
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - zaxira: Python sikli
+    np = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WINDOWS = (1, 7, 30)
+DEFAULT_MAX_AGE = float(os.getenv('STAFF_ROLLUP_MAX_AGE', 60))
+
+ACTIVE_STATUSES = ('in_progress', 'assigned')
+PRIORITIES = ('high', 'medium', 'low')
+
+
+def empty_performance(period_days: int) -> Dict[str, Any]:
+    return {
+        'total_tasks': 0,
+        'completed_tasks': 0,
+        'in_progress': 0,
+        'cancelled': 0,
+        'success_rate': 0,
+        'avg_completion_hours': 0,
+        'tasks_by_type': {},
+        'completed_today': 0,
+        'period_days': period_days
+    }
+
+
+def _finish(counts: Tuple[int, int, int, int, float, int, int], by_type: Dict[str, int], period_days: int) -> Dict[str, Any]:
+    total, completed, active, cancelled, hours_sum, hours_count, completed_today = counts
+    return {
+        'total_tasks': total,
+        'completed_tasks': completed,
+        'in_progress': active,
+        'cancelled': cancelled,
+        'success_rate': round((completed / total * 100) if total > 0 else 0, 1),
+        'avg_completion_hours': round(hours_sum / hours_count, 1) if hours_count else 0,
+        'tasks_by_type': by_type,
+        'completed_today': completed_today,
+        'period_days': period_days
+    }
+
+
+class StaffFacts:
+    """Ariza faktlari - ustunli ko'rinishda"""
+
+    def __init__(self, applications: Iterable[Dict[str, Any]]):
+        rows = [app for app in applications if app.get('current_assignee_id')]
+        self.staff_ids: List[Any] = list(dict.fromkeys(app['current_assignee_id'] for app in rows))
+        self.workflow_types: List[str] = list(dict.fromkeys(app.get('workflow_type', 'other') for app in rows))
+        staff_codes = {staff_id: code for code, staff_id in enumerate(self.staff_ids)}
+        type_codes = {name: code for code, name in enumerate(self.workflow_types)}
+        priority_codes = {name: code for code, name in enumerate(PRIORITIES)}
+
+        self.staff = [staff_codes[app['current_assignee_id']] for app in rows]
+        self.workflow = [type_codes[app.get('workflow_type', 'other')] for app in rows]
+        # Noma'lum prioritet 'medium' deb hisoblanadi
+        self.priority = [priority_codes.get(app.get('priority', 'medium'), 1) for app in rows]
+        self.status = [app.get('current_status') for app in rows]
+        self.created = [app.get('created_ts') for app in rows]
+        self.updated = [app.get('updated_ts') for app in rows]
+
+    def __len__(self) -> int:
+        return len(self.staff)
+
+    def codes_with_status(self, status: str) -> List[int]:
+        """Shu statusdagi arizasi bor xodimlar - birinchi uchragan tartibda"""
+        return list(dict.fromkeys(code for code, value in zip(self.staff, self.status) if value == status))
+
+
+def _rollup_numpy(facts: StaffFacts, windows: Iterable[int], now_ts: float, today_ts: float) -> Tuple[Dict, Dict]:
+    size = len(facts.staff_ids)
+    type_count = len(facts.workflow_types)
+    staff = np.asarray(facts.staff, dtype=np.int64)
+    workflow = np.asarray(facts.workflow, dtype=np.int64)
+    priority = np.asarray(facts.priority, dtype=np.int64)
+    status = np.asarray(facts.status, dtype=object)
+    created = np.asarray([ts if ts is not None else np.nan for ts in facts.created], dtype=np.float64)
+    updated = np.asarray([ts if ts is not None else np.nan for ts in facts.updated], dtype=np.float64)
+
+    completed = status == 'completed'
+    active = np.isin(status, ACTIVE_STATUSES)
+    cancelled = status == 'cancelled'
+    duration = updated - created
+    has_duration = completed & ~np.isnan(duration)
+    hours = np.where(has_duration, duration, 0.0) / 3600
+    done_today = completed & (np.nan_to_num(updated, nan=0.0) >= today_ts)
+
+    def per_staff(mask):
+        return np.bincount(staff[mask], minlength=size)
+
+    metrics: Dict[int, Dict[Any, Dict[str, Any]]] = {}
+    for days in windows:
+        # Vaqtsiz yozuvlar (NaN) davrga kirmaydi
+        in_window = np.nan_to_num(created, nan=-np.inf) >= now_ts - days * 86400
+        totals = per_staff(in_window)
+        done = per_staff(in_window & completed)
+        running = per_staff(in_window & active)
+        dropped = per_staff(in_window & cancelled)
+        hours_sum = np.bincount(staff[in_window], weights=hours[in_window], minlength=size)
+        hours_count = per_staff(in_window & has_duration)
+        today = per_staff(in_window & done_today)
+        by_type = np.bincount(
+            staff[in_window] * type_count + workflow[in_window], minlength=size * type_count
+        ).reshape(size, type_count) if type_count else np.zeros((size, 0), dtype=np.int64)
+
+        metrics[days] = {
+            staff_id: _finish(
+                (int(totals[code]), int(done[code]), int(running[code]), int(dropped[code]),
+                 float(hours_sum[code]), int(hours_count[code]), int(today[code])),
+                {facts.workflow_types[t]: int(n) for t, n in enumerate(by_type[code]) if n},
+                days
+            )
+            for code, staff_id in enumerate(facts.staff_ids)
+        }
+
+    in_progress = status == 'in_progress'
+    load = np.bincount(
+        staff[in_progress] * len(PRIORITIES) + priority[in_progress], minlength=size * len(PRIORITIES)
+    ).reshape(size, len(PRIORITIES))
+    workload = {facts.staff_ids[code]: _workload(load[code].tolist()) for code in facts.codes_with_status('in_progress')}
+    return metrics, workload
+
+
+def _rollup_python(facts: StaffFacts, windows: Iterable[int], now_ts: float, today_ts: float) -> Tuple[Dict, Dict]:
+    windows = list(windows)
+    size = len(facts.staff_ids)
+    starts = [now_ts - days * 86400 for days in windows]
+    # [oyna][xodim] -> [total, completed, active, cancelled, hours_sum, hours_count, today]
+    counts = [[[0, 0, 0, 0, 0.0, 0, 0] for _ in range(size)] for _ in windows]
+    by_type = [[{} for _ in range(size)] for _ in windows]
+    load = [[0] * len(PRIORITIES) for _ in range(size)]
+
+    for staff, workflow, priority, status, created, updated in zip(
+        facts.staff, facts.workflow, facts.priority, facts.status, facts.created, facts.updated
+    ):
+        if status == 'in_progress':
+            load[staff][priority] += 1
+        if created is None:
+            continue
+        completed = status == 'completed'
+        has_duration = completed and updated is not None
+        done_today = completed and (updated or 0) >= today_ts
+        for w, start in enumerate(starts):
+            if created < start:
+                continue
+            row = counts[w][staff]
+            row[0] += 1
+            if completed:
+                row[1] += 1
+            elif status in ACTIVE_STATUSES:
+                row[2] += 1
+            elif status == 'cancelled':
+                row[3] += 1
+            if has_duration:
+                row[4] += (updated - created) / 3600
+                row[5] += 1
+            if done_today:
+                row[6] += 1
+            types = by_type[w][staff]
+            name = facts.workflow_types[workflow]
+            types[name] = types.get(name, 0) + 1
+
+    metrics = {
+        days: {
+            staff_id: _finish(tuple(counts[w][code]), by_type[w][code], days)
+            for code, staff_id in enumerate(facts.staff_ids)
+        }
+        for w, days in enumerate(windows)
+    }
+    workload = {facts.staff_ids[code]: _workload(load[code]) for code in facts.codes_with_status('in_progress')}
+    return metrics, workload
+
+
+def _workload(counts: List[int]) -> Dict[str, int]:
+    result = {'total': sum(counts)}
+    result.update({f'{name}_priority': int(n) for name, n in zip(PRIORITIES, counts)})
+    return result
+
+
+class StaffRollup:
+    """Region bo'yicha keshlanadigan xodimlar ko'rsatkichlari"""
+
+    def __init__(self, windows: Iterable[int] = DEFAULT_WINDOWS, max_age: float = DEFAULT_MAX_AGE):
+        self.windows = tuple(windows)
+        self.max_age = max_age
+        self._source: Optional[Callable[[str], Awaitable[Iterable[Dict[str, Any]]]]] = None
+        # region -> (hisoblangan vaqt, kun, metrics, workload)
+        self._cache: Dict[str, Tuple[float, date, Dict, Dict]] = {}
+        self.stats = {'rollups': 0, 'hits': 0}
+
+    def set_source(self, source: Callable[[str], Awaitable[Iterable[Dict[str, Any]]]]) -> None:
+        """Region uchun ariza faktlarini qaytaruvchi manba"""
+        self._source = source
+
+    def invalidate(self, region: Optional[str] = None) -> None:
+        """Yangi hodisa (ariza yaratildi/tayinlandi/yopildi) - keyingi o'qishda qayta hisoblanadi"""
+        if region is None:
+            self._cache.clear()
+        else:
+            self._cache.pop(region, None)
+
+    def compute(self, applications: Iterable[Dict[str, Any]], windows: Iterable[int], now: Optional[datetime] = None) -> Tuple[Dict, Dict]:
+        """Barcha xodimlar va davrlar uchun ko'rsatkichlar: (metrics[davr][xodim], workload[xodim])"""
+        now = now or datetime.now()
+        today_ts = datetime.combine(now.date(), datetime.min.time()).timestamp()
+        facts = StaffFacts(applications)
+        rollup = _rollup_numpy if np is not None and len(facts) else _rollup_python
+        return rollup(facts, windows, now.timestamp(), today_ts)
+
+    async def _load(self, region: str, extra_window: Optional[int] = None) -> Tuple[Dict, Dict]:
+        entry = self._cache.get(region)
+        fresh = (
+            entry is not None
+            and time.monotonic() - entry[0] < self.max_age
+            and entry[1] == date.today()
+            and (extra_window is None or extra_window in entry[2])
+        )
+        if fresh:
+            self.stats['hits'] += 1
+            return entry[2], entry[3]
+
+        applications = await self._source(region) if self._source is not None else []
+        windows = set(self.windows) | set(entry[2] if entry else ()) | ({extra_window} if extra_window else set())
+        started = time.perf_counter()
+        metrics, workload = self.compute(applications, sorted(windows))
+        self.stats['rollups'] += 1
+        logger.debug(f"Staff rollup for {region}: {len(workload)} loaded staff, {(time.perf_counter() - started) * 1000:.1f} ms")
+        self._cache[region] = (time.monotonic(), date.today(), metrics, workload)
+        return metrics, workload
+
+    async def performance(self, region: str, staff_id: Any, period_days: int = 7) -> Dict[str, Any]:
+        metrics, _ = await self._load(region, period_days)
+        return metrics[period_days].get(staff_id) or empty_performance(period_days)
+
+    async def workload(self, region: str) -> Dict[Any, Dict[str, int]]:
+        _, workload = await self._load(region)
+        return workload
+
+
+staff_rollup = StaffRollup()
@@ -0,0 +1,66 @@
+"""
+Timestamps - Normalization at Ingestion and Batch Duration Math
+
+Bu modul vaqt maydonlarini ma'lumot yuklanganda bir marta normallashtiradi,
+shunda dashboard yangilanishlarida ISO satrlar qayta-qayta parse qilinmaydi.
+
+- to_datetime: ISO satr / aware datetime -> lokal naive datetime (ko'rsatish uchun)
+- to_epoch: istalgan ko'rinishdagi vaqt -> epoch sekund (vaqt mintaqasidan mustaqil)
+- normalize_timestamps: yozuvdagi `*_at` maydonlarini datetime'ga aylantirib,
+  yoniga `*_ts` (epoch) maydonini qo'shadi
+- elapsed_seconds: ko'p qatorlar uchun davomiylikni bitta o'tishda hisoblash
+"""
+
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Union
+
+TIMESTAMP_FIELDS = ('created_at', 'updated_at', 'assigned_at', 'completed_at', 'last_activity')
+
+
+def to_datetime(value: Any) -> Optional[datetime]:
+    """datetime yoki ISO satrni lokal (naive) datetime'ga keltirish"""
+    if value is None or value == '':
+        return None
+    if isinstance(value, (int, float)):
+        return datetime.fromtimestamp(value)
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    if value.tzinfo is not None:
+        value = value.astimezone().replace(tzinfo=None)
+    return value
+
+
+def to_epoch(value: Any) -> Optional[float]:
+    """Vaqtni epoch sekundga aylantirish"""
+    if isinstance(value, (int, float)):
+        return float(value)
+    value = to_datetime(value)
+    return value.timestamp() if value is not None else None
+
+
+def epoch_field(field: str) -> str:
+    """created_at -> created_ts, last_activity -> last_activity_ts"""
+    return (field[:-3] if field.endswith('_at') else field) + '_ts'
+
+
+def normalize_timestamps(record: Dict[str, Any], fields: Iterable[str] = TIMESTAMP_FIELDS) -> Dict[str, Any]:
+    """Yozuvdagi vaqt maydonlarini joyida normallashtirish (yuklash vaqtida bir marta)"""
+    for field in fields:
+        if field in record:
+            value = to_datetime(record[field])
+            record[field] = value
+            record[epoch_field(field)] = value.timestamp() if value is not None else None
+    return record
+
+
+def elapsed_seconds(
+    starts: Sequence[Optional[float]],
+    ends: Union[float, Sequence[Optional[float]]],
+) -> List[Optional[float]]:
+    """Har bir qator uchun ends - starts (sekund); ends bitta son bo'lsa hammasiga umumiy"""
+    if isinstance(ends, (int, float)):
+        return [ends - start if start is not None else None for start in starts]
+    return [
+        end - start if start is not None and end is not None else None
+        for start, end in zip(starts, ends)
+    ]
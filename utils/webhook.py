@@ -0,0 +1,186 @@
+"""
+Webhook Runtime - aiohttp Implementation
+
+Bu modul long polling o'rniga webhook rejimida ishlash uchun aiohttp serverni
+taqdim etadi. Kelgan update'lar navbatga qo'yiladi va cheklangan sondagi
+worker'lar tomonidan parallel qayta ishlanadi.
+
+- Navbat to'lsa server 503 qaytaradi (backpressure) - Telegram update'ni
+  keyinroq qayta yuboradi, shuning uchun hech narsa yo'qolmaydi
+- To'xtatishda yangi update'lar qabul qilinmaydi, navbatdagilar tugatiladi
+  (graceful drain)
+"""
+
+import asyncio
+import logging
+import signal
+import time
+from typing import Any, Dict, List, Optional
+
+from aiohttp import web
+from aiogram import Bot, Dispatcher
+from aiogram.types import Update
+
+logger = logging.getLogger(__name__)
+
+SECRET_HEADER = "X-Telegram-Bot-Api-Secret-Token"
+
+
+class WebhookRuntime:
+    """Bounded concurrency bilan webhook update'larini qayta ishlovchi runtime"""
+
+    def __init__(
+        self,
+        dp: Dispatcher,
+        bot: Bot,
+        path: str = "/webhook",
+        secret_token: Optional[str] = None,
+        max_concurrency: int = 50,
+        queue_size: int = 1000,
+        drain_timeout: float = 30.0,
+    ):
+        self.dp = dp
+        self.bot = bot
+        self.path = path
+        self.secret_token = secret_token
+        self.max_concurrency = max_concurrency
+        self.queue_size = queue_size
+        self.drain_timeout = drain_timeout
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+        self._accepting = False
+        self._in_flight = 0
+
+        self.stats = {'received': 0, 'processed': 0, 'failed': 0, 'rejected': 0}
+
+    # --- HTTP qismi ---
+
+    async def handle(self, request: web.Request) -> web.Response:
+        """Telegram'dan kelgan bitta update'ni qabul qilish"""
+        if self.secret_token and request.headers.get(SECRET_HEADER) != self.secret_token:
+            return web.Response(status=401)
+
+        if not self._accepting:
+            self.stats['rejected'] += 1
+            return web.Response(status=503)
+
+        try:
+            payload = await request.json()
+            update = Update.model_validate(payload, context={"bot": self.bot})
+        except Exception as e:
+            logger.warning(f"Invalid webhook payload: {e}")
+            return web.Response(status=400)
+
+        try:
+            self._queue.put_nowait(update)
+        except asyncio.QueueFull:
+            # Telegram 2xx bo'lmagan javobda update'ni qayta yuboradi
+            self.stats['rejected'] += 1
+            logger.warning(f"Webhook queue full ({self.queue_size}), update {update.update_id} rejected")
+            return web.Response(status=503, headers={"Retry-After": "1"})
+
+        self.stats['received'] += 1
+        return web.Response(status=200)
+
+    async def health(self, request: web.Request) -> web.Response:
+        """Health-check endpoint"""
+        return web.json_response(self.get_stats())
+
+    def create_app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_post(self.path, self.handle)
+        app.router.add_get(f"{self.path}/health", self.health)
+        return app
+
+    # --- Worker'lar ---
+
+    async def _worker(self) -> None:
+        while True:
+            update = await self._queue.get()
+            self._in_flight += 1
+            started = time.perf_counter()
+            try:
+                await self.dp.feed_update(self.bot, update)
+                self.stats['processed'] += 1
+            except Exception as e:
+                self.stats['failed'] += 1
+                logger.error(f"Error processing update {update.update_id}: {e}", exc_info=True)
+            finally:
+                self._in_flight -= 1
+                self._queue.task_done()
+                elapsed = time.perf_counter() - started
+                if elapsed > 5:
+                    logger.warning(f"Slow update {update.update_id}: {elapsed:.2f}s")
+
+    def start_workers(self) -> None:
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._workers = [asyncio.create_task(self._worker()) for _ in range(self.max_concurrency)]
+        self._accepting = True
+
+    async def drain(self) -> None:
+        """Yangi update'larni to'xtatish va navbatdagilarni tugatish"""
+        self._accepting = False
+        if self._queue is not None:
+            try:
+                await asyncio.wait_for(self._queue.join(), timeout=self.drain_timeout)
+            except asyncio.TimeoutError:
+                logger.warning(
+                    f"Webhook drain timeout: {self._queue.qsize()} queued, {self._in_flight} in flight"
+                )
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            'queued': self._queue.qsize() if self._queue else 0,
+            'in_flight': self._in_flight,
+            'accepting': self._accepting,
+        }
+
+    # --- Ishga tushirish ---
+
+    async def run(self, webhook_url: str, host: str = "0.0.0.0", port: int = 8080) -> None:
+        """Serverni ishga tushirish va to'xtatish signalini kutish"""
+        stop_event = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, stop_event.set)
+            except (NotImplementedError, RuntimeError):
+                # Windows'da signal handler'lar qo'llab-quvvatlanmaydi
+                pass
+
+        workflow_data = {"dispatcher": self.dp, "bots": [self.bot], "bot": self.bot, **self.dp.workflow_data}
+        await self.dp.emit_startup(**workflow_data)
+        runner: Optional[web.AppRunner] = None
+        # Startup'dan keyin har qanday xato (port band, set_webhook) ham shutdown'gacha yetadi
+        try:
+            self.start_workers()
+
+            runner = web.AppRunner(self.create_app())
+            await runner.setup()
+            site = web.TCPSite(runner, host=host, port=port)
+            await site.start()
+
+            await self.bot.set_webhook(
+                url=webhook_url.rstrip("/") + self.path,
+                secret_token=self.secret_token,
+                allowed_updates=self.dp.resolve_used_update_types(),
+                max_connections=min(max(self.max_concurrency, 1), 100),
+            )
+            print(f"🌐 Webhook server started on {host}:{port}{self.path}")
+            logger.info(f"Webhook mode: concurrency={self.max_concurrency}, queue={self.queue_size}")
+
+            await stop_event.wait()
+        finally:
+            print("⏹️ Stopping webhook server, draining pending updates...")
+            await self.drain()
+            if runner is not None:
+                await runner.cleanup()
+            await self.dp.emit_shutdown(**workflow_data)
+            await self.bot.session.close()
+            logger.info(f"Webhook stopped: {self.get_stats()}")